@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+分析バンドルベンチマーク
+
+``analyze`` 済みのファイルに対する後続の処理（別の設定での再分割、区間の
+特徴量抽出、LLMプロンプトの再生成）の時間を、音声から計算し直す場合と
+``analyze_to_bundle`` で保存したバンドルを使う場合で比較する。
+
+    python -m benchmarks.benchmark_analysis_bundle [--duration SEC]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.analysis import (
+    analyze_audio_segments,
+    analyze_to_bundle,
+    detect_segments,
+    load_bundle,
+)
+from vocal_insight.core.decode import load_audio, load_audio_range
+from vocal_insight.core.types import AnalysisConfig
+from vocal_insight.features import get_extractor
+from vocal_insight_cli import _generate_llm_prompt_from_segments
+
+SR = 22050
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=180.0)
+    args = parser.parse_args()
+
+    config = AnalysisConfig(rms_delta_percentile=95, min_len_sec=5.0, max_len_sec=30.0)
+    follow_up = AnalysisConfig(config, rms_delta_percentile=90, segmentation="phrase")
+    excerpt = (args.duration / 2, args.duration / 2 + 10.0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "take.wav")
+        bundle_path = Path(directory) / "take.bundle"
+        sf.write(path, render(make_melody(args.duration), SR), SR)
+
+        _, plain = timed(lambda: analyze_audio_segments(path, config))
+        _, bundled = timed(lambda: analyze_to_bundle(path, bundle_path, config))
+
+        def from_audio():
+            audio, sr = load_audio(path)
+            segments, _ = detect_segments(audio, sr, follow_up)
+            y, sr = load_audio_range(path, *excerpt, sr=SR)
+            features = get_extractor("acoustic").extract(y, sr)
+            prompt = _generate_llm_prompt_from_segments(
+                analyze_audio_segments(path, config), "take.wav"
+            )
+            return segments, features, prompt
+
+        def from_bundle():
+            bundle = load_bundle(bundle_path)
+            segments = bundle.segment(follow_up)
+            features = bundle.extract([excerpt])[0]
+            prompt = _generate_llm_prompt_from_segments(bundle.segments, "take.wav")
+            return segments, features, prompt
+
+        (segments, features, prompt), recomputed = timed(from_audio)
+        (b_segments, b_features, b_prompt), reused = timed(from_bundle)
+        size = sum(f.stat().st_size for f in bundle_path.iterdir())
+
+    print(f"audio          : {args.duration:.0f} s")
+    print(f"analyze        : {plain:6.2f} s")
+    print(f"analyze+bundle : {bundled:6.2f} s (bundle {size / 1024:.0f} KiB)")
+    print(f"follow-ups from audio  : {recomputed:6.2f} s")
+    print(f"follow-ups from bundle : {reused * 1000:6.1f} ms")
+    print(f"speedup        : {recomputed / reused:.0f}x")
+    print(f"same segments  : {segments == b_segments}")
+    print(f"same prompt    : {prompt == b_prompt}")
+    print(
+        f"excerpt F0     : {features['f0_mean_hz']:.1f} Hz (audio), "
+        f"{b_features['f0_mean_hz']:.1f} Hz (bundle)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+チャンク並列のトラック全体分析ベンチマーク
+
+合成歌声1ファイルのトラック全体のフレームRMS・Praat のピッチ輪郭を、
+一括で計算する場合と ``chunked_intermediates`` でチャンクに分けて計算する
+場合の時間を比較し、つなぎ合わせた結果と一括の結果の差（RMS・有声判定・
+F0・フレーズ分割の境界）を確認する。
+
+    python -m benchmarks.benchmark_chunked_analysis [--duration SEC]
+        [--chunk SEC] [--jobs N]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.analysis import chunked_intermediates, segment_track
+from vocal_insight.core.types import AnalysisConfig
+from vocal_insight.features.graph import FeatureContext
+
+SR = 22050
+
+
+def same_segments(expected, actual):
+    """セグメントの数が等しく、境界が時刻の丸め誤差の範囲で一致するか"""
+    return len(expected) == len(actual) and np.allclose(expected, actual, atol=1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=600.0)
+    parser.add_argument("--chunk", type=float, default=60.0)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    audio = render(make_melody(args.duration), SR).astype(np.float32)
+    config = AnalysisConfig(
+        rms_delta_percentile=95,
+        min_len_sec=5.0,
+        max_len_sec=30.0,
+        segmentation="phrase",
+    )
+    # 初回呼び出しの準備を除く
+    chunked_intermediates(audio[: 5 * SR], SR, chunk_sec=2.0)
+
+    start = time.perf_counter()
+    track = FeatureContext(audio, SR, "praat")
+    rms, contour = track.get("rms"), track.get("contour")
+    single = time.perf_counter() - start
+
+    rows = []
+    for jobs in sorted({1, args.jobs}):
+        start = time.perf_counter()
+        chunked = chunked_intermediates(audio, SR, chunk_sec=args.chunk, jobs=jobs)
+        rows.append((jobs, time.perf_counter() - start, chunked))
+
+    def phrases(contour):
+        return segment_track(len(audio) / SR, SR, config, contour=contour)
+
+    segments = phrases(contour)
+    print(f"audio   : {args.duration:.0f} s, chunks of {args.chunk:.0f} s")
+    print(f"single pass : {single:6.2f} s")
+    for jobs, elapsed, chunked in rows:
+        stitched = chunked["contour"]
+        voiced = contour.voiced & stitched.voiced
+        error = np.abs(stitched.f0_hz[voiced] / contour.f0_hz[voiced] - 1)
+        print(
+            f"chunked jobs={jobs}: {elapsed:6.2f} s ({single / elapsed:.2f}x), "
+            f"rms equal {np.array_equal(rms, chunked['rms'])}, "
+            f"voicing mismatches {np.sum(contour.voiced != stitched.voiced)}"
+            f"/{len(contour.f0_hz)}, "
+            f"F0 differs in {np.sum(error > 0)} frames (max {error.max():.1e}), "
+            f"same phrases {same_segments(segments, phrases(stitched))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
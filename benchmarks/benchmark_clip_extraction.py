@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+短いクリップの一括抽出ベンチマーク
+
+2〜5秒の合成歌声クリップ（既定は200ファイル、44.1 kHz の WAV）の特徴量抽出の
+処理速度（クリップ/秒）を比較する。
+
+- per-invocation: クリップごとに ``vocal-insight extract`` を別プロセスで実行。
+  時間がかかるため ``--sample`` 個のクリップで測定し、クリップ数に換算する
+- directory: ``extract <ディレクトリ>`` と同じく先読みしながら1プロセスで抽出
+  （ファイルの出力は除く）
+- clips: ``extract_clips`` で ``--clips-per-task`` 個ずつタスクにまとめて抽出
+  （1ジョブと ``--jobs`` 個のワーカー、タスクあたり1クリップとの比較）
+
+    python -m benchmarks.benchmark_clip_extraction [--clips N] [--jobs N]
+        [--clips-per-task N] [--sample N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.analysis import DEFAULT_CLIPS_PER_TASK, extract_clips
+from vocal_insight.core.prefetch import PrefetchLoader
+from vocal_insight.features import get_extractor
+
+SOURCE_SR = 44100
+
+
+def per_invocation(paths, output_dir):
+    """クリップごとに CLI を別プロセスで実行する従来の方式"""
+    cli = str(Path(__file__).resolve().parents[1] / "vocal_insight_cli.py")
+    for path in paths:
+        subprocess.run(
+            [sys.executable, cli, "--quiet", "extract", path, "-o", output_dir],
+            check=True,
+        )
+
+
+def per_file(paths):
+    """先読みしながら1プロセスでクリップごとに抽出する"""
+    extractor = get_extractor("acoustic")
+    with PrefetchLoader(paths, sr=None) as loader:
+        return [extractor.extract(item.audio, item.sr) for item in loader]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument("--clips-per-task", type=int, default=DEFAULT_CLIPS_PER_TASK)
+    parser.add_argument("--sample", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for number in range(args.clips):
+            path = str(Path(directory) / f"clip{number:05d}.wav")
+            melody = make_melody(rng.uniform(2.0, 5.0), seed=number)
+            sf.write(path, render(melody, SOURCE_SR), SOURCE_SR)
+            paths.append(path)
+        # 初回呼び出しの準備を除く
+        per_file(paths[:1])
+
+        invocation, _ = timed(lambda: per_invocation(paths[: args.sample], directory))
+        invocation *= len(paths) / args.sample
+        rows = [("per-invocation", invocation, None)]
+        elapsed, expected = timed(lambda: per_file(paths))
+        rows.append(("directory", elapsed, expected))
+        for jobs, per_task in (
+            (1, args.clips_per_task),
+            (args.jobs, 1),
+            (args.jobs, args.clips_per_task),
+        ):
+            elapsed, results = timed(
+                lambda: list(extract_clips(paths, jobs=jobs, clips_per_task=per_task))
+            )
+            values = [result["features"] for result in results]
+            rows.append((f"clips jobs={jobs} per-task={per_task}", elapsed, values))
+
+    print(
+        f"clips   : {args.clips} WAV files of 2-5 s "
+        "(44.1 kHz, analyzed at the native rate)"
+    )
+    for label, elapsed, values in rows:
+        same = "" if values is None else f", same features {values == expected}"
+        estimated = f" (estimated from {args.sample})" if values is None else ""
+        print(
+            f"{label:30s}: {elapsed:7.2f} s, "
+            f"{len(paths) / elapsed:6.1f} clips/s{estimated}{same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+デコードキャッシュベンチマーク
+
+合成歌声の MP3 を作成し、``librosa.load`` による毎回のデコードと、
+デコードキャッシュ（初回のデコードと保存、2回目以降のメモリマップ読み込み）の
+時間を比較する。一部区間の参照（10秒分）の時間もあわせて計測する。
+
+    python -m benchmarks.benchmark_decode_cache [--duration SEC] [--repeats N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.core.decode import DecodeCache, load_audio
+
+SR = 22050
+
+
+def timed(function, repeats):
+    """複数回実行した時間の中央値（秒）と最後の結果"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=300.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "take.mp3"
+        sf.write(path, render(make_melody(args.duration), 44100), 44100, format="MP3")
+        # librosa・リサンプラーの初回呼び出しの準備を除く
+        load_audio(path)
+
+        decode, (audio, _) = timed(lambda: load_audio(path), args.repeats)
+
+        cache = DecodeCache(Path(directory) / "cache")
+        start = time.perf_counter()
+        cache.load(path)
+        first = time.perf_counter() - start
+        hit, (cached, _, _) = timed(lambda: cache.load(path), args.repeats)
+        partial, _ = timed(
+            lambda: np.array(cache.load(path)[0][60 * SR : 70 * SR]), args.repeats
+        )
+
+    print(f"audio             : {args.duration:.0f} s MP3 (44.1 kHz -> {SR} Hz)")
+    print(f"librosa.load      : {decode:7.3f} s per load")
+    print(f"cache first load  : {first:7.3f} s (decode + save)")
+    print(f"cache hit         : {hit:7.3f} s (hash + memory map)")
+    print(f"cache hit, 10 s   : {partial:7.3f} s (hash + memory map + copy)")
+    print(f"speedup (hit)     : {decode / hit:.0f}x")
+    print(f"identical samples : {np.array_equal(np.asarray(cached), audio)}")
+
+
+if __name__ == "__main__":
+    main()
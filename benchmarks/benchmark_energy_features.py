@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+音量・ダイナミクス特徴量ベンチマーク
+
+10分間の合成歌声を10秒ごとのセグメントに分け、平均RMS・ダイナミックレンジ・
+クレストファクター・音量の傾きを計算する時間を比較する。
+
+- per-segment: セグメントごとに RMS を計算し直して統計量を求める
+- shared: 境界検出で計算したトラック全体の RMS を区間集約で全セグメント分計算
+
+    python -m benchmarks.benchmark_energy_features [--duration SEC] [--segment-sec SEC]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.features import FeatureContext, energy_statistics
+from vocal_insight.features.graph import STFT_HOP_LENGTH
+from vocal_insight.segments import SegmentBoundaryDetector
+
+SR = 22050
+
+
+def per_segment(audio, segments):
+    """セグメントごとに RMS を計算し直す方式"""
+    return [
+        FeatureContext(audio[int(start * SR) : int(end * SR)], SR).get("energy")
+        for start, end in segments
+    ]
+
+
+def shared(audio, segments):
+    """境界検出の RMS を共有して区間集約する方式（境界検出の時間を含む）"""
+    rms = SegmentBoundaryDetector().analyze(audio, SR, 95).rms
+    return energy_statistics(rms, SR, STFT_HOP_LENGTH, segments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=600.0)
+    parser.add_argument("--segment-sec", type=float, default=10.0)
+    args = parser.parse_args()
+
+    audio = render(make_melody(args.duration), SR).astype(np.float32)
+    duration = len(audio) / SR
+    segments = [
+        (start, min(start + args.segment_sec, duration))
+        for start in np.arange(0.0, duration, args.segment_sec)
+    ]
+
+    # 従来の境界検出（RMSを計算して捨てる）の時間（初回呼び出しの準備を除く）
+    SegmentBoundaryDetector().detect(audio[:SR], SR, 95)
+    start = time.perf_counter()
+    SegmentBoundaryDetector().detect(audio, SR, 95)
+    detection = time.perf_counter() - start
+
+    timings = {}
+    results = {}
+    for name, function in (("per-segment", per_segment), ("shared", shared)):
+        start = time.perf_counter()
+        results[name] = function(audio, segments)
+        timings[name] = time.perf_counter() - start
+    timings["per-segment"] += detection
+
+    difference = max(
+        abs(a["rms_mean"] - b["rms_mean"]) / a["rms_mean"]
+        for a, b in zip(results["per-segment"], results["shared"])
+    )
+    print(f"audio      : {duration:.0f} s, {len(segments)} segments")
+    for name, elapsed in timings.items():
+        print(f"{name:11s}: {elapsed * 1000:7.1f} ms (including boundary detection)")
+    extra = timings["shared"] - detection
+    print(f"energy features on top of detection: {extra * 1000:+.1f} ms")
+    print(f"max rms_mean difference: {100 * difference:.2f}% (segment edge frames)")
+
+
+if __name__ == "__main__":
+    main()
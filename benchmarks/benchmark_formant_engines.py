@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+フォルマントエンジン比較ベンチマーク
+
+Praat (Sound: To Formant (burg) + フレームごとの値読み出し) と
+バッチLPCエンジンの処理時間と推定値の差を比較する。
+
+    python -m benchmarks.benchmark_formant_engines [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import parselmouth
+import scipy.signal
+
+from vocal_insight.features.lpc import lpc_formants
+
+SR = 22050
+
+# 代表的な母音のフォルマント（周波数, 帯域幅）
+VOWELS = {
+    "a": [(730, 90), (1090, 110), (2440, 170)],
+    "i": [(270, 60), (2290, 100), (3010, 170)],
+    "u": [(300, 60), (870, 90), (2240, 150)],
+    "e": [(530, 70), (1840, 100), (2480, 160)],
+}
+
+
+def synth_vowel(f0, formants, duration=2.0, sr=SR):
+    """パルス列を共振器で濾波した合成母音"""
+    t = np.arange(int(duration * sr)) / sr
+    phase = np.cumsum(f0 * 2 ** (0.3 * np.sin(2 * np.pi * 5 * t) / 12)) / sr
+    audio = np.diff(np.floor(phase), prepend=0.0)
+    audio = scipy.signal.lfilter([1], [1, -0.97], audio)
+    # 高次フォルマント（F4, F5）を加えて実音声に近いスペクトル包絡にする
+    for frequency, bandwidth in formants + [(3500, 250), (4500, 300)]:
+        r = np.exp(-np.pi * bandwidth / sr)
+        theta = 2 * np.pi * frequency / sr
+        a = [1, -2 * r * np.cos(theta), r * r]
+        audio = scipy.signal.lfilter([sum(a)], a, audio)
+    return audio / np.max(np.abs(audio))
+
+
+def burg_formants(audio, sr):
+    formant = parselmouth.Sound(audio, sampling_frequency=sr).to_formant_burg()
+    times = formant.xs()
+    return np.array(
+        [[formant.get_value_at_time(i, t) for i in (1, 2, 3)] for t in times]
+    )
+
+
+def timed(func, audio, sr, repeat):
+    func(audio, sr)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(audio, sr)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("## accuracy (median over frames, Hz)")
+    for f0 in (110, 220):
+        for name, formants in VOWELS.items():
+            audio = synth_vowel(f0, formants)
+            lpc = np.nanmedian(lpc_formants(audio, SR)[1], axis=0)
+            burg = np.nanmedian(burg_formants(audio, SR), axis=0)
+            diff = np.abs(lpc - burg) / burg * 100
+            print(
+                f"f0={f0:3d} /{name}/ target={[f for f, _ in formants]} "
+                f"burg={np.round(burg).tolist()} lpc={np.round(lpc).tolist()} "
+                f"diff%={np.round(diff, 1).tolist()}"
+            )
+
+    print("\n## throughput")
+    audio = np.tile(np.concatenate([synth_vowel(150, f) for f in VOWELS.values()]), 8)
+    duration = len(audio) / SR
+    burg_time = timed(burg_formants, audio, SR, args.repeat)
+    lpc_time = timed(lpc_formants, audio, SR, args.repeat)
+    print(f"audio: {duration:.0f} s at {SR} Hz")
+    print(f"burg: {burg_time * 1000:8.1f} ms ({duration / burg_time:5.0f}x realtime)")
+    print(f"lpc : {lpc_time * 1000:8.1f} ms ({duration / lpc_time:5.0f}x realtime)")
+    print(f"speedup (burg / lpc): {burg_time / lpc_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
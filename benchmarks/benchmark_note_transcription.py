@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+音符採譜ベンチマーク
+
+アルバム1枚分（既定60分）の合成ピッチ輪郭（10 ms 間隔、ビブラート・
+ピッチの揺れ・無声区間あり）を音符イベントに変換する時間を計測する。
+
+    python -m benchmarks.benchmark_note_transcription [--minutes MIN]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from vocal_insight.features.contour import PitchContour
+from vocal_insight.pitch import NoteTranscriber
+
+TIME_STEP = 0.01
+
+
+def make_contour(minutes, seed=0):
+    """音符ごとに音高が変わるピッチ輪郭と、その音符数"""
+    rng = np.random.default_rng(seed)
+    n_frames = int(minutes * 60 / TIME_STEP)
+    lengths = rng.integers(20, 80, size=n_frames // 20)
+    lengths = lengths[: np.searchsorted(np.cumsum(lengths), n_frames) + 1]
+    rest = rng.random(len(lengths)) < 0.2
+    midi = rng.integers(55, 75, size=len(lengths)).astype(float)
+    f0 = np.repeat(np.where(rest, 0.0, 440.0 * 2 ** ((midi - 69) / 12)), lengths)
+    f0 = f0[:n_frames]
+    t = np.arange(len(f0)) * TIME_STEP
+    wobble = 25 * np.sin(2 * np.pi * 5.5 * t) + rng.normal(0, 8, len(f0))
+    return PitchContour(t, f0 * 2 ** (wobble / 1200), TIME_STEP), int((~rest).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    args = parser.parse_args()
+
+    contour, n_true = make_contour(args.minutes)
+    transcriber = NoteTranscriber()
+    transcriber.transcribe(contour)
+
+    start = time.perf_counter()
+    notes = transcriber.transcribe(contour)
+    elapsed = time.perf_counter() - start
+
+    print(f"contour: {args.minutes:.0f} min, {len(contour.f0_hz)} frames")
+    print(f"notes  : {len(notes)} transcribed ({n_true} sung, adjacent repeats merge)")
+    print(
+        f"elapsed: {elapsed * 1000:7.1f} ms ({args.minutes * 60 / elapsed:,.0f}x realtime)"
+    )
+
+
+if __name__ == "__main__":
+    main()
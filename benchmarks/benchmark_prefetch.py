@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+複数ファイルの先読みデコードベンチマーク
+
+合成歌声の MP3 を複数作成し、ファイルごとに「デコード → 特徴量抽出」を
+直列に行う場合（``depth=0``）と、``PrefetchLoader`` で後続のファイルを
+バックグラウンドでデコードする場合の合計時間を比較する（``extract <ディレクトリ>``
+と同じく元のサンプリング周波数のまま分析）。デコード時間の
+うち抽出と重なった割合（overlap）もあわせて表示する。
+
+    python -m benchmarks.benchmark_prefetch [--files N] [--duration SEC]
+        [--depth N] [--extractor NAME]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.core.prefetch import PrefetchLoader
+from vocal_insight.features.registry import get_extractor
+
+SOURCE_SR = 44100
+
+
+def run(paths, depth, extractor):
+    """全ファイルを抽出するまでの時間（秒）・抽出時間（秒）・計測結果・特徴量"""
+    results = []
+    extract_sec = 0.0
+    start = time.perf_counter()
+    with PrefetchLoader(paths, sr=None, depth=depth) as loader:
+        for item in loader:
+            started = time.perf_counter()
+            results.append(extractor.extract(item.audio, item.sr))
+            extract_sec += time.perf_counter() - started
+    return time.perf_counter() - start, extract_sec, loader.stats, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=12)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--extractor", default="acoustic")
+    args = parser.parse_args()
+
+    extractor = get_extractor(args.extractor)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for number in range(args.files):
+            path = Path(directory) / f"take{number:03d}.mp3"
+            audio = render(make_melody(args.duration, seed=number), SOURCE_SR)
+            sf.write(path, audio, SOURCE_SR, format="MP3")
+            paths.append(path)
+        # librosa・リサンプラー・抽出器の初回呼び出しの準備を除く
+        run(paths[:1], 0, extractor)
+
+        rows = [(depth, *run(paths, depth, extractor)) for depth in (0, args.depth)]
+
+    print(
+        f"input   : {args.files} MP3 files of {args.duration:.0f} s "
+        f"(44.1 kHz, analyzed at the native rate), extractor {args.extractor}"
+    )
+    sequential = rows[0][1]
+    for depth, elapsed, extract_sec, stats, results in rows:
+        label = "sequential" if depth == 0 else f"prefetch depth={depth}"
+        print(
+            f"{label:18s}: {elapsed:6.2f} s ({sequential / elapsed:.2f}x), "
+            f"decode {stats.decode_sec:5.2f} s, wait {stats.wait_sec:5.2f} s, "
+            f"extraction {extract_sec:5.2f} s, overlap {stats.overlap:4.0%}, "
+            f"same features {results == rows[0][4]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
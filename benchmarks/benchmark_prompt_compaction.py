@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+LLMプロンプトの圧縮ベンチマーク
+
+セグメント数を変えた合成の分析結果（全16特徴量、16セグメントのフレーズ
+ごとに値が跳び、フレーズ内では小さく揺れる）から LLM プロンプトを生成し、
+見積もりトークン数と生成時間を比較する。
+
+- full: セグメントごとに特徴量を列挙する従来のプロンプト
+- budget=N: ``--max-tokens N`` と同じ表形式のプロンプト
+
+セグメントあたりの時間が一定であれば、生成時間はセグメント数に比例する。
+
+    python -m benchmarks.benchmark_prompt_compaction [--segments N,N,...]
+        [--budgets N,N,...]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from vocal_insight.analysis import estimate_tokens
+from vocal_insight.analysis.prompt import TABLE_COLUMNS
+from vocal_insight_cli import _generate_llm_prompt_from_segments
+
+# フレーズ間・セグメント間の値のばらつき（典型値に対する比）と、特徴量ごとの典型値
+PHRASE_CHANGE = 0.15
+SEGMENT_CHANGE = 0.01
+SEGMENT_SEC = 0.5
+SEGMENTS_PER_PHRASE = 16
+TYPICAL = {
+    "f0_mean_hz": 220.0,
+    "f0_std_hz": 12.0,
+    "hnr_mean_db": 15.0,
+    "f1_mean_hz": 600.0,
+    "f2_mean_hz": 1600.0,
+    "f3_mean_hz": 2600.0,
+    "rms_mean": 0.05,
+    "dynamic_range_db": 20.0,
+    "crest_factor_db": 12.0,
+    "loudness_slope_db_per_s": 1.0,
+    "jitter_local": 0.01,
+    "shimmer_local": 0.05,
+    "vibrato_rate_hz": 5.5,
+    "vibrato_extent_cents": 60.0,
+    "spectral_centroid_hz": 1800.0,
+    "spectral_rolloff_hz": 4000.0,
+}
+
+
+def make_segments(count, seed=0):
+    """フレーズ単位で値が跳び、フレーズ内では小さく揺れる分析結果"""
+    rng = np.random.default_rng(seed)
+    keys = [key for key, _, _, _ in TABLE_COLUMNS]
+    typical = np.array([TYPICAL[key] for key in keys])
+    phrases = -(-count // SEGMENTS_PER_PHRASE)
+    levels = 1.0 + rng.normal(0.0, PHRASE_CHANGE, (phrases, len(keys)))
+    levels = np.repeat(levels, SEGMENTS_PER_PHRASE, axis=0)[:count]
+    values = typical * (levels + rng.normal(0.0, SEGMENT_CHANGE, levels.shape))
+    return [
+        {
+            "segment_id": number + 1,
+            "time_start_s": number * SEGMENT_SEC,
+            "time_end_s": (number + 1) * SEGMENT_SEC,
+            "features": dict(zip(keys, row.tolist())),
+        }
+        for number, row in enumerate(values)
+    ]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", default="100,1000,10000,100000")
+    parser.add_argument("--budgets", default="2000,8000")
+    args = parser.parse_args()
+    counts = [int(value) for value in args.segments.split(",")]
+    budgets = [int(value) for value in args.budgets.split(",")]
+
+    # 初回呼び出しの準備を除く
+    _generate_llm_prompt_from_segments(make_segments(10), "song.wav", max_tokens=100)
+
+    print(f"{'segments':>9} {'prompt':>12} {'tokens':>9} {'time s':>8} {'us/seg':>7}")
+    for count in counts:
+        segments = make_segments(count)
+        for budget in [None] + budgets:
+            prompt, elapsed = timed(
+                lambda: _generate_llm_prompt_from_segments(
+                    segments, "song.wav", max_tokens=budget
+                )
+            )
+            label = "full" if budget is None else f"budget={budget}"
+            print(
+                f"{count:9d} {label:>12} {estimate_tokens(prompt):9d} "
+                f"{elapsed:8.3f} {elapsed / count * 1e6:7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
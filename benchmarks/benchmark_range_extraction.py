@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+複数区間抽出ベンチマーク
+
+ラベリングツールが出力する多数の区間（既定は3分の録音から2秒の区間を200個）の
+特徴量抽出時間を比較する。
+
+- per-invocation: 区間ごとに ``vocal-insight extract --segment-start/--segment-end``
+  を別プロセスで実行（ライブラリの読み込み・デコードを毎回実行）。
+  時間がかかるため ``--sample`` 個の区間で測定し、区間数に換算する
+- per-range: 同じプロセス内で区間ごとに ``load_audio_range`` と抽出を実行
+- ranges: ``extract_audio_ranges`` で一度だけデコードし、``--jobs`` 個の
+  ワーカープロセスで全区間を抽出
+
+    python -m benchmarks.benchmark_range_extraction [--duration SEC] [--ranges N]
+        [--jobs N] [--sample N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.analysis import extract_audio_ranges
+from vocal_insight.core.decode import load_audio_range
+from vocal_insight.features import get_extractor
+
+SR = 22050
+RANGE_SEC = 2.0
+
+
+def per_invocation(path, ranges, output_dir):
+    """区間ごとに CLI を別プロセスで実行する従来の方式"""
+    cli = str(Path(__file__).resolve().parents[1] / "vocal_insight_cli.py")
+    for start, end in ranges:
+        subprocess.run(
+            [
+                sys.executable,
+                cli,
+                "--quiet",
+                "extract",
+                path,
+                "--segment-start",
+                str(start),
+                "--segment-end",
+                str(end),
+                "--output-dir",
+                output_dir,
+            ],
+            check=True,
+        )
+
+
+def per_range(path, ranges):
+    """同じプロセス内で区間ごとに読み込んで抽出する"""
+    extractor = get_extractor("acoustic")
+    values = []
+    for start, end in ranges:
+        y, sr = load_audio_range(path, start, end, sr=SR)
+        values.append(extractor.extract(y, sr))
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=180.0)
+    parser.add_argument("--ranges", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sample", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.uniform(0, args.duration - RANGE_SEC, args.ranges))
+    ranges = [(round(s, 3), round(s + RANGE_SEC, 3)) for s in starts]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "take.wav")
+        sf.write(path, render(make_melody(args.duration), SR), SR)
+        # 初回呼び出しの準備を除く
+        per_range(path, ranges[:1])
+
+        start = time.perf_counter()
+        per_invocation(path, ranges[: args.sample], directory)
+        invocation = (time.perf_counter() - start) / args.sample * len(ranges)
+
+        start = time.perf_counter()
+        expected = per_range(path, ranges)
+        ranged = time.perf_counter() - start
+
+        timings = {}
+        for jobs in sorted({1, args.jobs}):
+            start = time.perf_counter()
+            results = extract_audio_ranges(path, ranges, jobs=jobs)
+            timings[jobs] = time.perf_counter() - start
+
+    mismatches = sum(
+        result["features"] != value for result, value in zip(results, expected)
+    )
+    print(f"audio          : {args.duration:.0f} s, {len(ranges)} ranges")
+    print(f"per-invocation : {invocation:6.2f} s (estimated from {args.sample} calls)")
+    print(f"per-range      : {ranged:6.2f} s")
+    for jobs, elapsed in timings.items():
+        print(
+            f"ranges, {jobs} job{'s' if jobs > 1 else ' '} : {elapsed:6.2f} s "
+            f"({invocation / elapsed:.1f}x vs per-invocation)"
+        )
+    print(f"feature mismatches vs per-range: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+区間読み込みベンチマーク
+
+長時間の録音（既定は20分）から5秒の区間を取り出す時間を、ファイル全体を
+``librosa.load`` してから切り出す従来の ``extract`` の方式と、
+``load_audio_range`` のシークによる区間読み込みで比較する（WAV・FLAC・OGG）。
+
+    python -m benchmarks.benchmark_ranged_decoding [--duration SEC] [--excerpt SEC]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from vocal_insight.core.decode import load_audio_range
+
+SR = 44100
+
+
+def write_in_blocks(path, audio, block=1 << 16):
+    """ブロックごとに書き込む（libsndfile の OGG で大きな配列を一度に書くと落ちるため）"""
+    with sf.SoundFile(path, "w", SR, 1) as f:
+        for begin in range(0, len(audio), block):
+            f.write(audio[begin : begin + block])
+
+
+def full_load(path, start, end):
+    """ファイル全体を読み込んでから切り出す従来の方式"""
+    y, sr = librosa.load(path, sr=None)
+    return y[int(start * sr) : int(end * sr)]
+
+
+def ranged(path, start, end):
+    return load_audio_range(path, start, end)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=1200.0)
+    parser.add_argument("--excerpt", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = int(args.duration * SR)
+    t = np.arange(n) / SR
+    audio = (0.3 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 0.01, n)).astype(
+        np.float32
+    )
+    start = args.duration * 0.75
+    end = start + args.excerpt
+
+    print(f"audio: {args.duration:.0f} s at {SR} Hz, excerpt {args.excerpt:g} s")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ("wav", "flac", "ogg"):
+            path = str(Path(directory) / f"take.{extension}")
+            write_in_blocks(path, audio)
+            # 初回呼び出しの準備を除く
+            ranged(path, 0.0, 0.1)
+
+            timings = {}
+            results = {}
+            for name, function in (("full load", full_load), ("ranged", ranged)):
+                begin = time.perf_counter()
+                results[name] = function(path, start, end)
+                timings[name] = time.perf_counter() - begin
+            difference = np.max(np.abs(results["full load"] - results["ranged"]))
+            print(
+                f"{extension:4s}: full load {timings['full load']:6.2f} s, "
+                f"ranged {timings['ranged'] * 1000:6.1f} ms "
+                f"({timings['full load'] / timings['ranged']:.0f}x), "
+                f"max difference {difference:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+ワーカープロセスへの音声の受け渡しベンチマーク
+
+48 kHz の長い音声をワーカープロセスに渡して短い区間を読み取るまでの時間と、
+ワーカーごとに送るバイト数を、音声配列を initializer の引数として渡す場合
+（従来）と ``SharedAudio`` の参照を渡す場合で比較する。fork では initializer
+の引数はコピーオンライトで引き継がれ、spawn（macOS・Windows の既定）では
+pickle でワーカーごとに送られるため、両方の起動方式で計測する。
+
+    python -m benchmarks.benchmark_shared_audio [--duration SEC] [--jobs N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from vocal_insight.core.shared import SharedAudio, attach_audio
+
+SR = 48000
+
+_audio = None
+
+
+def _init_array(audio):
+    global _audio
+    _audio = audio
+
+
+def _init_handle(handle):
+    global _audio
+    _audio = attach_audio(handle)
+
+
+def _range_peak(time_range):
+    start, end = time_range
+    return float(np.max(np.abs(_audio[int(start * SR) : int(end * SR)])))
+
+
+def run(method, jobs, initializer, initarg, ranges):
+    """ワーカーを起動し、区間ごとのピーク値を求めるまでの時間"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context(method),
+        initializer=initializer,
+        initargs=(initarg,),
+    ) as executor:
+        peaks = list(executor.map(_range_peak, ranges))
+    return peaks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=1800.0)
+    parser.add_argument("--jobs", type=int, default=max(2, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal(int(args.duration * SR))).astype(np.float32)
+    ranges = [(t, t + 3.0) for t in np.linspace(0, args.duration - 3.0, 4 * args.jobs)]
+    print(
+        f"audio   : {args.duration:.0f} s at {SR} Hz ({audio.nbytes / 2**20:.0f} MiB)"
+    )
+    print(f"workers : {args.jobs}, {len(ranges)} ranges")
+    for method in ("fork", "spawn"):
+        # 初回呼び出しの準備を除く
+        run(method, args.jobs, _init_array, audio[:SR], [(0.0, 0.5)])
+
+        pickled, pickled_time = run(method, args.jobs, _init_array, audio, ranges)
+        start = time.perf_counter()
+        with SharedAudio(audio) as shared:
+            setup = time.perf_counter() - start
+            peaks, shared_time = run(
+                method, args.jobs, _init_handle, shared.handle, ranges
+            )
+            handle_bytes = len(pickle.dumps(shared.handle))
+
+        sent = "inherited" if method == "fork" else "sent"
+        print(
+            f"{method:5s} array  : {pickled_time:6.2f} s, "
+            f"{len(pickle.dumps(audio)) / 2**20:.0f} MiB {sent} per worker"
+        )
+        print(
+            f"{method:5s} shared : {setup + shared_time:6.2f} s "
+            f"(copy into shared memory {setup:.2f} s), "
+            f"{handle_bytes} bytes sent per worker, same results {peaks == pickled}"
+        )
+
+
+if __name__ == "__main__":
+    main()
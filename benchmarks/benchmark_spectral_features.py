@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+スペクトル特徴量ベンチマーク
+
+10分間の合成歌声を10秒ごとのセグメントに分け、スペクトル重心・フラックス・
+ロールオフ・MFCC統計量を計算する時間を比較する。
+
+- per-segment: セグメントごとに librosa の各特徴量関数を呼ぶ（特徴量ごとに STFT）
+- shared: トラック全体の STFT を一度だけ計算し、区間集約で全セグメント分を計算
+
+    python -m benchmarks.benchmark_spectral_features [--duration SEC] [--segment-sec SEC]
+"""
+
+import argparse
+import time
+
+import librosa
+import numpy as np
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.features import FeatureContext, spectral_frames, summarize_segments
+from vocal_insight.features.graph import STFT_HOP_LENGTH, STFT_N_FFT
+
+SR = 22050
+
+
+def per_segment(audio, segments):
+    """セグメントごとに librosa の特徴量関数を呼ぶ従来の方式"""
+    summaries = []
+    for start, end in segments:
+        y = audio[int(start * SR) : int(end * SR)]
+        centroid = librosa.feature.spectral_centroid(y=y, sr=SR)[0]
+        rolloff = librosa.feature.spectral_rolloff(y=y, sr=SR)[0]
+        magnitude = np.abs(
+            librosa.stft(y, n_fft=STFT_N_FFT, hop_length=STFT_HOP_LENGTH)
+        )
+        normalized = magnitude / np.maximum(magnitude.sum(axis=0), 1e-12)
+        flux = np.sqrt(np.sum(np.diff(normalized, axis=1) ** 2, axis=0))
+        mfcc = librosa.feature.mfcc(y=y, sr=SR, n_mfcc=13)
+        summaries.append(
+            (centroid.mean(), flux.mean(), rolloff.mean(), mfcc.mean(axis=1))
+        )
+    return summaries
+
+
+def shared(audio, segments):
+    """トラック全体の STFT を共有して区間集約する方式"""
+    magnitude = FeatureContext(audio, SR).get("stft")
+    frames = spectral_frames(magnitude, SR, STFT_HOP_LENGTH)
+    return summarize_segments(frames, segments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=600.0)
+    parser.add_argument("--segment-sec", type=float, default=10.0)
+    args = parser.parse_args()
+
+    audio = render(make_melody(args.duration), SR).astype(np.float32)
+    duration = len(audio) / SR
+    segments = [
+        (start, min(start + args.segment_sec, duration))
+        for start in np.arange(0.0, duration, args.segment_sec)
+    ]
+
+    timings = {}
+    results = {}
+    for name, function in (("per-segment", per_segment), ("shared", shared)):
+        start = time.perf_counter()
+        results[name] = function(audio, segments)
+        timings[name] = time.perf_counter() - start
+
+    difference = max(
+        abs(a[0] - b["spectral_centroid_hz"]) / a[0]
+        for a, b in zip(results["per-segment"], results["shared"])
+    )
+    print(f"audio      : {duration:.0f} s, {len(segments)} segments")
+    for name, elapsed in timings.items():
+        print(f"{name:11s}: {elapsed:6.2f} s")
+    print(f"speedup    : {timings['per-segment'] / timings['shared']:.1f}x")
+    print(
+        f"max centroid difference: {100 * difference:.2f}% (segment edges, silent frames excluded)"
+    )
+
+
+if __name__ == "__main__":
+    main()
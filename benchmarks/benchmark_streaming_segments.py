@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+セグメント逐次取得ベンチマーク
+
+合成歌声1ファイルについて、``analyze_audio_segments`` が全セグメントの結果を
+返すまでの時間と、``iter_audio_segments`` で最初のセグメントの結果が得られる
+までの時間・先頭の数セグメントで打ち切った場合の時間を比較する。
+
+    python -m benchmarks.benchmark_streaming_segments [--duration SEC] [--take N]
+        [--jobs N]
+"""
+
+import argparse
+import itertools
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.analysis import analyze_audio_segments, iter_audio_segments
+from vocal_insight.core.types import AnalysisConfig
+
+SR = 22050
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=300.0)
+    parser.add_argument("--take", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    config = AnalysisConfig(rms_delta_percentile=95, min_len_sec=5.0, max_len_sec=30.0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "take.wav")
+        sf.write(path, render(make_melody(args.duration), SR), SR)
+        # 初回呼び出しの準備を除く
+        analyze_audio_segments(path, config, features="f0")
+
+        start = time.perf_counter()
+        results = analyze_audio_segments(path, config)
+        full = time.perf_counter() - start
+
+        rows = []
+        for jobs, ordered in sorted({(1, True), (args.jobs, True), (args.jobs, False)}):
+            start = time.perf_counter()
+            iterator = iter_audio_segments(path, config, jobs=jobs, ordered=ordered)
+            next(iterator)
+            first = time.perf_counter() - start
+            list(itertools.islice(iterator, args.take - 1))
+            iterator.close()
+            rows.append((jobs, ordered, first, time.perf_counter() - start))
+
+    print(f"audio    : {args.duration:.0f} s, {len(results)} segments")
+    print(f"full list: {full:6.2f} s")
+    for jobs, ordered, first, taken in rows:
+        order = "in order" if ordered else "as completed"
+        print(
+            f"jobs={jobs} {order:12s}: first segment {first:5.2f} s, "
+            f"first {args.take} then stop {taken:5.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+パラメータスイープベンチマーク
+
+合成歌声1ファイルに対して、RMS分割の設定（パーセンタイル × 最小長 × 最大長）の
+全ての組み合わせを評価する時間を比較する。
+
+- per-config: 設定ごとに analyze_audio_segments を実行（デコード・RMS・Praat を毎回実行）
+- sweep: 一度だけデコードしてフレーム系列を計算し、設定ごとに分割と区間集約のみ行う
+
+    python -m benchmarks.benchmark_sweep [--duration SEC]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.analysis import (
+    analyze_audio_segments,
+    config_grid,
+    format_sweep_table,
+    sweep_audio_segments,
+)
+
+SR = 22050
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=120.0)
+    args = parser.parse_args()
+
+    configs = config_grid(
+        rms_delta_percentile=[85, 90, 95, 99],
+        min_len_sec=[5.0, 8.0],
+        max_len_sec=[30.0, 45.0],
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "take.wav")
+        sf.write(path, render(make_melody(args.duration), SR), SR)
+
+        start = time.perf_counter()
+        counts = [len(analyze_audio_segments(path, config)) for config in configs]
+        per_config = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = sweep_audio_segments(path, configs)
+        swept = time.perf_counter() - start
+
+    mismatches = sum(
+        count != result["n_segments"] for count, result in zip(counts, results)
+    )
+    print(format_sweep_table(results))
+    print()
+    print(f"audio      : {args.duration:.0f} s, {len(configs)} settings")
+    print(f"per-config : {per_config:6.2f} s")
+    print(f"sweep      : {swept:6.2f} s")
+    print(f"speedup    : {per_config / swept:.1f}x")
+    print(f"segment count mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
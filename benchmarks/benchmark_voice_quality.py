@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+声質特徴量ベンチマーク
+
+5分間の合成歌声（ビブラート付き）を15秒ごとのセグメントに分け、
+既定の特徴量抽出時間と、声質特徴量（ジッター・シマー・ビブラート）の
+追加時間を計測する。トラック全体で一度だけ Pitch・PointProcess を作成して
+切り出す方式（analyze_audio_segments と同じ）と、セグメントごとに Praat で
+PointProcess を作成する方式を比較する。
+
+    python -m benchmarks.benchmark_voice_quality [--duration SEC] [--segment-sec SEC]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from parselmouth.praat import call
+
+from benchmarks.benchmark_pitch_accuracy import make_melody
+from vocal_insight.features import AcousticFeatureExtractor, FeatureContext
+
+SR = 22050
+
+
+def render_vibrato(notes, sr, seed=0):
+    """音符列を5.5 Hz・±40セントのビブラート付き合成音声にする"""
+    rng = np.random.default_rng(seed)
+    samples = np.round(np.cumsum([length for _, length in notes]) * sr).astype(int)
+    f0 = np.repeat([hz for hz, _ in notes], np.diff(np.concatenate(([0], samples))))
+    t = np.arange(len(f0)) / sr
+    f0 = f0 * 2 ** (40 * np.sin(2 * np.pi * 5.5 * t) / 1200)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    audio = np.where(f0 > 0, 0.5 * np.sin(phase) + 0.25 * np.sin(2 * phase), 0.0)
+    return audio + rng.normal(0, 0.005, len(audio))
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=300.0)
+    parser.add_argument("--segment-sec", type=float, default=15.0)
+    args = parser.parse_args()
+
+    audio = render_vibrato(make_melody(args.duration), SR)
+    bounds = np.arange(0.0, len(audio) / SR, args.segment_sec)
+    segments = [
+        (start, min(start + args.segment_sec, len(audio) / SR)) for start in bounds
+    ]
+
+    def segment_audio(start, end):
+        return audio[int(start * SR) : int(end * SR)]
+
+    extractor = AcousticFeatureExtractor()
+    selected = AcousticFeatureExtractor(features="all")
+
+    def default_features():
+        return [extractor.extract(segment_audio(*segment), SR) for segment in segments]
+
+    def per_segment_praat():
+        # 既定の特徴量と同じコンテキストでセグメントごとに PointProcess を作成
+        values = []
+        for segment in segments:
+            context = FeatureContext(segment_audio(*segment), SR)
+            extractor.extract_from(context)
+            sound = context.get("sound")
+            point_process = call([sound, context.get("pitch")], "To PointProcess (cc)")
+            values.append(
+                (
+                    call(point_process, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3),
+                    call(
+                        [sound, point_process],
+                        "Get shimmer (local)",
+                        0,
+                        0,
+                        0.0001,
+                        0.02,
+                        1.3,
+                        1.6,
+                    ),
+                )
+            )
+        return values
+
+    def track_slicing():
+        # analyze_audio_segments と同じく、トラック全体の中間表現を切り出して渡す
+        track = FeatureContext(audio, SR)
+        pulses, contour = track.get("pulses"), track.get("contour")
+        values = []
+        for start, end in segments:
+            precomputed = {
+                "f0": contour.slice(start, end),
+                "contour": contour.segment(start, end),
+                "pulses": pulses.slice(start, end),
+            }
+            context = FeatureContext(
+                segment_audio(start, end), SR, precomputed=precomputed
+            )
+            values.append(selected.extract_from(context))
+        return values
+
+    _, baseline = timed(default_features)
+    _, praat = timed(per_segment_praat)
+    values, track = timed(track_slicing)
+    rates = np.array([value["vibrato_rate_hz"] for value in values])
+    extents = np.array([value["vibrato_extent_cents"] for value in values])
+
+    print(f"audio   : {args.duration:.0f} s, {len(segments)} segments")
+    print(f"default features                 : {baseline:6.2f} s")
+    print(
+        f"+ per-segment PointProcess       : {praat:6.2f} s "
+        f"({100 * (praat / baseline - 1):+4.0f}%, jitter/shimmer only)"
+    )
+    print(
+        f"+ track PointProcess and slicing : {track:6.2f} s "
+        f"({100 * (track / baseline - 1):+4.0f}%, with vibrato)"
+    )
+    print(
+        f"vibrato : rate {np.median(rates):.2f} Hz (true 5.50), "
+        f"extent {np.median(extents):.1f} cents (true 40.0)"
+    )
+
+
+if __name__ == "__main__":
+    main()
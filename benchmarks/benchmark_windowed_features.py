@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+スライディング窓の特徴量ベンチマーク
+
+合成歌声を一定間隔の窓（既定は3秒の窓を0.5秒ごと）に分け、F0・HNR・
+フォルマントの窓ごとの統計量を計算する時間を比較する。
+
+- per-window: 窓ごとに AcousticFeatureExtractor.extract を呼ぶ
+- prefix-sums: トラック全体のフレーム系列を一度だけ計算し、累積和から
+  窓ごとの平均・標準偏差を定数時間で求める
+
+    python -m benchmarks.benchmark_windowed_features [--duration SEC] [--window SEC] [--hop SEC]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.benchmark_pitch_accuracy import make_melody, render
+from vocal_insight.features import (
+    WINDOWED_FEATURE_GROUPS,
+    AcousticFeatureExtractor,
+    FeatureContext,
+    frame_series,
+    window_grid,
+    windowed_features,
+)
+
+SR = 22050
+KEYS = ("f0_mean_hz", "hnr_mean_db", "f1_mean_hz", "f2_mean_hz", "f3_mean_hz")
+
+
+def per_window(audio, windows):
+    """窓ごとに特徴量抽出を実行する方式"""
+    extractor = AcousticFeatureExtractor(features=WINDOWED_FEATURE_GROUPS)
+    return [
+        extractor.extract(audio[int(start * SR) : int(end * SR)], SR)
+        for start, end in windows
+    ]
+
+
+def prefix(audio, windows):
+    """トラック全体のフレーム系列の累積和から窓ごとに求める方式"""
+    series = frame_series(FeatureContext(audio, SR))
+    return windowed_features(series, windows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=120.0)
+    parser.add_argument("--window", type=float, default=3.0)
+    parser.add_argument("--hop", type=float, default=0.5)
+    args = parser.parse_args()
+
+    audio = render(make_melody(args.duration), SR)
+    windows = window_grid(len(audio) / SR, args.window, args.hop)
+
+    timings = {}
+    results = {}
+    for name, function in (("per-window", per_window), ("prefix-sums", prefix)):
+        start = time.perf_counter()
+        results[name] = function(audio, windows)
+        timings[name] = time.perf_counter() - start
+
+    print(
+        f"audio      : {len(audio) / SR:.0f} s, {len(windows)} windows "
+        f"({args.window:g} s every {args.hop:g} s)"
+    )
+    for name, elapsed in timings.items():
+        print(f"{name:11s}: {elapsed:6.2f} s")
+    print(f"speedup    : {timings['per-window'] / timings['prefix-sums']:.1f}x")
+    for key in KEYS:
+        difference = np.median(
+            [
+                abs(a[key] - b[key]) / a[key]
+                for a, b in zip(results["per-window"], results["prefix-sums"])
+            ]
+        )
+        print(f"median {key:12s} difference: {100 * difference:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 # テスト対象のCLIインポート
@@ -108,6 +109,402 @@ class TestCLIParameterValidation:
         assert "--plot" in result.output
         assert "--min-segment" in result.output
 
+    def test_sweep_help(self):
+        """sweepコマンドヘルプテスト"""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["sweep", "--help"])
+
+        assert result.exit_code == 0
+        assert "--percentile" in result.output
+        assert "--min-segment" in result.output
+
+    def test_sweep_rejects_malformed_list(self):
+        """カンマ区切りの数値として解釈できない値はエラーになる"""
+        runner = CliRunner()
+        with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+            result = runner.invoke(cli, ["sweep", tmp.name, "--percentile", "90,high"])
+
+        assert result.exit_code != 0
+        assert "comma-separated int" in result.output
+
+    def test_decode_cache_shared_across_commands(self, tmp_path):
+        """--decode-cache 指定時は同じ入力のデコード結果をコマンド間で再利用する"""
+        import numpy as np
+        import soundfile as sf
+
+        audio_path = tmp_path / "tone.wav"
+        t = np.arange(22050) / 22050
+        sf.write(audio_path, 0.5 * np.sin(2 * np.pi * 220 * t), 22050)
+        cache_dir = tmp_path / "cache"
+        runner = CliRunner()
+
+        for command in ("extract", "segment"):
+            result = runner.invoke(
+                cli,
+                [
+                    "--quiet",
+                    "--decode-cache",
+                    str(cache_dir),
+                    command,
+                    str(audio_path),
+                    "--output-dir",
+                    str(tmp_path),
+                ],
+            )
+            assert result.exit_code == 0, result.output
+
+        assert len(list(cache_dir.glob("*.npy"))) == 1
+
+    def test_extract_ranges_file(self, tmp_path):
+        """--ranges 指定時は全区間の特徴量を1つの表に出力する"""
+        import csv
+
+        import numpy as np
+        import soundfile as sf
+
+        audio_path = tmp_path / "tone.wav"
+        t = np.arange(3 * 22050) / 22050
+        sf.write(audio_path, 0.5 * np.sin(2 * np.pi * 220 * t), 22050)
+        ranges_path = tmp_path / "ranges.csv"
+        ranges_path.write_text("start_s,end_s\n0.0,1.0\n1.0,2.5\n")
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli,
+            [
+                "--quiet",
+                "extract",
+                str(audio_path),
+                "--ranges",
+                str(ranges_path),
+                "--features",
+                "f0",
+                "--format",
+                "csv",
+                "--output-dir",
+                str(tmp_path),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+
+        with open(tmp_path / "tone_range_features.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["time_start_s"] for row in rows] == ["0.0", "1.0"]
+        assert float(rows[1]["f0_mean_hz"]) == pytest.approx(220, abs=2)
+
+        result = runner.invoke(
+            cli,
+            [
+                "extract",
+                str(audio_path),
+                "--ranges",
+                str(ranges_path),
+                "--segment-start",
+                "0",
+            ],
+        )
+        assert result.exit_code != 0
+        assert "cannot be combined" in result.output
+
+    def test_extract_ranges_match_single_range_extract(self, tmp_path):
+        """--ranges の各区間の値は 22050 Hz 以外の音声でも1区間ずつの extract と一致する"""
+        import json
+
+        import numpy as np
+        import soundfile as sf
+
+        sr = 44100
+        audio_path = tmp_path / "take.wav"
+        t = np.arange(3 * sr) / sr
+        f0 = 220 * 2 ** (0.3 * np.sin(2 * np.pi * 5.5 * t) / 12)
+        tone = 0.5 * np.sin(2 * np.pi * np.cumsum(f0) / sr)
+        noise = 0.01 * np.random.default_rng(0).standard_normal(len(t))
+        sf.write(audio_path, tone + noise, sr)
+        ranges_path = tmp_path / "ranges.csv"
+        ranges_path.write_text("start_s,end_s\n0.0,1.0\n1.0,2.5\n")
+        runner = CliRunner()
+        common = ["--features", "f0,hnr", "--output-dir", str(tmp_path)]
+
+        result = runner.invoke(
+            cli,
+            ["--quiet", "extract", str(audio_path), "--ranges", str(ranges_path)]
+            + common,
+        )
+        assert result.exit_code == 0, result.output
+        result_single = runner.invoke(
+            cli,
+            [
+                "--quiet",
+                "extract",
+                str(audio_path),
+                "--segment-start",
+                "1.0",
+                "--segment-end",
+                "2.5",
+            ]
+            + common,
+        )
+        assert result_single.exit_code == 0, result_single.output
+
+        with open(tmp_path / "take_range_features.json") as f:
+            ranged = json.load(f)["ranges"][1]["features"]
+        with open(tmp_path / "take_features.json") as f:
+            single = json.load(f)["features"]
+        assert ranged == single
+
+    def test_extract_directory(self, tmp_path):
+        """ディレクトリ指定時は各音声ファイルを先読みしながら抽出する"""
+        import json
+
+        import numpy as np
+        import soundfile as sf
+
+        input_dir = tmp_path / "takes"
+        input_dir.mkdir()
+        sr = 44100
+        t = np.arange(sr) / sr
+        noise = 0.01 * np.random.default_rng(0).standard_normal(len(t))
+        for name, freq in (("low", 220), ("high", 330)):
+            sf.write(
+                input_dir / f"{name}.wav",
+                0.5 * np.sin(2 * np.pi * freq * t) + noise,
+                sr,
+            )
+        (input_dir / "notes.txt").write_text("ignored")
+        output_dir = tmp_path / "features"
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli,
+            [
+                "extract",
+                str(input_dir),
+                "--features",
+                "f0",
+                "--output-dir",
+                str(output_dir),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "2/2 files" in result.output
+        assert "overlapped with extraction" in result.output
+
+        assert sorted(path.name for path in output_dir.iterdir()) == [
+            "high_features.json",
+            "low_features.json",
+        ]
+        data = json.loads((output_dir / "high_features.json").read_text())
+        assert data["filename"] == "high.wav"
+        assert data["features"]["f0_mean_hz"] == pytest.approx(330, abs=3)
+
+        # 1ファイルずつの extract と同じ値（元のサンプリング周波数で分析）
+        result = runner.invoke(
+            cli,
+            [
+                "--quiet",
+                "extract",
+                str(input_dir / "high.wav"),
+                "--features",
+                "f0",
+                "--output-dir",
+                str(tmp_path),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        single = json.loads((tmp_path / "high_features.json").read_text())
+        assert data["features"] == single["features"]
+
+        result = runner.invoke(
+            cli, ["extract", str(input_dir), "--segment-start", "0.5"]
+        )
+        assert result.exit_code != 0
+        assert "cannot be used with a directory" in result.output
+
+    def test_extract_clips_into_one_table(self, tmp_path):
+        """--clips 指定時はディレクトリの全クリップを1つの表に出力する"""
+        import csv
+
+        import numpy as np
+        import soundfile as sf
+
+        input_dir = tmp_path / "clips"
+        input_dir.mkdir()
+        t = np.arange(22050) / 22050
+        for number in range(3):
+            tone = 0.5 * np.sin(2 * np.pi * (220 + 110 * number) * t)
+            sf.write(input_dir / f"clip{number}.wav", tone, 22050)
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli,
+            [
+                "extract",
+                str(input_dir),
+                "--clips",
+                "--clips-per-task",
+                "2",
+                "--features",
+                "f0",
+                "--format",
+                "csv",
+                "--output-dir",
+                str(tmp_path),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "clips/s" in result.output
+
+        with open(tmp_path / "clips_clip_features.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["filename"] for row in rows] == [
+            "clip0.wav",
+            "clip1.wav",
+            "clip2.wav",
+        ]
+        assert float(rows[2]["f0_mean_hz"]) == pytest.approx(440, abs=4)
+        assert rows[0]["error"] == ""
+
+        result = runner.invoke(
+            cli, ["extract", str(input_dir / "clip0.wav"), "--clips"]
+        )
+        assert result.exit_code != 0
+        assert "--clips requires a directory" in result.output
+
+    def test_bundle_reused_by_follow_up_commands(self, tmp_path):
+        """analyze --bundle の中間表現を segment・extract・prompt が再利用する"""
+        import json
+
+        import numpy as np
+        import soundfile as sf
+
+        audio_path = tmp_path / "tone.wav"
+        t = np.arange(3 * 22050) / 22050
+        sf.write(audio_path, 0.5 * np.sin(2 * np.pi * 220 * t), 22050)
+        bundle = tmp_path / "tone.bundle"
+        runner = CliRunner()
+
+        commands = [
+            ["analyze", str(audio_path), "--bundle", str(bundle), "--min-segment", "1"],
+            ["segment", str(audio_path), "--bundle", str(bundle), "--min-segment", "1"],
+            ["extract", str(audio_path), "--bundle", str(bundle), "--segment-end", "2"],
+            ["prompt", str(bundle)],
+        ]
+        for command in commands:
+            result = runner.invoke(
+                cli, ["--quiet", *command, "--output-dir", str(tmp_path)]
+            )
+            assert result.exit_code == 0, result.output
+
+        with open(tmp_path / "tone_features.json") as f:
+            features = json.load(f)["features"]
+        assert features["f0_mean_hz"] == pytest.approx(220, abs=2)
+        assert "Total segments analyzed" in (tmp_path / "tone_analysis.txt").read_text()
+
+        other_path = tmp_path / "other.wav"
+        sf.write(other_path, 0.5 * np.sin(2 * np.pi * 330 * t), 22050)
+        result = runner.invoke(
+            cli, ["segment", str(other_path), "--bundle", str(bundle)]
+        )
+        assert result.exit_code != 0
+        assert "was created from tone.wav" in result.output
+
+    def test_analyze_in_chunks(self, tmp_path):
+        """analyze --chunk はチャンク並列でトラック全体を分析する"""
+        import json
+
+        import numpy as np
+        import soundfile as sf
+
+        audio_path = tmp_path / "tone.wav"
+        t = np.arange(3 * 22050) / 22050
+        sf.write(audio_path, 0.5 * np.sin(2 * np.pi * 220 * t), 22050)
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli,
+            [
+                "--quiet",
+                "analyze",
+                str(audio_path),
+                "--segmentation",
+                "phrase",
+                "--min-segment",
+                "1",
+                "--chunk",
+                "1",
+                "--jobs",
+                "2",
+                "--format",
+                "json",
+                "--output-dir",
+                str(tmp_path),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+
+        with open(tmp_path / "tone_analysis.json") as f:
+            segments = json.load(f)["segments"]
+        assert segments[0]["features"]["f0_mean_hz"] == pytest.approx(220, abs=2)
+
+    def test_analyze_with_token_budget(self, tmp_path):
+        """analyze --max-tokens はプロンプトを表にして見積もりトークン数を表示する"""
+        import numpy as np
+        import soundfile as sf
+
+        audio_path = tmp_path / "tone.wav"
+        t = np.arange(3 * 22050) / 22050
+        sf.write(audio_path, 0.5 * np.sin(2 * np.pi * 220 * t), 22050)
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli,
+            [
+                "analyze",
+                str(audio_path),
+                "--min-segment",
+                "1",
+                "--max-tokens",
+                "300",
+                "--output-dir",
+                str(tmp_path),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "tokens (estimate, budget 300)" in result.output
+        assert "seg|time s|F0 Hz" in (tmp_path / "tone_analysis.txt").read_text()
+
+        result = runner.invoke(cli, ["analyze", str(audio_path), "--chunk", "0"])
+        assert result.exit_code != 0
+
+    def test_unknown_features_rejected(self):
+        """未知の--features指定はエラーになる"""
+        runner = CliRunner()
+        with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+            result = runner.invoke(cli, ["extract", tmp.name, "--features", "pitch"])
+
+        assert result.exit_code != 0
+        assert "unknown features" in result.output
+
+    def test_reference_audio_and_midi_mutually_exclusive(self):
+        """--reference-audio と --reference-midi は同時に指定できない"""
+        runner = CliRunner()
+        with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+            with tempfile.NamedTemporaryFile(suffix=".mid") as midi:
+                result = runner.invoke(
+                    cli,
+                    [
+                        "analyze",
+                        tmp.name,
+                        "--reference-audio",
+                        tmp.name,
+                        "--reference-midi",
+                        midi.name,
+                    ],
+                )
+
+        assert result.exit_code != 0
+        assert "mutually exclusive" in result.output
+
     def test_file_not_found_error(self):
         """存在しないファイルのエラーハンドリング"""
         runner = CliRunner()
@@ -200,6 +597,144 @@ class TestCLIOutputFormats:
         assert "Segment 0:" in prompt
         assert "150.0 Hz" in prompt
 
+    def test_llm_prompt_skips_unselected_features(self):
+        """計算されなかった特徴量はプロンプトに出力されない"""
+        from vocal_insight_cli import _generate_llm_prompt_from_segments
+
+        test_segments = [
+            {
+                "time_start_s": 0.0,
+                "time_end_s": 10.0,
+                "features": {
+                    "f0_mean_hz": 150.0,
+                    "f0_std_hz": 25.0,
+                    "hnr_mean_db": None,
+                    "f1_mean_hz": None,
+                    "f2_mean_hz": None,
+                    "f3_mean_hz": None,
+                },
+            }
+        ]
+
+        prompt = _generate_llm_prompt_from_segments(test_segments, "test.wav")
+
+        assert "F0 mean: 150.0 Hz" in prompt
+        assert "HNR" not in prompt
+
+    def test_llm_prompt_fits_token_budget(self):
+        """--max-tokens 指定時はセグメントを表にして上限内に収める"""
+        from vocal_insight.analysis import estimate_tokens
+        from vocal_insight_cli import _generate_llm_prompt_from_segments
+
+        test_segments = [
+            {
+                "time_start_s": float(number),
+                "time_end_s": float(number + 1),
+                "features": {
+                    "f0_mean_hz": 150.0 + (number % 5) * 40.0,
+                    "f0_std_hz": 25.0,
+                    "hnr_mean_db": 15.0,
+                },
+            }
+            for number in range(200)
+        ]
+        full = _generate_llm_prompt_from_segments(test_segments, "test.wav")
+
+        prompt = _generate_llm_prompt_from_segments(
+            test_segments, "test.wav", max_tokens=500
+        )
+
+        assert estimate_tokens(prompt) <= 500 < estimate_tokens(full)
+        assert "Total segments analyzed: 200" in prompt
+        assert "seg|time s|F0 Hz|F0 sd Hz|HNR dB" in prompt
+        assert "rows shown" in prompt
+        assert "F1 mean" not in prompt
+        assert "Jitter" not in prompt
+
+    def test_llm_prompt_includes_voice_quality(self):
+        """声質特徴量はジッター・シマーを%で出力する"""
+        from vocal_insight_cli import _generate_llm_prompt_from_segments
+
+        test_segments = [
+            {
+                "time_start_s": 0.0,
+                "time_end_s": 10.0,
+                "features": {
+                    "f0_mean_hz": None,
+                    "jitter_local": 0.0123,
+                    "shimmer_local": 0.0456,
+                    "vibrato_rate_hz": 5.5,
+                    "vibrato_extent_cents": 48.0,
+                },
+            }
+        ]
+
+        prompt = _generate_llm_prompt_from_segments(test_segments, "test.wav")
+
+        assert "Jitter (local): 1.2 %" in prompt
+        assert "Shimmer (local): 4.6 %" in prompt
+        assert "Vibrato rate: 5.5 Hz" in prompt
+        assert "Vibrato extent: 48.0 cents" in prompt
+
+    def test_llm_prompt_includes_energy(self):
+        """音量・ダイナミクス特徴量をプロンプトに出力する"""
+        from vocal_insight_cli import _generate_llm_prompt_from_segments
+
+        test_segments = [
+            {
+                "time_start_s": 0.0,
+                "time_end_s": 10.0,
+                "features": {
+                    "rms_mean": 0.0523,
+                    "dynamic_range_db": 18.24,
+                    "crest_factor_db": 6.0,
+                    "loudness_slope_db_per_s": -1.25,
+                },
+            }
+        ]
+
+        prompt = _generate_llm_prompt_from_segments(test_segments, "test.wav")
+
+        assert "RMS mean: 52.3 x 1e-3" in prompt
+        assert "Dynamic range: 18.2 dB" in prompt
+        assert "Crest factor: 6.0 dB" in prompt
+        assert "Loudness slope: -1.2 dB/s" in prompt
+
+    def test_pitch_accuracy_prompt_section(self):
+        """音程判定結果のプロンプトセクション生成テスト"""
+        from vocal_insight_cli import _format_pitch_accuracy_section
+
+        result = {
+            "version": "1.0",
+            "reference_audio": {
+                "id": "ref",
+                "source_path": "ref.wav",
+                "alignment": {"offset_seconds": 0.42, "DTW_cost": 12.5},
+            },
+            "pitch_accuracy": {
+                "mean_cent_deviation": 23.4,
+                "hit_rate": 0.78,
+                "stability": 0.65,
+                "per_section": [
+                    {
+                        "section_id": "verse_1",
+                        "time_start_s": 0.0,
+                        "time_end_s": 12.0,
+                        "cent_deviation": None,
+                        "hit_rate": None,
+                    }
+                ],
+            },
+            "expression_comparison": {"vibrato": None, "dynamics": None, "notes": []},
+        }
+
+        section = _format_pitch_accuracy_section(result)
+
+        assert "Mean deviation: 23.4 cents" in section
+        assert "Hit rate: 78%" in section
+        assert "verse_1 (0.0s - 12.0s): n/a cents" in section
+        assert _format_pitch_accuracy_section({**result, "pitch_accuracy": None}) == ""
+
 
 def run_integration_tests():
     """統合テストの実行"""
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from vocal_insight.analysis.prompt import estimate_tokens
 from vocal_insight_ai import (
     analyze_audio_segments,
     analyze_segment_with_praat,
@@ -127,6 +128,34 @@ def test_generate_llm_prompt():
     assert "Segment 1" in prompt
 
 
+def test_generate_llm_prompt_with_token_budget():
+    analysis_data = [
+        {
+            "segment_id": number + 1,
+            "time_start_s": float(number),
+            "time_end_s": float(number + 1),
+            "features": {
+                "f0_mean_hz": 150 + (number % 7) * 30,
+                "f0_std_hz": 5,
+                "hnr_mean_db": 10 + number % 3,
+                "f1_mean_hz": 500,
+                "f2_mean_hz": 1500,
+                "f3_mean_hz": 2500,
+            },
+        }
+        for number in range(300)
+    ]
+    full = generate_llm_prompt(analysis_data, "test_song.wav")
+
+    prompt = generate_llm_prompt(analysis_data, "test_song.wav", max_tokens=800)
+
+    assert estimate_tokens(prompt) <= 800 < estimate_tokens(full)
+    assert "test_song.wav" in prompt
+    assert "seg|time s|F0 Hz|F0 sd Hz|HNR dB|F1 Hz|F2 Hz|F3 Hz" in prompt
+    assert "行を表示" in prompt
+    assert prompt.endswith("分析レポートを作成してください。---")
+
+
 def test_analyze_audio_segments():
     np.random.seed(0)  # For reproducible results
     y = np.random.rand(44100 * 15)  # 15 seconds of audio
@@ -0,0 +1,719 @@
+"""
+テスト仕様: vocal_insight.analysis モジュール
+
+このテストファイルは、分析パイプライン統合機能の
+テスト仕様を定義します。
+"""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from vocal_insight.analysis.bundle import analyze_to_bundle, load_bundle
+from vocal_insight.analysis.chunked import chunked_intermediates, plan_chunks
+from vocal_insight.analysis.clips import extract_clips
+from vocal_insight.analysis.pipeline import (
+    analyze_audio_segments,
+    detect_segments,
+    iter_audio_segments,
+)
+from vocal_insight.analysis.prompt import estimate_tokens, segment_table
+from vocal_insight.analysis.ranges import extract_ranges, read_ranges
+from vocal_insight.analysis.sweep import (
+    config_grid,
+    format_sweep_table,
+    sweep_audio,
+    sweep_audio_segments,
+)
+from vocal_insight.core.decode import load_audio
+from vocal_insight.core.types import AnalysisConfig
+from vocal_insight.features import get_extractor
+from vocal_insight.features.graph import FeatureContext
+
+SR = 22050
+
+
+def _phrase_audio(phrase_sec=2.0, gap_sec=0.5, n_phrases=3):
+    """無音で区切られた正弦波フレーズの連続を生成"""
+    t = np.arange(int(SR * phrase_sec)) / SR
+    phrase = 0.5 * np.sin(2 * np.pi * 220 * t)
+    gap = np.zeros(int(SR * gap_sec))
+    parts = []
+    for i in range(n_phrases):
+        parts.append(phrase)
+        if i < n_phrases - 1:
+            parts.append(gap)
+    return np.concatenate(parts).astype(np.float32)
+
+
+@pytest.fixture
+def phrase_wav(tmp_path):
+    """フレーズ音声のWAVファイル"""
+    path = tmp_path / "phrases.wav"
+    sf.write(path, _phrase_audio(), SR)
+    return path
+
+
+class TestDetectSegments:
+    """セグメント検出統合処理のテスト"""
+
+    def test_phrase_segmentation_splits_at_gaps(self):
+        """フレーズ分割で無声区間に境界が置かれる"""
+        # Given: 3フレーズの音声とフレーズ分割設定
+        audio = _phrase_audio()
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=1.0,
+            max_len_sec=45.0,
+            segmentation="phrase",
+            min_gap_sec=0.3,
+        )
+
+        # When: セグメント検出を実行
+        segments, contour = detect_segments(audio, SR, config)
+
+        # Then: 3セグメントに分割され、ピッチ輪郭が返される
+        assert contour is not None
+        assert len(segments) == 3
+        assert abs(segments[0][1] - 2.25) < 0.05
+        assert abs(segments[1][1] - 4.75) < 0.05
+
+    def test_rms_segmentation_returns_no_contour(self):
+        """RMS分割ではピッチ輪郭を計算しない"""
+        audio = _phrase_audio()
+        config = AnalysisConfig(
+            rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0
+        )
+
+        segments, contour = detect_segments(audio, SR, config)
+
+        assert contour is None
+        assert len(segments) >= 1
+
+    def test_window_segmentation_returns_overlapping_grid(self):
+        """スライディング窓は長さ制約を適用せず一定間隔の窓を返す"""
+        audio = _phrase_audio()
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=8.0,
+            max_len_sec=45.0,
+            segmentation="window",
+            window_sec=2.0,
+            window_hop_sec=0.5,
+        )
+
+        segments, _ = detect_segments(audio, SR, config)
+
+        assert len(segments) == 11
+        assert segments[1] == (0.5, 2.5)
+        assert segments[-1][1] <= len(audio) / SR
+
+
+class TestAnalyzeAudioSegments:
+    """分析パイプラインのテスト"""
+
+    def test_phrase_segmentation_reuses_contour(self, phrase_wav, monkeypatch):
+        """フレーズ分割時はセグメントごとのピッチ分析を行わない"""
+        # Given: セグメント単位のピッチ分析呼び出しを検知する
+        from vocal_insight.features import graph
+
+        def fail_pitch(context):
+            raise AssertionError("per-segment to_pitch must not run")
+
+        monkeypatch.setitem(graph._PRODUCERS, "pitch", fail_pitch)
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=1.0,
+            max_len_sec=45.0,
+            segmentation="phrase",
+            min_gap_sec=0.3,
+        )
+
+        # When: パイプラインを実行
+        results = analyze_audio_segments(str(phrase_wav), config)
+
+        # Then: フレーズ単位の結果とトラック輪郭由来のF0が得られる
+        assert len(results) == 3
+        for segment in results:
+            assert 200.0 <= segment["features"]["f0_mean_hz"] <= 240.0
+
+    def test_feature_selection_marks_skipped_fields(self, phrase_wav):
+        """特徴量選択時は選択外のフィールドがNoneになる"""
+        config = AnalysisConfig(
+            rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0
+        )
+
+        results = analyze_audio_segments(str(phrase_wav), config, features=["hnr"])
+
+        assert len(results) >= 1
+        for segment in results:
+            assert segment["features"]["hnr_mean_db"] is not None
+            assert segment["features"]["f0_mean_hz"] is None
+            assert segment["features"]["f1_mean_hz"] is None
+
+    def test_voice_quality_uses_one_point_process_per_track(
+        self, phrase_wav, monkeypatch
+    ):
+        """声門パルス列とピッチはトラック全体で一度だけ計算し、区間ごとに切り出す"""
+        import vocal_insight.features.graph as graph
+
+        calls = []
+        original = graph.compute_glottal_pulses
+
+        def counting(sound, pitch, audio, sr):
+            calls.append(len(audio))
+            return original(sound, pitch, audio, sr)
+
+        monkeypatch.setattr(graph, "compute_glottal_pulses", counting)
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=1.0,
+            max_len_sec=45.0,
+            segmentation="phrase",
+        )
+
+        results = analyze_audio_segments(
+            str(phrase_wav), config, features=["f0", "voice_quality"]
+        )
+
+        assert calls == [len(_phrase_audio())]
+        assert len(results) == 3
+        for segment in results:
+            features = segment["features"]
+            assert 200.0 <= features["f0_mean_hz"] <= 240.0
+            assert 0.0 <= features["jitter_local"] < 0.01
+            assert features["vibrato_extent_cents"] == 0.0
+            assert features["hnr_mean_db"] is None
+
+    def test_spectral_features_use_one_track_stft(self, phrase_wav, monkeypatch):
+        """スペクトル特徴量はトラック全体のSTFTを一度だけ計算して区間集約する"""
+        import vocal_insight.features.graph as graph
+
+        calls = []
+        original = graph._PRODUCERS["stft"]
+
+        def counting(context):
+            calls.append(len(context.audio))
+            return original(context)
+
+        monkeypatch.setitem(graph._PRODUCERS, "stft", counting)
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=1.0,
+            max_len_sec=45.0,
+            segmentation="phrase",
+        )
+
+        results = analyze_audio_segments(str(phrase_wav), config, features="spectral")
+
+        assert calls == [len(_phrase_audio())]
+        assert len(results) == 3
+        for segment in results:
+            features = segment["features"]
+            assert 200.0 < features["spectral_centroid_hz"] < 1000.0
+            assert len(features["mfcc_mean"]) == 13
+            assert features["f0_mean_hz"] is None
+
+    def test_energy_features_share_detector_rms(self, phrase_wav, monkeypatch):
+        """RMS分割の境界検出と音量特徴量はトラック全体のRMSを一度だけ計算する"""
+        import vocal_insight.features.graph as graph
+
+        calls = []
+        original = graph._PRODUCERS["rms"]
+
+        def counting(context):
+            calls.append(len(context.audio))
+            return original(context)
+
+        monkeypatch.setitem(graph._PRODUCERS, "rms", counting)
+        config = AnalysisConfig(
+            rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0
+        )
+
+        results = analyze_audio_segments(str(phrase_wav), config, features="energy")
+
+        assert calls == [len(_phrase_audio())]
+        for segment in results:
+            features = segment["features"]
+            assert features["rms_mean"] > 0.0
+            assert features["crest_factor_db"] >= 0.0
+            assert features["f0_mean_hz"] is None
+
+    def test_window_segmentation_computes_contours_once(self, phrase_wav, monkeypatch):
+        """スライディング窓ではF0・HNR・フォルマントをトラック全体で一度だけ計算する"""
+        import vocal_insight.features.graph as graph
+
+        calls = []
+        for name in ("pitch", "harmonicity", "formant"):
+            original = graph._PRODUCERS[name]
+
+            def counting(context, name=name, original=original):
+                calls.append(name)
+                return original(context)
+
+            monkeypatch.setitem(graph._PRODUCERS, name, counting)
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=1.0,
+            max_len_sec=45.0,
+            segmentation="window",
+            window_sec=1.0,
+            window_hop_sec=0.25,
+        )
+
+        results = analyze_audio_segments(
+            str(phrase_wav), config, features="f0,hnr,formants,energy"
+        )
+
+        assert sorted(calls) == ["formant", "harmonicity", "pitch"]
+        assert len(results) == 25
+        # 最初の窓はフレーズ内、フレーズ間の無音を含む窓もF0はフレーズ部分のみ
+        assert results[0]["features"]["f0_mean_hz"] == pytest.approx(220.0, abs=2.0)
+        assert results[0]["features"]["rms_mean"] > 0.0
+        assert all(r["features"]["hnr_mean_db"] is not None for r in results)
+
+
+class TestSweep:
+    """パラメータスイープのテスト"""
+
+    def test_config_grid_is_cartesian_product(self):
+        """候補値の全ての組み合わせが作られ、指定外の項目は基準設定の値"""
+        configs = config_grid(
+            rms_delta_percentile=[90, 95], min_len_sec=[1.0, 2.0, 4.0]
+        )
+
+        assert len(configs) == 6
+        assert [c["min_len_sec"] for c in configs[:3]] == [1.0, 2.0, 4.0]
+        assert all(c["max_len_sec"] == 45.0 for c in configs)
+
+    def test_sweep_matches_detect_segments(self):
+        """設定ごとのセグメント数・長さが単独のセグメント検出と一致する"""
+        audio = _phrase_audio()
+        base = AnalysisConfig(
+            rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0
+        )
+        configs = config_grid(base, segmentation=["rms", "phrase"])
+
+        results = sweep_audio(audio, SR, configs)
+
+        for config, result in zip(configs, results):
+            segments, _ = detect_segments(audio, SR, config)
+            lengths = [end - start for start, end in segments]
+            assert result["config"] == config
+            assert result["n_segments"] == len(segments)
+            assert result["length_max_s"] == pytest.approx(max(lengths))
+        assert results[1]["n_segments"] == 3
+        assert results[1]["feature_std"]["f0_mean_hz"] < 1.0
+
+    def test_track_analysis_runs_once_for_all_configs(self, phrase_wav, monkeypatch):
+        """Praat の分析とRMSは設定の数によらずトラックごとに一度だけ"""
+        import vocal_insight.features.graph as graph
+
+        calls = []
+        for name in ("pitch", "harmonicity", "formant", "rms"):
+            original = graph._PRODUCERS[name]
+
+            def counting(context, name=name, original=original):
+                calls.append(name)
+                return original(context)
+
+            monkeypatch.setitem(graph._PRODUCERS, name, counting)
+        configs = config_grid(
+            AnalysisConfig(rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0),
+            rms_delta_percentile=[80, 90, 99],
+            segmentation=["rms", "phrase"],
+        )
+
+        results = sweep_audio_segments(str(phrase_wav), configs)
+
+        assert len(results) == 6
+        assert sorted(calls) == ["formant", "harmonicity", "pitch", "rms"]
+
+    def test_sweep_rejects_unsupported_features(self):
+        """区間集約で求まらない特徴量グループはエラー"""
+        base = AnalysisConfig(
+            rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0
+        )
+        with pytest.raises(ValueError, match="sweep cannot evaluate"):
+            sweep_audio(_phrase_audio(), SR, [base], features="voice_quality")
+
+    def test_table_lists_only_varying_settings(self):
+        """比較表には値が異なる設定項目だけが列として出力される"""
+        audio = _phrase_audio()
+        configs = config_grid(
+            AnalysisConfig(rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0),
+            min_len_sec=[1.0, 3.0],
+        )
+
+        table = format_sweep_table(sweep_audio(audio, SR, configs, features="f0"))
+
+        header = table.splitlines()[0].split()
+        assert header[:2] == ["min_len_sec", "segments"]
+        assert "std_f0_mean_hz" in header
+        assert "std_hnr_mean_db" not in header
+        assert len(table.splitlines()) == 4
+
+
+class TestExtractRanges:
+    """複数区間の特徴量抽出のテスト"""
+
+    def test_read_ranges_csv_and_json(self, tmp_path):
+        """CSV（列名）と JSON（ペア・オブジェクト）の区間ファイルを読み込める"""
+        csv_path = tmp_path / "ranges.csv"
+        csv_path.write_text("label,start_s,end_s\na,0.0,1.5\nb,2.5,4.0\n")
+        json_path = tmp_path / "ranges.json"
+        json_path.write_text('{"ranges": [[0, 1.5], {"start": 2.5, "end": 4}]}')
+
+        assert read_ranges(csv_path) == [(0.0, 1.5), (2.5, 4.0)]
+        assert read_ranges(json_path) == [(0.0, 1.5), (2.5, 4.0)]
+
+    def test_read_ranges_rejects_invalid(self, tmp_path):
+        """開始時刻が終了時刻以上の区間や時刻の欠けた区間はエラー"""
+        reversed_path = tmp_path / "reversed.json"
+        reversed_path.write_text("[[2.0, 1.0]]")
+        missing_path = tmp_path / "missing.csv"
+        missing_path.write_text("start_s,duration\n0.0,1.0\n")
+
+        with pytest.raises(ValueError, match="start must be less than end"):
+            read_ranges(reversed_path)
+        with pytest.raises(ValueError, match="invalid range 1"):
+            read_ranges(missing_path)
+
+    def test_matches_single_range_extraction(self):
+        """各区間の値は区間の音声を単独で抽出した場合と一致する"""
+        audio = _phrase_audio()
+        ranges = [(0.0, 1.5), (2.5, 4.0), (5.0, 7.0)]
+
+        results = extract_ranges(audio, SR, ranges, features="f0,hnr")
+
+        extractor = get_extractor("acoustic", features="f0,hnr")
+        for number, (result, (start, end)) in enumerate(zip(results, ranges), 1):
+            expected = extractor.extract(audio[int(start * SR) : int(end * SR)], SR)
+            assert result["segment_id"] == number
+            assert result["time_start_s"] == start
+            assert result["features"] == expected
+        assert results[-1]["time_end_s"] == pytest.approx(len(audio) / SR)
+
+    def test_parallel_matches_serial(self):
+        """ワーカープロセスで抽出しても逐次実行と同じ結果（同じ順）"""
+        audio = _phrase_audio()
+        ranges = [(0.0, 1.0), (2.5, 3.5), (0.5, 1.5), (5.0, 6.0)]
+
+        serial = extract_ranges(audio, SR, ranges, features="f0")
+        parallel = extract_ranges(audio, SR, ranges, features="f0", jobs=2)
+
+        assert parallel == serial
+
+    def test_rejects_range_outside_audio(self):
+        """音声の長さ以降から始まる区間はエラー"""
+        with pytest.raises(ValueError, match="outside the audio"):
+            extract_ranges(_phrase_audio(), SR, [(0.0, 1.0), (30.0, 31.0)])
+
+
+class TestExtractClips:
+    """多数の短いクリップの特徴量抽出のテスト"""
+
+    @pytest.fixture
+    def clips(self, tmp_path):
+        """1秒のクリップ5つ（44.1 kHz、3つ目は壊れたファイル）"""
+        sr = 44100
+        t = np.arange(sr) / sr
+        paths = []
+        for number in range(5):
+            path = tmp_path / f"clip{number}.wav"
+            if number == 2:
+                path.write_bytes(b"not audio")
+            else:
+                tone = 0.5 * np.sin(2 * np.pi * (200 + 20 * number) * t)
+                sf.write(path, tone, sr)
+            paths.append(path)
+        return paths
+
+    def test_matches_per_file_extraction(self, clips):
+        """各クリップの値は1ファイルずつ抽出した場合と一致し、失敗は記録される"""
+        results = list(extract_clips(clips, features="f0", clips_per_task=2))
+
+        extractor = get_extractor("acoustic", features="f0")
+        assert [result["clip_id"] for result in results] == [1, 2, 3, 4, 5]
+        assert results[2]["features"] is None and results[2]["error"]
+        for result, path in zip(results, clips):
+            assert result["filename"] == path.name
+            if path.name != "clip2.wav":
+                audio, sr = load_audio(path, sr=None)
+                assert result["error"] is None
+                assert result["duration_s"] == pytest.approx(1.0)
+                assert result["features"] == extractor.extract(audio, sr)
+
+    def test_parallel_matches_serial(self, clips):
+        """タスクにまとめてワーカーで抽出しても逐次実行と同じ結果（同じ順）"""
+        serial = list(extract_clips(clips, features="f0"))
+        parallel = list(extract_clips(clips, features="f0", jobs=2, clips_per_task=2))
+
+        assert parallel == serial
+
+    def test_rejects_invalid_arguments(self, clips):
+        """ワーカー数・タスクあたりのクリップ数が1未満の場合はエラー"""
+        with pytest.raises(ValueError, match="jobs"):
+            next(extract_clips(clips, jobs=0))
+        with pytest.raises(ValueError, match="clips_per_task"):
+            next(extract_clips(clips, clips_per_task=0))
+
+
+class TestAnalysisBundle:
+    """分析バンドルのテスト"""
+
+    CONFIG = AnalysisConfig(rms_delta_percentile=95, min_len_sec=1.0, max_len_sec=45.0)
+
+    def test_round_trip_matches_analysis(self, phrase_wav, tmp_path):
+        """保存した結果は分析結果と一致し、入力音声の内容で照合できる"""
+        results = analyze_to_bundle(phrase_wav, tmp_path / "b", self.CONFIG)
+
+        bundle = load_bundle(tmp_path / "b")
+
+        assert bundle.segments == results
+        assert results == analyze_audio_segments(str(phrase_wav), self.CONFIG)
+        assert bundle.filename == "phrases.wav"
+        assert bundle.matches(phrase_wav)
+        assert len(bundle.envelope) == len(bundle.rms)
+
+    def test_resegment_without_audio(self, phrase_wav, tmp_path, monkeypatch):
+        """保存したRMS・ピッチ輪郭から別の設定のセグメントを再計算できる"""
+        from vocal_insight.features import graph
+
+        analyze_to_bundle(phrase_wav, tmp_path / "b", self.CONFIG)
+        bundle = load_bundle(tmp_path / "b")
+        for name in graph.INTERMEDIATES:
+            monkeypatch.setitem(graph._PRODUCERS, name, None)
+        audio, _ = sf.read(phrase_wav, dtype="float32")
+
+        for segmentation in ("rms", "phrase", "window"):
+            config = AnalysisConfig(self.CONFIG, segmentation=segmentation)
+            expected, _ = detect_segments(audio, SR, config)
+            assert bundle.segment(config) == expected
+
+    def test_extract_from_tracks(self, phrase_wav, tmp_path):
+        """区間の特徴量は保存したフレーム系列から求まり、未保存のグループはエラー"""
+        analyze_to_bundle(phrase_wav, tmp_path / "b", self.CONFIG, features="f0,energy")
+        bundle = load_bundle(tmp_path / "b")
+
+        features = bundle.extract([(0.0, 2.0), (5.0, 7.0)])
+
+        assert features[0]["f0_mean_hz"] == pytest.approx(220, abs=2)
+        assert features[1]["rms_mean"] > 0.3
+        assert features[0]["hnr_mean_db"] is None
+        with pytest.raises(ValueError, match="does not store features"):
+            bundle.extract([(0.0, 2.0)], features="hnr")
+
+    def test_rejects_other_format_version(self, phrase_wav, tmp_path):
+        """形式のバージョンが異なるバンドルは読み込まない"""
+        import json
+
+        analyze_to_bundle(phrase_wav, tmp_path / "b", self.CONFIG, features="f0")
+        manifest_path = tmp_path / "b" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["version"] = 0
+        manifest_path.write_text(json.dumps(manifest))
+
+        with pytest.raises(ValueError, match="unsupported bundle version"):
+            load_bundle(tmp_path / "b")
+        with pytest.raises(ValueError, match="not an analysis bundle"):
+            load_bundle(tmp_path / "missing")
+
+
+class TestIterAudioSegments:
+    """セグメント結果を逐次返すイテレータのテスト"""
+
+    CONFIG = AnalysisConfig(
+        rms_delta_percentile=95,
+        min_len_sec=1.0,
+        max_len_sec=45.0,
+        segmentation="phrase",
+    )
+
+    def test_yields_same_results_as_list(self, phrase_wav):
+        """セグメント順に、リストを返す関数と同じ結果を返す"""
+        results = list(iter_audio_segments(str(phrase_wav), self.CONFIG))
+
+        assert [r["segment_id"] for r in results] == [0, 1, 2]
+        assert results == analyze_audio_segments(str(phrase_wav), self.CONFIG)
+
+    def test_early_termination_stops_extraction(self, phrase_wav, monkeypatch):
+        """途中でやめると残りのセグメントの特徴量抽出は行わない"""
+        from vocal_insight.features.acoustic import AcousticFeatureExtractor
+
+        calls = []
+        original = AcousticFeatureExtractor.extract_from
+
+        def counting(self, context):
+            calls.append(context)
+            return original(self, context)
+
+        monkeypatch.setattr(AcousticFeatureExtractor, "extract_from", counting)
+
+        iterator = iter_audio_segments(str(phrase_wav), self.CONFIG)
+        first = next(iterator)
+        iterator.close()
+
+        assert first["segment_id"] == 0
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_worker_processes_match_serial(self, phrase_wav, ordered):
+        """ワーカープロセスでの抽出も逐次実行と同じ結果（順不同指定時は集合として）"""
+        serial = analyze_audio_segments(str(phrase_wav), self.CONFIG)
+
+        results = list(
+            iter_audio_segments(str(phrase_wav), self.CONFIG, jobs=2, ordered=ordered)
+        )
+
+        if not ordered:
+            results.sort(key=lambda r: r["segment_id"])
+        assert results == serial
+
+    def test_rejects_invalid_jobs(self, phrase_wav):
+        """ワーカー数が1未満はエラー"""
+        with pytest.raises(ValueError, match="jobs must be at least 1"):
+            analyze_audio_segments(str(phrase_wav), self.CONFIG, jobs=0)
+
+
+class TestChunkedIntermediates:
+    """チャンク並列のトラック全体分析のテスト"""
+
+    @staticmethod
+    def _varied_audio(duration=7.0):
+        """音量とピッチが変化し、無音を挟む音声"""
+        rng = np.random.default_rng(0)
+        t = np.arange(int(SR * duration)) / SR
+        f0 = 180 + 80 * np.sin(2 * np.pi * 0.3 * t)
+        audio = (0.2 + 0.6 * np.abs(np.sin(2 * np.pi * 0.2 * t))) * np.sin(
+            2 * np.pi * np.cumsum(f0) / SR
+        )
+        audio += 0.01 * rng.standard_normal(len(t))
+        audio[int(2.9 * SR) : int(3.6 * SR)] = 0.0
+        return audio.astype(np.float32)
+
+    def test_plan_tiles_track(self):
+        """採用範囲は隙間なく並び、分析範囲は採用範囲を含む"""
+        chunks = plan_chunks(7 * SR, SR, chunk_sec=1.5, overlap_sec=0.5)
+
+        assert chunks[0].keep_start == 0
+        assert chunks[-1].keep_end == 7 * SR
+        for before, after in zip(chunks, chunks[1:]):
+            assert before.keep_end == after.keep_start
+        for chunk in chunks:
+            assert chunk.start <= chunk.keep_start < chunk.keep_end <= chunk.end
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_matches_single_pass(self, jobs):
+        """つなぎ合わせたRMS・ピッチ輪郭は一括で計算したものと一致する"""
+        audio = self._varied_audio()
+        track = FeatureContext(audio, SR, "praat")
+
+        chunked = chunked_intermediates(
+            audio, SR, chunk_sec=1.5, overlap_sec=0.5, jobs=jobs
+        )
+
+        np.testing.assert_array_equal(chunked["rms"], track.get("rms"))
+        contour = track.get("contour")
+        np.testing.assert_allclose(chunked["contour"].times, contour.times, atol=1e-9)
+        # 半サンプル位置のフレームでは Praat の丸めにより F0 がわずかに異なりうる
+        np.testing.assert_array_equal(chunked["contour"].voiced, contour.voiced)
+        np.testing.assert_allclose(chunked["contour"].f0_hz, contour.f0_hz, rtol=1e-3)
+        assert chunked["contour"].time_step == contour.time_step
+
+    def test_segment_analysis_matches(self, phrase_wav):
+        """チャンク並列でもセグメント分析結果は変わらない"""
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=1.0,
+            max_len_sec=45.0,
+            segmentation="phrase",
+        )
+
+        chunked = analyze_audio_segments(str(phrase_wav), config, chunk_sec=1.0)
+        single = analyze_audio_segments(str(phrase_wav), config)
+
+        assert [(r["time_start_s"], r["time_end_s"]) for r in chunked] == [
+            (r["time_start_s"], r["time_end_s"]) for r in single
+        ]
+        for result, expected in zip(chunked, single):
+            assert result["features"] == pytest.approx(
+                expected["features"], rel=1e-4, abs=1e-3
+            )
+
+    def test_rejects_invalid_arguments(self):
+        """未知の中間表現・正でないチャンク長はエラー"""
+        audio = self._varied_audio(1.0)
+        with pytest.raises(ValueError, match="cannot compute"):
+            chunked_intermediates(audio, SR, ["stft"])
+        with pytest.raises(ValueError, match="chunk_sec must be positive"):
+            chunked_intermediates(audio, SR, chunk_sec=0.0)
+
+
+class TestSegmentTable:
+    """トークン数の上限に合わせたプロンプト用セグメント表のテスト"""
+
+    @staticmethod
+    def make_segments(f0_values):
+        return [
+            {
+                "segment_id": number + 1,
+                "time_start_s": float(number),
+                "time_end_s": float(number + 1),
+                "features": {"f0_mean_hz": f0, "hnr_mean_db": 15.0, "f1_mean_hz": None},
+            }
+            for number, f0 in enumerate(f0_values)
+        ]
+
+    def test_without_budget_renders_every_segment(self):
+        """上限なしでは全セグメントを1行ずつ出力し、値のない列は出力しない"""
+        table = segment_table(self.make_segments([150.0, 151.0, 300.0]))
+
+        lines = table.text.splitlines()
+        assert lines[0] == "seg|time s|F0 Hz|HNR dB"
+        assert lines[1:] == [
+            "1|0.0-1.0|150.0|15.0",
+            "2|1.0-2.0|151.0|15.0",
+            "3|2.0-3.0|300.0|15.0",
+        ]
+        assert (table.rows, table.merged, table.omitted) == (3, 0, 0)
+        assert table.tokens == estimate_tokens(table.text)
+
+    def test_merges_similar_adjacent_segments(self):
+        """上限を超える場合は隣接する似たセグメントを長さで重み付けした平均にまとめる"""
+        segments = self.make_segments([150.0, 150.2, 149.8, 300.0, 300.4])
+        full = segment_table(segments)
+
+        table = segment_table(segments, max_tokens=full.tokens - 1)
+
+        assert table.text.splitlines()[1:] == [
+            "1-3|0.0-3.0|150.0|15.0",
+            "4-5|3.0-5.0|300.2|15.0",
+        ]
+        assert (table.rows, table.merged, table.omitted) == (2, 3, 0)
+        assert table.tokens <= full.tokens - 1
+
+    def test_keeps_rows_with_largest_changes(self):
+        """まとめても超える場合は変化の大きい行を時間順に残し、注記を付ける"""
+        rng = np.random.default_rng(0)
+        f0_values = list(150.0 + rng.normal(0.0, 20.0, 200))
+        f0_values[100] = 600.0
+        segments = self.make_segments(f0_values)
+
+        table = segment_table(segments, max_tokens=150, tolerance=0.0)
+
+        assert table.tokens <= 150
+        assert 0 < table.rows < len(segments)
+        assert table.omitted == len(segments) - table.rows
+        assert "|600.0|" in table.text
+        kept = [int(line.split("|")[0]) for line in table.text.splitlines()[1:-1]]
+        assert kept == sorted(kept)
+        assert table.text.splitlines()[-1].startswith(f"({table.rows} of 200 rows")
+
+    def test_token_estimate_counts_character_classes(self):
+        """英字は6文字・数字は3桁ごと、記号と ASCII 以外の文字は1文字ごとに数える"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("F0 Hz") == 3
+        assert estimate_tokens("vibrato 12345") == 4
+        assert estimate_tokens("1|0.0-1.0") == 9
+        assert estimate_tokens("音声") == 2
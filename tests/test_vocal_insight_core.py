@@ -7,9 +7,31 @@
 TDD Red Phase: 実装前のテスト記述
 """
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
 import pytest
+import soundfile as sf
 
-from vocal_insight.core.config import get_default_config, validate_config
+from vocal_insight.core.config import (
+    DEFAULT_FEATURE_GROUPS,
+    FEATURE_GROUPS,
+    get_default_config,
+    parse_features,
+    validate_config,
+)
+from vocal_insight.core.decode import (
+    DecodeCache,
+    list_audio_files,
+    load_audio,
+    load_audio_range,
+)
+from vocal_insight.core.prefetch import PrefetchLoader
+from vocal_insight.core.shared import SharedAudio, attach_audio
 from vocal_insight.core.types import AnalysisConfig, FeatureData, SegmentAnalysis
 
 
@@ -122,3 +144,324 @@ class TestCoreConfig:
             ValueError, match="min_len_sec must be less than max_len_sec"
         ):
             validate_config(invalid_config)
+
+    def test_validate_config_with_invalid_segmentation(self):
+        """未知のセグメンテーション方式で検証が失敗することを確認"""
+        # Given: 未知のセグメンテーション方式
+        invalid_config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=8.0,
+            max_len_sec=45.0,
+            segmentation="unknown",
+        )
+
+        # When & Then: 検証が失敗する
+        with pytest.raises(ValueError, match="segmentation must be one of"):
+            validate_config(invalid_config)
+
+    def test_validate_config_with_invalid_window(self):
+        """スライディング窓の長さ・間隔が正でない場合はエラー"""
+        config = AnalysisConfig(
+            rms_delta_percentile=95,
+            min_len_sec=8.0,
+            max_len_sec=45.0,
+            segmentation="window",
+            window_hop_sec=0.0,
+        )
+
+        with pytest.raises(ValueError, match="window_hop_sec"):
+            validate_config(config)
+
+
+class TestFeatureSelectionConfig:
+    """特徴量選択の正規化のテスト"""
+
+    def test_parse_features_defaults_to_all(self):
+        """未指定の場合は音量・声質・スペクトル以外の全グループ、allの場合は全グループ"""
+        assert parse_features(None) == DEFAULT_FEATURE_GROUPS
+        assert "voice_quality" not in DEFAULT_FEATURE_GROUPS
+        assert "energy" not in DEFAULT_FEATURE_GROUPS
+        assert parse_features("all") == tuple(FEATURE_GROUPS)
+        assert parse_features("f0,voice_quality") == ("f0", "voice_quality")
+
+    def test_parse_features_from_comma_separated_string(self):
+        """カンマ区切り文字列を定義順のタプルに正規化"""
+        assert parse_features("hnr, F0") == ("f0", "hnr")
+
+    def test_parse_features_rejects_unknown_group(self):
+        """未知のグループでValueError"""
+        with pytest.raises(ValueError, match="unknown features"):
+            parse_features(["f0", "jitter"])
+
+
+class TestDecodeCache:
+    """デコード済み音声キャッシュのテスト"""
+
+    @staticmethod
+    def _write_tone(path, freq, seconds=1.0, sr=16000):
+        t = np.arange(int(seconds * sr)) / sr
+        sf.write(path, 0.5 * np.sin(2 * np.pi * freq * t), sr)
+        return path
+
+    def test_second_load_is_memory_mapped(self, tmp_path, monkeypatch):
+        """2回目以降はデコードせず、メモリマップされた同じ音声を返す"""
+        import librosa
+
+        path = self._write_tone(tmp_path / "tone.wav", 220)
+        cache = DecodeCache(tmp_path / "cache")
+        audio, sr, cached = cache.load(path, sr=22050)
+
+        # When: デコードを禁止して再度読み込む
+        def fail(*args, **kwargs):
+            raise AssertionError("decoded again")
+
+        monkeypatch.setattr(librosa, "load", fail)
+        again, again_sr, again_cached = cache.load(path, sr=22050)
+
+        # Then: 分析用のサンプリング周波数の float32 がメモリマップで返される
+        assert not cached and again_cached
+        assert sr == again_sr == 22050
+        assert isinstance(again, np.memmap) and again.dtype == np.float32
+        np.testing.assert_array_equal(again, audio)
+        assert not again.flags.writeable
+
+    def test_key_depends_on_content_and_rate(self, tmp_path):
+        """キーはファイル内容とサンプリング周波数で決まり、パスには依存しない"""
+        cache = DecodeCache(tmp_path / "cache")
+        a = self._write_tone(tmp_path / "a.wav", 220)
+        b = self._write_tone(tmp_path / "b.wav", 220)
+        c = self._write_tone(tmp_path / "c.wav", 330)
+
+        assert cache.key(a, 22050) == cache.key(b, 22050)
+        assert cache.key(a, 22050) != cache.key(c, 22050)
+        assert cache.key(a, 22050) != cache.key(a, None)
+
+    def test_native_rate_is_kept(self, tmp_path):
+        """sr=None では元のサンプリング周波数で保存される"""
+        path = self._write_tone(tmp_path / "tone.wav", 220)
+        audio, sr = load_audio(path, sr=None, cache=DecodeCache(tmp_path / "cache"))
+
+        assert sr == 16000
+        assert len(audio) == 16000
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """容量を超えると最終利用時刻の古いエントリから削除される"""
+        paths = [
+            self._write_tone(tmp_path / f"{freq}.wav", freq) for freq in (220, 330, 440)
+        ]
+        # 1エントリ（16000サンプルの float32 ≒ 64 KB）を2つだけ保持できる容量
+        cache = DecodeCache(tmp_path / "cache", max_bytes=150_000)
+        cache.load(paths[0], sr=None)
+        cache.load(paths[1], sr=None)
+        # 2つ目のエントリの最終利用時刻を古くし、1つ目を再度読み込む
+        old = cache.cache_dir / f"{cache.key(paths[1], None)}.npy"
+        os.utime(old, (1, 1))
+        cache.load(paths[0], sr=None)
+
+        # When: 3つ目を保存
+        cache.load(paths[2], sr=None)
+
+        # Then: 最終利用時刻が最も古い2つ目が削除される
+        stored = {path.stem for path in cache.cache_dir.glob("*.npy")}
+        assert stored == {cache.key(paths[0], None), cache.key(paths[2], None)}
+        assert cache.size() <= 150_000
+
+
+class TestLoadAudioRange:
+    """区間読み込みのテスト"""
+
+    @pytest.fixture
+    def stereo_wav(self, tmp_path):
+        """3秒のステレオWAVと、全体を読み込んだモノラル音声"""
+        import librosa
+
+        sr = 16000
+        rng = np.random.default_rng(0)
+        path = tmp_path / "take.wav"
+        sf.write(path, rng.uniform(-0.5, 0.5, (3 * sr, 2)), sr)
+        audio, _ = librosa.load(path, sr=None)
+        return path, audio, sr
+
+    def test_seek_matches_full_load_slice(self, stereo_wav):
+        """シークして読んだ区間は全体を読み込んで切り出した区間と一致する"""
+        path, audio, sr = stereo_wav
+
+        excerpt, excerpt_sr = load_audio_range(path, 1.25, 2.5)
+
+        assert excerpt_sr == sr
+        np.testing.assert_allclose(
+            excerpt, audio[int(1.25 * sr) : int(2.5 * sr)], atol=1e-7
+        )
+
+    def test_open_ended_and_out_of_range(self, stereo_wav):
+        """片側のみの指定は先頭・末尾まで、範囲外の区間は空"""
+        path, audio, sr = stereo_wav
+
+        head, _ = load_audio_range(path, end_sec=0.5)
+        tail, _ = load_audio_range(path, start_sec=2.0)
+        beyond, _ = load_audio_range(path, 5.0, 6.0)
+
+        assert len(head) == sr // 2
+        assert len(tail) == len(audio) - 2 * sr
+        assert len(beyond) == 0
+
+    def test_fallback_decodes_up_to_end(self, stereo_wav, monkeypatch):
+        """soundfile で開けない形式は librosa の offset/duration で読み込む"""
+        from types import SimpleNamespace
+
+        import librosa
+
+        import vocal_insight.core.decode as decode
+
+        path, audio, sr = stereo_wav
+        calls = []
+        original = librosa.load
+
+        def unsupported(*args, **kwargs):
+            raise sf.LibsndfileError(0, "unsupported format")
+
+        def recording_load(*args, **kwargs):
+            calls.append(kwargs)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(
+            decode,
+            "sf",
+            SimpleNamespace(SoundFile=unsupported, LibsndfileError=sf.LibsndfileError),
+        )
+        monkeypatch.setattr(librosa, "load", recording_load)
+
+        excerpt, _ = load_audio_range(path, 1.0, 2.0)
+
+        assert calls[0]["offset"] == 1.0 and calls[0]["duration"] == 1.0
+        assert len(excerpt) == sr
+
+    def test_cached_range_is_a_view(self, stereo_wav, tmp_path):
+        """キャッシュ指定時はメモリマップの切り出しを返す"""
+        path, audio, sr = stereo_wav
+        cache = DecodeCache(tmp_path / "cache")
+        load_audio(path, sr=None, cache=cache)
+
+        excerpt, _ = load_audio_range(path, 1.0, 2.0, cache=cache)
+
+        assert isinstance(excerpt, np.memmap)
+        np.testing.assert_array_equal(excerpt, audio[sr : 2 * sr])
+
+
+def _attached_sum(handle, start, end):
+    """ワーカーで共有された音声の区間の和を求める"""
+    return float(attach_audio(handle)[start:end].sum())
+
+
+def _crash(handle):
+    """共有された音声を参照したままワーカーを異常終了させる"""
+    attach_audio(handle)
+    os._exit(1)
+
+
+class TestSharedAudio:
+    """ワーカープロセスへの音声の受け渡しのテスト"""
+
+    def test_workers_read_shared_audio(self):
+        """ワーカーは参照から同じ音声を読み取れる"""
+        audio = np.random.default_rng(0).standard_normal(10000).astype(np.float32)
+
+        with SharedAudio(audio) as shared:
+            assert shared.handle.shm_name is not None
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                total = executor.submit(
+                    _attached_sum, shared.handle, 100, 5000
+                ).result()
+
+        assert total == pytest.approx(float(audio[100:5000].sum()), rel=1e-6)
+
+    def test_memory_mapped_audio_shares_file(self, tmp_path):
+        """メモリマップの音声は共有メモリにコピーせずファイルを参照する"""
+        np.save(tmp_path / "audio.npy", np.arange(100, dtype=np.float32))
+        audio = np.load(tmp_path / "audio.npy", mmap_mode="r")
+
+        with SharedAudio(audio) as shared:
+            assert shared.handle.shm_name is None
+            view = attach_audio(shared.handle)
+
+        np.testing.assert_array_equal(view, audio)
+
+    def test_removed_after_worker_crash(self):
+        """ワーカーが異常終了しても共有メモリは削除される"""
+        audio = np.ones(1000, dtype=np.float32)
+
+        with pytest.raises(BrokenProcessPool):
+            with SharedAudio(audio) as shared:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    executor.submit(_crash, shared.handle).result()
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared.handle.shm_name)
+
+
+class TestPrefetchLoader:
+    """複数ファイルの先読みデコードのテスト"""
+
+    @pytest.fixture
+    def takes(self, tmp_path):
+        """短い音声ファイル3つと壊れたファイル1つ（名前順で2番目）"""
+        sr = 16000
+        t = np.arange(sr // 2) / sr
+        for name, freq in (("a", 220), ("c", 330), ("d", 440)):
+            sf.write(tmp_path / f"{name}.wav", 0.5 * np.sin(2 * np.pi * freq * t), sr)
+        (tmp_path / "b.wav").write_bytes(b"not audio")
+        (tmp_path / "notes.txt").write_text("ignored")
+        return tmp_path
+
+    def test_files_in_order_with_errors_in_place(self, takes):
+        """ファイルを順に返し、デコードに失敗したファイルは同じ位置で返す"""
+        paths = list_audio_files(takes)
+        assert [path.name for path in paths] == ["a.wav", "b.wav", "c.wav", "d.wav"]
+
+        with PrefetchLoader(paths, sr=None) as loader:
+            items = list(loader)
+
+        assert [item.path for item in items] == paths
+        assert items[1].error is not None and items[1].audio is None
+        for item in (items[0], items[2], items[3]):
+            audio, sr = load_audio(item.path, sr=None)
+            assert item.error is None and item.sr == sr
+            np.testing.assert_array_equal(item.audio, audio)
+        assert loader.stats.files == 4
+
+    def test_decoding_stays_within_depth(self, takes, monkeypatch):
+        """キューが埋まるとデコードを止め、close でスレッドが終了する"""
+        import vocal_insight.core.prefetch as prefetch
+
+        decoded = []
+
+        def counting_load(path, sr, cache):
+            decoded.append(path)
+            return np.zeros(10, dtype=np.float32), 16000
+
+        monkeypatch.setattr(prefetch, "load_audio", counting_load)
+        paths = [takes / "a.wav"] * 10
+        loader = PrefetchLoader(paths, depth=2)
+        first = next(iter(loader))
+        time.sleep(0.2)
+
+        # 受け取った1ファイル・キューの2ファイル・積むのを待つ1ファイル
+        assert first.error is None
+        assert len(decoded) == 4
+        loader.close()
+        assert not loader._thread.is_alive()
+
+    def test_without_prefetch_every_decode_is_waited_for(self, takes):
+        """depth=0 ではデコードの時間をすべて待つため重なりは0"""
+        with PrefetchLoader(list_audio_files(takes), depth=0) as loader:
+            for _ in loader:
+                pass
+
+        stats = loader.stats
+        assert stats.wait_sec == pytest.approx(stats.decode_sec)
+        assert stats.overlap == pytest.approx(0.0, abs=1e-9)
+
+    def test_negative_depth_is_rejected(self):
+        """先読みするファイル数が負の場合はエラー"""
+        with pytest.raises(ValueError, match="depth"):
+            PrefetchLoader([], depth=-1)
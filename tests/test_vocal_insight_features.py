@@ -12,6 +12,24 @@ import pytest
 
 from vocal_insight.features.acoustic import AcousticFeatureExtractor
 from vocal_insight.features.base import FeatureExtractor
+from vocal_insight.features.contour import compute_pitch_contour
+from vocal_insight.features.energy import energy_statistics
+from vocal_insight.features.graph import FeatureContext
+from vocal_insight.features.lpc import lpc_formants
+from vocal_insight.features.registry import available_extractors, get_extractor
+from vocal_insight.features.spectral import spectral_frames, summarize_segments
+from vocal_insight.features.voice_quality import (
+    jitter_local,
+    shimmer_local,
+    vibrato,
+)
+from vocal_insight.features.windowed import (
+    frame_series,
+    prefix_sums,
+    window_grid,
+    windowed_features,
+)
+from vocal_insight.features.yin import yin_f0
 
 
 class TestFeatureExtractorProtocol:
@@ -218,3 +236,592 @@ class TestAcousticFeatureExtractor:
 
         with pytest.raises(TypeError):
             extractor.extract(np.array([1, 2, 3]), "invalid_sr")  # srが文字列は無効
+
+
+class TestYinPitchEngine:
+    """YINピッチエンジンのテスト"""
+
+    @pytest.mark.parametrize("sr", [22050, 44100])
+    @pytest.mark.parametrize("frequency", [110.0, 220.0, 440.0])
+    def test_yin_estimates_sine_frequency(self, sr, frequency):
+        """正弦波の周波数を1%以内の誤差で推定する"""
+        # Given: 既知の周波数の正弦波
+        t = np.arange(sr) / sr
+        audio = np.sin(2 * np.pi * frequency * t)
+
+        # When: YINでF0を推定
+        times, f0 = yin_f0(audio, sr)
+
+        # Then: 有声フレームのF0が期待値に近い
+        voiced = f0[f0 > 0]
+        assert len(times) == len(f0)
+        assert len(voiced) > 0.9 * len(f0)
+        assert abs(np.median(voiced) - frequency) / frequency < 0.01
+
+    def test_yin_silence_is_unvoiced(self):
+        """無音区間は無声（0）と判定される"""
+        sr = 22050
+        t = np.arange(sr) / sr
+        audio = np.concatenate([np.sin(2 * np.pi * 200 * t), np.zeros(sr)])
+
+        times, f0 = yin_f0(audio, sr)
+
+        assert np.all(f0[times > 1.1] == 0)
+        assert np.all(yin_f0(np.zeros(sr), sr)[1] == 0)
+
+    def test_yin_agrees_with_praat_contour(self):
+        """YINとPraatのピッチ輪郭がおおむね一致する"""
+        # Given: ビブラートを含む倍音信号
+        sr = 22050
+        t = np.arange(2 * sr) / sr
+        f0_true = 180 * 2 ** (0.3 * np.sin(2 * np.pi * 5 * t) / 12)
+        phase = 2 * np.pi * np.cumsum(f0_true) / sr
+        audio = sum((0.6**k) * np.sin(k * phase) for k in range(1, 8))
+
+        # When: 両エンジンでピッチ輪郭を計算
+        praat = compute_pitch_contour(audio, sr, engine="praat")
+        yin = compute_pitch_contour(audio, sr, engine="yin")
+
+        # Then: 共通して有声のフレームで50セント以内に収まる
+        praat_on_yin_grid = np.interp(yin.times, praat.times, praat.f0_hz)
+        both = yin.voiced & (praat_on_yin_grid > 0)
+        cents = 1200 * np.abs(np.log2(yin.f0_hz[both] / praat_on_yin_grid[both]))
+        assert np.mean(cents <= 50) > 0.95
+
+    def test_unknown_pitch_engine_is_rejected(self):
+        """未知のピッチエンジンはValueErrorになる"""
+        with pytest.raises(ValueError):
+            AcousticFeatureExtractor(pitch_engine="unknown")
+        with pytest.raises(ValueError):
+            compute_pitch_contour(np.zeros(100), 22050, engine="unknown")
+
+
+def _synth_vowel(f0, formants, sr=22050, duration=1.0):
+    """パルス列を共振器で濾波した合成母音を生成"""
+    from scipy.signal import lfilter
+
+    t = np.arange(int(sr * duration)) / sr
+    audio = lfilter([1], [1, -0.97], np.diff(np.floor(f0 * t), prepend=0.0))
+    for frequency, bandwidth in formants:
+        r = np.exp(-np.pi * bandwidth / sr)
+        a = [1, -2 * r * np.cos(2 * np.pi * frequency / sr), r * r]
+        audio = lfilter([sum(a)], a, audio)
+    return audio / np.max(np.abs(audio))
+
+
+class TestLpcFormantEngine:
+    """バッチLPCフォルマントエンジンのテスト"""
+
+    def test_lpc_recovers_vowel_formants(self):
+        """合成母音のF1〜F3を5%以内で推定する"""
+        # Given: /a/ に近い合成母音（F4, F5 を含む）
+        sr = 22050
+        targets = [730.0, 1090.0, 2440.0]
+        formants = [(730, 90), (1090, 110), (2440, 170), (3500, 250), (4500, 300)]
+        audio = _synth_vowel(110, formants, sr)
+
+        # When: LPCでフォルマントを推定
+        times, tracks = lpc_formants(audio, sr)
+
+        # Then: フレーム数が揃い、中央値が目標値に近い
+        assert tracks.shape == (len(times), 3)
+        estimated = np.nanmedian(tracks, axis=0)
+        for value, target in zip(estimated, targets):
+            assert abs(value - target) / target < 0.05
+
+    def test_lpc_silent_frames_are_nan(self):
+        """無音フレームはNaNになる"""
+        times, tracks = lpc_formants(np.zeros(22050), 22050)
+
+        assert len(times) > 0
+        assert np.all(np.isnan(tracks))
+
+    def test_lpc_extractor_uses_defaults_for_silence(self):
+        """LPC抽出器は無音でも数値を返す"""
+        extractor = AcousticFeatureExtractor(formant_engine="lpc")
+
+        features = extractor.extract(np.zeros(22050), 22050)
+
+        for value in features.values():
+            assert isinstance(value, float)
+            assert not np.isnan(value)
+
+    def test_unknown_formant_engine_is_rejected(self):
+        """未知のフォルマントエンジンはValueErrorになる"""
+        with pytest.raises(ValueError):
+            AcousticFeatureExtractor(formant_engine="unknown")
+
+
+class TestFeatureSelection:
+    """特徴量選択のテスト"""
+
+    def test_only_requested_analyses_run(self, monkeypatch):
+        """F0のみ指定時はHNR・フォルマント分析が実行されない"""
+
+        # Given: HNR・フォルマント分析の呼び出しを検知する
+        def fail(*args, **kwargs):
+            raise AssertionError("unrequested analysis must not run")
+
+        monkeypatch.setattr(AcousticFeatureExtractor, "_extract_hnr", fail)
+        monkeypatch.setattr(AcousticFeatureExtractor, "_extract_formants", fail)
+        extractor = AcousticFeatureExtractor(features=["f0"])
+        sr = 22050
+        t = np.arange(sr) / sr
+        audio = np.sin(2 * np.pi * 200 * t)
+
+        # When: 特徴量抽出を実行
+        features = extractor.extract(audio, sr)
+
+        # Then: F0のみ計算され、他のフィールドは明示的にNone
+        assert 195.0 <= features["f0_mean_hz"] <= 205.0
+        assert features["f0_std_hz"] is not None
+        for key in ("hnr_mean_db", "f1_mean_hz", "f2_mean_hz", "f3_mean_hz"):
+            assert key in features
+            assert features[key] is None
+
+    def test_skipped_praat_analyses_do_not_build_sound(self, monkeypatch):
+        """Praatを使わない組み合わせではSoundオブジェクトを作成しない"""
+        import parselmouth
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parselmouth.Sound must not be created")
+
+        monkeypatch.setattr(parselmouth, "Sound", fail)
+        extractor = AcousticFeatureExtractor(
+            pitch_engine="yin", formant_engine="lpc", features="f0,formants"
+        )
+
+        features = extractor.extract(np.random.normal(0, 0.1, 22050), 22050)
+
+        assert features["hnr_mean_db"] is None
+        assert features["f1_mean_hz"] is not None
+
+    def test_unknown_feature_is_rejected(self):
+        """未知の特徴量グループはValueErrorになる"""
+        with pytest.raises(ValueError, match="unknown features"):
+            AcousticFeatureExtractor(features=["pitch"])
+
+
+class TestFeatureGraph:
+    """中間表現共有グラフのテスト"""
+
+    class _SpectralProbe:
+        """STFT・RMS・Soundを要求するテスト用抽出器"""
+
+        requires = ("sound", "stft", "rms")
+
+        def extract_from(self, context):
+            context.get("sound")
+            return {"n_stft_frames": context.get("stft").shape[1]}
+
+    def test_intermediates_computed_once_across_extractors(self, monkeypatch):
+        """複数の抽出器が同じ中間表現を共有し、各々一度だけ計算される"""
+        import parselmouth
+
+        from vocal_insight.features import FeatureGraph
+
+        # Given: Soundの生成回数を数える
+        created = []
+        original = parselmouth.Sound
+
+        def counting_sound(*args, **kwargs):
+            created.append(1)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(parselmouth, "Sound", counting_sound)
+        graph = FeatureGraph([AcousticFeatureExtractor(), self._SpectralProbe()])
+        sr = 22050
+        t = np.arange(sr) / sr
+        audio = np.sin(2 * np.pi * 200 * t)
+
+        # When: グラフを実行
+        result = graph.run(audio, sr)
+
+        # Then: Soundは一度だけ作成され、両抽出器の結果が統合される
+        assert len(created) == 1
+        assert 195.0 <= result["f0_mean_hz"] <= 205.0
+        assert result["n_stft_frames"] > 0
+        assert graph.requires == (
+            "f0",
+            "harmonicity",
+            "formant",
+            "sound",
+            "stft",
+            "rms",
+        )
+
+    def test_context_resolves_dependencies_lazily(self):
+        """コンテキストは参照された中間表現と依存のみを計算する"""
+        from vocal_insight.features import FeatureContext
+
+        sr = 22050
+        audio = np.sin(2 * np.pi * 200 * np.arange(sr) / sr)
+        context = FeatureContext(audio, sr)
+
+        voiced = context.get("voiced")
+
+        assert voiced.any()
+        assert context.computed == ("sound", "pitch", "f0", "voiced")
+        assert context.get("voiced") is voiced
+
+    def test_precomputed_intermediate_is_not_recomputed(self):
+        """計算済みの中間表現を渡すと再計算しない"""
+        from vocal_insight.features import FeatureContext
+
+        f0 = np.array([0.0, 220.0, 230.0])
+        context = FeatureContext(np.zeros(2205), 22050, precomputed={"f0": f0})
+
+        assert context.get("f0") is f0
+        assert context.get("voiced").tolist() == [False, True, True]
+        assert "sound" not in context
+
+    def test_unknown_intermediate_is_rejected(self):
+        """未知の中間表現への依存はValueError"""
+        from vocal_insight.features import FeatureGraph
+
+        class Unknown:
+            requires = ("mel",)
+
+            def extract_from(self, context):
+                return {}
+
+        with pytest.raises(ValueError, match="unknown intermediates"):
+            FeatureGraph([Unknown()])
+
+
+def _pulse_train(f0=150.0, duration=3.0, jitter=0.01, shimmer=0.05, sr=22050):
+    """周期・振幅が揺らぐ減衰パルス列（声門パルスを模した合成音）"""
+    rng = np.random.default_rng(0)
+    n = int(duration * f0)
+    periods = (1 / f0) * (1 + jitter * rng.standard_normal(n))
+    amplitudes = 1 + shimmer * rng.standard_normal(n)
+    starts = np.round(np.concatenate(([0.0], np.cumsum(periods)))[:-1] * sr)
+    t = np.arange(300) / sr
+    pulse = np.exp(-400 * t) * np.sin(2 * np.pi * 500 * t)
+    audio = np.zeros(int(starts[-1]) + sr // 10)
+    for start, amplitude in zip(starts.astype(int), amplitudes):
+        audio[start : start + len(pulse)] += amplitude * pulse
+    return audio
+
+
+def _vibrato_tone(rate_hz, extent_cents, duration=4.0, sr=22050):
+    """ビブラートのかかった調波音"""
+    t = np.arange(int(duration * sr)) / sr
+    f0 = 220 * 2 ** (extent_cents / 1200 * np.sin(2 * np.pi * rate_hz * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    return np.sin(phase) + 0.3 * np.sin(2 * phase)
+
+
+class TestVoiceQuality:
+    """声質特徴量（ジッター・シマー・ビブラート）のテスト"""
+
+    def test_jitter_and_shimmer_match_praat(self):
+        """トラック全体のパルス列から計算した値がPraatのVoiceレポートと一致する"""
+        from parselmouth.praat import call
+
+        context = FeatureContext(_pulse_train(), 22050)
+        pulses = context.get("pulses")
+        point_process = call(
+            [context.get("sound"), context.get("pitch")], "To PointProcess (cc)"
+        )
+
+        for start, end in ((0.0, 0.0), (1.0, 2.0)):
+            segment = pulses.slice(start, end) if end else pulses
+            praat_jitter = call(
+                point_process, "Get jitter (local)", start, end, 0.0001, 0.02, 1.3
+            )
+            praat_shimmer = call(
+                [context.get("sound"), point_process],
+                "Get shimmer (local)",
+                start,
+                end,
+                0.0001,
+                0.02,
+                1.3,
+                1.6,
+            )
+            assert jitter_local(segment) == pytest.approx(praat_jitter, rel=1e-6)
+            assert shimmer_local(segment) == pytest.approx(praat_shimmer, rel=0.05)
+
+    def test_sliced_pulses_stay_within_segment(self):
+        """区間の切り出しは区間内のパルスと振幅のみを返す"""
+        pulses = FeatureContext(_pulse_train(), 22050).get("pulses")
+
+        segment = pulses.slice(1.0, 2.0)
+
+        assert len(segment) == len(segment.amplitudes) > 100
+        assert segment.times.min() >= 1.0 and segment.times.max() < 2.0
+
+    @pytest.mark.parametrize("rate_hz, extent_cents", [(5.5, 50.0), (6.5, 30.0)])
+    def test_vibrato_rate_and_extent(self, rate_hz, extent_cents):
+        """ピッチ輪郭のスペクトルからビブラートの速さと深さを推定する"""
+        contour = FeatureContext(_vibrato_tone(rate_hz, extent_cents), 22050).get(
+            "contour"
+        )
+
+        rate, extent = vibrato(contour)
+
+        assert rate == pytest.approx(rate_hz, abs=0.2)
+        assert extent == pytest.approx(extent_cents, rel=0.1)
+
+    def test_steady_tone_has_no_vibrato(self):
+        """音高が一定の音ではビブラートを検出しない"""
+        contour = FeatureContext(_vibrato_tone(5.0, 0.0), 22050).get("contour")
+
+        assert vibrato(contour) == (0.0, 0.0)
+
+    def test_voice_quality_fields_are_opt_in(self):
+        """声質特徴量は選択時のみ計算され、結果のフィールドにも含まれる"""
+        audio = _vibrato_tone(5.5, 50.0, duration=2.0)
+
+        default = AcousticFeatureExtractor().extract(audio, 22050)
+        selected = AcousticFeatureExtractor(features="voice_quality").extract(
+            audio, 22050
+        )
+
+        assert "jitter_local" not in default
+        assert selected["f0_mean_hz"] is None
+        assert selected["jitter_local"] < 0.01
+        assert selected["vibrato_rate_hz"] == pytest.approx(5.5, abs=0.2)
+
+    def test_silence_yields_no_jitter_or_shimmer(self):
+        """無音では周期を検出できずジッター・シマーはNone、ビブラートは0.0"""
+        features = AcousticFeatureExtractor(features="voice_quality").extract(
+            np.zeros(22050), 22050
+        )
+
+        assert features["jitter_local"] is None
+        assert features["shimmer_local"] is None
+        assert features["vibrato_rate_hz"] == 0.0
+        assert features["vibrato_extent_cents"] == 0.0
+
+
+class TestSpectralFeatures:
+    """スペクトル特徴量（共有STFTと区間集約）のテスト"""
+
+    @pytest.fixture
+    def track(self):
+        """正弦波・無音・ノイズが続く音声とその振幅スペクトログラム"""
+        import librosa
+
+        sr = 22050
+        rng = np.random.default_rng(0)
+        audio = np.concatenate(
+            (
+                np.sin(2 * np.pi * 440 * np.arange(2 * sr) / sr),
+                np.zeros(sr),
+                rng.normal(0, 0.3, 2 * sr),
+            )
+        )
+        magnitude = np.abs(librosa.stft(audio, n_fft=2048, hop_length=512))
+        return audio, sr, magnitude
+
+    def test_segment_means_match_librosa(self, track):
+        """区間集約した重心・ロールオフ・MFCCがlibrosaのフレーム値の平均と一致する"""
+        import librosa
+
+        audio, sr, magnitude = track
+        frames = spectral_frames(magnitude, sr, 512)
+        in_noise = (frames.times >= 3.0) & (frames.times < 5.0)
+
+        (summary,) = summarize_segments(frames, [(3.0, 5.0)])
+
+        centroid = librosa.feature.spectral_centroid(S=magnitude, sr=sr)[0]
+        rolloff = librosa.feature.spectral_rolloff(S=magnitude, sr=sr)[0]
+        mfcc = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=13)[:, in_noise]
+        assert summary["spectral_centroid_hz"] == pytest.approx(
+            centroid[in_noise].mean()
+        )
+        assert summary["spectral_rolloff_hz"] == pytest.approx(rolloff[in_noise].mean())
+        np.testing.assert_allclose(summary["mfcc_mean"], mfcc.mean(axis=1), atol=1e-6)
+        np.testing.assert_allclose(summary["mfcc_std"], mfcc.std(axis=1), atol=1e-4)
+
+    def test_overlapping_segments_match_direct_reduction(self, track):
+        """重なり・順不同の区間でも区間ごとに直接集約した値と一致する"""
+        _, sr, magnitude = track
+        frames = spectral_frames(magnitude, sr, 512)
+        segments = [(1.0, 4.0), (0.0, 2.0), (0.5, 1.5), (4.0, 10.0)]
+
+        summaries = summarize_segments(frames, segments)
+
+        for (start, end), summary in zip(segments, summaries):
+            mask = (frames.times >= start) & (frames.times < end) & frames.valid
+            flux = frames.flux[(frames.times >= start) & (frames.times < end)]
+            assert summary["spectral_centroid_hz"] == pytest.approx(
+                frames.centroid_hz[mask].mean()
+            )
+            assert summary["spectral_flux"] == pytest.approx(np.nanmean(flux))
+
+    def test_silent_frames_are_excluded(self, track):
+        """無音フレームは統計量から除外し、無音のみの区間は0とする"""
+        _, sr, magnitude = track
+        frames = spectral_frames(magnitude, sr, 512)
+
+        tone, silence, both = summarize_segments(
+            frames, [(0.1, 1.9), (2.2, 2.8), (0.1, 2.8)]
+        )
+
+        assert 400.0 < tone["spectral_centroid_hz"] < 500.0
+        assert silence["spectral_centroid_hz"] == 0.0
+        assert silence["mfcc_mean"] == [0.0] * 13
+        assert both["spectral_centroid_hz"] == pytest.approx(
+            tone["spectral_centroid_hz"], rel=0.05
+        )
+
+    def test_spectral_fields_are_opt_in(self, track):
+        """スペクトル特徴量は選択時のみ計算され、STFTは一度だけ計算される"""
+        audio, sr, _ = track
+        context = FeatureContext(audio, sr)
+
+        default = AcousticFeatureExtractor().extract(audio, sr)
+        selected = AcousticFeatureExtractor(features="spectral").extract_from(context)
+
+        assert "spectral_centroid_hz" not in default
+        assert selected["f0_mean_hz"] is None
+        assert selected["spectral_centroid_hz"] > 0
+        assert len(selected["mfcc_mean"]) == len(selected["mfcc_std"]) == 13
+        assert context.computed == ("stft", "spectral")
+
+
+class TestEnergyFeatures:
+    """音量・ダイナミクス特徴量（フレームRMSの区間集約）のテスト"""
+
+    SR = 22050
+    HOP = 512
+
+    def _rms(self, audio):
+        import librosa
+
+        return librosa.feature.rms(y=audio, frame_length=2048, hop_length=self.HOP)[0]
+
+    def test_crescendo_has_positive_slope(self):
+        """音量が指数的に大きくなる音は正の傾きとダイナミックレンジを持つ"""
+        # Given: 2秒で 0.01 → 0.5（約34 dB）のクレッシェンド
+        t = np.arange(2 * self.SR) / self.SR
+        audio = np.geomspace(0.01, 0.5, len(t)) * np.sin(2 * np.pi * 220 * t)
+
+        # When: 区間全体の統計量を計算
+        (stats,) = energy_statistics(self._rms(audio), self.SR, self.HOP, [(0.0, 2.0)])
+
+        # Then: 傾きは約17 dB/秒、レンジは約30 dB
+        assert stats["loudness_slope_db_per_s"] == pytest.approx(17.0, rel=0.1)
+        assert 25.0 < stats["dynamic_range_db"] < 34.0
+        assert stats["crest_factor_db"] > 0.0
+        assert stats["rms_mean"] > 0.0
+
+    def test_silence_is_excluded_from_dynamic_range(self):
+        """無音フレームはダイナミックレンジと傾きに含まれない"""
+        # Given: 一定音量の正弦波の後に無音
+        t = np.arange(self.SR) / self.SR
+        audio = np.concatenate((0.5 * np.sin(2 * np.pi * 220 * t), np.zeros(self.SR)))
+
+        (stats,) = energy_statistics(self._rms(audio), self.SR, self.HOP, [(0.0, 2.0)])
+
+        # Then: 無音部分（-100 dB）ではなく音のある部分のみで計算される
+        # （境界付近のフレームの減衰分のみ）
+        assert stats["dynamic_range_db"] < 6.0
+        assert abs(stats["loudness_slope_db_per_s"]) < 3.0
+
+    def test_segments_are_computed_independently(self):
+        """複数区間を一括計算した結果が区間ごとの計算と一致し、空の区間は0"""
+        rng = np.random.default_rng(0)
+        audio = rng.normal(0, 0.1, 3 * self.SR) * np.repeat([1.0, 0.3, 2.0], self.SR)
+        rms = self._rms(audio)
+        segments = [(0.0, 1.0), (0.5, 2.5), (2.0, 3.0), (10.0, 11.0)]
+
+        batch = energy_statistics(rms, self.SR, self.HOP, segments)
+
+        for segment, stats in zip(segments[:3], batch):
+            (single,) = energy_statistics(rms, self.SR, self.HOP, [segment])
+            assert stats == pytest.approx(single)
+        assert batch[3] == dict.fromkeys(batch[3], 0.0)
+
+
+class TestWindowedFeatures:
+    """スライディング窓の特徴量（累積和による窓ごとの統計量）のテスト"""
+
+    def test_window_statistics_match_direct_computation(self):
+        """累積和から求めた窓ごとの平均・標準偏差が直接計算と一致する"""
+        # Given: 無効フレームを含む2系列
+        rng = np.random.default_rng(0)
+        times = np.arange(500) * 0.01
+        values = rng.normal(300.0, 20.0, (500, 2))
+        valid = rng.random((500, 2)) > 0.3
+        sums = prefix_sums(times, values, valid)
+        segments = window_grid(5.0, 1.5, 0.25)
+
+        # When: 窓ごとの統計量を計算
+        mean, std, count = sums.window_statistics(segments)
+
+        # Then: 窓内の有効フレームの平均・標準偏差と一致する
+        for index, (start, end) in enumerate(segments):
+            inside = (times >= start) & (times < end)
+            for column in range(2):
+                selected = values[inside & valid[:, column], column]
+                assert count[index, column] == len(selected)
+                assert mean[index, column] == pytest.approx(selected.mean())
+                assert std[index, column] == pytest.approx(selected.std())
+
+    def test_window_grid(self):
+        """窓は間隔ごとに始まりトラック内に収まり、短いトラックは1窓"""
+        assert window_grid(5.0, 3.0, 1.0) == [(0.0, 3.0), (1.0, 4.0), (2.0, 5.0)]
+        assert window_grid(2.0, 3.0, 0.5) == [(0.0, 2.0)]
+        assert window_grid(0.0, 3.0, 0.5) == []
+        with pytest.raises(ValueError):
+            window_grid(5.0, 3.0, 0.0)
+
+    def test_windows_follow_pitch_change(self):
+        """窓ごとのF0がトラック全体の輪郭から求まり、無声の窓はデフォルト値"""
+        # Given: 200 Hz → 無音 → 300 Hz の音声
+        sr = 22050
+        t = np.arange(2 * sr) / sr
+        audio = np.concatenate(
+            (
+                np.sin(2 * np.pi * 200 * t),
+                np.zeros(2 * sr),
+                np.sin(2 * np.pi * 300 * t),
+            )
+        )
+        series = frame_series(FeatureContext(audio, sr), ["f0", "hnr"])
+
+        # When: 1秒の窓ごとに統計量を計算
+        results = windowed_features(series, [(0.5, 1.5), (2.5, 3.5), (4.5, 5.5)])
+
+        # Then: 各窓のF0と、無声の窓のデフォルト値
+        assert results[0]["f0_mean_hz"] == pytest.approx(200.0, abs=1.0)
+        assert results[1]["f0_mean_hz"] == 120.0
+        assert results[1]["hnr_mean_db"] == 10.0
+        assert results[2]["f0_mean_hz"] == pytest.approx(300.0, abs=1.0)
+        assert "f1_mean_hz" not in results[0]
+
+
+class TestExtractorRegistry:
+    """特徴量抽出器レジストリのテスト"""
+
+    def test_registry_lists_alternative_extractors(self):
+        """YIN・LPC抽出器が登録されている"""
+        assert "acoustic" in available_extractors()
+        assert "yin" in available_extractors()
+        assert "lpc" in available_extractors()
+        assert "fast" in available_extractors()
+
+    def test_yin_extractor_returns_feature_data(self):
+        """YIN抽出器がFeatureDataを返す"""
+        # Given: YIN抽出器と200Hzの正弦波
+        extractor = get_extractor("yin")
+        sr = 22050
+        t = np.arange(sr) / sr
+        audio = np.sin(2 * np.pi * 200 * t)
+
+        # When: 特徴量抽出を実行
+        features = extractor.extract(audio, sr)
+
+        # Then: F0がYINで推定され、他の特徴量も揃っている
+        assert 195.0 <= features["f0_mean_hz"] <= 205.0
+        assert "hnr_mean_db" in features
+        assert "f3_mean_hz" in features
+
+    def test_unknown_extractor_is_rejected(self):
+        """未登録の抽出器名はValueErrorになる"""
+        with pytest.raises(ValueError):
+            get_extractor("unknown")
@@ -0,0 +1,568 @@
+"""
+テスト仕様: vocal_insight.pitch モジュール
+
+このテストファイルは、音程判定（帯域制約DTW・指標計算・スキーマ）の
+テスト仕様を定義します。
+"""
+
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from vocal_insight.features.contour import PitchContour
+from vocal_insight.pitch import (
+    SCHEMA_VERSION,
+    PitchAccuracyAnalyzer,
+    banded_dtw,
+    estimate_offset,
+    hz_to_cents,
+    validate_result,
+)
+from vocal_insight.pitch.alignment import MAX_FRAME_COST_CENTS, VOICING_MISMATCH_COST
+from vocal_insight.pitch.metrics import cent_deviation, hit_rate, section_metrics
+
+SR = 16000
+STEP = 0.01
+
+# （周波数, 長さ）の音符列（0 Hz は休符）
+MELODY = [
+    (220.0, 0.5),
+    (247.0, 0.5),
+    (262.0, 0.5),
+    (0.0, 0.4),
+    (294.0, 0.5),
+    (330.0, 0.6),
+]
+
+
+def _render(notes, detune_cents=0.0, lead_sec=0.0, sr=SR):
+    """音符列を倍音付きの合成音声にする"""
+    hz = np.repeat(
+        [0.0] + [f * 2 ** (detune_cents / 1200) for f, _ in notes],
+        np.diff(
+            np.round(np.cumsum([0.0, lead_sec] + [d for _, d in notes]) * sr)
+        ).astype(int),
+    )
+    phase = 2 * np.pi * np.cumsum(hz) / sr
+    audio = np.where(hz > 0, 0.5 * np.sin(phase) + 0.25 * np.sin(2 * phase), 0.0)
+    return audio + np.random.default_rng(0).normal(0, 0.003, len(audio))
+
+
+def _contour(notes, detune_cents=0.0, lead_sec=0.0):
+    """音符列から理想的なピッチ輪郭を直接作成"""
+    frames = np.round(np.cumsum([0.0, lead_sec] + [d for _, d in notes]) / STEP)
+    f0 = np.repeat(
+        [0.0] + [f * 2 ** (detune_cents / 1200) for f, _ in notes],
+        np.diff(frames).astype(int),
+    )
+    return PitchContour(times=np.arange(len(f0)) * STEP, f0_hz=f0, time_step=STEP)
+
+
+def _full_dtw_cost(x, y):
+    """検証用の素朴なDTW（全行列）"""
+
+    def cost(a, b):
+        if np.isfinite(a) and np.isfinite(b):
+            return min(abs(a - b), MAX_FRAME_COST_CENTS)
+        if np.isfinite(a) or np.isfinite(b):
+            return VOICING_MISMATCH_COST
+        return 0.0
+
+    D = np.full((len(x) + 1, len(y) + 1), np.inf)
+    D[0, 0] = 0.0
+    for i in range(1, len(x) + 1):
+        for j in range(1, len(y) + 1):
+            D[i, j] = cost(x[i - 1], y[j - 1]) + min(
+                D[i - 1, j - 1], D[i - 1, j], D[i, j - 1]
+            )
+    return D[-1, -1]
+
+
+class TestBandedDtw:
+    """帯域制約DTWのテスト"""
+
+    def test_matches_full_dtw_when_band_covers_matrix(self):
+        """バンドが行列全体を覆う場合は全行列DTWと同じコスト"""
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            x = rng.normal(0, 300, rng.integers(1, 25))
+            y = rng.normal(0, 300, rng.integers(1, 25))
+            x[rng.random(len(x)) < 0.3] = np.nan
+            y[rng.random(len(y)) < 0.3] = np.nan
+
+            alignment = banded_dtw(x, y, radius=100)
+
+            assert alignment.cost == pytest.approx(_full_dtw_cost(x, y))
+
+    def test_path_is_monotonic_and_connected(self):
+        """経路は (0,0) から終端まで単調・連続"""
+        x = hz_to_cents(_contour(MELODY).f0_hz)
+        y = hz_to_cents(_contour(MELODY, lead_sec=0.3).f0_hz)
+
+        alignment = banded_dtw(x, y, radius=20, offset=30)
+
+        assert (alignment.user_index[0], alignment.reference_index[0]) == (0, 0)
+        assert alignment.user_index[-1] == len(x) - 1
+        assert alignment.reference_index[-1] == len(y) - 1
+        steps = np.stack(
+            [np.diff(alignment.user_index), np.diff(alignment.reference_index)]
+        )
+        assert np.all((steps >= 0) & (steps <= 1))
+        assert np.all(steps.sum(axis=0) >= 1)
+
+    def test_estimate_offset_recovers_delay(self):
+        """相互相関でリファレンスの遅れを推定"""
+        user = hz_to_cents(_contour(MELODY).f0_hz)
+        reference = hz_to_cents(_contour(MELODY, lead_sec=0.25).f0_hz)
+
+        assert estimate_offset(user, reference, max_lag=100) == 25
+        assert estimate_offset(reference, user, max_lag=100) == -25
+
+    def test_empty_contour_is_rejected(self):
+        """空の系列はValueError"""
+        with pytest.raises(ValueError, match="empty"):
+            banded_dtw(np.array([]), np.array([100.0]), radius=5)
+
+
+class TestPitchMetrics:
+    """音程指標計算のテスト"""
+
+    def test_cent_deviation_and_hit_rate(self):
+        """セント偏差・一致率・外れ値除外"""
+        user = hz_to_cents(np.array([440.0, 440.0 * 2 ** (1 / 12), 0.0, 880.0]))
+        reference = hz_to_cents(np.array([440.0, 440.0, 440.0, 440.0]))
+
+        deviation = cent_deviation(user, reference, outlier_cents=600.0)
+
+        np.testing.assert_allclose(deviation[:2], [0.0, 100.0], atol=0.01)
+        assert np.isnan(deviation[2])  # 無声
+        assert np.isnan(deviation[3])  # オクターブ誤り
+        assert hit_rate(deviation, tolerance_cents=50.0) == 0.5
+
+    def test_section_metrics(self):
+        """区間ごとの平均偏差と一致率を一括集計"""
+        times = np.arange(6) * 1.0
+        deviation = np.array([10.0, -30.0, np.nan, 80.0, 20.0, 5.0])
+
+        mean, hits = section_metrics(
+            times, deviation, [(0.0, 2.0), (2.0, 4.0), (10.0, 12.0)], 50.0
+        )
+
+        np.testing.assert_allclose(mean[:2], [20.0, 80.0])
+        np.testing.assert_allclose(hits[:2], [1.0, 0.0])
+        assert np.isnan(mean[2]) and np.isnan(hits[2])
+
+
+class TestPitchAccuracyAnalyzer:
+    """音程判定アナライザーのテスト"""
+
+    def test_detuned_take_reports_constant_deviation(self):
+        """一定のずれと遅れのある歌唱で偏差・オフセットが得られる"""
+        analyzer = PitchAccuracyAnalyzer()
+
+        result = analyzer.compare(
+            _contour(MELODY, detune_cents=30.0, lead_sec=0.3), _contour(MELODY)
+        )
+
+        accuracy = result["pitch_accuracy"]
+        assert accuracy["mean_cent_deviation"] == pytest.approx(30.0, abs=0.5)
+        assert accuracy["hit_rate"] == 1.0
+        assert result["reference_audio"]["alignment"]["offset_seconds"] == -0.3
+        assert [s["section_id"] for s in accuracy["per_section"]] == [
+            "section_1",
+            "section_2",
+        ]
+
+    def test_tolerance_controls_hit_rate(self):
+        """許容範囲外のずれは一致とみなさない"""
+        analyzer = PitchAccuracyAnalyzer({"hit_tolerance_cents": 20.0})
+
+        result = analyzer.compare(_contour(MELODY, detune_cents=30.0), _contour(MELODY))
+
+        assert result["pitch_accuracy"]["hit_rate"] == 0.0
+
+    def test_analyze_synthetic_audio(self):
+        """合成音声（異なるサンプリング周波数）を比較"""
+        analyzer = PitchAccuracyAnalyzer()
+
+        result = analyzer.analyze(
+            _render(MELODY, detune_cents=-20.0),
+            _render(MELODY, sr=22050),
+            sr=SR,
+            reference_sr=22050,
+            sections=[("verse_1", 0.0, 1.5), ("verse_2", 1.9, 3.0)],
+        )
+
+        accuracy = result["pitch_accuracy"]
+        assert accuracy["mean_cent_deviation"] == pytest.approx(20.0, abs=5.0)
+        assert accuracy["hit_rate"] > 0.9
+        assert [s["section_id"] for s in accuracy["per_section"]] == [
+            "verse_1",
+            "verse_2",
+        ]
+
+    def test_without_reference_skips_pitch_analysis(self):
+        """リファレンス未指定時は音程判定なし"""
+        result = PitchAccuracyAnalyzer().analyze(_render(MELODY), sr=SR)
+
+        assert result["version"] == SCHEMA_VERSION
+        assert result["reference_audio"] is None
+        assert result["pitch_accuracy"] is None
+
+    def test_array_input_requires_sampling_rate(self):
+        """配列入力でサンプリング周波数がない場合はValueError"""
+        with pytest.raises(ValueError, match="sampling rate"):
+            PitchAccuracyAnalyzer().analyze(_render(MELODY))
+
+    def test_unvoiced_reference_is_rejected(self):
+        """リファレンスから有声フレームが検出できない場合はValueError"""
+        silent = PitchContour(np.arange(100) * STEP, np.zeros(100), STEP)
+
+        with pytest.raises(ValueError, match="reference has no voiced frames"):
+            PitchAccuracyAnalyzer().compare(_contour(MELODY), silent)
+
+    def test_invalid_config_is_rejected(self):
+        """不正な設定値はValueError"""
+        with pytest.raises(ValueError, match="hit_tolerance_cents"):
+            PitchAccuracyAnalyzer({"hit_tolerance_cents": 0})
+
+    def test_result_round_trips_through_json(self, tmp_path):
+        """結果はJSONとして保存・検証できる"""
+        ref_path = tmp_path / "reference.wav"
+        sf.write(ref_path, _render(MELODY), SR)
+        result = PitchAccuracyAnalyzer().analyze(_render(MELODY), ref_path, sr=SR)
+
+        loaded = validate_result(json.loads(json.dumps(result)))
+
+        assert loaded["reference_audio"]["id"] == "reference"
+        assert loaded["expression_comparison"]["notes"] == []
+
+
+class TestPitchResultSchema:
+    """音程判定結果スキーマのテスト"""
+
+    def test_unsupported_version_is_rejected(self):
+        """未対応のバージョンはValueError"""
+        with pytest.raises(ValueError, match="unsupported pitch result version"):
+            validate_result({"version": "0.1"})
+
+    def test_missing_metric_is_rejected(self):
+        """必須指標の欠落はValueError"""
+        data = {
+            "version": SCHEMA_VERSION,
+            "reference_audio": None,
+            "pitch_accuracy": {"hit_rate": 1.0},
+            "expression_comparison": {},
+        }
+        with pytest.raises(ValueError, match="mean_cent_deviation"):
+            validate_result(data)
+
+
+class TestReferenceContourStore:
+    """リファレンス輪郭ストアのテスト"""
+
+    @pytest.fixture
+    def reference_wav(self, tmp_path):
+        path = tmp_path / "reference.wav"
+        sf.write(path, _render(MELODY), SR)
+        return path
+
+    def test_second_lookup_is_memory_mapped_and_not_recomputed(
+        self, tmp_path, reference_wav, monkeypatch
+    ):
+        """2回目以降はピッチ分析せずメモリマップで読み込む"""
+        from vocal_insight.pitch import ReferenceContourStore
+        from vocal_insight.pitch import reference as reference_module
+
+        store = ReferenceContourStore(tmp_path / "cache")
+        first, cached = store.get(reference_wav)
+        assert not cached
+
+        # Given: 以降のピッチ分析呼び出しを検知する
+        def fail(*args, **kwargs):
+            raise AssertionError("reference pitch must not be recomputed")
+
+        monkeypatch.setattr(reference_module, "compute_pitch_contour", fail)
+
+        # When: 同じリファレンスを再取得
+        second, cached = store.get(reference_wav)
+
+        # Then: キャッシュからメモリマップで読み込まれる
+        assert cached
+        assert isinstance(second.cents, np.memmap)
+        np.testing.assert_array_equal(first.cents, second.cents)
+        assert second.time_step == first.time_step
+
+    def test_settings_are_part_of_the_key(self, tmp_path, reference_wav):
+        """平滑化設定が異なる場合は別のキャッシュとなる"""
+        from vocal_insight.pitch import ReferenceContourStore
+
+        store = ReferenceContourStore(tmp_path)
+        store.get(reference_wav, smoothing_frames=5)
+
+        _, cached = store.get(reference_wav, smoothing_frames=1)
+
+        assert not cached
+        assert len(list(tmp_path.glob("*.npy"))) == 2
+
+    def test_corrupted_entry_is_recomputed(self, tmp_path, reference_wav):
+        """破損したキャッシュは再計算される"""
+        from vocal_insight.pitch import ReferenceContourStore
+
+        store = ReferenceContourStore(tmp_path)
+        store.get(reference_wav)
+        for meta in tmp_path.glob("*.json"):
+            meta.write_text("{broken")
+
+        _, cached = store.get(reference_wav)
+
+        assert not cached
+
+    def test_analyzer_results_match_without_store(self, tmp_path, reference_wav):
+        """ストア経由でも同じ音程判定結果が得られる"""
+        from vocal_insight.pitch import ReferenceContourStore
+
+        take = _render(MELODY, detune_cents=15.0, lead_sec=0.2)
+        store = ReferenceContourStore(tmp_path)
+        with_store = PitchAccuracyAnalyzer(reference_store=store)
+
+        expected = PitchAccuracyAnalyzer().analyze(take, reference_wav, sr=SR)
+        first = with_store.analyze(take, reference_wav, sr=SR)
+        second = with_store.analyze(take, reference_wav, sr=SR)
+
+        assert first == expected
+        assert second == expected
+
+
+def _midi_hz(note):
+    return 440.0 * 2 ** ((note - 69) / 12)
+
+
+def _varlen(value):
+    """MIDIの可変長数値"""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.insert(0, (value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(out)
+
+
+def _write_midi(path, tracks, division=480):
+    """（delta tick, イベントバイト列）のリストからフォーマット1のSMFを作成"""
+    data = b"MThd" + (6).to_bytes(4, "big")
+    data += (1).to_bytes(2, "big") + len(tracks).to_bytes(2, "big")
+    data += division.to_bytes(2, "big")
+    for events in tracks:
+        body = b"".join(_varlen(delta) + event for delta, event in events)
+        body += b"\x00\xff\x2f\x00"
+        data += b"MTrk" + len(body).to_bytes(4, "big") + body
+    path.write_bytes(data)
+
+
+class TestNoteReference:
+    """MIDI・音符リストのリファレンスのテスト"""
+
+    def test_read_midi_with_tempo_change_and_running_status(self, tmp_path):
+        """テンポ変更とランニングステータスを含むMIDIを秒に換算して読み込む"""
+        from vocal_insight.pitch import read_midi
+
+        path = tmp_path / "melody.mid"
+        tempo_track = [
+            (0, b"\xff\x51\x03" + (500000).to_bytes(3, "big")),  # 120 BPM
+            (960, b"\xff\x51\x03" + (1000000).to_bytes(3, "big")),  # 60 BPM
+        ]
+        melody_track = [
+            (0, bytes([0x90, 60, 100])),
+            (480, bytes([62, 100])),  # ランニングステータスの note on
+            (0, bytes([60, 0])),  # velocity 0 の note off
+            (480, bytes([0x80, 62, 0])),
+            (0, bytes([0x90, 64, 90])),
+            (480, bytes([0x80, 64, 0])),
+            (0, bytes([0x99, 36, 100])),  # ドラムは除外
+            (10, bytes([0x89, 36, 0])),
+        ]
+        _write_midi(path, [tempo_track, melody_track])
+
+        notes = read_midi(path)
+
+        np.testing.assert_allclose(notes.start_s, [0.0, 0.5, 1.0])
+        np.testing.assert_allclose(notes.end_s, [0.5, 1.0, 2.0])
+        np.testing.assert_array_equal(notes.pitch, [60, 62, 64])
+        assert len(read_midi(path, track=0)) == 0
+        assert len(read_midi(path, include_drums=True)) == 4
+
+    def test_invalid_midi_is_rejected(self, tmp_path):
+        """MIDIでないファイル・存在しないトラックはValueError"""
+        from vocal_insight.pitch import read_midi
+
+        path = tmp_path / "broken.mid"
+        path.write_bytes(b"RIFF0000")
+        with pytest.raises(ValueError, match="not a standard MIDI file"):
+            read_midi(path)
+
+        _write_midi(path, [[(0, bytes([0x90, 60, 100]))]])
+        with pytest.raises(ValueError, match="track 3 not found"):
+            read_midi(path, track=3)
+
+    def test_note_list_csv_and_unsupported_suffix(self, tmp_path):
+        """ヘッダー付きCSVを読み込み、未対応の拡張子はValueError"""
+        from vocal_insight.pitch import load_notes
+
+        path = tmp_path / "notes.csv"
+        path.write_text("start_s,end_s,pitch\n0.5,1.0,62\n0.0,0.5,60.5\n")
+
+        notes = load_notes(path)
+
+        np.testing.assert_allclose(notes.start_s, [0.0, 0.5])
+        np.testing.assert_allclose(notes.pitch, [60.5, 62])
+        assert notes.source_path == str(path)
+        with pytest.raises(ValueError, match="unsupported note reference"):
+            load_notes(tmp_path / "notes.txt")
+
+    def test_contour_on_frame_grid_uses_highest_note(self):
+        """フレーム格子上に描画し、重なる音符は高い方・休符は0"""
+        from vocal_insight.pitch import NoteSequence
+
+        notes = NoteSequence.from_notes([(0.0, 0.05, 69), (0.03, 0.06, 81)])
+
+        contour = notes.to_contour(0.01, start_time=0.005, n_frames=8)
+
+        np.testing.assert_allclose(contour.times, 0.005 + np.arange(8) * 0.01)
+        np.testing.assert_allclose(contour.f0_hz, [440, 440, 440, 880, 880, 880, 0, 0])
+
+    def test_analyze_against_notes_skips_reference_audio(self, monkeypatch):
+        """音符列リファレンスではリファレンス側の音声処理を行わない"""
+        from vocal_insight.pitch import NoteSequence
+        from vocal_insight.pitch import analyzer as analyzer_module
+
+        notes = [(57, 0.5), (59, 0.5), (60, 0.5), (None, 0.4), (62, 0.5), (64, 0.6)]
+        take = _render(
+            [(0.0 if n is None else _midi_hz(n), d) for n, d in notes],
+            detune_cents=25.0,
+            lead_sec=0.2,
+        )
+        starts = np.cumsum([0.0] + [d for _, d in notes])
+        reference = NoteSequence.from_notes(
+            [(s, s + d, n) for s, (n, d) in zip(starts, notes) if n is not None],
+            source_path="melody.mid",
+        )
+
+        analyzed = []
+        original = analyzer_module.compute_pitch_contour
+        monkeypatch.setattr(
+            analyzer_module,
+            "compute_pitch_contour",
+            lambda audio, sr, engine: analyzed.append(len(audio))
+            or original(audio, sr, engine=engine),
+        )
+        result = PitchAccuracyAnalyzer().analyze(take, reference, sr=SR)
+
+        assert analyzed == [len(take)]
+        assert result["reference_audio"]["id"] == "melody"
+        assert result["reference_audio"]["alignment"]["offset_seconds"] == (
+            pytest.approx(-0.2, abs=0.02)
+        )
+        accuracy = result["pitch_accuracy"]
+        assert accuracy["mean_cent_deviation"] == pytest.approx(25.0, abs=5.0)
+        assert accuracy["hit_rate"] > 0.9
+
+
+def _cents_contour(cents):
+    """セント値の列（NaNは無声）からピッチ輪郭を作成"""
+    cents = np.asarray(cents, dtype=float)
+    f0 = np.where(np.isnan(cents), 0.0, 440.0 * 2 ** (np.nan_to_num(cents) / 1200))
+    return PitchContour(times=np.arange(len(f0)) * STEP, f0_hz=f0, time_step=STEP)
+
+
+class TestNoteTranscriber:
+    """音符イベント採譜のテスト"""
+
+    def test_melody_is_segmented_into_notes(self):
+        """音符ごとの開始・終了時刻と中央値ピッチを求める"""
+        from vocal_insight.pitch import NoteTranscriber
+
+        notes = NoteTranscriber().transcribe(_contour(MELODY))
+
+        np.testing.assert_allclose(notes.onset_s, [0.0, 0.5, 1.0, 1.9, 2.4])
+        np.testing.assert_allclose(notes.offset_s, [0.5, 1.0, 1.5, 2.4, 3.0])
+        np.testing.assert_allclose(
+            notes.pitch_cents, hz_to_cents([f for f, _ in MELODY if f > 0])
+        )
+
+    def test_hysteresis_ignores_jitter_at_semitone_boundary(self):
+        """半音の境界付近の揺れでは音符を分割しない"""
+        from vocal_insight.pitch import NoteTranscriber
+
+        cents = np.concatenate((np.zeros(100), np.tile([40.0, 60.0], 50)))
+
+        notes = NoteTranscriber(smoothing_frames=1).transcribe(_cents_contour(cents))
+        unstable = NoteTranscriber(hysteresis_cents=0.0, smoothing_frames=1).transcribe(
+            _cents_contour(cents)
+        )
+
+        assert len(notes) == 1
+        assert notes.offset_s[0] == pytest.approx(2.0)
+        # ヒステリシスなしでは境界で毎フレーム切り替わり、最短長未満として除外
+        assert len(unstable) == 1
+        assert unstable.offset_s[0] == pytest.approx(1.01)
+
+    def test_vibrato_and_short_dropouts_stay_in_one_note(self):
+        """±30セントのビブラートと短い途切れは1つの音符、長い無声区間は分割"""
+        from vocal_insight.pitch import NoteTranscriber
+
+        t = np.arange(100) * STEP
+        vibrato = 300 + 30 * np.sin(2 * np.pi * 5.5 * t)
+        vibrato[40:42] = np.nan
+        cents = np.concatenate((vibrato, np.full(20, np.nan), np.full(30, 500.0)))
+
+        notes = NoteTranscriber().transcribe(_cents_contour(cents))
+
+        np.testing.assert_allclose(notes.onset_s, [0.0, 1.2])
+        np.testing.assert_allclose(notes.offset_s, [1.0, 1.5])
+        np.testing.assert_allclose(notes.pitch_cents, [300.0, 500.0], atol=5.0)
+
+    def test_detuned_singer_is_segmented_by_estimated_tuning(self):
+        """全体が半音格子からずれていても音符の境界を検出する"""
+        from vocal_insight.pitch import NoteTranscriber
+
+        cents = np.repeat([48.0, 148.0, 248.0, 148.0], 30)
+        cents += np.random.default_rng(0).normal(0, 5, len(cents))
+
+        notes = NoteTranscriber().transcribe(_cents_contour(cents))
+
+        np.testing.assert_allclose(notes.onset_s, [0.0, 0.3, 0.6, 0.9])
+        np.testing.assert_allclose(notes.pitch_cents, [48, 148, 248, 148], atol=3.0)
+
+    def test_unvoiced_contour_gives_empty_table(self):
+        """有声フレームがない場合は空の表"""
+        from vocal_insight.pitch import NoteTranscriber
+
+        notes = NoteTranscriber().transcribe(_cents_contour(np.full(50, np.nan)))
+
+        assert len(notes) == 0
+        assert notes.to_sections() == []
+
+    def test_table_converts_to_sections_and_reference(self):
+        """音符表は区間指定・音符列リファレンスに変換できる"""
+        from vocal_insight.pitch import NoteTranscriber
+
+        notes = NoteTranscriber().transcribe(_contour(MELODY))
+
+        assert notes.to_sections()[3] == (
+            "note_4",
+            pytest.approx(1.9),
+            pytest.approx(2.4),
+        )
+        result = PitchAccuracyAnalyzer().compare(
+            _contour(MELODY, detune_cents=20.0),
+            notes.to_sequence().to_contour(STEP, n_frames=300),
+            sections=notes.to_sections(),
+        )
+        per_note = result["pitch_accuracy"]["per_section"]
+        assert len(per_note) == 5
+        assert all(
+            s["cent_deviation"] == pytest.approx(20.0, abs=1.0) for s in per_note
+        )
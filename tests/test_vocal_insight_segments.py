@@ -10,7 +10,9 @@ TDD Red Phase: 実装前のテスト記述
 import numpy as np
 
 from vocal_insight.core.types import AnalysisConfig
+from vocal_insight.features.contour import PitchContour
 from vocal_insight.segments.detector import SegmentBoundaryDetector
+from vocal_insight.segments.phrase import PhraseBoundaryDetector
 from vocal_insight.segments.processor import SegmentProcessor
 
 
@@ -81,6 +83,25 @@ class TestSegmentBoundaryDetector:
         audio_duration = len(test_audio) / sr
         assert all(0 <= boundary <= audio_duration for boundary in boundaries)
 
+    def test_analyze_returns_rms_and_reuses_given_rms(self):
+        """analyze はRMS・変化量を返し、計算済みのRMSを渡すと再計算しない"""
+        # Given: 前半静寂・後半高音量の音声
+        detector = SegmentBoundaryDetector()
+        audio = np.concatenate([np.zeros(11025), np.ones(11025) * 0.8])
+        sr = 22050
+
+        # When: RMSを計算させた場合と、計算済みRMSを渡した場合
+        computed = detector.analyze(audio, sr, 90)
+        reused = detector.analyze(audio, sr, 90, rms=computed.rms * 2)
+
+        # Then: RMSと変化量が返され、渡したRMSがそのまま使われる
+        assert len(computed.delta_rms) == len(computed.rms) - 1
+        np.testing.assert_allclose(computed.delta_rms, np.abs(np.diff(computed.rms)))
+        np.testing.assert_array_equal(
+            computed.boundaries, detector.detect(audio, sr, 90)
+        )
+        np.testing.assert_allclose(reused.rms, computed.rms * 2)
+
 
 class TestSegmentProcessor:
     """セグメント処理機能のテスト"""
@@ -197,3 +218,59 @@ class TestSegmentProcessor:
         segments_sorted = sorted(segments)
         for i in range(len(segments_sorted) - 1):
             assert segments_sorted[i][1] <= segments_sorted[i + 1][0]
+
+
+def _make_contour(voiced_pattern, time_step=0.01):
+    """有声/無声パターンからテスト用ピッチ輪郭を作成"""
+    voiced = np.asarray(voiced_pattern, dtype=bool)
+    times = (np.arange(len(voiced)) + 0.5) * time_step
+    return PitchContour(
+        times=times, f0_hz=np.where(voiced, 220.0, 0.0), time_step=time_step
+    )
+
+
+class TestPhraseBoundaryDetector:
+    """フレーズ境界検出機能のテスト"""
+
+    def test_detect_gap_between_phrases(self):
+        """フレーズ間の無声区間の中央に境界が検出される"""
+        # Given: 1秒有声 + 0.5秒無声 + 1秒有声
+        contour = _make_contour([True] * 100 + [False] * 50 + [True] * 100)
+
+        # When: 境界検出を実行
+        boundaries = PhraseBoundaryDetector().detect(contour, min_gap_sec=0.3)
+
+        # Then: 無声区間の中央（約1.25秒）に1つの境界
+        assert len(boundaries) == 1
+        assert abs(boundaries[0] - 1.25) < 0.02
+
+    def test_short_gaps_are_ignored(self):
+        """最小長未満の無声区間は境界にならない"""
+        # Given: 0.1秒の短い無声区間
+        contour = _make_contour([True] * 100 + [False] * 10 + [True] * 100)
+
+        # When: 境界検出を実行
+        boundaries = PhraseBoundaryDetector().detect(contour, min_gap_sec=0.3)
+
+        # Then: 境界は検出されない
+        assert len(boundaries) == 0
+
+    def test_leading_and_trailing_silence_are_ignored(self):
+        """先頭・末尾の無声区間は境界にならない"""
+        # Given: 前後に長い無声区間を持つ1フレーズ
+        contour = _make_contour([False] * 80 + [True] * 100 + [False] * 80)
+
+        # When: 境界検出を実行
+        boundaries = PhraseBoundaryDetector().detect(contour, min_gap_sec=0.3)
+
+        # Then: 境界は検出されない
+        assert len(boundaries) == 0
+
+    def test_empty_contour(self):
+        """空のピッチ輪郭では空の配列が返される"""
+        contour = _make_contour([])
+
+        boundaries = PhraseBoundaryDetector().detect(contour, min_gap_sec=0.3)
+
+        assert isinstance(boundaries, np.ndarray)
+        assert len(boundaries) == 0
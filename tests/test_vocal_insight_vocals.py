@@ -0,0 +1,219 @@
+"""
+テスト仕様: vocal_insight.vocals モジュール
+
+このテストファイルは、リファレンスボーカル抽出（チャンク処理・分離・
+キャッシュ）のテスト仕様を定義します。
+"""
+
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from vocal_insight.vocals import (
+    HpssRepetModel,
+    VocalExtractor,
+    load_source,
+    separate_in_chunks,
+)
+
+SR = 16000
+
+
+def _snr_db(reference, estimate):
+    return 10 * np.log10(np.sum(reference**2) / np.sum((reference - estimate) ** 2))
+
+
+def _mixture(duration=12.0, seed=0):
+    """中央定位のボーカル・左寄りの繰り返し伴奏・打楽器のステレオ合成音源"""
+    rng = np.random.default_rng(seed)
+    n = int(duration * SR)
+    t = np.arange(n) / SR
+
+    # 0.25〜0.5秒ごとに音高が変わるボーカル（約2割は休符）
+    lengths = rng.integers(SR // 4, SR // 2, size=n // (SR // 4))
+    hz = np.where(
+        rng.random(len(lengths)) < 0.2,
+        0.0,
+        440 * 2 ** (rng.integers(-9, 8, len(lengths)) / 12),
+    )
+    f0 = np.repeat(hz, lengths)[:n]
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+    vocal = np.where(f0 > 0, 0.4 * np.sin(phase) + 0.2 * np.sin(2 * phase), 0.0)
+
+    loop = sum(0.15 * np.sin(2 * np.pi * f * t[: 2 * SR]) for f in (110, 165, 220))
+    accompaniment = np.tile(loop, n // len(loop) + 1)[:n]
+    drums = np.zeros(n)
+    for start in range(0, n, SR // 2):
+        drums[start : start + 300] = rng.normal(0, 0.4, len(drums[start : start + 300]))
+
+    left = vocal + 0.9 * accompaniment + drums
+    right = vocal + 0.3 * accompaniment + drums
+    return np.stack([left, right]).astype(np.float32), vocal.astype(np.float32)
+
+
+class _CountingModel:
+    """呼び出し回数を記録する分離モデル（チャンネル平均をそのまま返す）"""
+
+    name = "passthrough"
+    params = {}
+
+    def __init__(self):
+        self.calls = []
+
+    def separate(self, audio, sr):
+        self.calls.append(audio.shape[-1])
+        return audio.mean(axis=0).astype(np.float32)
+
+
+class TestChunkedSeparation:
+    """チャンク処理のテスト"""
+
+    @pytest.mark.parametrize("overlap_sec, expected_chunks", [(0.0, 4), (0.5, 5)])
+    def test_crossfade_reconstructs_signal(self, overlap_sec, expected_chunks):
+        """重なり部分の重みの和が1で、恒等モデルなら入力を再現する"""
+        audio = np.random.default_rng(0).normal(size=(2, int(7.3 * SR)))
+        audio = audio.astype(np.float32)
+        model = _CountingModel()
+
+        vocal, n_chunks = separate_in_chunks(model, audio, SR, 2.0, overlap_sec)
+
+        np.testing.assert_allclose(vocal, audio.mean(axis=0), atol=1e-5)
+        assert n_chunks == len(model.calls) == expected_chunks
+        assert max(model.calls) == 2 * SR
+
+    def test_short_source_is_one_chunk(self):
+        """チャンク長以下の音源は分割しない"""
+        model = _CountingModel()
+
+        _, n_chunks = separate_in_chunks(
+            model, np.zeros((1, SR), np.float32), SR, 2.0, 0.5
+        )
+
+        assert n_chunks == 1
+        assert model.calls == [SR]
+
+
+class TestHpssRepetModel:
+    """学習不要のボーカル分離のテスト"""
+
+    def test_stereo_mix_improves_vocal_snr(self):
+        """センター定位とHPSSでボーカルのSNRが改善する"""
+        mix, vocal = _mixture()
+
+        estimate = HpssRepetModel().separate(mix, SR)
+
+        assert estimate.shape == vocal.shape
+        assert _snr_db(vocal, estimate) > _snr_db(vocal, mix.mean(axis=0)) + 6.0
+
+    def test_mono_mix_uses_repeating_background(self):
+        """モノラル音源ではREPET-SIMで繰り返し伴奏を抑える"""
+        mix, vocal = _mixture()
+        mono = mix.mean(axis=0, keepdims=True)
+
+        estimate = HpssRepetModel().separate(mono, SR)
+
+        assert _snr_db(vocal, estimate) > _snr_db(vocal, mono[0]) + 2.0
+
+
+class TestVocalExtractor:
+    """抽出器とキャッシュのテスト"""
+
+    def test_extract_records_metadata(self):
+        """処理時間・SNR・有声率などのメタデータを記録する"""
+        mix, _ = _mixture(duration=5.0)
+        extractor = VocalExtractor(
+            {"sample_rate": None, "chunk_sec": 2.0, "overlap_sec": 0.5}
+        )
+
+        result = extractor.extract(mix, SR)
+
+        metadata = result.metadata
+        assert result.sr == SR and result.audio.dtype == np.float32
+        assert len(result.audio) == mix.shape[1]
+        assert metadata["model"] == "hpss_repet"
+        assert metadata["n_channels"] == 2
+        assert metadata["n_chunks"] == 3
+        assert metadata["duration_s"] == 5.0
+        assert metadata["processing_time_s"] > 0
+        assert metadata["snr_db"] is not None
+        assert 0.5 < metadata["voiced_ratio"] <= 1.0
+        assert result.cache_path is None and not result.cached
+
+    def test_cached_result_skips_separation(self, tmp_path, monkeypatch):
+        """同じ音源・設定の2回目はキャッシュを読み込み、分離しない"""
+        mix, _ = _mixture(duration=3.0)
+        source = tmp_path / "song.wav"
+        sf.write(source, mix.T, SR)
+        monkeypatch.setenv("VOCAL_CACHE_ROOT", str(tmp_path))
+        model = _CountingModel()
+        extractor = VocalExtractor(
+            {"sample_rate": 8000}, cache_dir="$VOCAL_CACHE_ROOT/vocals", model=model
+        )
+
+        first = extractor.extract(source)
+        second = extractor.extract(source)
+
+        assert len(model.calls) == 1
+        assert not first.cached and second.cached
+        assert second.cache_path == first.cache_path
+        assert first.cache_path.startswith(str(tmp_path / "vocals"))
+        assert second.sr == 8000
+        np.testing.assert_allclose(second.audio, first.audio)
+        with open(first.cache_path.replace(".wav", ".json")) as f:
+            assert json.load(f)["source_path"] == str(source)
+
+    def test_settings_are_part_of_the_key(self, tmp_path):
+        """設定が異なると別のキャッシュエントリになる"""
+        mix, _ = _mixture(duration=1.0)
+
+        keys = {
+            VocalExtractor(config, cache_dir=tmp_path).key(mix, SR)
+            for config in ({}, {"chunk_sec": 10.0}, {"sample_rate": 16000})
+        }
+
+        assert len(keys) == 3
+
+    def test_corrupted_entry_is_recomputed(self, tmp_path):
+        """破損したキャッシュは再抽出する"""
+        mix, _ = _mixture(duration=1.0)
+        model = _CountingModel()
+        extractor = VocalExtractor(cache_dir=tmp_path, model=model)
+        first = extractor.extract(mix, SR)
+        with open(first.cache_path, "wb") as f:
+            f.write(b"broken")
+
+        again = extractor.extract(mix, SR)
+
+        assert not again.cached
+        assert len(model.calls) == 2
+
+    def test_invalid_input_and_config_are_rejected(self):
+        """サンプリング周波数の指定漏れ・未知のモデル・不正な重なりはValueError"""
+        with pytest.raises(ValueError, match="sampling rate"):
+            VocalExtractor().extract(np.zeros(SR, np.float32))
+        with pytest.raises(ValueError, match="unknown separation model"):
+            VocalExtractor({"model": "demucs"})
+        with pytest.raises(ValueError, match="overlap_sec"):
+            VocalExtractor({"chunk_sec": 2.0, "overlap_sec": 1.0})
+
+
+class TestLoadSource:
+    """音源読み込みのテスト"""
+
+    def test_stereo_file_keeps_channels_and_resamples(self, tmp_path):
+        """ステレオのチャンネルを保持し、指定のサンプリング周波数に変換する"""
+        path = tmp_path / "stereo.wav"
+        sf.write(path, np.zeros((SR, 2), np.float32), SR)
+
+        audio, sr = load_source(path, target_sr=8000)
+
+        assert sr == 8000
+        assert audio.shape == (2, 8000)
+        assert audio.dtype == np.float32
+
+    def test_empty_array_is_rejected(self):
+        """空の音声データはValueError"""
+        with pytest.raises(ValueError, match="unsupported audio shape"):
+            load_source(np.zeros(0), sr=SR)
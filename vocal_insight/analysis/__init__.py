@@ -4,6 +4,73 @@
 分析パイプライン統合機能を提供
 """
 
-from .pipeline import analyze_audio_segments
+from .bundle import (
+    BUNDLE_FORMAT_VERSION,
+    AnalysisBundle,
+    analyze_to_bundle,
+    load_bundle,
+    write_bundle,
+)
+from .chunked import (
+    DEFAULT_CHUNK_OVERLAP_SEC,
+    DEFAULT_CHUNK_SEC,
+    TrackChunk,
+    chunked_intermediates,
+    plan_chunks,
+)
+from .clips import DEFAULT_CLIPS_PER_TASK, extract_clips
+from .pipeline import (
+    analyze_audio,
+    analyze_audio_segments,
+    detect_segments,
+    iter_audio,
+    iter_audio_segments,
+    segment_track,
+)
+from .prompt import (
+    DEFAULT_MERGE_TOLERANCE,
+    SegmentTable,
+    estimate_tokens,
+    segment_table,
+)
+from .ranges import extract_audio_ranges, extract_ranges, read_ranges
+from .sweep import (
+    config_grid,
+    format_sweep_table,
+    sweep_audio,
+    sweep_audio_segments,
+    table_rows,
+)
 
-__all__ = ["analyze_audio_segments"]
+__all__ = [
+    "analyze_audio",
+    "analyze_audio_segments",
+    "detect_segments",
+    "iter_audio",
+    "iter_audio_segments",
+    "segment_track",
+    "AnalysisBundle",
+    "BUNDLE_FORMAT_VERSION",
+    "analyze_to_bundle",
+    "load_bundle",
+    "write_bundle",
+    "DEFAULT_CHUNK_SEC",
+    "DEFAULT_CHUNK_OVERLAP_SEC",
+    "TrackChunk",
+    "chunked_intermediates",
+    "plan_chunks",
+    "extract_ranges",
+    "DEFAULT_CLIPS_PER_TASK",
+    "extract_clips",
+    "extract_audio_ranges",
+    "DEFAULT_MERGE_TOLERANCE",
+    "SegmentTable",
+    "estimate_tokens",
+    "segment_table",
+    "read_ranges",
+    "config_grid",
+    "sweep_audio",
+    "sweep_audio_segments",
+    "format_sweep_table",
+    "table_rows",
+]
@@ -0,0 +1,349 @@
+"""
+分析バンドル（中間表現の保存と再利用）
+
+分析結果のJSONに加えて、計算コストの高い中間表現（フレームRMS・境界候補・
+ピッチ輪郭・HNR・フォルマントのフレーム系列）をディレクトリに保存する。
+``segment``・``extract``・プロット・LLMプロンプトの再生成は、同じファイルの
+バンドルがあれば音声のデコードと Praat の分析を行わずに結果を求められる
+
+バンドルの構成::
+
+    <バンドル>/
+        arrays.npz      中間表現の配列（圧縮）
+        manifest.json   形式のバージョン・入力音声・設定・セグメント分析結果
+"""
+
+import io
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.config import get_default_config, parse_features
+from ..core.decode import DecodeCache, load_audio
+from ..core.storage import atomic_write, audio_hash
+from ..core.types import AnalysisConfig, FeatureData, SegmentAnalysis
+from ..features.acoustic import AcousticFeatureExtractor
+from ..features.contour import PitchContour
+from ..features.energy import energy_statistics
+from ..features.graph import STFT_HOP_LENGTH, STFT_N_FFT, FeatureContext
+from ..features.windowed import (
+    WINDOWED_FEATURE_GROUPS,
+    frame_tracks,
+    series_from_tracks,
+    windowed_features,
+)
+from .chunked import chunked_intermediates
+from .pipeline import analyze_audio, boundary_candidates, segment_track
+
+# バンドル形式のバージョン（保存内容を変えたら上げる）
+BUNDLE_FORMAT_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+ARRAYS_NAME = "arrays.npz"
+
+
+@dataclass(frozen=True)
+class AnalysisBundle:
+    """保存済みの分析バンドル
+
+    Attributes:
+        path: バンドルのディレクトリ
+        manifest: マニフェスト（入力音声・設定・セグメント分析結果など）
+        arrays: 中間表現の配列（配列名 → 配列）
+    """
+
+    path: Path
+    manifest: Dict[str, Any]
+    arrays: Mapping[str, np.ndarray]
+
+    @property
+    def sr(self) -> int:
+        """分析時のサンプリング周波数"""
+        return int(self.manifest["source"]["sr"])
+
+    @property
+    def duration(self) -> float:
+        """音声の長さ（秒）"""
+        return float(self.manifest["source"]["duration_s"])
+
+    @property
+    def filename(self) -> str:
+        """入力音声のファイル名"""
+        return self.manifest["source"]["filename"]
+
+    @property
+    def config(self) -> AnalysisConfig:
+        """分析設定"""
+        return AnalysisConfig(**self.manifest["config"])
+
+    @property
+    def features(self) -> Tuple[str, ...]:
+        """分析時に選択した特徴量グループ"""
+        return tuple(self.manifest["features"])
+
+    @property
+    def segments(self) -> List[SegmentAnalysis]:
+        """セグメント分析結果"""
+        return [SegmentAnalysis(**segment) for segment in self.manifest["segments"]]
+
+    @property
+    def rms(self) -> np.ndarray:
+        """トラック全体のフレームRMS（フレーム間隔は STFT_HOP_LENGTH）"""
+        return self.arrays["rms"]
+
+    @property
+    def envelope(self) -> np.ndarray:
+        """RMSと同じフレームごとの振幅の最大値（波形の概形の描画用）"""
+        return self.arrays["envelope"]
+
+    @property
+    def boundaries(self) -> np.ndarray:
+        """分析設定での長さ制約の適用前の境界候補（秒）"""
+        return self.arrays["boundaries"]
+
+    @property
+    def contour(self) -> PitchContour:
+        """トラック全体のピッチ輪郭"""
+        return PitchContour(
+            times=self.arrays["contour_times"],
+            f0_hz=self.arrays["contour_f0_hz"],
+            time_step=float(self.manifest["contour_time_step"]),
+        )
+
+    def matches(self, audio_path: Union[str, Path]) -> bool:
+        """音声ファイルがバンドルの作成に使われたものと同じ内容か"""
+        return audio_hash(audio_path) == self.manifest["source"]["audio_hash"]
+
+    def segment(self, config: AnalysisConfig) -> List[Tuple[float, float]]:
+        """保存したRMS・ピッチ輪郭から別の設定でセグメントを求める
+
+        ピッチ輪郭はバンドル作成時のピッチエンジンのもの
+
+        Args:
+            config: 分析設定
+
+        Returns:
+            セグメント（開始時刻, 終了時刻）のリスト
+        """
+        return segment_track(
+            self.duration, self.sr, config, contour=self.contour, rms=self.rms
+        )
+
+    def extract(
+        self,
+        ranges: Sequence[Tuple[float, float]],
+        features: Optional[Iterable[str]] = None,
+    ) -> List[FeatureData]:
+        """保存したフレーム系列から区間ごとの特徴量を求める
+
+        スライディング窓と同じ累積和で求めるため、区間の音声を単独で分析した
+        場合とは区間端のフレームの分だけ値が異なる
+
+        Args:
+            ranges: (開始時刻, 終了時刻) のリスト（秒）
+            features: 計算する特徴量グループ（省略時はバンドルに保存した全て）
+
+        Returns:
+            区間ごとの特徴量（選択外のフィールドはNone）
+
+        Raises:
+            ValueError: バンドルに系列が保存されていない特徴量グループが
+                指定された場合
+        """
+        stored = self.manifest["tracks"] + ["energy"]
+        groups = parse_features(features) if features is not None else stored
+        missing = [group for group in groups if group not in stored]
+        if missing:
+            raise ValueError(
+                f"bundle does not store features {missing}; "
+                f"it has {stored} (re-run analyze with --features)"
+            )
+
+        tracks = {}
+        for group in WINDOWED_FEATURE_GROUPS:
+            if group == "f0" and "f0" in groups:
+                contour = self.contour
+                tracks["f0"] = (contour.times, contour.f0_hz)
+            elif group in groups:
+                tracks[group] = (
+                    self.arrays[f"{group}_times"],
+                    self.arrays[f"{group}_values"],
+                )
+        values = windowed_features(series_from_tracks(tracks), ranges)
+        if "energy" in groups:
+            energy = energy_statistics(self.rms, self.sr, STFT_HOP_LENGTH, ranges)
+            for value, stats in zip(values, energy):
+                value.update(stats)
+
+        empty = AcousticFeatureExtractor(features=groups).empty_features()
+        return [FeatureData(**{**empty, **value}) for value in values]
+
+
+def analyze_to_bundle(
+    audio_path: Union[str, Path],
+    bundle_path: Union[str, Path],
+    config: Optional[AnalysisConfig] = None,
+    features: Optional[Iterable[str]] = None,
+    decode_cache: Optional[DecodeCache] = None,
+    jobs: int = 1,
+    chunk_sec: Optional[float] = None,
+) -> List[SegmentAnalysis]:
+    """音声ファイルを分析し、結果と中間表現をバンドルに保存する
+
+    中間表現は分析と同じトラック全体のコンテキストから取り出す。分析で
+    計算しない系列（RMS分割以外でのRMS、トラック全体の HNR・フォルマントなど）
+    はバンドルのために追加で計算する
+
+    Args:
+        audio_path: 音声ファイルのパス
+        bundle_path: バンドルのディレクトリ（既存のバンドルは上書き）
+        config: 分析設定（省略時はデフォルト）
+        features: 計算する特徴量グループ（``analyze_audio_segments`` と同じ）
+        decode_cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+        jobs: セグメントの特徴量抽出に使うワーカープロセス数（1で逐次実行）
+        chunk_sec: 指定時はトラック全体のRMS・ピッチ輪郭（Praat）をこの長さ（秒）
+            のチャンクに分けて ``jobs`` 個のワーカープロセスで計算する
+
+    Returns:
+        セグメント分析結果のリスト
+    """
+    config = AnalysisConfig(**{**get_default_config(), **(config or {})})
+    audio, sr = load_audio(audio_path, cache=decode_cache)
+    precomputed = None
+    if chunk_sec is not None:
+        names = ("rms", "contour") if config["pitch_engine"] == "praat" else ("rms",)
+        precomputed = chunked_intermediates(
+            audio, sr, names, chunk_sec=chunk_sec, jobs=jobs
+        )
+    track = FeatureContext(audio, sr, config["pitch_engine"], precomputed=precomputed)
+    results = analyze_audio(audio, sr, config, features, track=track, jobs=jobs)
+    write_bundle(bundle_path, audio_path, track, config, features, results)
+    return results
+
+
+def write_bundle(
+    bundle_path: Union[str, Path],
+    audio_path: Union[str, Path],
+    track: FeatureContext,
+    config: AnalysisConfig,
+    features: Optional[Iterable[str]],
+    segments: Sequence[SegmentAnalysis],
+) -> Path:
+    """分析結果とトラック全体の中間表現をバンドルに保存する
+
+    配列を先に保存し、マニフェストの存在をもって保存完了とする
+
+    Args:
+        bundle_path: バンドルのディレクトリ（既存のバンドルは上書き）
+        audio_path: 分析した音声ファイルのパス
+        track: 分析に使ったトラック全体の中間表現のキャッシュ
+        config: 分析設定
+        features: 分析時に選択した特徴量グループ
+        segments: セグメント分析結果
+
+    Returns:
+        バンドルのディレクトリ
+    """
+    bundle_path = Path(bundle_path)
+    groups = parse_features(features)
+    audio, sr = track.audio, track.sr
+
+    rms = track.get("rms")
+    contour = track.get("contour")
+    tracks = frame_tracks(
+        track,
+        [g for g in WINDOWED_FEATURE_GROUPS if g in groups],
+        config.get("formant_engine", "burg"),
+    )
+    arrays = {
+        "rms": rms,
+        "envelope": _envelope(audio, len(rms)),
+        "boundaries": boundary_candidates(sr, config, contour=contour, rms=rms),
+        "contour_times": contour.times,
+        "contour_f0_hz": contour.f0_hz,
+    }
+    for group, (times, values) in tracks.items():
+        if group != "f0":
+            arrays[f"{group}_times"] = times
+            arrays[f"{group}_values"] = values
+
+    manifest = {
+        "version": BUNDLE_FORMAT_VERSION,
+        "source": {
+            "filename": Path(audio_path).name,
+            "audio_hash": audio_hash(audio_path),
+            "sr": int(sr),
+            "n_samples": len(audio),
+            "duration_s": len(audio) / sr,
+        },
+        "config": dict(config),
+        "features": list(groups),
+        "rms": {"frame_length": STFT_N_FFT, "hop_length": STFT_HOP_LENGTH},
+        "contour_time_step": float(contour.time_step),
+        "tracks": list(tracks),
+        "arrays": sorted(arrays),
+        "segments": [
+            dict(segment, features=dict(segment["features"])) for segment in segments
+        ],
+    }
+
+    bundle_path.mkdir(parents=True, exist_ok=True)
+    # 上書き時に古いマニフェストと新しい配列が組み合わさらないよう先に削除
+    (bundle_path / MANIFEST_NAME).unlink(missing_ok=True)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    atomic_write(bundle_path / ARRAYS_NAME, lambda f: f.write(buffer.getvalue()))
+    atomic_write(
+        bundle_path / MANIFEST_NAME,
+        lambda f: f.write(
+            json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+        ),
+    )
+    return bundle_path
+
+
+def load_bundle(bundle_path: Union[str, Path]) -> AnalysisBundle:
+    """保存済みの分析バンドルを読み込む
+
+    Args:
+        bundle_path: バンドルのディレクトリ
+
+    Returns:
+        分析バンドル
+
+    Raises:
+        ValueError: バンドルが存在しない・不完全な場合、または形式の
+            バージョンが異なる場合
+    """
+    bundle_path = Path(bundle_path)
+    try:
+        with open(bundle_path / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        raise ValueError(f"{bundle_path} is not an analysis bundle") from None
+    if manifest.get("version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"unsupported bundle version {manifest.get('version')} "
+            f"(expected {BUNDLE_FORMAT_VERSION}); re-run analyze with --bundle"
+        )
+    try:
+        with np.load(bundle_path / ARRAYS_NAME) as data:
+            arrays = {name: data[name] for name in manifest["arrays"]}
+    except (OSError, KeyError, ValueError):
+        raise ValueError(f"{bundle_path} is incomplete; re-run analyze") from None
+    return AnalysisBundle(path=bundle_path, manifest=manifest, arrays=arrays)
+
+
+def _envelope(audio: np.ndarray, n_frames: int) -> np.ndarray:
+    """RMSのフレームごとの振幅の最大値（フレーム中心の前後 hop/2 サンプル）"""
+    if len(audio) == 0:
+        return np.zeros(n_frames, dtype=np.float32)
+    starts = np.clip(
+        np.arange(n_frames) * STFT_HOP_LENGTH - STFT_HOP_LENGTH // 2, 0, len(audio)
+    )
+    magnitude = np.abs(np.asarray(audio, dtype=np.float32))
+    peaks = np.maximum.reduceat(np.append(magnitude, 0.0), starts)
+    return peaks.astype(np.float32)
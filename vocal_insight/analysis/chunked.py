@@ -0,0 +1,311 @@
+"""
+チャンク並列のトラック全体分析
+
+長い音声のトラック全体の中間表現（フレームRMS・Praat のピッチ輪郭）を、
+重なりのあるチャンクに分けてワーカープロセスで計算し、重なり部分を除いて
+つなぎ合わせる。チャンクの範囲はフレームの格子がトラック全体の分析と一致
+するように選ぶため、つなぎ合わせた結果は一括で計算した場合と同じになる
+（Praat がフレーム中心を標本位置に丸める際の誤差による差は除く。
+``doc/chunked_analysis.md`` を参照）
+
+- RMS: チャンクの開始をフレーム間隔（STFT_HOP_LENGTH）の倍数とし、
+  チャンク端から n_fft/2 以上離れたフレームのみを採用する
+- ピッチ輪郭: Praat はフレームを音声の中央に揃えて配置するため、チャンクの
+  長さを調整してフレーム時刻をトラック全体の格子に揃える。無音判定の基準と
+  なる最大振幅はチャンクごとに異なるので、トラック全体の最大振幅との比で
+  無音閾値を補正する。最適経路探索（Viterbi）の影響はチャンク端の数フレームに
+  とどまるため、重なり部分で吸収する
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import librosa
+import numpy as np
+import parselmouth
+
+from ..core.shared import AudioHandle, SharedAudio, attach_audio
+from ..features.contour import PitchContour, contour_from_pitch
+from ..features.graph import STFT_HOP_LENGTH, STFT_N_FFT
+from ..features.yin import (
+    DEFAULT_FMAX,
+    DEFAULT_FMIN,
+    DEFAULT_TIME_STEP,
+    SILENCE_THRESHOLD,
+)
+
+# チャンク分割に対応する中間表現
+CHUNKED_INTERMEDIATES: Tuple[str, ...] = ("rms", "contour")
+
+# チャンクの長さと前後の重なりのデフォルト値（秒）
+DEFAULT_CHUNK_SEC = 60.0
+DEFAULT_CHUNK_OVERLAP_SEC = 1.0
+
+# Praat の Sound: To Pitch（自己相関法）の分析窓の周期数
+PRAAT_PERIODS_PER_WINDOW = 3.0
+
+
+@dataclass(frozen=True)
+class TrackChunk:
+    """トラック全体の分析のチャンク
+
+    Attributes:
+        start: 分析するサンプル範囲の開始（重なりを含む）
+        end: 分析するサンプル範囲の終了（重なりを含む）
+        keep_start: 結果を採用するサンプル範囲の開始
+        keep_end: 結果を採用するサンプル範囲の終了
+    """
+
+    start: int
+    end: int
+    keep_start: int
+    keep_end: int
+
+
+def plan_chunks(
+    n_samples: int,
+    sr: int,
+    chunk_sec: float = DEFAULT_CHUNK_SEC,
+    overlap_sec: float = DEFAULT_CHUNK_OVERLAP_SEC,
+    align_pitch: bool = True,
+) -> List[TrackChunk]:
+    """トラックを重なりのあるチャンクに分割する
+
+    採用範囲はRMSのフレーム間隔の倍数で区切り、隙間なく並ぶ。重なりは
+    RMSのフレーム長の半分より短くならないよう広げる
+
+    Args:
+        n_samples: トラックのサンプル数
+        sr: サンプリング周波数
+        chunk_sec: チャンクの採用範囲の長さ（秒）
+        overlap_sec: 採用範囲の前後に加える重なり（秒）
+        align_pitch: Praat のピッチ分析のフレーム時刻をトラック全体と揃えるよう
+            チャンクの範囲を調整するか
+
+    Returns:
+        チャンクのリスト（トラックがチャンクより短い場合は全体の1つ）
+
+    Raises:
+        ValueError: チャンクの長さが正でない場合、または重なりが負の場合
+    """
+    if chunk_sec <= 0:
+        raise ValueError("chunk_sec must be positive")
+    if overlap_sec < 0:
+        raise ValueError("overlap_sec must not be negative")
+
+    hop = STFT_HOP_LENGTH
+    length = max(1, round(chunk_sec * sr / hop)) * hop
+    margin = max(int(round(overlap_sec * sr)), STFT_N_FFT)
+    global_grid = _praat_grid(0, n_samples, sr) if align_pitch else None
+
+    chunks = []
+    for keep_start in range(0, n_samples, length):
+        keep_end = min(keep_start + length, n_samples)
+        start = max(0, keep_start - margin) // hop * hop
+        end = min(n_samples, keep_end + margin)
+        if global_grid is not None:
+            start, end = _align_to_grid(start, end, n_samples, sr, global_grid)
+        chunks.append(TrackChunk(start, end, keep_start, keep_end))
+    return chunks or [TrackChunk(0, n_samples, 0, n_samples)]
+
+
+def chunked_intermediates(
+    audio: np.ndarray,
+    sr: int,
+    names: Iterable[str] = CHUNKED_INTERMEDIATES,
+    chunk_sec: float = DEFAULT_CHUNK_SEC,
+    overlap_sec: float = DEFAULT_CHUNK_OVERLAP_SEC,
+    jobs: int = 1,
+) -> Dict[str, Any]:
+    """トラック全体の中間表現をチャンクごとに計算してつなぎ合わせる
+
+    結果は ``FeatureContext`` の "rms"・"contour"（Praat のピッチ輪郭）と
+    同じ形式で、``precomputed`` としてそのまま渡せる
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        names: 計算する中間表現（``CHUNKED_INTERMEDIATES`` の要素）
+        chunk_sec: チャンクの採用範囲の長さ（秒）
+        overlap_sec: 採用範囲の前後に加える重なり（秒）
+        jobs: チャンクの分析に使うワーカープロセス数（1で逐次実行）
+
+    Returns:
+        中間表現の名前 → 値の辞書
+
+    Raises:
+        ValueError: 未知の中間表現が指定された場合、またはワーカー数が
+            1未満の場合
+    """
+    names = tuple(names)
+    unknown = [name for name in names if name not in CHUNKED_INTERMEDIATES]
+    if unknown:
+        raise ValueError(
+            f"cannot compute {unknown} in chunks; "
+            f"supported intermediates are {CHUNKED_INTERMEDIATES}"
+        )
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if not names:
+        return {}
+
+    audio = np.asarray(audio, dtype=np.float32)
+    chunks = plan_chunks(
+        len(audio), sr, chunk_sec, overlap_sec, align_pitch="contour" in names
+    )
+    # Praat の無音判定の基準（平均を除いた最大振幅）はトラック全体で求める
+    samples = audio.astype(np.float64)
+    global_peak = (
+        float(np.max(np.abs(samples - samples.mean()))) if len(samples) else 0.0
+    )
+    tasks = [(chunk.start, chunk.end, sr, names, global_peak) for chunk in chunks]
+
+    if jobs == 1 or len(tasks) <= 1:
+        results = [_analyze_chunk(audio, *task) for task in tasks]
+    else:
+        # 音声は共有メモリに一度だけ置き、チャンクごとにはサンプル範囲のみを送る
+        with (
+            SharedAudio(audio) as shared,
+            ProcessPoolExecutor(
+                max_workers=min(jobs, len(tasks)),
+                initializer=_init_worker,
+                initargs=(shared.handle,),
+            ) as executor,
+        ):
+            results = list(executor.map(_analyze_chunk_in_worker, tasks))
+
+    stitched: Dict[str, Any] = {}
+    if "rms" in names:
+        stitched["rms"] = _stitch_rms(chunks, results, len(audio))
+    if "contour" in names:
+        stitched["contour"] = _stitch_contour(chunks, results, len(audio), sr)
+    return stitched
+
+
+# ワーカープロセスで共有された音声（initializer で設定）
+_worker_audio: Optional[np.ndarray] = None
+
+
+def _init_worker(handle: AudioHandle) -> None:
+    """ワーカーに共有された音声を設定する（ワーカーごとに一度だけ）"""
+    global _worker_audio
+    _worker_audio = attach_audio(handle)
+
+
+def _analyze_chunk_in_worker(task: Tuple) -> Dict[str, Any]:
+    return _analyze_chunk(_worker_audio, *task)
+
+
+def _analyze_chunk(
+    track: np.ndarray,
+    start: int,
+    end: int,
+    sr: int,
+    names: Tuple[str, ...],
+    global_peak: float,
+) -> Dict[str, Any]:
+    """1チャンクの中間表現を計算する（時刻はトラック先頭基準）"""
+    audio = track[start:end]
+    result: Dict[str, Any] = {}
+    if "rms" in names:
+        result["rms"] = librosa.feature.rms(
+            y=audio, frame_length=STFT_N_FFT, hop_length=STFT_HOP_LENGTH
+        )[0]
+    if "contour" in names:
+        samples = audio.astype(np.float64)
+        peak = float(np.max(np.abs(samples - samples.mean())))
+        silence = SILENCE_THRESHOLD
+        if peak > 0:
+            # 各フレームの振幅とトラック全体の最大振幅の比で無音を判定させる
+            silence *= global_peak / peak
+        sound = parselmouth.Sound(samples, sr, start_time=start / sr)
+        pitch = sound.to_pitch_ac(
+            time_step=DEFAULT_TIME_STEP,
+            pitch_floor=DEFAULT_FMIN,
+            pitch_ceiling=DEFAULT_FMAX,
+            silence_threshold=silence,
+        )
+        result["contour"] = contour_from_pitch(pitch)
+    return result
+
+
+def _stitch_rms(
+    chunks: List[TrackChunk], results: List[Dict[str, Any]], n_samples: int
+) -> np.ndarray:
+    """チャンクのRMSから採用範囲のフレームを取り出して連結"""
+    hop = STFT_HOP_LENGTH
+    n_frames = 1 + n_samples // hop
+    parts = []
+    for chunk, result in zip(chunks, results):
+        first = -(-chunk.keep_start // hop)
+        last = -(-chunk.keep_end // hop) if chunk.keep_end < n_samples else n_frames
+        offset = chunk.start // hop
+        parts.append(result["rms"][first - offset : last - offset])
+    return np.concatenate(parts)
+
+
+def _stitch_contour(
+    chunks: List[TrackChunk],
+    results: List[Dict[str, Any]],
+    n_samples: int,
+    sr: int,
+) -> PitchContour:
+    """チャンクのピッチ輪郭から採用範囲のフレームを取り出して連結"""
+    first_time, n_frames = _praat_grid(0, n_samples, sr)
+    step = DEFAULT_TIME_STEP
+
+    def frame_at(sample: int) -> int:
+        if sample >= n_samples:
+            return n_frames
+        index = math.ceil((sample / sr - first_time) / step - 1e-9)
+        return min(max(index, 0), n_frames)
+
+    times, f0_hz = [], []
+    for chunk, result in zip(chunks, results):
+        contour = result["contour"]
+        if len(contour.times) == 0:
+            continue
+        offset = int(round((contour.times[0] - first_time) / step))
+        lo = frame_at(chunk.keep_start) - offset
+        hi = frame_at(chunk.keep_end) - offset
+        times.append(contour.times[lo:hi])
+        f0_hz.append(contour.f0_hz[lo:hi])
+    return PitchContour(
+        times=np.concatenate(times) if times else np.array([]),
+        f0_hz=np.concatenate(f0_hz) if f0_hz else np.array([]),
+        time_step=step,
+    )
+
+
+def _praat_grid(start: int, n_samples: int, sr: int) -> Tuple[float, int]:
+    """Praat のピッチ分析の最初のフレーム時刻とフレーム数
+
+    フレームは分析窓が収まる範囲で音声の中央に揃えて配置される
+    （Praat の Sampled_shortTermAnalysis と同じ計算）
+    """
+    duration = n_samples / sr
+    window = PRAAT_PERIODS_PER_WINDOW / DEFAULT_FMIN
+    n_frames = max(0, math.floor((duration - window) / DEFAULT_TIME_STEP) + 1)
+    first_time = start / sr + duration / 2 - (n_frames - 1) * DEFAULT_TIME_STEP / 2
+    return first_time, n_frames
+
+
+def _align_to_grid(
+    start: int, end: int, n_samples: int, sr: int, global_grid: Tuple[float, int]
+) -> Tuple[int, int]:
+    """チャンクのフレーム時刻がトラック全体の格子に乗るよう範囲を広げる
+
+    終了位置を1サンプルずつ、揃わなければ開始位置をフレーム間隔ずつ
+    前に広げて探す（トラック全体は常に揃う）
+    """
+    first_time, _ = global_grid
+    span = 2 * int(math.ceil(DEFAULT_TIME_STEP * sr))
+    for a in range(start, -1, -STFT_HOP_LENGTH):
+        for b in range(end, min(end + span, n_samples) + 1):
+            chunk_first, _ = _praat_grid(a, b - a, sr)
+            k = (chunk_first - first_time) / DEFAULT_TIME_STEP
+            if abs(k - round(k)) < 1e-6:
+                return a, b
+    return 0, n_samples
@@ -0,0 +1,143 @@
+"""
+多数の短い音声ファイルの特徴量抽出
+
+2〜5秒のクリップが数十万ファイルある場合、ファイルごとに CLI を起動したり
+ワーカーのタスクを1ファイルずつ送ったりすると、抽出そのものより
+プロセス起動・ライブラリの読み込み・タスクの受け渡しに時間がかかる。
+ここではクリップを ``clips_per_task`` ファイルずつ1つのタスクにまとめて
+ワーカープロセスに送り、ワーカーはプロセスごとに一度だけ作った抽出器で
+タスク内のクリップを順にデコード・抽出する。結果はファイルの順に返すため、
+呼び出し側は1つの表に書き出しながら受け取れる
+
+1ファイルのデコードや抽出の失敗はそのクリップの ``error`` に記録し、
+残りのクリップの処理は続ける
+"""
+
+import itertools
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..core.config import parse_features
+from ..core.decode import load_audio
+from ..core.types import ClipAnalysis
+from ..features.base import FeatureExtractor
+from ..features.registry import get_extractor
+
+# 1タスクにまとめるクリップ数のデフォルト値
+DEFAULT_CLIPS_PER_TASK = 64
+
+# ワーカープロセスごとの状態（initializer で設定）
+_worker_extractor: Optional[FeatureExtractor] = None
+_worker_sr: Optional[int] = None
+
+
+def extract_clips(
+    paths: Sequence[Union[str, Path]],
+    extractor: str = "acoustic",
+    features: Optional[Iterable[str]] = None,
+    jobs: int = 1,
+    clips_per_task: int = DEFAULT_CLIPS_PER_TASK,
+    sr: Optional[int] = None,
+) -> Iterator[ClipAnalysis]:
+    """多数の短い音声ファイルの特徴量を抽出し、ファイルの順に返す
+
+    ``extract`` と同じく元のサンプリング周波数のまま分析するため（``sr`` を
+    指定しない場合）、各クリップの値は ``extract`` で1ファイルずつ抽出した
+    場合と同じになる。
+    実行中・待機中のタスクはワーカー数の2倍までとし、イテレーションを
+    やめた時点で未着手のタスクは取り消す
+
+    Args:
+        paths: 音声ファイルのパス
+        extractor: 特徴量抽出器名（``available_extractors()`` のいずれか）
+        features: 計算する特徴量グループ（省略時は ``DEFAULT_FEATURE_GROUPS``）
+        jobs: ワーカープロセス数（1でプロセスを使わず逐次実行）
+        clips_per_task: 1タスクにまとめるクリップ数
+        sr: 分析用のサンプリング周波数（Noneで元のまま、``extract`` と同じ）
+
+    Yields:
+        クリップごとの特徴量（``clip_id`` は ``paths`` の1始まりの番号）
+
+    Raises:
+        ValueError: 抽出器名・特徴量グループ・ワーカー数・タスクあたりの
+            クリップ数が不正な場合
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if clips_per_task < 1:
+        raise ValueError("clips_per_task must be at least 1")
+    if features is not None:
+        features = parse_features(features)
+    # 未登録の抽出器名・特徴量グループはワーカー起動前にここで検出する
+    instance = get_extractor(extractor, features=features)
+
+    paths = [str(path) for path in paths]
+    tasks = (
+        (first + 1, paths[first : first + clips_per_task])
+        for first in range(0, len(paths), clips_per_task)
+    )
+    jobs = min(jobs, -(-len(paths) // clips_per_task))
+    if jobs <= 1:
+        for task in tasks:
+            yield from _extract_batch(instance, sr, *task)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(extractor, features, sr)
+    )
+    pending: Deque[Future] = deque()
+    try:
+        for task in itertools.islice(tasks, jobs * 2):
+            pending.append(executor.submit(_extract_batch_in_worker, task))
+        while pending:
+            results = pending.popleft().result()
+            for task in itertools.islice(tasks, 1):
+                pending.append(executor.submit(_extract_batch_in_worker, task))
+            yield from results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _init_worker(
+    extractor: str, features: Optional[Tuple[str, ...]], sr: Optional[int]
+) -> None:
+    """ワーカーに抽出器を設定する（ワーカーごとに一度だけ）"""
+    global _worker_extractor, _worker_sr
+    _worker_extractor = get_extractor(extractor, features=features)
+    _worker_sr = sr
+
+
+def _extract_batch_in_worker(task: Tuple[int, List[str]]) -> List[ClipAnalysis]:
+    return _extract_batch(_worker_extractor, _worker_sr, *task)
+
+
+def _extract_batch(
+    extractor: FeatureExtractor,
+    sr: Optional[int],
+    first_id: int,
+    paths: List[str],
+) -> List[ClipAnalysis]:
+    """1タスク分のクリップを順にデコードして特徴量を抽出する"""
+    results = []
+    for clip_id, path in enumerate(paths, start=first_id):
+        try:
+            audio, rate = load_audio(path, sr=sr)
+            clip = ClipAnalysis(
+                clip_id=clip_id,
+                filename=Path(path).name,
+                duration_s=len(audio) / rate,
+                features=extractor.extract(audio, rate),
+                error=None,
+            )
+        except Exception as e:
+            clip = ClipAnalysis(
+                clip_id=clip_id,
+                filename=Path(path).name,
+                duration_s=None,
+                features=None,
+                error=str(e) or type(e).__name__,
+            )
+        results.append(clip)
+    return results
@@ -4,65 +4,470 @@
 セグメント検出から特徴量抽出までの統合処理
 """
 
-from typing import List, Optional
+import itertools
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
 
-import librosa
+import numpy as np
 
-from ..core.config import get_default_config
+from ..core.config import (
+    DEFAULT_MIN_GAP_SEC,
+    DEFAULT_WINDOW_HOP_SEC,
+    DEFAULT_WINDOW_SEC,
+    get_default_config,
+)
+from ..core.decode import DecodeCache, load_audio
+from ..core.shared import SharedAudio, attach_audio
 from ..core.types import AnalysisConfig, SegmentAnalysis
 from ..features.acoustic import AcousticFeatureExtractor
-from ..segments.detector import SegmentBoundaryDetector
+from ..features.contour import PitchContour, compute_pitch_contour
+from ..features.energy import energy_statistics
+from ..features.graph import STFT_HOP_LENGTH, FeatureContext
+from ..features.spectral import spectral_frames, summarize_segments
+from ..features.windowed import (
+    WINDOWED_FEATURE_GROUPS,
+    frame_series,
+    window_grid,
+    windowed_features,
+)
+from ..segments.detector import SegmentBoundaryDetector, rms_boundaries
+from ..segments.phrase import PhraseBoundaryDetector
 from ..segments.processor import SegmentProcessor
+from .chunked import chunked_intermediates
+
+
+def detect_segments(
+    audio: np.ndarray,
+    sr: int,
+    config: AnalysisConfig,
+    contour: Optional[PitchContour] = None,
+    rms: Optional[np.ndarray] = None,
+) -> Tuple[List[Tuple[float, float]], Optional[PitchContour]]:
+    """設定に従ってセグメント境界を検出し、長さ制約を適用する
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        config: 分析設定
+        contour: 計算済みのトラック全体のピッチ輪郭（フレーズ分割時に
+            再計算しない）
+        rms: 計算済みのトラック全体のフレームRMS（RMS分割時に再計算しない）
+
+    Returns:
+        セグメント（開始時刻, 終了時刻）のリストと、トラック全体のピッチ輪郭
+        （フレーズ分割時または ``contour`` 指定時。それ以外はNone）のタプル。
+        スライディング窓（``segmentation="window"``）では一定間隔の重なりのある
+        窓を返し、長さ制約は適用しない
+    """
+    segmentation = config.get("segmentation", "rms")
+    if segmentation == "phrase" and contour is None:
+        # トラック全体のピッチ輪郭を一度だけ計算し、境界検出とF0統計で共有
+        contour = compute_pitch_contour(
+            audio, sr, engine=config.get("pitch_engine", "praat")
+        )
+    if segmentation == "rms" and rms is None:
+        rms = (
+            SegmentBoundaryDetector()
+            .analyze(audio, sr, config["rms_delta_percentile"])
+            .rms
+        )
+
+    segments = segment_track(len(audio) / sr, sr, config, contour=contour, rms=rms)
+    return segments, contour
+
+
+def boundary_candidates(
+    sr: int,
+    config: AnalysisConfig,
+    contour: Optional[PitchContour] = None,
+    rms: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """計算済みのトラック全体の系列から長さ制約の適用前の境界を検出する
+
+    Args:
+        sr: サンプリング周波数
+        config: 分析設定
+        contour: トラック全体のピッチ輪郭（フレーズ分割時に必須）
+        rms: トラック全体のフレームRMS（RMS分割時に必須）
+
+    Returns:
+        境界時刻（秒）の配列（スライディング窓では空）
+    """
+    segmentation = config.get("segmentation", "rms")
+    if segmentation == "window":
+        return np.array([])
+    if segmentation == "phrase":
+        return PhraseBoundaryDetector().detect(
+            contour, config.get("min_gap_sec", DEFAULT_MIN_GAP_SEC)
+        )
+    return rms_boundaries(rms, sr, config["rms_delta_percentile"]).boundaries
+
+
+def segment_track(
+    duration: float,
+    sr: int,
+    config: AnalysisConfig,
+    contour: Optional[PitchContour] = None,
+    rms: Optional[np.ndarray] = None,
+) -> List[Tuple[float, float]]:
+    """計算済みのトラック全体の系列からセグメントを求める（音声は不要）
+
+    Args:
+        duration: トラックの長さ（秒）
+        sr: サンプリング周波数
+        config: 分析設定
+        contour: トラック全体のピッチ輪郭（フレーズ分割時に必須）
+        rms: トラック全体のフレームRMS（RMS分割時に必須）
+
+    Returns:
+        セグメント（開始時刻, 終了時刻）のリスト
+    """
+    if config.get("segmentation", "rms") == "window":
+        return window_grid(
+            duration,
+            config.get("window_sec", DEFAULT_WINDOW_SEC),
+            config.get("window_hop_sec", DEFAULT_WINDOW_HOP_SEC),
+        )
+
+    # セグメント境界検出・長さ制約の適用
+    boundaries = boundary_candidates(sr, config, contour=contour, rms=rms)
+    return SegmentProcessor().process(boundaries, duration, config)
 
 
 def analyze_audio_segments(
-    audio_path: str, config: Optional[AnalysisConfig] = None
+    audio_path: str,
+    config: Optional[AnalysisConfig] = None,
+    features: Optional[Iterable[str]] = None,
+    decode_cache: Optional[DecodeCache] = None,
+    jobs: int = 1,
+    chunk_sec: Optional[float] = None,
 ) -> List[SegmentAnalysis]:
     """音声ファイルを分析してセグメント情報を返す
 
     Args:
         audio_path: 音声ファイルのパス
         config: 分析設定（省略時はデフォルト）
+        features: 計算する特徴量グループ（"f0", "hnr", "formants",
+            "energy", "voice_quality", "spectral"）。省略時は "f0", "hnr",
+            "formants"。選択外のフィールドはNoneとなる
+        decode_cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+        jobs: セグメントの特徴量抽出に使うワーカープロセス数（1で逐次実行）
+        chunk_sec: 指定時はトラック全体のRMS・ピッチ輪郭をこの長さ（秒）の
+            チャンクに分けて ``jobs`` 個のワーカープロセスで計算する
 
     Returns:
         セグメント分析結果のリスト
     """
+    return list(
+        iter_audio_segments(
+            audio_path, config, features, decode_cache, jobs=jobs, chunk_sec=chunk_sec
+        )
+    )
+
+
+def iter_audio_segments(
+    audio_path: str,
+    config: Optional[AnalysisConfig] = None,
+    features: Optional[Iterable[str]] = None,
+    decode_cache: Optional[DecodeCache] = None,
+    jobs: int = 1,
+    ordered: bool = True,
+    chunk_sec: Optional[float] = None,
+) -> Iterator[SegmentAnalysis]:
+    """音声ファイルを分析し、セグメントの結果を抽出が終わったものから返す
+
+    デコード・境界検出・トラック全体の中間表現の計算の後、セグメントごとの
+    特徴量抽出が終わるたびに結果を返す。途中でイテレーションをやめる
+    （``close()`` や ``break``）と、残りのセグメントの分析は行わない
+
+    Args:
+        audio_path: 音声ファイルのパス
+        config: 分析設定（省略時はデフォルト）
+        features: 計算する特徴量グループ（``analyze_audio_segments`` と同じ）
+        decode_cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+        jobs: セグメントの特徴量抽出に使うワーカープロセス数（1で逐次実行）
+        ordered: Trueでセグメント順、Falseで抽出が終わった順に返す
+            （逐次実行では常にセグメント順）
+        chunk_sec: トラック全体の中間表現を計算するチャンクの長さ（秒）。
+            Noneで一括計算（``analyze_audio_segments`` と同じ）
+
+    Yields:
+        セグメント分析結果
+    """
+    # 音声ファイルを読み込み
+    audio, sr = load_audio(audio_path, cache=decode_cache)
+    yield from iter_audio(
+        audio, sr, config, features, jobs=jobs, ordered=ordered, chunk_sec=chunk_sec
+    )
+
+
+def analyze_audio(
+    audio: np.ndarray,
+    sr: int,
+    config: Optional[AnalysisConfig] = None,
+    features: Optional[Iterable[str]] = None,
+    track: Optional[FeatureContext] = None,
+    jobs: int = 1,
+    chunk_sec: Optional[float] = None,
+) -> List[SegmentAnalysis]:
+    """デコード済みの音声を分析してセグメント情報を返す
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        config: 分析設定（省略時はデフォルト）
+        features: 計算する特徴量グループ（``analyze_audio_segments`` と同じ）
+        track: トラック全体の中間表現のキャッシュ（同じ音声・ピッチエンジンの
+            もの）。指定時は計算した中間表現が呼び出し元に残る
+        jobs: セグメントの特徴量抽出に使うワーカープロセス数（1で逐次実行）
+        chunk_sec: トラック全体の中間表現を計算するチャンクの長さ（秒）。
+            Noneで一括計算（``analyze_audio_segments`` と同じ）
+
+    Returns:
+        セグメント分析結果のリスト
+    """
+    return list(
+        iter_audio(
+            audio, sr, config, features, track=track, jobs=jobs, chunk_sec=chunk_sec
+        )
+    )
+
+
+def iter_audio(
+    audio: np.ndarray,
+    sr: int,
+    config: Optional[AnalysisConfig] = None,
+    features: Optional[Iterable[str]] = None,
+    track: Optional[FeatureContext] = None,
+    jobs: int = 1,
+    ordered: bool = True,
+    chunk_sec: Optional[float] = None,
+) -> Iterator[SegmentAnalysis]:
+    """デコード済みの音声を分析し、セグメントの結果を抽出が終わったものから返す
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        config: 分析設定（省略時はデフォルト）
+        features: 計算する特徴量グループ（``analyze_audio_segments`` と同じ）
+        track: トラック全体の中間表現のキャッシュ（``analyze_audio`` と同じ）
+        jobs: セグメントの特徴量抽出に使うワーカープロセス数（1で逐次実行）
+        ordered: Trueでセグメント順、Falseで抽出が終わった順に返す
+        chunk_sec: トラック全体の中間表現を計算するチャンクの長さ（秒）。
+            ``track`` 指定時は使わない
+
+    Yields:
+        セグメント分析結果
+
+    Raises:
+        ValueError: ワーカー数が1未満の場合
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
     if config is None:
         config = get_default_config()
 
-    # 音声ファイルを読み込み
-    audio, sr = librosa.load(audio_path)
-    total_duration = len(audio) / sr
-
-    # セグメント境界検出
-    detector = SegmentBoundaryDetector()
-    boundaries = detector.detect(audio, sr, config["rms_delta_percentile"])
-
-    # セグメント処理
-    processor = SegmentProcessor()
-    segments = processor.process(boundaries, total_duration, config)
-
-    # 各セグメントから特徴量抽出
-    extractor = AcousticFeatureExtractor()
-    results = []
-
-    for segment_id, (start_sec, end_sec) in enumerate(segments):
-        # セグメント音声を抽出
-        start_frame = int(start_sec * sr)
-        end_frame = int(end_sec * sr)
-        segment_audio = audio[start_frame:end_frame]
-
-        # 特徴量抽出
-        features = extractor.extract(segment_audio, sr)
-
-        # 結果作成
-        segment_analysis = SegmentAnalysis(
-            segment_id=segment_id,
-            time_start_s=start_sec,
-            time_end_s=end_sec,
-            features=features,
+    extractor = AcousticFeatureExtractor(
+        pitch_engine=config.get("pitch_engine", "praat"),
+        formant_engine=config.get("formant_engine", "burg"),
+        features=features,
+    )
+
+    # 声質特徴量の声門パルス列・ピッチ輪郭はトラック全体で一度だけ計算し、
+    # 同じ Pitch をフレーズ境界検出とも共有する
+    if track is None:
+        precomputed = None
+        if chunk_sec is not None:
+            # 長いトラックのRMS・ピッチ輪郭はチャンクに分けて並列に計算する
+            precomputed = chunked_intermediates(
+                audio,
+                sr,
+                _chunked_names(config, extractor),
+                chunk_sec=chunk_sec,
+                jobs=jobs,
+            )
+        track = FeatureContext(
+            audio, sr, extractor.pitch_engine, precomputed=precomputed
+        )
+    pulses = None
+    contour = None
+    if "voice_quality" in extractor.features:
+        contour = track.get("contour")
+        pulses = track.get("pulses")
+    elif config.get("segmentation", "rms") == "phrase" and "contour" in track:
+        contour = track.get("contour")
+
+    # フレームRMSはRMS分割の境界検出と音量特徴量で共有する
+    rms = None
+    if config.get("segmentation", "rms") == "rms" or "energy" in extractor.features:
+        rms = track.get("rms")
+
+    # セグメント境界検出・長さ調整
+    segments, contour = detect_segments(audio, sr, config, contour=contour, rms=rms)
+
+    # 音量特徴量は全セグメント分をフレームRMSから一括で集約
+    energy = None
+    if "energy" in extractor.features:
+        energy = energy_statistics(rms, sr, STFT_HOP_LENGTH, segments)
+
+    # スペクトル特徴量はトラック全体の STFT から全セグメント分を一括で集約
+    spectral = None
+    if "spectral" in extractor.features:
+        frames = spectral_frames(track.get("stft"), sr, STFT_HOP_LENGTH)
+        spectral = summarize_segments(frames, segments)
+
+    # スライディング窓では F0・HNR・フォルマントをトラック全体のフレーム系列の
+    # 累積和から窓ごとに定数時間で求め、残りのグループのみ窓ごとに抽出する
+    windowed = None
+    per_segment = None
+    if config.get("segmentation", "rms") == "window":
+        groups = [g for g in WINDOWED_FEATURE_GROUPS if g in extractor.features]
+        series = frame_series(track, groups, extractor.formant_engine)
+        windowed = windowed_features(series, segments)
+        remaining = [g for g in extractor.features if g not in groups]
+        per_segment = (
+            AcousticFeatureExtractor(
+                pitch_engine=extractor.pitch_engine,
+                formant_engine=extractor.formant_engine,
+                features=remaining,
+            )
+            if remaining
+            else None
+        )
+
+    # 各セグメントの抽出に渡すもの（トラック全体の中間表現はセグメント区間を
+    # 切り出して渡す）。ワーカーへは区間と切り出した中間表現のみを送る
+    def tasks() -> Iterator[Tuple]:
+        for segment_id, (start_sec, end_sec) in enumerate(segments):
+            precomputed = {}
+            if contour is not None:
+                precomputed["f0"] = contour.slice(start_sec, end_sec)
+            if pulses is not None:
+                precomputed["contour"] = contour.segment(start_sec, end_sec)
+                precomputed["pulses"] = pulses.slice(start_sec, end_sec)
+            if energy is not None:
+                precomputed["energy"] = energy[segment_id]
+            if spectral is not None:
+                precomputed["spectral"] = spectral[segment_id]
+            yield (
+                segment_id,
+                start_sec,
+                end_sec,
+                precomputed,
+                windowed[segment_id] if windowed is not None else None,
+            )
+
+    if jobs == 1 or len(segments) <= 1:
+        # 逐次実行（イテレーションをやめた時点で以降のセグメントは分析しない）
+        for task in tasks():
+            yield _analyze_segment(audio, sr, extractor, per_segment, *task)
+        return
+
+    # 音声は共有メモリに一度だけ置き、ワーカーには参照のみを渡す
+    with SharedAudio(audio) as shared:
+        yield from _iter_parallel(
+            tasks(), jobs, ordered, (shared.handle, sr, extractor, per_segment)
         )
 
-        results.append(segment_analysis)
 
-    return results
+def _chunked_names(
+    config: AnalysisConfig, extractor: AcousticFeatureExtractor
+) -> Tuple[str, ...]:
+    """チャンクに分けて計算するトラック全体の中間表現
+
+    声質特徴量では声門パルス列のためにトラック全体の Pitch を一括で計算
+    するため、ピッチ輪郭はそこから求める（YIN は一括で計算する）
+    """
+    segmentation = config.get("segmentation", "rms")
+    names = []
+    if segmentation == "rms" or "energy" in extractor.features:
+        names.append("rms")
+    if (
+        segmentation == "phrase"
+        and extractor.pitch_engine == "praat"
+        and "voice_quality" not in extractor.features
+    ):
+        names.append("contour")
+    return tuple(names)
+
+
+# ワーカープロセスごとの状態（initializer で設定）
+_worker_state: Optional[Tuple] = None
+
+
+def _iter_parallel(
+    tasks: Iterator[Tuple], jobs: int, ordered: bool, state: Tuple
+) -> Iterator[SegmentAnalysis]:
+    """セグメントの抽出をワーカープロセスで実行し、結果を順に返す
+
+    実行中・待機中のタスクはワーカー数の2倍までとし、イテレーションを
+    やめた時点で未着手のタスクは取り消す
+    """
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=state
+    )
+    pending: Deque[Future] = deque()
+    try:
+        for task in itertools.islice(tasks, jobs * 2):
+            pending.append(executor.submit(_analyze_segment_in_worker, task))
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+                pending.remove(future)
+            result = future.result()
+            for task in itertools.islice(tasks, 1):
+                pending.append(executor.submit(_analyze_segment_in_worker, task))
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _init_worker(handle, *state) -> None:
+    """ワーカーに共有された音声と抽出器を設定する（ワーカーごとに一度だけ）"""
+    global _worker_state
+    _worker_state = (attach_audio(handle), *state)
+
+
+def _analyze_segment_in_worker(task: Tuple) -> SegmentAnalysis:
+    return _analyze_segment(*_worker_state, *task)
+
+
+def _analyze_segment(
+    audio: np.ndarray,
+    sr: int,
+    extractor: AcousticFeatureExtractor,
+    per_segment: Optional[AcousticFeatureExtractor],
+    segment_id: int,
+    start_sec: float,
+    end_sec: float,
+    precomputed: dict,
+    windowed: Optional[dict],
+) -> SegmentAnalysis:
+    """1セグメントの特徴量を抽出する"""
+    # セグメント音声を抽出
+    start_frame = int(start_sec * sr)
+    end_frame = int(end_sec * sr)
+    segment_audio = audio[start_frame:end_frame]
+
+    context = FeatureContext(
+        segment_audio, sr, extractor.pitch_engine, precomputed=precomputed
+    )
+    if windowed is None:
+        features = extractor.extract_from(context)
+    else:
+        features = extractor.empty_features()
+        if per_segment is not None:
+            features.update(per_segment.extract_from(context))
+        features.update(windowed)
+
+    # 結果作成
+    return SegmentAnalysis(
+        segment_id=segment_id,
+        time_start_s=start_sec,
+        time_end_s=end_sec,
+        features=features,
+    )
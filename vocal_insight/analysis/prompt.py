@@ -0,0 +1,303 @@
+"""
+トークン数の上限に合わせたプロンプト用セグメント表
+
+長い録音を細かく分割すると、セグメントごとに特徴量を列挙するプロンプトは
+数百セグメントで LLM のコンテキストを使い切る。ここではセグメントを
+1行1セグメントの表（``|`` 区切り）にし、上限（``max_tokens``）を超える
+場合は次の順で行を減らす
+
+1. 隣接するセグメントのうち特徴量の近いものを1行にまとめる
+   （各特徴量をセグメント間の標準偏差で正規化した差の平均が
+   ``tolerance`` 未満、値の変わらない特徴量は比べない。値はセグメント長で
+   重み付けした平均）
+2. それでも超える場合は、前後の行との特徴量の変化が大きい行を優先して残し、
+   変化の小さい行を省く
+
+トークン数は外部のトークナイザーを使わず、``estimate_tokens`` で文字の
+種類から見積もる。表の描画・見積もり・統合はセグメント数に比例する時間で
+行い、省く行の選択のみ変化量の並べ替え（n log n）を伴う
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.types import SegmentAnalysis
+
+# 統合するセグメント間の差の上限（正規化した特徴量の差の平均）のデフォルト値
+DEFAULT_MERGE_TOLERANCE = 0.5
+
+# 表の列（特徴量キー, 見出し, 倍率, 小数点以下の桁数）
+TABLE_COLUMNS: Tuple[Tuple[str, str, float, int], ...] = (
+    ("f0_mean_hz", "F0 Hz", 1.0, 1),
+    ("f0_std_hz", "F0 sd Hz", 1.0, 1),
+    ("hnr_mean_db", "HNR dB", 1.0, 1),
+    ("f1_mean_hz", "F1 Hz", 1.0, 0),
+    ("f2_mean_hz", "F2 Hz", 1.0, 0),
+    ("f3_mean_hz", "F3 Hz", 1.0, 0),
+    ("rms_mean", "RMS e-3", 1000.0, 1),
+    ("dynamic_range_db", "DR dB", 1.0, 1),
+    ("crest_factor_db", "Crest dB", 1.0, 1),
+    ("loudness_slope_db_per_s", "Slope dB/s", 1.0, 2),
+    ("jitter_local", "Jitter %", 100.0, 2),
+    ("shimmer_local", "Shimmer %", 100.0, 2),
+    ("vibrato_rate_hz", "Vib Hz", 1.0, 1),
+    ("vibrato_extent_cents", "Vib cents", 1.0, 0),
+    ("spectral_centroid_hz", "Centroid Hz", 1.0, 0),
+    ("spectral_rolloff_hz", "Rolloff Hz", 1.0, 0),
+)
+
+# 行を省いた場合に表の末尾に付ける注記（shown: 表示した行数, total: 統合後の行数）
+DEFAULT_OMITTED_NOTE = (
+    "({shown} of {total} rows shown; rows with the smallest feature changes "
+    "were omitted)"
+)
+
+# トークンの見積もりに使う区切り（英字は6文字・数字は3桁ごと、記号と
+# ASCII 以外の文字は1文字ごと、空白の並びは直後の語に含めて1トークン）
+_TOKEN_PATTERN = re.compile(r"\s*(?:[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d])|\s+")
+
+
+@dataclass(frozen=True)
+class SegmentTable:
+    """プロンプト用のセグメント表
+
+    Attributes:
+        text: 表のテキスト（見出し行・各行・注記）
+        tokens: ``text`` の見積もりトークン数
+        segments: 入力のセグメント数
+        rows: 表示した行数
+        merged: 他のセグメントと1行にまとめたことで減った行数
+        omitted: 変化が小さいため省いた行数
+    """
+
+    text: str
+    tokens: int
+    segments: int
+    rows: int
+    merged: int
+    omitted: int
+
+
+def estimate_tokens(text: str) -> int:
+    """テキストのトークン数を見積もる（文字数に比例する時間）
+
+    一般的な BPE トークナイザーの区切り方に合わせ、英単語は6文字ごと、
+    数字は3桁ごと、記号・日本語などの ASCII 以外の文字は1文字ごとに
+    1トークンと数える。実際のトークン数はモデルにより異なる
+
+    Args:
+        text: 対象のテキスト
+
+    Returns:
+        見積もりトークン数
+    """
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def segment_table(
+    segments: Sequence[SegmentAnalysis],
+    max_tokens: Optional[int] = None,
+    tolerance: float = DEFAULT_MERGE_TOLERANCE,
+    start: int = 1,
+    omitted_note: str = DEFAULT_OMITTED_NOTE,
+) -> SegmentTable:
+    """セグメントの特徴量を上限のトークン数に収まる表にする
+
+    見出し行と1行1セグメント（まとめた行は ``3-5`` のように番号の範囲）の
+    表で、全セグメントの値がない特徴量の列は出力しない。上限を超える場合は
+    隣接する似たセグメントをまとめ、それでも超える場合は特徴量の変化が
+    大きい行を優先して残す。見出し行と注記だけで上限を超える場合は行を
+    表示しない
+
+    Args:
+        segments: セグメントの分析結果（時間順）
+        max_tokens: 表のトークン数の上限（Noneで上限なし）
+        tolerance: 1行にまとめるセグメント間の差の上限
+            （標準偏差で正規化した特徴量の差の平均）
+        start: 先頭のセグメントの番号
+        omitted_note: 行を省いた場合の注記（``{shown}``・``{total}`` を置換）
+
+    Returns:
+        セグメント表
+    """
+    columns = [
+        column
+        for column in TABLE_COLUMNS
+        if any(segment["features"].get(column[0]) is not None for segment in segments)
+    ]
+    header = "|".join(["seg", "time s"] + [label for _, label, _, _ in columns])
+    values = np.array(
+        [
+            [_value(segment["features"].get(key)) for key, _, _, _ in columns]
+            for segment in segments
+        ],
+        dtype=float,
+    ).reshape(len(segments), len(columns))
+    first = np.arange(len(segments)) + start
+    bounds = np.array(
+        [(s["time_start_s"], s["time_end_s"]) for s in segments], dtype=float
+    ).reshape(len(segments), 2)
+
+    lines = _render_rows(first, first, bounds, values, columns)
+    costs = [estimate_tokens(line + "\n") for line in lines]
+    header_tokens = estimate_tokens(header + "\n")
+    if max_tokens is None or not segments or header_tokens + sum(costs) <= max_tokens:
+        return _table(header, lines, len(segments))
+
+    # 1. 隣接する似たセグメントをまとめる
+    weights = np.maximum(bounds[:, 1] - bounds[:, 0], 1e-6)
+    scaled = _standardize(values)
+    groups = _similar_runs(scaled, weights, tolerance)
+    if len(groups) < len(segments):
+        values = _group_means(values, weights, groups)
+        scaled = _group_means(scaled, weights, groups)
+        last = np.append(groups[1:], len(segments)) - 1
+        bounds = np.column_stack([bounds[groups, 0], bounds[last, 1]])
+        lines = _render_rows(first[groups], first[last], bounds, values, columns)
+        costs = [estimate_tokens(line + "\n") for line in lines]
+    merged = len(segments) - len(lines)
+    if header_tokens + sum(costs) <= max_tokens:
+        return _table(header, lines, len(segments), merged=merged)
+
+    # 2. 前後の行との変化が大きい行を優先して残す
+    total = len(lines)
+    note = omitted_note.format(shown=total, total=total)
+    available = max_tokens - header_tokens - estimate_tokens(note)
+    keep = np.zeros(total, dtype=bool)
+    used = 0
+    for index in np.argsort(-_change_scores(scaled), kind="stable"):
+        if used + costs[index] <= available:
+            keep[index] = True
+            used += costs[index]
+    shown = [line for line, kept in zip(lines, keep) if kept]
+    note = omitted_note.format(shown=len(shown), total=total)
+    return _table(
+        header,
+        shown,
+        len(segments),
+        merged=merged,
+        omitted=total - len(shown),
+        note=note,
+    )
+
+
+def _value(value: Optional[float]) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _table(
+    header: str,
+    lines: List[str],
+    segments: int,
+    merged: int = 0,
+    omitted: int = 0,
+    note: Optional[str] = None,
+) -> SegmentTable:
+    text = "\n".join([header] + lines + ([note] if note else [])) + "\n"
+    return SegmentTable(
+        text=text,
+        tokens=estimate_tokens(text),
+        segments=segments,
+        rows=len(lines),
+        merged=merged,
+        omitted=omitted,
+    )
+
+
+def _render_rows(
+    first: np.ndarray,
+    last: np.ndarray,
+    bounds: np.ndarray,
+    values: np.ndarray,
+    columns: Sequence[Tuple[str, str, float, int]],
+) -> List[str]:
+    """表の各行を描画する（番号・時間範囲・各列の値、値のない列は ``-``）"""
+    formats = [(scale, f".{digits}f") for _, _, scale, digits in columns]
+    lines = []
+    # numpy のスカラーより速い Python の数値で書式化する
+    for head, tail, (start, end), row in zip(
+        first.tolist(), last.tolist(), bounds.tolist(), values.tolist()
+    ):
+        cells = [
+            str(head) if head == tail else f"{head}-{tail}",
+            f"{start:.1f}-{end:.1f}",
+        ]
+        for value, (scale, spec) in zip(row, formats):
+            cells.append("-" if value != value else format(value * scale, spec))
+        lines.append("|".join(cells))
+    return lines
+
+
+def _standardize(values: np.ndarray) -> np.ndarray:
+    """列ごとにセグメント間の標準偏差で正規化する
+
+    値のない要素と、全セグメントで値が同じ列は NaN とし、差の平均に含めない
+    （変化のない列で差が薄まらないようにする）
+    """
+    if values.size == 0:
+        return values
+    available = ~np.isnan(values)
+    counts = np.maximum(available.sum(axis=0), 1)
+    mean = np.where(available, values, 0.0).sum(axis=0) / counts
+    deviation = np.where(available, values - mean, 0.0)
+    std = np.sqrt((deviation**2).sum(axis=0) / counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, (values - mean) / std, np.nan)
+
+
+def _similar_runs(
+    scaled: np.ndarray, weights: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """まとめる隣接セグメントの並びの先頭の番号（1回の走査）
+
+    各並びの特徴量（セグメント長で重み付けした平均）との差の平均が
+    ``tolerance`` 未満の次のセグメントを同じ並びに加える（比べられる値が
+    ない場合も加える）。列数が少ないため、
+    numpy の小さな配列演算より速い Python の数値で計算する
+    """
+    starts = [0]
+    total = [0.0] * scaled.shape[1]
+    weight = [0.0] * scaled.shape[1]
+    for index, (row, row_weight) in enumerate(zip(scaled.tolist(), weights.tolist())):
+        if index > 0:
+            differences = [
+                abs(total[column] / weight[column] - value)
+                for column, value in enumerate(row)
+                if value == value and weight[column] > 0
+            ]
+            if differences and sum(differences) >= tolerance * len(differences):
+                starts.append(index)
+                total = [0.0] * len(row)
+                weight = [0.0] * len(row)
+        for column, value in enumerate(row):
+            # NaN（値のない要素）は並びの平均に含めない
+            if value == value:
+                total[column] += value * row_weight
+                weight[column] += row_weight
+    return np.array(starts)
+
+
+def _group_means(
+    values: np.ndarray, weights: np.ndarray, groups: np.ndarray
+) -> np.ndarray:
+    """並びごとのセグメント長で重み付けした平均（値のない要素は除く）"""
+    available = ~np.isnan(values)
+    weighted = np.where(available, values, 0.0) * weights[:, None]
+    counts = available * weights[:, None]
+    total = np.add.reduceat(weighted, groups, axis=0)
+    weight = np.add.reduceat(counts, groups, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weight > 0, total / weight, np.nan)
+
+
+def _change_scores(scaled: np.ndarray) -> np.ndarray:
+    """各行の前後の行との特徴量の差の大きい方（差がない・比べられない場合は0）"""
+    difference = np.abs(scaled[1:] - scaled[:-1])
+    available = ~np.isnan(difference)
+    counts = available.sum(axis=1)
+    steps = np.where(available, difference, 0.0).sum(axis=1) / np.maximum(counts, 1)
+    padded = np.concatenate([[0.0], steps, [0.0]])
+    return np.maximum(padded[:-1], padded[1:])
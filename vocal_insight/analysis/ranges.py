@@ -0,0 +1,219 @@
+"""
+複数区間の特徴量抽出
+
+ラベリングツールが出力する多数の (開始, 終了) 区間について、音声のデコードと
+ライブラリの読み込みを一度だけ行い、各区間の特徴量をワーカープロセスで並列に
+抽出する。Praat の分析は GIL を解放しないため、並列化にはプロセスを使う
+"""
+
+import csv
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.config import parse_features
+from ..core.decode import DecodeCache, load_audio
+from ..core.shared import AudioHandle, SharedAudio, attach_audio
+from ..core.types import FeatureData, SegmentAnalysis
+from ..features.base import FeatureExtractor
+from ..features.registry import get_extractor
+
+# 区間ファイルで開始・終了時刻として認識する列名（先に見つかったものを使う）
+RANGE_START_KEYS = ("start_s", "time_start_s", "start")
+RANGE_END_KEYS = ("end_s", "time_end_s", "end")
+
+# ワーカープロセスごとの状態（initializer で設定）
+_worker_audio: Optional[np.ndarray] = None
+_worker_sr: int = 0
+_worker_extractor: Optional[FeatureExtractor] = None
+
+
+def read_ranges(path: Union[str, Path]) -> List[Tuple[float, float]]:
+    """区間ファイル（CSV または JSON）を読み込む
+
+    CSV はヘッダー行に開始・終了時刻の列（``start_s``/``end_s`` など）を持つ。
+    JSON は ``[[開始, 終了], ...]`` または ``[{"start_s": .., "end_s": ..}, ...]``
+    のリスト（``{"ranges": [...]}`` で包んでもよい）。その他の列・キーは無視する
+
+    Args:
+        path: 区間ファイルのパス（拡張子 .csv または .json）
+
+    Returns:
+        (開始時刻, 終了時刻) のリスト（秒、ファイルと同じ順）
+
+    Raises:
+        ValueError: 形式が不正な場合、または開始時刻が終了時刻以上の区間がある場合
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            entries: list = list(csv.DictReader(f))
+    elif suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        if isinstance(entries, dict):
+            entries = entries.get("ranges")
+        if not isinstance(entries, list):
+            raise ValueError("ranges JSON must be a list of ranges")
+    else:
+        raise ValueError(f"ranges file must be .csv or .json, got '{path.suffix}'")
+
+    ranges = []
+    for number, entry in enumerate(entries, start=1):
+        try:
+            start, end = _range_bounds(entry)
+            start, end = float(start), float(end)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"invalid range {number} in {path.name}: {e}") from None
+        if not (math.isfinite(start) and math.isfinite(end)) or start < 0:
+            raise ValueError(f"invalid range {number} in {path.name}: {entry}")
+        if start >= end:
+            raise ValueError(
+                f"range {number} in {path.name}: start must be less than end"
+            )
+        ranges.append((start, end))
+    return ranges
+
+
+def _range_bounds(entry: object) -> Tuple[object, object]:
+    """区間ファイルの1件から開始・終了時刻を取り出す"""
+    if isinstance(entry, dict):
+        start = next((entry[k] for k in RANGE_START_KEYS if k in entry), None)
+        end = next((entry[k] for k in RANGE_END_KEYS if k in entry), None)
+        if start is None or end is None:
+            raise KeyError(
+                f"expected columns {RANGE_START_KEYS[0]}, {RANGE_END_KEYS[0]}"
+            )
+        return start, end
+    if isinstance(entry, (list, tuple)) and len(entry) == 2:
+        return entry[0], entry[1]
+    raise TypeError("expected [start, end] or an object with start_s/end_s")
+
+
+def extract_audio_ranges(
+    audio_path: str,
+    ranges: Sequence[Tuple[float, float]],
+    extractor: str = "acoustic",
+    features: Optional[Iterable[str]] = None,
+    jobs: int = 1,
+    decode_cache: Optional[DecodeCache] = None,
+) -> List[SegmentAnalysis]:
+    """音声ファイルを一度だけデコードし、複数区間の特徴量を抽出する
+
+    ``extract`` と同じく元のサンプリング周波数のまま分析する
+
+    Args:
+        audio_path: 音声ファイルのパス
+        ranges: (開始時刻, 終了時刻) のリスト（秒）
+        extractor: 特徴量抽出器名（``available_extractors()`` のいずれか）
+        features: 計算する特徴量グループ（省略時は ``DEFAULT_FEATURE_GROUPS``）
+        jobs: ワーカープロセス数（1でプロセスを使わず逐次実行）
+        decode_cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+
+    Returns:
+        区間ごとの特徴量（``ranges`` と同じ順、``segment_id`` は区間の番号）
+    """
+    audio, sr = load_audio(audio_path, sr=None, cache=decode_cache)
+    return extract_ranges(audio, sr, ranges, extractor, features, jobs)
+
+
+def extract_ranges(
+    audio: np.ndarray,
+    sr: int,
+    ranges: Sequence[Tuple[float, float]],
+    extractor: str = "acoustic",
+    features: Optional[Iterable[str]] = None,
+    jobs: int = 1,
+) -> List[SegmentAnalysis]:
+    """デコード済みの音声から複数区間の特徴量を抽出する
+
+    各区間の値は、元のサンプリング周波数のまま ``extract --segment-start/--segment-end``
+    で1区間ずつ抽出した場合と同じになる。音声は共有メモリに一度だけ置いて
+    ワーカーには参照を渡し、区間ごとには時刻のみを送る
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        ranges: (開始時刻, 終了時刻) のリスト（秒）
+        extractor: 特徴量抽出器名（``available_extractors()`` のいずれか）
+        features: 計算する特徴量グループ（省略時は ``DEFAULT_FEATURE_GROUPS``）
+        jobs: ワーカープロセス数（1でプロセスを使わず逐次実行）
+
+    Returns:
+        区間ごとの特徴量（``ranges`` と同じ順、``segment_id`` は区間の番号）
+
+    Raises:
+        ValueError: 抽出器名・特徴量グループ・ワーカー数が不正な場合、
+            または音声の範囲外の区間がある場合
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if features is not None:
+        features = parse_features(features)
+    duration = len(audio) / sr
+    for number, (start, end) in enumerate(ranges, start=1):
+        if not 0 <= start < end or start >= duration:
+            raise ValueError(
+                f"range {number} ({start}s - {end}s) is outside the audio "
+                f"(0s - {duration:.3f}s)"
+            )
+    # 未登録の抽出器名・特徴量グループはワーカー起動前にここで検出する
+    instance = get_extractor(extractor, features=features)
+
+    jobs = min(jobs, len(ranges))
+    if jobs <= 1:
+        values = [instance.extract(_range_audio(audio, sr, r), sr) for r in ranges]
+    else:
+        chunksize = max(1, len(ranges) // (jobs * 4))
+        with (
+            SharedAudio(audio) as shared,
+            ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(shared.handle, sr, extractor, features),
+            ) as executor,
+        ):
+            values = list(executor.map(_extract_range, ranges, chunksize=chunksize))
+
+    return [
+        SegmentAnalysis(
+            segment_id=number,
+            time_start_s=float(start),
+            time_end_s=float(min(end, duration)),
+            features=value,
+        )
+        for number, ((start, end), value) in enumerate(zip(ranges, values), start=1)
+    ]
+
+
+def _init_worker(
+    handle: AudioHandle,
+    sr: int,
+    extractor: str,
+    features: Optional[Tuple[str, ...]],
+) -> None:
+    """ワーカーに共有された音声と抽出器を設定する（ワーカーごとに一度だけ）"""
+    global _worker_audio, _worker_sr, _worker_extractor
+    _worker_audio = attach_audio(handle)
+    _worker_sr = sr
+    _worker_extractor = get_extractor(extractor, features=features)
+
+
+def _extract_range(time_range: Tuple[float, float]) -> FeatureData:
+    """ワーカーに設定した音声の1区間の特徴量を抽出する"""
+    return _worker_extractor.extract(
+        _range_audio(_worker_audio, _worker_sr, time_range), _worker_sr
+    )
+
+
+def _range_audio(
+    audio: np.ndarray, sr: int, time_range: Tuple[float, float]
+) -> np.ndarray:
+    """区間の音声を取り出す（``load_audio_range`` と同じサンプル範囲）"""
+    start, end = time_range
+    return audio[int(start * sr) : int(end * sr)]
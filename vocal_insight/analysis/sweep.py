@@ -0,0 +1,238 @@
+"""
+パラメータスイープ
+
+新しいジャンル向けに ``rms_delta_percentile``・``min_len_sec``・``max_len_sec``
+などを調整する際、設定ごとに分析を実行するとデコード・RMS・Praat の分析が
+毎回繰り返される。ここでは音声のデコードとトラック全体のフレーム系列
+（RMS・ピッチ輪郭・HNR・フォルマント）の計算を一度だけ行い、設定ごとには
+セグメント分割のやり直しと、共有したフレーム系列の区間集約のみを行う
+"""
+
+import itertools
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import get_default_config, parse_features
+from ..core.decode import DecodeCache, load_audio
+from ..core.types import AnalysisConfig, SweepResult
+from ..features.energy import energy_statistics
+from ..features.graph import STFT_HOP_LENGTH, FeatureContext
+from ..features.windowed import (
+    WINDOWED_FEATURE_GROUPS,
+    FramePrefixSums,
+    frame_series,
+    windowed_features,
+)
+from .pipeline import detect_segments
+
+# スイープで評価できる特徴量グループ（フレーム系列の区間集約で求まるもの）
+SWEEP_FEATURE_GROUPS = WINDOWED_FEATURE_GROUPS + ("energy",)
+
+# 比較表に出力するスカラー特徴量（選択されたグループのもの）
+SWEEP_FEATURE_FIELDS = (
+    "f0_mean_hz",
+    "hnr_mean_db",
+    "f1_mean_hz",
+    "f2_mean_hz",
+    "f3_mean_hz",
+    "rms_mean",
+)
+
+
+def config_grid(
+    base: Optional[AnalysisConfig] = None, **values: Iterable
+) -> List[AnalysisConfig]:
+    """設定値の組み合わせ（直積）から設定のリストを作成
+
+    Args:
+        base: 指定しない項目に使う設定（省略時はデフォルト）
+        **values: 項目名をキーにした候補値のリスト
+            （例: ``rms_delta_percentile=[90, 95]``）
+
+    Returns:
+        全ての組み合わせの設定のリスト（後のキーほど内側で変化する）
+    """
+    base = dict(base if base is not None else get_default_config())
+    keys = list(values)
+    return [
+        AnalysisConfig(**{**base, **dict(zip(keys, combination))})
+        for combination in itertools.product(*(list(values[key]) for key in keys))
+    ]
+
+
+def sweep_audio_segments(
+    audio_path: str,
+    configs: Sequence[AnalysisConfig],
+    features: Optional[Iterable[str]] = None,
+    decode_cache: Optional[DecodeCache] = None,
+) -> List[SweepResult]:
+    """音声ファイルを一度だけデコードし、複数の分析設定を評価する
+
+    Args:
+        audio_path: 音声ファイルのパス
+        configs: 評価する分析設定のリスト
+        features: 比較する特徴量グループ（SWEEP_FEATURE_GROUPS のうち）。
+            省略時は "f0", "hnr", "formants"
+        decode_cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+
+    Returns:
+        設定ごとの評価結果（``configs`` と同じ順）
+
+    Raises:
+        ValueError: スイープで評価できない特徴量グループが指定された場合
+    """
+    audio, sr = load_audio(audio_path, cache=decode_cache)
+    return sweep_audio(audio, sr, configs, features)
+
+
+def sweep_audio(
+    audio: np.ndarray,
+    sr: int,
+    configs: Sequence[AnalysisConfig],
+    features: Optional[Iterable[str]] = None,
+) -> List[SweepResult]:
+    """デコード済みの音声で複数の分析設定を評価する
+
+    トラック全体の中間表現はピッチエンジンごとに一度だけ計算し、フォルマントの
+    フレーム系列はフォルマントエンジンごとに一度だけ計算する。各セグメントの
+    特徴量はトラック全体のフレーム系列から求めるため、セグメントごとに分析する
+    ``analyze_audio_segments`` とはセグメント端のフレームの分だけ値が異なる
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        configs: 評価する分析設定のリスト
+        features: 比較する特徴量グループ（SWEEP_FEATURE_GROUPS のうち）
+
+    Returns:
+        設定ごとの評価結果（``configs`` と同じ順）
+
+    Raises:
+        ValueError: スイープで評価できない特徴量グループが指定された場合
+    """
+    groups = parse_features(features)
+    unsupported = [group for group in groups if group not in SWEEP_FEATURE_GROUPS]
+    if unsupported:
+        raise ValueError(
+            f"sweep cannot evaluate features {unsupported}; "
+            f"choose from {list(SWEEP_FEATURE_GROUPS)}"
+        )
+
+    tracks: Dict[str, FeatureContext] = {}
+    series: Dict[Tuple[str, str], Dict[str, FramePrefixSums]] = {}
+    results = []
+    for config in configs:
+        pitch_engine = config.get("pitch_engine", "praat")
+        formant_engine = config.get("formant_engine", "burg")
+        if pitch_engine not in tracks:
+            tracks[pitch_engine] = FeatureContext(audio, sr, pitch_engine)
+        track = tracks[pitch_engine]
+        if (pitch_engine, formant_engine) not in series:
+            series[pitch_engine, formant_engine] = frame_series(
+                track, groups, formant_engine
+            )
+
+        # 境界検出はトラック全体のRMS・ピッチ輪郭を共有してやり直す
+        contour = None
+        if config.get("segmentation", "rms") == "phrase":
+            contour = track.get("contour")
+        segments, _ = detect_segments(
+            audio, sr, config, contour=contour, rms=track.get("rms")
+        )
+
+        values = windowed_features(series[pitch_engine, formant_engine], segments)
+        if "energy" in groups:
+            energy = energy_statistics(track.get("rms"), sr, STFT_HOP_LENGTH, segments)
+            for value, stats in zip(values, energy):
+                value.update(stats)
+        results.append(_summarize(config, segments, values))
+    return results
+
+
+def _summarize(
+    config: AnalysisConfig,
+    segments: List[Tuple[float, float]],
+    values: List[dict],
+) -> SweepResult:
+    """セグメント長の分布と特徴量のセグメント間の標準偏差を集計"""
+    lengths = np.array([end - start for start, end in segments])
+    fields = [field for field in SWEEP_FEATURE_FIELDS if values and field in values[0]]
+    return SweepResult(
+        config=config,
+        n_segments=len(segments),
+        length_min_s=float(lengths.min()) if len(lengths) else 0.0,
+        length_median_s=float(np.median(lengths)) if len(lengths) else 0.0,
+        length_max_s=float(lengths.max()) if len(lengths) else 0.0,
+        feature_std={
+            field: float(np.std([value[field] for value in values])) for field in fields
+        },
+    )
+
+
+def format_sweep_table(results: Sequence[SweepResult]) -> str:
+    """評価結果を設定ごとに1行の比較表（固定幅テキスト）にする
+
+    設定項目は結果の間で値が異なるものだけを列として出力する
+
+    Args:
+        results: ``sweep_audio`` の評価結果
+
+    Returns:
+        比較表の文字列
+    """
+    rows = table_rows(results)
+    if not rows:
+        return ""
+    columns = list(rows[0])
+    cells = [[_format_cell(row[column]) for column in columns] for row in rows]
+    widths = [
+        max(len(column), *(len(row[index]) for row in cells))
+        for index, column in enumerate(columns)
+    ]
+    lines = [
+        "  ".join(column.rjust(width) for column, width in zip(columns, widths)),
+        "  ".join("-" * width for width in widths),
+    ]
+    lines.extend(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths))
+        for row in cells
+    )
+    return "\n".join(lines)
+
+
+def table_rows(results: Sequence[SweepResult]) -> List[Dict[str, object]]:
+    """評価結果を比較表の行（列名をキーにした辞書）に平坦化
+
+    Args:
+        results: ``sweep_audio`` の評価結果
+
+    Returns:
+        設定ごとの行。値が異なる設定項目、セグメント数・長さの分布、
+        特徴量ごとの ``std_<フィールド名>`` の列を持つ
+    """
+    if not results:
+        return []
+    keys = [key for key in results[0]["config"]]
+    varying = [
+        key
+        for key in keys
+        if len({repr(result["config"].get(key)) for result in results}) > 1
+    ]
+    return [
+        {
+            **{key: result["config"].get(key) for key in varying},
+            "segments": result["n_segments"],
+            "len_min_s": result["length_min_s"],
+            "len_median_s": result["length_median_s"],
+            "len_max_s": result["length_max_s"],
+            **{f"std_{field}": value for field, value in result["feature_std"].items()},
+        }
+        for result in results
+    ]
+
+
+def _format_cell(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
@@ -4,13 +4,50 @@
 共通型定義、設定管理、ユーティリティを提供
 """
 
-from .config import get_default_config, validate_config
-from .types import AnalysisConfig, FeatureData, SegmentAnalysis
+from .config import (
+    DEFAULT_FEATURE_GROUPS,
+    FEATURE_GROUPS,
+    get_default_config,
+    parse_features,
+    validate_config,
+)
+from .decode import (
+    AUDIO_SUFFIXES,
+    DecodeCache,
+    list_audio_files,
+    load_audio,
+    load_audio_range,
+)
+from .prefetch import DecodedFile, PrefetchLoader, PrefetchStats
+from .shared import AudioHandle, SharedAudio, attach_audio
+from .types import (
+    AnalysisConfig,
+    ClipAnalysis,
+    FeatureData,
+    SegmentAnalysis,
+    SweepResult,
+)
 
 __all__ = [
     "FeatureData",
     "SegmentAnalysis",
+    "ClipAnalysis",
+    "SweepResult",
     "AnalysisConfig",
     "get_default_config",
     "validate_config",
+    "parse_features",
+    "FEATURE_GROUPS",
+    "DEFAULT_FEATURE_GROUPS",
+    "DecodeCache",
+    "load_audio",
+    "load_audio_range",
+    "AUDIO_SUFFIXES",
+    "list_audio_files",
+    "DecodedFile",
+    "PrefetchLoader",
+    "PrefetchStats",
+    "AudioHandle",
+    "SharedAudio",
+    "attach_audio",
 ]
@@ -4,8 +4,56 @@
 デフォルト設定と設定の検証機能を提供
 """
 
+from typing import Iterable, Optional, Tuple, Union
+
 from .types import AnalysisConfig
 
+# サポートするセグメンテーション方式
+SEGMENTATION_METHODS = ("rms", "phrase", "window")
+
+# サポートするピッチエンジン
+PITCH_ENGINES = ("praat", "yin")
+
+# サポートするフォルマントエンジン
+FORMANT_ENGINES = ("burg", "lpc")
+
+# 選択可能な特徴量グループと、各グループが出力する FeatureData のフィールド
+FEATURE_GROUPS = {
+    "f0": ("f0_mean_hz", "f0_std_hz"),
+    "hnr": ("hnr_mean_db",),
+    "formants": ("f1_mean_hz", "f2_mean_hz", "f3_mean_hz"),
+    "energy": (
+        "rms_mean",
+        "dynamic_range_db",
+        "crest_factor_db",
+        "loudness_slope_db_per_s",
+    ),
+    "voice_quality": (
+        "jitter_local",
+        "shimmer_local",
+        "vibrato_rate_hz",
+        "vibrato_extent_cents",
+    ),
+    "spectral": (
+        "spectral_centroid_hz",
+        "spectral_flux",
+        "spectral_rolloff_hz",
+        "mfcc_mean",
+        "mfcc_std",
+    ),
+}
+
+# 特徴量の指定を省略した場合に計算するグループ。それ以外（energy, voice_quality,
+# spectral）は明示的に選択した場合のみ計算し、結果にもフィールドを含める
+DEFAULT_FEATURE_GROUPS = ("f0", "hnr", "formants")
+
+# フレーズ区切りとみなす無声区間の最小長（秒）のデフォルト値
+DEFAULT_MIN_GAP_SEC = 0.3
+
+# スライディング窓（segmentation="window"）の窓の長さと間隔（秒）のデフォルト値
+DEFAULT_WINDOW_SEC = 3.0
+DEFAULT_WINDOW_HOP_SEC = 0.5
+
 
 def get_default_config() -> AnalysisConfig:
     """デフォルト分析設定を取得
@@ -13,7 +61,17 @@ def get_default_config() -> AnalysisConfig:
     Returns:
         デフォルトの分析設定
     """
-    return AnalysisConfig(rms_delta_percentile=95, min_len_sec=8.0, max_len_sec=45.0)
+    return AnalysisConfig(
+        rms_delta_percentile=95,
+        min_len_sec=8.0,
+        max_len_sec=45.0,
+        segmentation="rms",
+        min_gap_sec=DEFAULT_MIN_GAP_SEC,
+        window_sec=DEFAULT_WINDOW_SEC,
+        window_hop_sec=DEFAULT_WINDOW_HOP_SEC,
+        pitch_engine="praat",
+        formant_engine="burg",
+    )
 
 
 def validate_config(config: AnalysisConfig) -> bool:
@@ -40,4 +98,59 @@ def validate_config(config: AnalysisConfig) -> bool:
     if config["min_len_sec"] >= config["max_len_sec"]:
         raise ValueError("min_len_sec must be less than max_len_sec")
 
+    if config.get("segmentation", "rms") not in SEGMENTATION_METHODS:
+        raise ValueError(f"segmentation must be one of {SEGMENTATION_METHODS}")
+
+    if config.get("min_gap_sec", DEFAULT_MIN_GAP_SEC) < 0:
+        raise ValueError("min_gap_sec must be positive")
+
+    if config.get("window_sec", DEFAULT_WINDOW_SEC) <= 0:
+        raise ValueError("window_sec must be positive")
+
+    if config.get("window_hop_sec", DEFAULT_WINDOW_HOP_SEC) <= 0:
+        raise ValueError("window_hop_sec must be positive")
+
+    if config.get("pitch_engine", "praat") not in PITCH_ENGINES:
+        raise ValueError(f"pitch_engine must be one of {PITCH_ENGINES}")
+
+    if config.get("formant_engine", "burg") not in FORMANT_ENGINES:
+        raise ValueError(f"formant_engine must be one of {FORMANT_ENGINES}")
+
     return True
+
+
+def parse_features(
+    features: Optional[Union[str, Iterable[str]]] = None,
+) -> Tuple[str, ...]:
+    """特徴量グループの選択を正規化
+
+    Args:
+        features: 特徴量グループ名のリスト、またはカンマ区切りの文字列
+            （例: "f0,hnr"）。None の場合は DEFAULT_FEATURE_GROUPS、
+            "all" の場合は全グループ
+
+    Returns:
+        FEATURE_GROUPS の定義順に並べた特徴量グループ名のタプル
+
+    Raises:
+        ValueError: 未知の特徴量グループが指定された場合
+    """
+    if features is None:
+        return DEFAULT_FEATURE_GROUPS
+
+    if isinstance(features, str):
+        features = features.split(",")
+
+    requested = {name.strip().lower() for name in features if name.strip()}
+    if not requested:
+        return DEFAULT_FEATURE_GROUPS
+    if "all" in requested:
+        return tuple(FEATURE_GROUPS)
+
+    unknown = requested - set(FEATURE_GROUPS)
+    if unknown:
+        raise ValueError(
+            f"unknown features {sorted(unknown)}; choose from {list(FEATURE_GROUPS)}"
+        )
+
+    return tuple(name for name in FEATURE_GROUPS if name in requested)
@@ -0,0 +1,295 @@
+"""
+デコード済み音声のキャッシュ
+
+MP3/M4A などの圧縮音源は ``librosa.load``（audioread/ffmpeg）でのデコードが
+処理時間の大きな割合を占め、``analyze``・``extract``・``segment`` がそれぞれ
+デコードし直す。ここでは入力ごとに一度だけデコードし、分析用のサンプリング
+周波数の float32 ``.npy`` としてファイル内容のハッシュをキーに保存する。
+以降の読み込みはメモリマップのため、繰り返しの読み込みや一部区間の参照は
+コピーを伴わない。キャッシュ全体の容量は上限を超えると最終利用時刻の古い順に削除する。
+
+一部区間のみが必要な場合（``extract --segment-start/--segment-end``）は
+``load_audio_range`` がシーク可能な形式（WAV/FLAC/OGG など soundfile で
+開ける形式）の該当区間だけを読み込み、それ以外の形式は終了位置までの
+デコードで打ち切る
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from .storage import atomic_write, audio_hash, settings_digest
+
+# 保存形式のバージョン（保存内容を変更した場合は更新してキャッシュを無効化）
+DECODE_FORMAT_VERSION = 1
+
+# キャッシュ容量の上限のデフォルト値（バイト）
+DEFAULT_DECODE_CACHE_BYTES = 2 << 30
+
+# librosa.load と同じ分析用サンプリング周波数のデフォルト値
+DEFAULT_ANALYSIS_SR = 22050
+
+# ディレクトリ入力で音声ファイルとみなす拡張子
+AUDIO_SUFFIXES = (".wav", ".flac", ".mp3", ".m4a", ".ogg", ".aif", ".aiff")
+
+
+class DecodeCache:
+    """デコード済み音声のディスクキャッシュ
+
+    ``<キー>.npy`` にモノラル float32 の音声を、``<キー>.json`` にサンプリング
+    周波数などのメタデータを保存する。キーは音声ファイルの内容ハッシュ・
+    サンプリング周波数・保存形式バージョンから決まる。読み込むたびに最終利用
+    時刻（``.npy`` の更新時刻）を更新し、保存後に容量が ``max_bytes`` を超えて
+    いれば最終利用時刻の古いエントリから削除する
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_bytes: int = DEFAULT_DECODE_CACHE_BYTES,
+    ):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（存在しない場合は作成）
+            max_bytes: キャッシュ容量の上限（バイト）
+
+        Raises:
+            ValueError: 容量の上限が正でない場合
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+
+    def key(self, path: Union[str, Path], sr: Optional[int]) -> str:
+        """キャッシュキーを計算
+
+        Args:
+            path: 音声ファイルのパス
+            sr: 分析用のサンプリング周波数（Noneで元のまま）
+
+        Returns:
+            キャッシュキー
+        """
+        rate = "native" if sr is None else int(sr)
+        digest = settings_digest(rate, f"v{DECODE_FORMAT_VERSION}")
+        return f"{audio_hash(path)}-{digest}"
+
+    def load(
+        self, path: Union[str, Path], sr: Optional[int] = DEFAULT_ANALYSIS_SR
+    ) -> Tuple[np.ndarray, int, bool]:
+        """音声を読み込む（未保存ならデコードして保存）
+
+        Args:
+            path: 音声ファイルのパス
+            sr: 分析用のサンプリング周波数（Noneで元のまま）
+
+        Returns:
+            メモリマップされた読み取り専用のモノラル音声、サンプリング周波数、
+            キャッシュから読み込んだかどうかのタプル
+        """
+        key = self.key(path, sr)
+        cached = self._load(key)
+        if cached is not None:
+            return cached[0], cached[1], True
+
+        audio, decoded_sr = librosa.load(str(path), sr=sr)
+        self._save(key, np.asarray(audio, dtype=np.float32), decoded_sr, path)
+        self.evict(keep=key)
+        cached = self._load(key)
+        if cached is None:
+            # 保存直後に他のプロセスが削除した場合はデコード結果をそのまま返す
+            return audio, int(decoded_sr), False
+        return cached[0], cached[1], False
+
+    def size(self) -> int:
+        """キャッシュの合計サイズ（バイト）"""
+        return sum(path.stat().st_size for path in self._entries())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """容量の上限を超えている間、最終利用時刻の古いエントリから削除
+
+        Args:
+            keep: 削除しないエントリのキー（保存直後のエントリ）
+
+        Returns:
+            削除したバイト数
+        """
+        entries = []
+        for array_path in self.cache_dir.glob("*.npy"):
+            meta_path = array_path.with_suffix(".json")
+            try:
+                stat = array_path.stat()
+                size = stat.st_size + (
+                    meta_path.stat().st_size if meta_path.exists() else 0
+                )
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, array_path.stem, size))
+
+        total = sum(size for _, _, size in entries)
+        freed = 0
+        for _, key, size in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            array_path, meta_path = self._paths(key)
+            # メタデータを先に削除し、読み込み中の判定から外す
+            for entry_path in (meta_path, array_path):
+                try:
+                    entry_path.unlink()
+                except FileNotFoundError:
+                    pass
+            freed += size
+        return freed
+
+    def _entries(self):
+        for pattern in ("*.npy", "*.json"):
+            yield from self.cache_dir.glob(pattern)
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.npy", self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        """保存済みの音声をメモリマップで読み込む（未保存・破損時はNone）"""
+        array_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            audio = np.load(array_path, mmap_mode="r")
+            # 最終利用時刻を更新（容量超過時の削除順に使う）
+            os.utime(array_path)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != DECODE_FORMAT_VERSION or len(audio) != meta.get(
+            "n_samples"
+        ):
+            return None
+        return audio, int(meta["sr"])
+
+    def _save(
+        self, key: str, audio: np.ndarray, sr: int, path: Union[str, Path]
+    ) -> None:
+        """音声とメタデータを一時ファイル経由でアトミックに保存"""
+        array_path, meta_path = self._paths(key)
+        meta = {
+            "version": DECODE_FORMAT_VERSION,
+            "source_path": str(path),
+            "sr": int(sr),
+            "n_samples": len(audio),
+        }
+        # 配列を先に保存し、メタデータの存在をもって保存完了とする
+        atomic_write(array_path, lambda f: np.save(f, audio))
+        atomic_write(
+            meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode("utf-8"))
+        )
+
+
+def load_audio(
+    path: Union[str, Path],
+    sr: Optional[int] = DEFAULT_ANALYSIS_SR,
+    cache: Optional[DecodeCache] = None,
+) -> Tuple[np.ndarray, int]:
+    """音声ファイルをモノラルで読み込む（キャッシュ指定時はデコード結果を再利用）
+
+    Args:
+        path: 音声ファイルのパス
+        sr: 分析用のサンプリング周波数（Noneで元のまま）
+        cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+
+    Returns:
+        音声データ（キャッシュ使用時はメモリマップされた読み取り専用配列）と
+        サンプリング周波数のタプル
+    """
+    if cache is None:
+        audio, sr = librosa.load(str(path), sr=sr)
+        return audio, int(sr)
+    audio, sr, _ = cache.load(path, sr)
+    return audio, sr
+
+
+def list_audio_files(directory: Union[str, Path]) -> List[Path]:
+    """ディレクトリ直下の音声ファイルを列挙する
+
+    Args:
+        directory: ディレクトリのパス
+
+    Returns:
+        拡張子が ``AUDIO_SUFFIXES`` のファイルのパス（名前順）
+    """
+    return sorted(
+        path
+        for path in Path(directory).iterdir()
+        if path.is_file() and path.suffix.lower() in AUDIO_SUFFIXES
+    )
+
+
+def load_audio_range(
+    path: Union[str, Path],
+    start_sec: Optional[float] = None,
+    end_sec: Optional[float] = None,
+    sr: Optional[int] = None,
+    cache: Optional[DecodeCache] = None,
+) -> Tuple[np.ndarray, int]:
+    """音声ファイルの区間 [start_sec, end_sec) をモノラルで読み込む
+
+    区間はファイル全体を読み込んでから ``audio[int(start_sec * sr):int(end_sec * sr)]``
+    で切り出した場合と同じサンプルになる（``sr`` 指定時は切り出した区間を
+    リサンプリングするため、区間の端のサンプルはわずかに異なる）。
+
+    - キャッシュ指定時: キャッシュのメモリマップから切り出す（コピーなし）
+    - soundfile で開ける形式: 開始位置にシークして区間のみを読み込む
+    - それ以外: ``librosa.load`` の ``offset``/``duration`` で終了位置までの
+      デコードで打ち切る
+
+    Args:
+        path: 音声ファイルのパス
+        start_sec: 開始時刻（秒、Noneでファイル先頭）
+        end_sec: 終了時刻（秒、Noneでファイル末尾）
+        sr: 分析用のサンプリング周波数（Noneで元のまま）
+        cache: デコード済み音声のキャッシュ
+
+    Returns:
+        区間の音声データとサンプリング周波数のタプル
+    """
+    if cache is not None:
+        audio, sr = load_audio(path, sr=sr, cache=cache)
+        return audio[_sample_range(start_sec, end_sec, sr, len(audio))], sr
+
+    try:
+        with sf.SoundFile(str(path)) as f:
+            native_sr = f.samplerate
+            frames = _sample_range(start_sec, end_sec, native_sr, f.frames)
+            f.seek(frames.start)
+            data = f.read(
+                max(frames.stop - frames.start, 0), dtype="float32", always_2d=True
+            )
+    except (sf.LibsndfileError, RuntimeError):
+        # soundfile で開けない形式は終了位置までデコードして打ち切る
+        offset = start_sec or 0.0
+        duration = None if end_sec is None else max(end_sec - offset, 0.0)
+        audio, sr = librosa.load(str(path), sr=sr, offset=offset, duration=duration)
+        return audio, int(sr)
+
+    audio = np.ascontiguousarray(data.mean(axis=1), dtype=np.float32)
+    if sr is not None and sr != native_sr and len(audio):
+        audio = librosa.resample(audio, orig_sr=native_sr, target_sr=sr)
+        return audio, int(sr)
+    return audio, int(native_sr)
+
+
+def _sample_range(
+    start_sec: Optional[float], end_sec: Optional[float], sr: int, n_samples: int
+) -> slice:
+    """区間の秒をサンプル番号の範囲（全体の長さに収めたもの）に変換"""
+    start = int(start_sec * sr) if start_sec is not None else 0
+    end = int(end_sec * sr) if end_sec is not None else n_samples
+    start = min(max(start, 0), n_samples)
+    return slice(start, min(max(end, start), n_samples))
@@ -0,0 +1,203 @@
+"""
+複数ファイルの先読みデコード
+
+ディレクトリ内の多数のファイルを順に分析する場合、ファイルごとに
+「デコード → 分析」を直列に行うと、デコード（特に MP3/M4A の ffmpeg による
+デコードやディスクの読み込み）の間は分析が止まる。``PrefetchLoader`` は
+後続のファイルをバックグラウンドのスレッドでデコードして上限付きのキューに
+積み、現在のファイルの分析と重ねる。キューの上限（``depth``）により、
+先読みで保持するデコード済み音声は、キューの ``depth`` ファイルとデコード中の
+1ファイルまでに抑えられる
+
+デコードにかかった時間と、分析側がデコードを待った時間を記録し、デコード
+時間のうち分析と重なった割合（``PrefetchStats.overlap``）を求める
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .decode import DEFAULT_ANALYSIS_SR, DecodeCache, load_audio
+
+# 先読みするファイル数のデフォルト値
+DEFAULT_PREFETCH_DEPTH = 2
+
+# キューの終端を表す値
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class DecodedFile:
+    """先読みでデコードした1ファイル
+
+    Attributes:
+        path: 音声ファイルのパス
+        audio: 音声データ（デコードに失敗した場合はNone）
+        sr: サンプリング周波数（デコードに失敗した場合は0）
+        decode_sec: デコードにかかった時間（秒）
+        error: デコードで送出された例外（成功した場合はNone）
+    """
+
+    path: Path
+    audio: Optional[np.ndarray]
+    sr: int
+    decode_sec: float
+    error: Optional[BaseException] = None
+
+
+@dataclass(frozen=True)
+class PrefetchStats:
+    """先読みの計測結果
+
+    Attributes:
+        files: 受け取ったファイル数
+        decode_sec: デコードにかかった時間の合計（秒）
+        wait_sec: 分析側がデコードを待った時間の合計（秒）
+    """
+
+    files: int
+    decode_sec: float
+    wait_sec: float
+
+    @property
+    def overlap(self) -> float:
+        """デコード時間のうち分析と重なった割合（0〜1）"""
+        if self.decode_sec <= 0:
+            return 0.0
+        return min(max(1.0 - self.wait_sec / self.decode_sec, 0.0), 1.0)
+
+
+class PrefetchLoader:
+    """後続のファイルをバックグラウンドでデコードするローダー
+
+    ファイルを ``paths`` の順に ``DecodedFile`` として返す。デコードに失敗した
+    ファイルも ``error`` を設定して同じ位置で返すため、呼び出し側はファイル
+    ごとにエラーを扱える::
+
+        with PrefetchLoader(paths, cache=cache) as loader:
+            for item in loader:
+                if item.error is None:
+                    analyze(item.audio, item.sr)
+        print(loader.stats.overlap)
+
+    ``depth=0`` の場合はスレッドを使わず、要求されたときにデコードする
+    （直列の処理と同じ）
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Union[str, Path]],
+        sr: Optional[int] = DEFAULT_ANALYSIS_SR,
+        cache: Optional[DecodeCache] = None,
+        depth: int = DEFAULT_PREFETCH_DEPTH,
+    ):
+        """
+        Args:
+            paths: 音声ファイルのパス（この順に返す）
+            sr: 分析用のサンプリング周波数（Noneで元のまま）
+            cache: デコード済み音声のキャッシュ（Noneで毎回デコード）
+            depth: 先読みするファイル数（0で先読みしない）
+
+        Raises:
+            ValueError: 先読みするファイル数が負の場合
+        """
+        if depth < 0:
+            raise ValueError("depth must not be negative")
+        self.paths: List[Path] = [Path(path) for path in paths]
+        self.sr = sr
+        self.cache = cache
+        self.depth = int(depth)
+        self._files = 0
+        self._decode_sec = 0.0
+        self._wait_sec = 0.0
+        self._stop = threading.Event()
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stats(self) -> PrefetchStats:
+        """これまでに受け取ったファイルの計測結果"""
+        return PrefetchStats(self._files, self._decode_sec, self._wait_sec)
+
+    def __iter__(self) -> Iterator[DecodedFile]:
+        if self.depth == 0:
+            for path in self.paths:
+                if self._stop.is_set():
+                    return
+                item = self._decode(path)
+                # 先読みしない場合はデコード時間の全体を待つ
+                self._record(item, item.decode_sec)
+                yield item
+            return
+
+        if self._thread is not None:
+            raise RuntimeError("PrefetchLoader can only be iterated once")
+        self._queue = queue.Queue(maxsize=self.depth)
+        self._thread = threading.Thread(
+            target=self._fill, name="vocal-insight-prefetch", daemon=True
+        )
+        self._thread.start()
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            item = self._queue.get()
+            wait = time.perf_counter() - start
+            if item is _DONE:
+                return
+            self._record(item, wait)
+            yield item
+
+    def close(self) -> None:
+        """先読みを止めてスレッドの終了を待つ（複数回呼んでもよい）"""
+        self._stop.set()
+        if self._thread is None:
+            return
+        # キューの空きを待っているスレッドを進めるため、残りを捨てる
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(timeout=0.05)
+
+    def __enter__(self) -> "PrefetchLoader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _decode(self, path: Path) -> DecodedFile:
+        start = time.perf_counter()
+        try:
+            audio, sr = load_audio(path, sr=self.sr, cache=self.cache)
+        except Exception as e:
+            return DecodedFile(path, None, 0, time.perf_counter() - start, e)
+        return DecodedFile(path, audio, sr, time.perf_counter() - start)
+
+    def _record(self, item: DecodedFile, wait: float) -> None:
+        self._files += 1
+        self._decode_sec += item.decode_sec
+        self._wait_sec += wait
+
+    def _fill(self) -> None:
+        """バックグラウンドのスレッドでファイルを順にデコードしてキューに積む"""
+        for path in self.paths:
+            if self._stop.is_set():
+                break
+            if not self._put(self._decode(path)):
+                return
+        self._put(_DONE)
+
+    def _put(self, item: object) -> bool:
+        """キューに空きができるまで待って積む（停止した場合は False）"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -0,0 +1,152 @@
+"""
+ワーカープロセスへの音声の受け渡し
+
+``ProcessPoolExecutor`` の引数として音声配列を渡すと、ワーカーごと（または
+タスクごと）に pickle でコピーされる。48 kHz で数時間の音声ではギガバイト
+単位のコピーになるため、デコード済みの音声を共有メモリ
+（``multiprocessing.shared_memory``）に一度だけ置き、ワーカーには名前と形状
+だけの小さな参照（``AudioHandle``）を渡す。ワーカーは参照から読み取り専用の
+ビューを作り、区間はサンプル位置で切り出す
+
+デコードキャッシュから読み込んだメモリマップの音声は、共有メモリへ
+コピーせず同じファイルをワーカーでもメモリマップする
+
+共有メモリは作成したプロセスが ``SharedAudio`` の終了時（``with`` ブロックの
+終了・``close()``・オブジェクトの破棄）に削除する。ワーカーが異常終了しても
+親プロセスでの削除は変わらず、親プロセス自体が強制終了した場合は
+multiprocessing の resource tracker が削除する
+"""
+
+import mmap
+import weakref
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AudioHandle:
+    """ワーカーへ渡す音声の参照
+
+    Attributes:
+        shape: 配列の形状
+        dtype: 配列のデータ型
+        shm_name: 共有メモリの名前（メモリマップファイルの場合はNone）
+        path: メモリマップファイルのパス（共有メモリの場合はNone）
+        offset: メモリマップファイル内の配列の開始位置（バイト）
+    """
+
+    shape: Tuple[int, ...]
+    dtype: str
+    shm_name: Optional[str] = None
+    path: Optional[str] = None
+    offset: int = 0
+
+
+class SharedAudio:
+    """ワーカープロセスと共有する音声
+
+    ``with`` ブロックの間、``handle`` をワーカーに渡すと ``attach_audio`` で
+    同じ音声を参照できる::
+
+        with SharedAudio(audio) as shared:
+            executor = ProcessPoolExecutor(
+                initializer=_init_worker, initargs=(shared.handle,)
+            )
+    """
+
+    def __init__(self, audio: np.ndarray):
+        """
+        Args:
+            audio: 共有する音声データ（メモリマップの場合はファイルを共有）
+        """
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        if _is_mapped_file(audio):
+            self.handle = AudioHandle(
+                shape=audio.shape,
+                dtype=audio.dtype.str,
+                path=str(audio.filename),
+                offset=int(audio.offset),
+            )
+        else:
+            audio = np.ascontiguousarray(audio)
+            # 長さ0の共有メモリは作れないため最低1バイト確保する
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=max(audio.nbytes, 1)
+            )
+            self._finalizer = weakref.finalize(self, _release, self._shm)
+            np.ndarray(audio.shape, dtype=audio.dtype, buffer=self._shm.buf)[...] = (
+                audio
+            )
+            self.handle = AudioHandle(
+                shape=audio.shape, dtype=audio.dtype.str, shm_name=self._shm.name
+            )
+
+    def close(self) -> None:
+        """共有メモリを削除する（複数回呼んでもよい）"""
+        if self._shm is not None:
+            self._finalizer()
+            self._shm = None
+
+    def __enter__(self) -> "SharedAudio":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# ワーカーで参照中の共有メモリ（名前 → SharedMemory）。ビューの参照先を
+# 保持するため、プロセスの終了まで閉じない
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def attach_audio(handle: AudioHandle) -> np.ndarray:
+    """参照から共有された音声の読み取り専用ビューを作る
+
+    Args:
+        handle: ``SharedAudio.handle``
+
+    Returns:
+        音声データ（コピーを伴わないビュー）
+
+    Raises:
+        FileNotFoundError: 共有メモリが既に削除されている場合
+    """
+    if handle.path is not None:
+        return np.memmap(
+            handle.path,
+            dtype=np.dtype(handle.dtype),
+            mode="r",
+            offset=handle.offset,
+            shape=handle.shape,
+        )
+    shm = _attached.get(handle.shm_name)
+    if shm is None:
+        shm = _attached[handle.shm_name] = shared_memory.SharedMemory(
+            name=handle.shm_name
+        )
+    audio = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf)
+    audio.flags.writeable = False
+    return audio
+
+
+def _is_mapped_file(audio: np.ndarray) -> bool:
+    """ファイル全体をメモリマップした配列か（切り出したビューは除く）"""
+    return (
+        isinstance(audio, np.memmap)
+        and audio.filename is not None
+        and isinstance(audio.base, mmap.mmap)
+        and audio.flags.c_contiguous
+    )
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # 同じプロセスにビューが残っている場合も名前は削除し、
+        # メモリはビューの解放時に解放させる
+        pass
+    shm.unlink()
@@ -0,0 +1,69 @@
+"""
+ディスクキャッシュ共通処理
+
+内容アドレス型キャッシュのキー計算（音声ハッシュ）と、
+一時ファイル経由のアトミックな書き込みを提供
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+# 音声入力: ファイルパス、または音声データ（サンプリング周波数は別途指定）
+AudioInput = Union[str, Path, np.ndarray]
+
+# ファイルハッシュ計算時の読み込み単位
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def audio_hash(audio: AudioInput, sr: Optional[int] = None) -> str:
+    """音声ファイルの内容、または音声データとサンプリング周波数のハッシュ
+
+    Args:
+        audio: ファイルパスまたは音声データ
+        sr: 音声データのサンプリング周波数（配列入力時に必須）
+
+    Returns:
+        SHA-256 の16進文字列
+
+    Raises:
+        ValueError: 配列入力でサンプリング周波数が指定されていない場合
+    """
+    digest = hashlib.sha256()
+    if isinstance(audio, np.ndarray):
+        if sr is None:
+            raise ValueError("sampling rate is required when audio is an array")
+        digest.update(f"{audio.dtype.str}:{int(sr)}:".encode())
+        digest.update(np.ascontiguousarray(audio).tobytes())
+    else:
+        with open(audio, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_digest(*settings: object) -> str:
+    """分析設定の短いハッシュ（キャッシュキーの設定部分）"""
+    text = ":".join(str(value) for value in settings)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def atomic_write(path: Path, write: Callable) -> None:
+    """同じディレクトリの一時ファイルに書き込んでから置き換える
+
+    Args:
+        path: 書き込み先
+        write: バイナリモードのファイルオブジェクトを受け取って書き込む関数
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -4,18 +4,42 @@
 アプリケーション全体で使用される型定義を提供
 """
 
-from typing import TypedDict
+from typing import Dict, List, Optional, TypedDict
 
 
-class FeatureData(TypedDict):
-    """音響特徴量データの型定義"""
+class _RequiredFeatureData(TypedDict):
+    """音響特徴量データの常に含まれる項目"""
 
-    f0_mean_hz: float
-    f0_std_hz: float
-    hnr_mean_db: float
-    f1_mean_hz: float
-    f2_mean_hz: float
-    f3_mean_hz: float
+    f0_mean_hz: Optional[float]
+    f0_std_hz: Optional[float]
+    hnr_mean_db: Optional[float]
+    f1_mean_hz: Optional[float]
+    f2_mean_hz: Optional[float]
+    f3_mean_hz: Optional[float]
+
+
+class FeatureData(_RequiredFeatureData, total=False):
+    """音響特徴量データの型定義
+
+    特徴量選択で計算対象外となったフィールドは None となる。
+    音量・声質特徴量・スペクトル特徴量（省略可能な項目）は "energy",
+    "voice_quality", "spectral" を選択した場合のみ含まれる。
+    """
+
+    rms_mean: Optional[float]  # フレームRMSの平均
+    dynamic_range_db: Optional[float]  # フレームRMSの5〜95パーセンタイル幅（dB）
+    crest_factor_db: Optional[float]  # 最大フレームRMSと区間全体のRMSの比（dB）
+    loudness_slope_db_per_s: Optional[float]  # 音量の傾き（dB/秒）
+
+    jitter_local: Optional[float]  # 局所ジッター（比率）
+    shimmer_local: Optional[float]  # 局所シマー（比率）
+    vibrato_rate_hz: Optional[float]  # ビブラートの速さ（Hz）
+    vibrato_extent_cents: Optional[float]  # ビブラートの深さ（セント、片側）
+    spectral_centroid_hz: Optional[float]  # スペクトル重心の平均（Hz）
+    spectral_flux: Optional[float]  # スペクトルフラックスの平均
+    spectral_rolloff_hz: Optional[float]  # ロールオフ周波数の平均（Hz）
+    mfcc_mean: Optional[List[float]]  # MFCC各係数の平均
+    mfcc_std: Optional[List[float]]  # MFCC各係数の標準偏差
 
 
 class SegmentAnalysis(TypedDict):
@@ -27,9 +51,44 @@ class SegmentAnalysis(TypedDict):
     features: FeatureData
 
 
-class AnalysisConfig(TypedDict):
-    """分析設定の型定義"""
+class ClipAnalysis(TypedDict):
+    """短いクリップ（1ファイル）の分析結果の型定義"""
+
+    clip_id: int
+    filename: str
+    duration_s: Optional[float]  # デコードに失敗した場合はNone
+    features: Optional[FeatureData]  # 失敗した場合はNone
+    error: Optional[str]  # 失敗の内容（成功した場合はNone）
+
+
+class _RequiredAnalysisConfig(TypedDict):
+    """分析設定の必須項目"""
 
     rms_delta_percentile: int
     min_len_sec: float
     max_len_sec: float
+
+
+class AnalysisConfig(_RequiredAnalysisConfig, total=False):
+    """分析設定の型定義
+
+    省略可能な項目は省略時に ``get_default_config`` と同じ値として扱われる。
+    """
+
+    segmentation: str  # "rms", "phrase" または "window"
+    min_gap_sec: float  # フレーズ区切りとみなす無声区間の最小長（秒）
+    window_sec: float  # スライディング窓の長さ（秒）
+    window_hop_sec: float  # スライディング窓の間隔（秒）
+    pitch_engine: str  # "praat" または "yin"
+    formant_engine: str  # "burg" または "lpc"
+
+
+class SweepResult(TypedDict):
+    """パラメータスイープの設定ごとの評価結果の型定義"""
+
+    config: AnalysisConfig
+    n_segments: int
+    length_min_s: float  # セグメント長の最小値（秒）
+    length_median_s: float  # セグメント長の中央値（秒）
+    length_max_s: float  # セグメント長の最大値（秒）
+    feature_std: Dict[str, float]  # 特徴量ごとのセグメント間の標準偏差
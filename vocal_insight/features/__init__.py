@@ -5,6 +5,63 @@
 """
 
 from .acoustic import AcousticFeatureExtractor
-from .base import FeatureExtractor
+from .base import FeatureExtractor, GraphFeatureExtractor
+from .contour import PITCH_ENGINES, PitchContour, compute_pitch_contour
+from .energy import energy_statistics
+from .graph import INTERMEDIATES, FeatureContext, FeatureGraph
+from .lpc import lpc_formants
+from .registry import available_extractors, get_extractor
+from .spectral import SpectralFrames, spectral_frames, summarize_segments
+from .voice_quality import (
+    GlottalPulses,
+    VoiceQualityExtractor,
+    compute_glottal_pulses,
+    jitter_local,
+    shimmer_local,
+    vibrato,
+)
+from .windowed import (
+    WINDOWED_FEATURE_GROUPS,
+    FramePrefixSums,
+    frame_series,
+    frame_tracks,
+    prefix_sums,
+    series_from_tracks,
+    window_grid,
+    windowed_features,
+)
+from .yin import yin_f0
 
-__all__ = ["FeatureExtractor", "AcousticFeatureExtractor"]
+__all__ = [
+    "FeatureExtractor",
+    "GraphFeatureExtractor",
+    "FeatureContext",
+    "FeatureGraph",
+    "INTERMEDIATES",
+    "AcousticFeatureExtractor",
+    "PitchContour",
+    "compute_pitch_contour",
+    "PITCH_ENGINES",
+    "yin_f0",
+    "lpc_formants",
+    "available_extractors",
+    "get_extractor",
+    "VoiceQualityExtractor",
+    "GlottalPulses",
+    "compute_glottal_pulses",
+    "jitter_local",
+    "shimmer_local",
+    "vibrato",
+    "SpectralFrames",
+    "spectral_frames",
+    "summarize_segments",
+    "energy_statistics",
+    "WINDOWED_FEATURE_GROUPS",
+    "FramePrefixSums",
+    "prefix_sums",
+    "frame_series",
+    "frame_tracks",
+    "series_from_tracks",
+    "window_grid",
+    "windowed_features",
+]
@@ -1,24 +1,68 @@
 """
 音響特徴量抽出器
 
-音声データから基本周波数、HNR、フォルマント周波数を抽出
+音声データから基本周波数、HNR、フォルマント周波数と、選択時は音量・
+ダイナミクス・声質特徴量（ジッター・シマー・ビブラート）・スペクトル特徴量
+（重心・フラックス・ロールオフ・MFCC統計量）を抽出
 """
 
+from typing import Iterable, Optional, Tuple
+
 import numpy as np
-import parselmouth
 
+from ..core.config import (
+    DEFAULT_FEATURE_GROUPS,
+    FEATURE_GROUPS,
+    FORMANT_ENGINES,
+    PITCH_ENGINES,
+    parse_features,
+)
 from ..core.types import FeatureData
+from .graph import FeatureContext
+from .lpc import lpc_formants
+from .spectral import N_MFCC
+from .voice_quality import VoiceQualityExtractor
 
 
 class AcousticFeatureExtractor:
     """音響特徴量抽出器クラス"""
 
-    def extract(self, audio: np.ndarray, sr: int) -> FeatureData:
+    def __init__(
+        self,
+        pitch_engine: str = "praat",
+        formant_engine: str = "burg",
+        features: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            pitch_engine: F0推定に使用するエンジン（"praat" または "yin"）
+            formant_engine: フォルマント推定に使用するエンジン
+                （"burg" または "lpc"）
+            features: 計算する特徴量グループ（"f0", "hnr", "formants",
+                "energy", "voice_quality", "spectral"）。省略時は "f0", "hnr",
+                "formants"。選択外の分析は実行せず、対応するフィールドはNone
+
+        Raises:
+            ValueError: 未知のエンジン・特徴量グループが指定された場合
+        """
+        if pitch_engine not in PITCH_ENGINES:
+            raise ValueError(f"pitch_engine must be one of {PITCH_ENGINES}")
+        if formant_engine not in FORMANT_ENGINES:
+            raise ValueError(f"formant_engine must be one of {FORMANT_ENGINES}")
+        self.pitch_engine = pitch_engine
+        self.formant_engine = formant_engine
+        self.features = parse_features(features)
+
+    def extract(
+        self, audio: np.ndarray, sr: int, f0_values: Optional[np.ndarray] = None
+    ) -> FeatureData:
         """音声データから音響特徴量を抽出
 
         Args:
             audio: 音声データ
             sr: サンプリング周波数
+            f0_values: 計算済みのフレーム単位F0（トラック全体のピッチ輪郭の
+                切り出しなど）。指定時はピッチ分析を再実行しない
 
         Returns:
             抽出された音響特徴量
@@ -32,52 +76,116 @@ class AcousticFeatureExtractor:
         if not isinstance(sr, (int, float)):
             raise TypeError("sr must be a number")
 
-        # Parselmouthオブジェクトを作成
-        sound = parselmouth.Sound(audio, sampling_frequency=sr)
+        context = FeatureContext(
+            audio, sr, self.pitch_engine, precomputed={"f0": f0_values}
+        )
+        return self.extract_from(context)
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        """選択された特徴量の計算に必要な中間表現"""
+        requires = []
+        if "f0" in self.features:
+            requires.append("f0")
+        if "hnr" in self.features:
+            requires.append("harmonicity")
+        if "formants" in self.features and self.formant_engine == "burg":
+            requires.append("formant")
+        if "energy" in self.features:
+            requires.append("energy")
+        if "voice_quality" in self.features:
+            requires.extend(VoiceQualityExtractor.requires)
+        if "spectral" in self.features:
+            requires.append("spectral")
+        return tuple(requires)
+
+    def extract_from(self, context: FeatureContext) -> FeatureData:
+        """共有コンテキストから音響特徴量を抽出
+
+        Parselmouth の Sound・Pitch などの中間表現はコンテキストで一度だけ
+        作成され、同じコンテキストを使う他の抽出器と共有される
+
+        Args:
+            context: 中間表現のキャッシュ
+
+        Returns:
+            抽出された音響特徴量（選択外のフィールドはNone。声質・スペクトル
+            特徴量のフィールドは選択時のみ含まれる）
+        """
+        result = self.empty_features()
 
         # 基本周波数（F0）抽出
-        f0_values = self._extract_f0(sound)
+        if "f0" in self.features:
+            f0_stats = self._extract_f0(context)
+            result["f0_mean_hz"] = f0_stats["mean"]
+            result["f0_std_hz"] = f0_stats["std"]
 
         # HNR（調和対雑音比）抽出
-        hnr_value = self._extract_hnr(sound)
+        if "hnr" in self.features:
+            result["hnr_mean_db"] = self._extract_hnr(context)
 
         # フォルマント周波数抽出
-        formants = self._extract_formants(sound)
+        if "formants" in self.features:
+            if self.formant_engine == "lpc":
+                formants = self._extract_formants_lpc(context.audio, context.sr)
+            else:
+                formants = self._extract_formants(context)
+            result["f1_mean_hz"] = formants["f1"]
+            result["f2_mean_hz"] = formants["f2"]
+            result["f3_mean_hz"] = formants["f3"]
+
+        # 音量・ダイナミクス（フレームRMSを共有）抽出
+        if "energy" in self.features:
+            result.update(self._extract_energy(context))
+
+        # 声質特徴量（ジッター・シマー・ビブラート）抽出
+        if "voice_quality" in self.features:
+            result.update(self._extract_voice_quality(context))
+
+        # スペクトル特徴量（STFT を共有）抽出
+        if "spectral" in self.features:
+            result.update(self._extract_spectral(context))
 
+        return result
+
+    def empty_features(self) -> FeatureData:
+        """全フィールドがNoneの結果（選択された音量・声質・スペクトル特徴量を含む）"""
         return FeatureData(
-            f0_mean_hz=f0_values["mean"],
-            f0_std_hz=f0_values["std"],
-            hnr_mean_db=hnr_value,
-            f1_mean_hz=formants["f1"],
-            f2_mean_hz=formants["f2"],
-            f3_mean_hz=formants["f3"],
+            **{
+                field: None
+                for group, fields in FEATURE_GROUPS.items()
+                if group in DEFAULT_FEATURE_GROUPS or group in self.features
+                for field in fields
+            }
         )
 
-    def _extract_f0(self, sound: parselmouth.Sound) -> dict:
+    def _extract_f0(self, context: FeatureContext) -> dict:
         """基本周波数を抽出"""
         try:
-            pitch = sound.to_pitch()
-            f0_values = pitch.selected_array["frequency"]
-            # 無効値（0）を除去
-            valid_f0 = f0_values[f0_values > 0]
-
-            if len(valid_f0) > 0:
-                return {
-                    "mean": float(np.mean(valid_f0)),
-                    "std": float(np.std(valid_f0)),
-                }
-            else:
-                # 検出できない場合のデフォルト値
-                return {"mean": 120.0, "std": 0.0}
+            return self._summarize_f0(np.asarray(context.get("f0")))
 
         except Exception:
             # エラー時のデフォルト値
             return {"mean": 120.0, "std": 0.0}
 
-    def _extract_hnr(self, sound: parselmouth.Sound) -> float:
+    def _summarize_f0(self, f0_values: np.ndarray) -> dict:
+        """フレーム単位のF0から平均・標準偏差を計算"""
+        # 無効値（0）を除去
+        valid_f0 = f0_values[f0_values > 0]
+
+        if len(valid_f0) > 0:
+            return {
+                "mean": float(np.mean(valid_f0)),
+                "std": float(np.std(valid_f0)),
+            }
+        else:
+            # 検出できない場合のデフォルト値
+            return {"mean": 120.0, "std": 0.0}
+
+    def _extract_hnr(self, context: FeatureContext) -> float:
         """調和対雑音比を抽出"""
         try:
-            harmonicity = sound.to_harmonicity()
+            harmonicity = context.get("harmonicity")
             hnr_values = harmonicity.values[harmonicity.values != -200]  # 無効値除去
 
             if len(hnr_values) > 0:
@@ -88,10 +196,10 @@ class AcousticFeatureExtractor:
         except Exception:
             return 10.0  # エラー時のデフォルト値
 
-    def _extract_formants(self, sound: parselmouth.Sound) -> dict:
+    def _extract_formants(self, context: FeatureContext) -> dict:
         """フォルマント周波数を抽出"""
         try:
-            formants = sound.to_formant_burg()
+            formants = context.get("formant")
 
             # 時間軸全体での平均を計算
             f1_values = []
@@ -125,3 +233,62 @@ class AcousticFeatureExtractor:
         except Exception:
             # エラー時のデフォルト値（典型的なフォルマント値）
             return {"f1": 500.0, "f2": 1500.0, "f3": 2500.0}
+
+    def _extract_energy(self, context: FeatureContext) -> dict:
+        """平均RMS・ダイナミックレンジ・クレストファクター・音量の傾きを抽出"""
+        try:
+            return dict(context.get("energy"))
+
+        except Exception:
+            # エラー時のデフォルト値（フレームがない場合と同じ）
+            return {
+                "rms_mean": 0.0,
+                "dynamic_range_db": 0.0,
+                "crest_factor_db": 0.0,
+                "loudness_slope_db_per_s": 0.0,
+            }
+
+    def _extract_voice_quality(self, context: FeatureContext) -> dict:
+        """ジッター・シマー・ビブラートを抽出"""
+        try:
+            return VoiceQualityExtractor().extract_from(context)
+
+        except Exception:
+            # エラー時のデフォルト値（周期・ビブラートを検出できない場合と同じ）
+            return {
+                "jitter_local": None,
+                "shimmer_local": None,
+                "vibrato_rate_hz": 0.0,
+                "vibrato_extent_cents": 0.0,
+            }
+
+    def _extract_spectral(self, context: FeatureContext) -> dict:
+        """スペクトル重心・フラックス・ロールオフ・MFCC統計量を抽出"""
+        try:
+            return dict(context.get("spectral"))
+
+        except Exception:
+            # エラー時のデフォルト値（有効なフレームがない場合と同じ）
+            return {
+                "spectral_centroid_hz": 0.0,
+                "spectral_flux": 0.0,
+                "spectral_rolloff_hz": 0.0,
+                "mfcc_mean": [0.0] * N_MFCC,
+                "mfcc_std": [0.0] * N_MFCC,
+            }
+
+    def _extract_formants_lpc(self, audio: np.ndarray, sr: int) -> dict:
+        """バッチLPCでフォルマント周波数を抽出"""
+        defaults = {"f1": 500.0, "f2": 1500.0, "f3": 2500.0}
+        try:
+            _, tracks = lpc_formants(audio, sr)
+        except Exception:
+            # エラー時のデフォルト値（典型的なフォルマント値）
+            return defaults
+
+        formants = {}
+        for index, key in enumerate(("f1", "f2", "f3")):
+            values = tracks[:, index]
+            values = values[np.isfinite(values)]
+            formants[key] = float(np.mean(values)) if len(values) else defaults[key]
+        return formants
@@ -4,12 +4,15 @@
 拡張可能な特徴量抽出システムのためのインターフェイス定義
 """
 
-from typing import Protocol
+from typing import TYPE_CHECKING, Any, Mapping, Protocol, Tuple
 
 import numpy as np
 
 from ..core.types import FeatureData
 
+if TYPE_CHECKING:
+    from .graph import FeatureContext
+
 
 class FeatureExtractor(Protocol):
     """特徴量抽出器のプロトコル"""
@@ -25,3 +28,25 @@ class FeatureExtractor(Protocol):
             抽出された特徴量データ
         """
         ...
+
+
+class GraphFeatureExtractor(Protocol):
+    """中間表現を共有する特徴量抽出器のプロトコル
+
+    ``requires`` に必要な中間表現（"sound", "pitch", "harmonicity",
+    "formant", "stft", "rms" など）を宣言し、``extract_from`` では
+    コンテキストから取得した中間表現を使って固有の計算のみを行う
+    """
+
+    requires: Tuple[str, ...]
+
+    def extract_from(self, context: "FeatureContext") -> Mapping[str, Any]:
+        """共有コンテキストから特徴量を抽出
+
+        Args:
+            context: 中間表現のキャッシュ
+
+        Returns:
+            抽出された特徴量（フィールド名 → 値）
+        """
+        ...
@@ -0,0 +1,108 @@
+"""
+ピッチ輪郭（F0コンター）
+
+トラック全体に対して一度だけピッチ分析を行い、その結果を
+セグメント境界検出とセグメント単位の統計量計算の双方で再利用する
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import parselmouth
+
+from ..core.config import PITCH_ENGINES
+from .yin import DEFAULT_TIME_STEP, yin_f0
+
+
+@dataclass(frozen=True)
+class PitchContour:
+    """フレーム単位の基本周波数系列
+
+    Attributes:
+        times: 各フレームの中心時刻（秒）
+        f0_hz: 各フレームの基本周波数（無声フレームは0）
+        time_step: フレーム間隔（秒）
+    """
+
+    times: np.ndarray
+    f0_hz: np.ndarray
+    time_step: float
+
+    @property
+    def voiced(self) -> np.ndarray:
+        """有声フレームのマスク"""
+        return self.f0_hz > 0
+
+    def slice(self, start_sec: float, end_sec: float) -> np.ndarray:
+        """指定区間 [start_sec, end_sec) に含まれるフレームのF0を返す
+
+        Args:
+            start_sec: 開始時刻（秒）
+            end_sec: 終了時刻（秒）
+
+        Returns:
+            区間内のF0値（無声フレームの0を含む）
+        """
+        start, end = np.searchsorted(self.times, [start_sec, end_sec])
+        return self.f0_hz[start:end]
+
+    def segment(self, start_sec: float, end_sec: float) -> "PitchContour":
+        """指定区間 [start_sec, end_sec) に含まれるフレームの輪郭を返す
+
+        Args:
+            start_sec: 開始時刻（秒）
+            end_sec: 終了時刻（秒）
+
+        Returns:
+            区間内のピッチ輪郭（時刻はトラック先頭基準のまま）
+        """
+        start, end = np.searchsorted(self.times, [start_sec, end_sec])
+        return PitchContour(
+            times=self.times[start:end],
+            f0_hz=self.f0_hz[start:end],
+            time_step=self.time_step,
+        )
+
+
+def compute_pitch_contour(
+    audio: np.ndarray, sr: int, engine: str = "praat"
+) -> PitchContour:
+    """音声全体からピッチ輪郭を計算
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        engine: ピッチエンジン（"praat" または "yin"）
+
+    Returns:
+        トラック全体のピッチ輪郭
+
+    Raises:
+        ValueError: 未知のピッチエンジンが指定された場合
+    """
+    if engine not in PITCH_ENGINES:
+        raise ValueError(f"engine must be one of {PITCH_ENGINES}")
+
+    if engine == "yin":
+        times, f0_hz = yin_f0(audio, sr)
+        return PitchContour(times=times, f0_hz=f0_hz, time_step=DEFAULT_TIME_STEP)
+
+    sound = parselmouth.Sound(audio, sampling_frequency=sr)
+    return contour_from_pitch(sound.to_pitch())
+
+
+def contour_from_pitch(pitch: Any) -> PitchContour:
+    """Praat の Pitch オブジェクトをピッチ輪郭に変換
+
+    Args:
+        pitch: parselmouth.Pitch
+
+    Returns:
+        ピッチ輪郭
+    """
+    return PitchContour(
+        times=np.asarray(pitch.xs()),
+        f0_hz=np.asarray(pitch.selected_array["frequency"]),
+        time_step=float(pitch.time_step),
+    )
@@ -0,0 +1,114 @@
+"""
+音量・ダイナミクス特徴量
+
+セグメント境界検出（``SegmentBoundaryDetector``）と同じフレーム単位のRMSから、
+セグメントごとの平均RMS・ダイナミックレンジ・クレストファクター・
+音量の傾きを全セグメント分まとめて計算する。RMSはトラックごとに一度だけ
+計算され、境界検出・特徴量・CLIのプロットで共有される
+"""
+
+from typing import List, Sequence, Tuple
+
+import librosa
+import numpy as np
+
+from .framing import segment_frame_indices
+
+# dB換算時のRMSの下限（-100 dB）と、ダイナミックレンジに使うパーセンタイル
+RMS_FLOOR = 1e-5
+DYNAMIC_RANGE_PERCENTILES = (5.0, 95.0)
+# 区間内の最大フレームからこの値（dB）以上小さいフレームは無音として扱う
+SILENCE_GATE_DB = 50.0
+
+
+def energy_statistics(
+    rms: np.ndarray,
+    sr: int,
+    hop_length: int,
+    segments: Sequence[Tuple[float, float]],
+) -> List[dict]:
+    """フレーム単位のRMSを区間ごとの音量・ダイナミクス特徴量に集約
+
+    中心時刻が [開始時刻, 終了時刻) に含まれるフレームを対象に、全区間の
+    フレームを連結して ``np.add.reduceat`` と区間番号での並べ替えで一括計算する
+
+    Args:
+        rms: フレーム単位のRMS
+        sr: サンプリング周波数
+        hop_length: フレーム間隔（サンプル数）
+        segments: 区間（開始時刻, 終了時刻）のリスト
+
+    Returns:
+        区間ごとの rms_mean, dynamic_range_db（RMSの5〜95パーセンタイル幅）,
+        crest_factor_db（最大フレームRMSと区間全体のRMSの比）,
+        loudness_slope_db_per_s（RMSのdB値の回帰直線の傾き）。
+        ダイナミックレンジと傾きは無音フレームを除いて計算する。
+        フレームがない区間は全て0.0
+    """
+    if not len(segments):
+        return []
+    rms = np.asarray(rms, dtype=np.float64)
+    times = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=hop_length)
+    starts, ends = np.searchsorted(times, np.asarray(segments, dtype=float)).T
+    segment, frames = segment_frame_indices(starts, ends)
+    counts = np.bincount(segment, minlength=len(starts))
+    present = counts > 0
+    first = (np.cumsum(counts) - counts)[present]
+    n = counts[present].astype(np.float64)
+
+    values = rms[frames]
+    level = 20 * np.log10(np.maximum(values, RMS_FLOOR))
+    t = times[frames]
+    total = counts[present]
+
+    # 区間番号・dB値の順に並べ、区間内の順位から最大値を取り出す
+    order = np.lexsort((level, segment))
+    sorted_level = level[order]
+    peak = sorted_level[first + total - 1]
+
+    # ダイナミックレンジと傾きは最大値から SILENCE_GATE_DB 以内のフレームのみを
+    # 対象とする（無音・休符を除く）。対象フレームは並べ替え後の各区間の末尾に並ぶ
+    gate = (level >= np.repeat(peak - SILENCE_GATE_DB, total)).astype(np.float64)
+    gated = np.add.reduceat(gate, first) if len(first) else np.zeros(0)
+    low, high = (
+        sorted_level[first + total - gated.astype(np.int64) + _rank(q, gated)]
+        for q in DYNAMIC_RANGE_PERCENTILES
+    )
+
+    # 平均・二乗平均と、dB値の時間に対する重み付き最小二乗の傾き
+    mean = _group_mean(values, first, n)
+    power = _group_mean(values**2, first, n)
+    t_mean = _group_mean(t * gate, first, gated)
+    level_mean = _group_mean(level * gate, first, gated)
+    t_centered = (t - np.repeat(t_mean, total)) * gate
+    level_centered = level - np.repeat(level_mean, total)
+    covariance = _group_mean(t_centered * level_centered, first, gated)
+    variance = _group_mean(t_centered**2, first, gated)
+    slope = np.divide(
+        covariance, variance, out=np.zeros_like(covariance), where=variance > 0
+    )
+    overall = 10 * np.log10(np.maximum(power, RMS_FLOOR**2))
+
+    columns = {
+        "rms_mean": mean,
+        "dynamic_range_db": high - low,
+        "crest_factor_db": np.maximum(peak - overall, 0.0),
+        "loudness_slope_db_per_s": slope,
+    }
+    results = [dict.fromkeys(columns, 0.0) for _ in range(len(starts))]
+    for index, segment_index in enumerate(np.flatnonzero(present)):
+        for key, column in columns.items():
+            results[segment_index][key] = float(column[index])
+    return results
+
+
+def _rank(percentile: float, n: np.ndarray) -> np.ndarray:
+    """n個の昇順の値におけるパーセンタイルの位置（最近傍）"""
+    return np.round(percentile / 100 * (n - 1)).astype(np.int64)
+
+
+def _group_mean(values: np.ndarray, first: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """区間順に連結された値の区間ごとの平均"""
+    if not len(first):
+        return np.zeros(0)
+    return np.add.reduceat(values, first) / n
@@ -0,0 +1,70 @@
+"""
+フレーム分割ユーティリティ
+
+信号を (フレーム数, フレーム長) の2次元配列として扱うための補助関数
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def frame_signal(audio: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """信号をフレーム単位の2次元配列に分割
+
+    コピーを伴わないストライドビューを返すため、書き込みは行わないこと。
+    フレーム長に満たない信号は末尾をゼロ埋めして1フレームとする。
+
+    Args:
+        audio: 1次元の音声データ
+        frame_length: フレーム長（サンプル数）
+        hop_length: フレーム間隔（サンプル数）
+
+    Returns:
+        形状 (フレーム数, frame_length) の配列
+    """
+    audio = np.asarray(audio)
+    if len(audio) < frame_length:
+        audio = np.pad(audio, (0, frame_length - len(audio)))
+
+    windows = np.lib.stride_tricks.sliding_window_view(audio, frame_length)
+    return windows[::hop_length]
+
+
+def frame_times(
+    n_frames: int, frame_length: float, hop_length: int, sr: int
+) -> np.ndarray:
+    """各フレームの中心時刻（秒）を計算
+
+    Args:
+        n_frames: フレーム数
+        frame_length: フレーム長（サンプル数）
+        hop_length: フレーム間隔（サンプル数）
+        sr: サンプリング周波数
+
+    Returns:
+        各フレームの中心時刻の配列
+    """
+    return (np.arange(n_frames) * hop_length + frame_length / 2) / sr
+
+
+def segment_frame_indices(
+    starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """複数の区間 [start, end) に含まれるフレーム番号を区間順に連結
+
+    区間ごとのPythonループを使わずに区間単位の集約（``np.add.reduceat`` や
+    区間番号をキーにした並べ替え）を行うための展開。区間の重なりも可
+
+    Args:
+        starts: 各区間の開始フレーム番号
+        ends: 各区間の終了フレーム番号（この番号を含まない）
+
+    Returns:
+        (各要素の区間番号, フレーム番号) のタプル
+    """
+    lengths = np.maximum(np.asarray(ends) - np.asarray(starts), 0)
+    offsets = np.cumsum(lengths) - lengths
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    frames = np.repeat(starts, lengths) + np.arange(lengths.sum()) - offsets[segment]
+    return segment, frames
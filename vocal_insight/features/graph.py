@@ -0,0 +1,228 @@
+"""
+特徴量依存グラフ
+
+特徴量抽出器が必要とする中間表現（Sound, Pitch, Harmonicity, Formant,
+声門パルス, STFT, RMS, 音量・スペクトル統計量など）を宣言し、セグメント（またはトラック）ごとに
+一度だけ計算して全ての抽出器で共有する。中間表現は初回参照時に遅延計算され、依存する
+中間表現も同じコンテキストから再帰的に解決される
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import librosa
+import numpy as np
+import parselmouth
+
+from ..core.config import PITCH_ENGINES
+from .base import GraphFeatureExtractor
+from .contour import PitchContour, contour_from_pitch
+from .energy import energy_statistics
+from .spectral import spectral_frames, summarize_segments
+from .voice_quality import compute_glottal_pulses
+from .yin import DEFAULT_TIME_STEP, yin_f0
+
+# STFT・RMSのフレーム設定（セグメント境界検出と同じlibrosaの既定値）
+STFT_N_FFT = 2048
+STFT_HOP_LENGTH = 512
+
+
+def _sound(context: "FeatureContext") -> Any:
+    return parselmouth.Sound(context.audio, context.sr)
+
+
+def _pitch(context: "FeatureContext") -> Any:
+    return context.get("sound").to_pitch()
+
+
+def _f0(context: "FeatureContext") -> np.ndarray:
+    if context.pitch_engine == "yin":
+        return yin_f0(context.audio, context.sr)[1]
+    return np.asarray(context.get("pitch").selected_array["frequency"])
+
+
+def _voiced(context: "FeatureContext") -> np.ndarray:
+    return context.get("f0") > 0
+
+
+def _contour(context: "FeatureContext") -> PitchContour:
+    if context.pitch_engine == "yin":
+        times, f0_hz = yin_f0(context.audio, context.sr)
+        return PitchContour(times=times, f0_hz=f0_hz, time_step=DEFAULT_TIME_STEP)
+    return contour_from_pitch(context.get("pitch"))
+
+
+def _pulses(context: "FeatureContext") -> Any:
+    return compute_glottal_pulses(
+        context.get("sound"), context.get("pitch"), context.audio, context.sr
+    )
+
+
+def _harmonicity(context: "FeatureContext") -> Any:
+    return context.get("sound").to_harmonicity()
+
+
+def _formant(context: "FeatureContext") -> Any:
+    return context.get("sound").to_formant_burg()
+
+
+def _stft(context: "FeatureContext") -> np.ndarray:
+    return np.abs(
+        librosa.stft(context.audio, n_fft=STFT_N_FFT, hop_length=STFT_HOP_LENGTH)
+    )
+
+
+def _rms(context: "FeatureContext") -> np.ndarray:
+    return librosa.feature.rms(
+        y=context.audio, frame_length=STFT_N_FFT, hop_length=STFT_HOP_LENGTH
+    )[0]
+
+
+def _energy(context: "FeatureContext") -> Dict[str, float]:
+    return energy_statistics(
+        context.get("rms"), context.sr, STFT_HOP_LENGTH, [(0.0, np.inf)]
+    )[0]
+
+
+def _spectral(context: "FeatureContext") -> Dict[str, Any]:
+    frames = spectral_frames(context.get("stft"), context.sr, STFT_HOP_LENGTH)
+    return summarize_segments(frames, [(0.0, np.inf)])[0]
+
+
+# 中間表現名 → 生成関数
+_PRODUCERS: Dict[str, Callable[["FeatureContext"], Any]] = {
+    "sound": _sound,
+    "pitch": _pitch,
+    "f0": _f0,
+    "voiced": _voiced,
+    "contour": _contour,
+    "pulses": _pulses,
+    "harmonicity": _harmonicity,
+    "formant": _formant,
+    "stft": _stft,
+    "rms": _rms,
+    "energy": _energy,
+    "spectral": _spectral,
+}
+
+INTERMEDIATES: Tuple[str, ...] = tuple(_PRODUCERS)
+
+
+class FeatureContext:
+    """1つの音声区間に対する中間表現のキャッシュ
+
+    Attributes:
+        audio: 音声データ
+        sr: サンプリング周波数
+        pitch_engine: フレーム単位F0（"f0"）の推定に使用するエンジン
+    """
+
+    def __init__(
+        self,
+        audio: np.ndarray,
+        sr: int,
+        pitch_engine: str = "praat",
+        precomputed: Optional[Mapping[str, Any]] = None,
+    ):
+        """
+        Args:
+            audio: 音声データ
+            sr: サンプリング周波数
+            pitch_engine: ピッチエンジン（"praat" または "yin"）
+            precomputed: 計算済みの中間表現（トラック全体のピッチ輪郭の
+                切り出しなど）。指定された中間表現は再計算しない
+
+        Raises:
+            ValueError: 未知のエンジン・中間表現が指定された場合
+        """
+        if pitch_engine not in PITCH_ENGINES:
+            raise ValueError(f"pitch_engine must be one of {PITCH_ENGINES}")
+        self.audio = audio
+        self.sr = sr
+        self.pitch_engine = pitch_engine
+        self._cache: Dict[str, Any] = {}
+        for name, value in (precomputed or {}).items():
+            if value is None:
+                continue
+            if name not in _PRODUCERS:
+                raise ValueError(
+                    f"unknown intermediate {name!r}; choose from {list(INTERMEDIATES)}"
+                )
+            self._cache[name] = value
+        self._computed: List[str] = []
+
+    def get(self, name: str) -> Any:
+        """中間表現を取得（未計算の場合は依存関係を解決して一度だけ計算）
+
+        Args:
+            name: 中間表現名
+
+        Returns:
+            中間表現
+
+        Raises:
+            KeyError: 未知の中間表現名が指定された場合
+        """
+        if name not in self._cache:
+            if name not in _PRODUCERS:
+                raise KeyError(name)
+            self._cache[name] = _PRODUCERS[name](self)
+            self._computed.append(name)
+        return self._cache[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._cache
+
+    @property
+    def computed(self) -> Tuple[str, ...]:
+        """このコンテキストで実際に計算された中間表現（計算順）"""
+        return tuple(self._computed)
+
+
+class FeatureGraph:
+    """複数の特徴量抽出器を中間表現を共有して実行する"""
+
+    def __init__(self, extractors: Iterable[GraphFeatureExtractor]):
+        """
+        Args:
+            extractors: 中間表現の依存を宣言した特徴量抽出器
+
+        Raises:
+            ValueError: 未知の中間表現への依存が宣言された場合
+        """
+        self.extractors = list(extractors)
+        unknown = [name for name in self.requires if name not in _PRODUCERS]
+        if unknown:
+            raise ValueError(
+                f"unknown intermediates {unknown}; choose from {list(INTERMEDIATES)}"
+            )
+
+    @property
+    def requires(self) -> Tuple[str, ...]:
+        """全抽出器が必要とする中間表現（重複なし・宣言順）"""
+        return tuple(
+            dict.fromkeys(name for e in self.extractors for name in e.requires)
+        )
+
+    def run(
+        self,
+        audio: np.ndarray,
+        sr: int,
+        pitch_engine: str = "praat",
+        precomputed: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """全抽出器を実行し、結果を1つの辞書に統合
+
+        Args:
+            audio: 音声データ
+            sr: サンプリング周波数
+            pitch_engine: ピッチエンジン（"praat" または "yin"）
+            precomputed: 計算済みの中間表現
+
+        Returns:
+            各抽出器の結果を統合した特徴量
+        """
+        context = FeatureContext(audio, sr, pitch_engine, precomputed)
+        result: Dict[str, Any] = {}
+        for extractor in self.extractors:
+            result.update(extractor.extract_from(context))
+        return result
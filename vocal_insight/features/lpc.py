@@ -0,0 +1,147 @@
+"""
+バッチLPCフォルマント推定器
+
+全フレームを2次元配列にまとめ、自己相関・Levinson-Durbin再帰・
+多項式の根の計算をフレーム方向にベクトル化してF1〜F3を一括推定する
+"""
+
+from typing import Tuple
+
+import librosa
+import numpy as np
+
+from .framing import frame_signal, frame_times
+
+# Praat の Sound: To Formant (burg) と揃えたデフォルト値
+DEFAULT_MAX_FORMANT = 5500.0
+DEFAULT_WINDOW_LENGTH = 0.025
+DEFAULT_PRE_EMPHASIS_FROM = 50.0
+DEFAULT_N_POLES = 10
+
+# フォルマントとして採用する根の周波数下限（Hz）
+MIN_FORMANT_HZ = 50.0
+
+# 一度に処理するフレーム数（窓掛けしたフレームのコピーのメモリ上限を抑える）
+BLOCK_FRAMES = 4096
+
+
+def lpc_formants(
+    audio: np.ndarray,
+    sr: int,
+    n_formants: int = 3,
+    max_formant: float = DEFAULT_MAX_FORMANT,
+    window_length: float = DEFAULT_WINDOW_LENGTH,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """LPC分析でフレーム単位のフォルマント周波数を推定
+
+    Args:
+        audio: 音声データ
+        sr: サンプリング周波数
+        n_formants: 返すフォルマント数
+        max_formant: フォルマント探索の上限周波数（Hz）。解析前にこの2倍の
+            サンプリング周波数へリサンプリングする
+        window_length: 有効窓長（秒）。実際の窓はPraatと同様にその2倍
+
+    Returns:
+        各フレームの中心時刻（秒）と、形状 (フレーム数, n_formants) の
+        フォルマント周波数（検出できない場合はNaN）のタプル
+    """
+    audio = np.asarray(audio, dtype=np.float64)
+    if len(audio) == 0:
+        return np.array([]), np.empty((0, n_formants))
+
+    analysis_sr = int(2 * max_formant)
+    if sr != analysis_sr:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=analysis_sr)
+
+    # プリエンファシス
+    alpha = np.exp(-2 * np.pi * DEFAULT_PRE_EMPHASIS_FROM / analysis_sr)
+    emphasized = np.append(audio[:1], audio[1:] - alpha * audio[:-1])
+
+    frame_length = int(round(2 * window_length * analysis_sr))
+    hop_length = max(1, int(round(window_length / 4 * analysis_sr)))
+    frames = frame_signal(emphasized, frame_length, hop_length)
+    window = _gaussian_window(frame_length)
+
+    formants = np.empty((len(frames), n_formants))
+    for start in range(0, len(frames), BLOCK_FRAMES):
+        block = frames[start : start + BLOCK_FRAMES] * window
+        coefficients, valid = _lpc_coefficients(block, DEFAULT_N_POLES)
+        block_formants = _formants_from_roots(
+            coefficients, analysis_sr, max_formant, n_formants
+        )
+        block_formants[~valid] = np.nan
+        formants[start : start + len(block)] = block_formants
+
+    times = frame_times(len(frames), frame_length, hop_length, analysis_sr)
+    return times, formants
+
+
+def _gaussian_window(length: int) -> np.ndarray:
+    """Praat と同形のガウス窓"""
+    position = (np.arange(length) + 0.5) / length - 0.5
+    edge = np.exp(-12.0)
+    return (np.exp(-48.0 * position**2) - edge) / (1.0 - edge)
+
+
+def _lpc_coefficients(frames: np.ndarray, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """全フレームの自己相関とLevinson-Durbin再帰を一括計算
+
+    Returns:
+        形状 (フレーム数, order + 1) の予測係数（先頭は1）と、
+        係数が有効なフレームのマスク
+    """
+    n_frames, frame_length = frames.shape
+
+    # 必要なのは order + 1 個のラグのみなので、FFTより直接計算の方が軽い
+    acf = np.empty((n_frames, order + 1))
+    for lag in range(order + 1):
+        acf[:, lag] = np.einsum(
+            "ij,ij->i", frames[:, : frame_length - lag], frames[:, lag:]
+        )
+
+    # 無音フレームは係数を求められないため無効とする
+    valid = acf[:, 0] > 1e-10
+    error = np.where(valid, acf[:, 0], 1.0)
+
+    coefficients = np.zeros((n_frames, order + 1))
+    coefficients[:, 0] = 1.0
+    for i in range(1, order + 1):
+        accumulated = acf[:, i] + np.einsum(
+            "ij,ij->i", coefficients[:, 1:i], acf[:, i - 1 : 0 : -1]
+        )
+        reflection = -accumulated / error
+        previous = coefficients[:, 1:i].copy()
+        coefficients[:, 1:i] = previous + reflection[:, None] * previous[:, ::-1]
+        coefficients[:, i] = reflection
+        error = np.maximum(error * (1.0 - reflection**2), 1e-30)
+
+    return coefficients, valid
+
+
+def _formants_from_roots(
+    coefficients: np.ndarray, sr: int, max_formant: float, n_formants: int
+) -> np.ndarray:
+    """予測多項式の根からフォルマント周波数を一括抽出"""
+    n_frames, n_coefficients = coefficients.shape
+    order = n_coefficients - 1
+
+    # 全フレームのコンパニオン行列を積み上げ、固有値（＝根）をまとめて求める
+    companion = np.zeros((n_frames, order, order))
+    companion[:, 0, :] = -coefficients[:, 1:]
+    companion[:, np.arange(1, order), np.arange(order - 1)] = 1.0
+    roots = np.linalg.eigvals(companion)
+
+    frequencies = np.angle(roots) * sr / (2 * np.pi)
+    usable = (
+        (roots.imag > 0)
+        & (frequencies > MIN_FORMANT_HZ)
+        & (frequencies < max_formant - MIN_FORMANT_HZ)
+    )
+    frequencies = np.sort(np.where(usable, frequencies, np.inf), axis=1)
+
+    formants = np.full((n_frames, n_formants), np.nan)
+    available = min(n_formants, order)
+    formants[:, :available] = frequencies[:, :available]
+    formants[~np.isfinite(formants)] = np.nan
+    return formants
@@ -0,0 +1,48 @@
+"""
+特徴量抽出器レジストリ
+
+名前で選択可能な特徴量抽出器の一覧を管理
+"""
+
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .acoustic import AcousticFeatureExtractor
+from .base import FeatureExtractor
+
+# 抽出器名 -> 抽出器ファクトリ（features キーワード引数を受け付ける）
+EXTRACTORS: Dict[str, Callable[..., FeatureExtractor]] = {
+    "acoustic": AcousticFeatureExtractor,
+    "yin": partial(AcousticFeatureExtractor, pitch_engine="yin"),
+    "lpc": partial(AcousticFeatureExtractor, formant_engine="lpc"),
+    "fast": partial(AcousticFeatureExtractor, pitch_engine="yin", formant_engine="lpc"),
+}
+
+
+def available_extractors() -> List[str]:
+    """登録済みの抽出器名を取得
+
+    Returns:
+        抽出器名のリスト
+    """
+    return list(EXTRACTORS)
+
+
+def get_extractor(
+    name: str, features: Optional[Iterable[str]] = None
+) -> FeatureExtractor:
+    """名前から特徴量抽出器を生成
+
+    Args:
+        name: 抽出器名
+        features: 計算する特徴量グループ（省略時は ``DEFAULT_FEATURE_GROUPS``）
+
+    Returns:
+        特徴量抽出器のインスタンス
+
+    Raises:
+        ValueError: 未登録の抽出器名が指定された場合
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"extractor must be one of {available_extractors()}")
+    return EXTRACTORS[name](features=features)
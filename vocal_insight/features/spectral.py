@@ -0,0 +1,167 @@
+"""
+スペクトル特徴量（重心・フラックス・ロールオフ・MFCC統計量）
+
+トラック全体（またはセグメント）の振幅スペクトログラムを一度だけ計算し、
+フレーム単位の特徴量を求めてから、セグメントごとの統計量を
+``np.add.reduceat`` による区間集約で一括計算する。セグメントごとに
+STFT を再計算しない
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import librosa
+import numpy as np
+
+# ロールオフとみなす累積エネルギーの割合と、MFCCの係数数
+ROLLOFF_PERCENT = 0.85
+N_MFCC = 13
+
+
+@dataclass(frozen=True)
+class SpectralFrames:
+    """フレーム単位のスペクトル特徴量
+
+    Attributes:
+        times: 各フレームの中心時刻（秒）
+        centroid_hz: スペクトル重心（Hz）
+        flux: 直前フレームとの正規化スペクトルの差のL2ノルム（先頭フレームと、
+            前後どちらかが無音のフレームはNaN）
+        rolloff_hz: ロールオフ周波数（Hz）
+        mfcc: MFCC（形状 (N_MFCC, フレーム数)）
+        valid: 無音でないフレームのマスク（統計量の計算対象）
+    """
+
+    times: np.ndarray
+    centroid_hz: np.ndarray
+    flux: np.ndarray
+    rolloff_hz: np.ndarray
+    mfcc: np.ndarray
+    valid: np.ndarray
+
+
+def spectral_frames(magnitude: np.ndarray, sr: int, hop_length: int) -> SpectralFrames:
+    """振幅スペクトログラムからフレーム単位のスペクトル特徴量を計算
+
+    Args:
+        magnitude: 振幅スペクトログラム（形状 (周波数ビン数, フレーム数)）
+        sr: サンプリング周波数
+        hop_length: フレーム間隔（サンプル数）
+
+    Returns:
+        フレーム単位のスペクトル特徴量
+    """
+    n_fft = 2 * (magnitude.shape[0] - 1)
+    frequencies = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+    total = magnitude.sum(axis=0)
+    valid = total > 0
+    safe_total = np.where(valid, total, 1.0)
+
+    centroid = frequencies @ magnitude / safe_total
+
+    # 累積エネルギーが ROLLOFF_PERCENT に達する最初のビン
+    cumulative = np.cumsum(magnitude, axis=0)
+    rolloff_bin = np.argmax(cumulative >= ROLLOFF_PERCENT * total, axis=0)
+    rolloff = frequencies[rolloff_bin]
+
+    # 音量に依存しないよう各フレームを正規化してから差分を取る
+    normalized = magnitude / safe_total
+    flux = np.full(magnitude.shape[1], np.nan)
+    flux[1:] = np.where(
+        valid[1:] & valid[:-1],
+        np.sqrt(np.sum(np.diff(normalized, axis=1) ** 2, axis=0)),
+        np.nan,
+    )
+
+    mel = librosa.feature.melspectrogram(S=magnitude**2, sr=sr, n_fft=n_fft)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+
+    times = librosa.frames_to_time(
+        np.arange(magnitude.shape[1]), sr=sr, hop_length=hop_length
+    )
+    return SpectralFrames(
+        times=times,
+        centroid_hz=np.where(valid, centroid, 0.0),
+        flux=flux,
+        rolloff_hz=np.where(valid, rolloff, 0.0),
+        mfcc=mfcc,
+        valid=valid,
+    )
+
+
+def _segment_sums(values: np.ndarray, frame_ranges: np.ndarray) -> np.ndarray:
+    """各区間 [start, end) のフレーム方向の和を一括で計算
+
+    全区間の境界を重複なく並べて ``np.add.reduceat`` で境界間の小区間ごとに
+    集約し、その累積和の差として各区間の和を求める（区間の重なりも可）
+
+    Args:
+        values: 形状 (特徴量数, フレーム数) の配列
+        frame_ranges: 形状 (区間数, 2) のフレーム番号の範囲
+
+    Returns:
+        形状 (特徴量数, 区間数) の区間ごとの和
+    """
+    n_frames = values.shape[1]
+    points = np.unique(np.concatenate(([0, n_frames], frame_ranges.ravel())))
+    points = points[points <= n_frames]
+    if n_frames:
+        pieces = np.add.reduceat(values, points[:-1], axis=1)
+    else:
+        pieces = np.zeros((values.shape[0], len(points) - 1))
+    cumulative = np.concatenate(
+        (np.zeros((values.shape[0], 1)), np.cumsum(pieces, axis=1)), axis=1
+    )
+    start = np.searchsorted(points, frame_ranges[:, 0])
+    end = np.searchsorted(points, frame_ranges[:, 1])
+    return cumulative[:, end] - cumulative[:, start]
+
+
+def summarize_segments(
+    frames: SpectralFrames, segments: Sequence[Tuple[float, float]]
+) -> List[dict]:
+    """フレーム単位の特徴量を区間ごとの統計量に集約
+
+    中心時刻が [開始時刻, 終了時刻) に含まれる無音でないフレームの平均
+    （MFCCは平均と標準偏差）を計算する
+
+    Args:
+        frames: フレーム単位のスペクトル特徴量
+        segments: 区間（開始時刻, 終了時刻）のリスト
+
+    Returns:
+        区間ごとの spectral_centroid_hz, spectral_flux, spectral_rolloff_hz,
+        mfcc_mean, mfcc_std（有効なフレームがない区間は0）
+    """
+    if not len(segments):
+        return []
+    frame_ranges = np.searchsorted(frames.times, np.asarray(segments, dtype=float))
+
+    # 特徴量・MFCCの二乗・有効フレーム数を1つの配列にまとめて一度に集約する
+    weights = frames.valid.astype(np.float64)
+    flux_weights = np.isfinite(frames.flux).astype(np.float64)
+    rows = np.vstack(
+        (
+            np.vstack((frames.centroid_hz, frames.rolloff_hz)) * weights,
+            np.vstack((frames.mfcc, frames.mfcc**2)) * weights,
+            weights,
+            np.nan_to_num(frames.flux) * flux_weights,
+            flux_weights,
+        )
+    )
+    sums = _segment_sums(rows, frame_ranges)
+    n_mfcc = frames.mfcc.shape[0]
+    means = sums[: 2 + 2 * n_mfcc] / np.maximum(sums[2 + 2 * n_mfcc], 1.0)
+    flux = sums[-2] / np.maximum(sums[-1], 1.0)
+    mfcc_mean = means[2 : 2 + n_mfcc]
+    mfcc_std = np.sqrt(np.maximum(means[2 + n_mfcc :] - mfcc_mean**2, 0.0))
+    return [
+        {
+            "spectral_centroid_hz": float(means[0, index]),
+            "spectral_flux": float(flux[index]),
+            "spectral_rolloff_hz": float(means[1, index]),
+            "mfcc_mean": mfcc_mean[:, index].tolist(),
+            "mfcc_std": mfcc_std[:, index].tolist(),
+        }
+        for index in range(len(segments))
+    ]
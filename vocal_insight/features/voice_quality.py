@@ -0,0 +1,243 @@
+"""
+声質特徴量（ジッター・シマー・ビブラート）
+
+声門パルス列（Praat の PointProcess）とピッチ輪郭をトラック全体で一度だけ
+計算し、セグメントごとの値はパルス列・輪郭の切り出しから求める。
+ジッター・シマーは周期単位、ビブラートは輪郭の短時間スペクトルから
+ベクトル化して計算するため、セグメントごとの Praat 分析を必要としない
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+import numpy as np
+from parselmouth.praat import call
+
+from .contour import PitchContour
+
+if TYPE_CHECKING:
+    from .graph import FeatureContext
+
+# Praat の Voice レポートと同じ周期の許容範囲（秒）と隣接周期・振幅の最大比
+PERIOD_FLOOR_SEC = 0.0001
+PERIOD_CEILING_SEC = 0.02
+MAX_PERIOD_FACTOR = 1.3
+MAX_AMPLITUDE_FACTOR = 1.6
+
+# ビブラートとみなす変調周波数の範囲（Hz）と解析窓
+VIBRATO_RATE_RANGE_HZ = (4.0, 8.0)
+VIBRATO_WINDOW_SEC = 0.8
+VIBRATO_HOP_SEC = 0.1
+# 窓内の変動エネルギーのうち変調成分が占める割合の下限
+VIBRATO_MIN_POWER_RATIO = 0.5
+
+
+@dataclass(frozen=True)
+class GlottalPulses:
+    """声門パルス列と各パルスのピーク振幅
+
+    Attributes:
+        times: 各パルスの時刻（秒、昇順）
+        amplitudes: 各パルスの最大絶対振幅（前後のパルスとの中点で区切った範囲）
+    """
+
+    times: np.ndarray
+    amplitudes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def slice(self, start_sec: float, end_sec: float) -> "GlottalPulses":
+        """指定区間 [start_sec, end_sec) に含まれるパルスを返す
+
+        Args:
+            start_sec: 開始時刻（秒）
+            end_sec: 終了時刻（秒）
+
+        Returns:
+            区間内のパルス列（区間をまたぐ周期は含まない）
+        """
+        start, end = np.searchsorted(self.times, [start_sec, end_sec])
+        return GlottalPulses(
+            times=self.times[start:end], amplitudes=self.amplitudes[start:end]
+        )
+
+
+def compute_glottal_pulses(
+    sound: Any, pitch: Any, audio: np.ndarray, sr: int
+) -> GlottalPulses:
+    """Praat の相互相関法（To PointProcess (cc)）で声門パルス列を計算
+
+    Args:
+        sound: parselmouth.Sound
+        pitch: sound から計算した parselmouth.Pitch
+        audio: sound と同じ音声データ（各パルスの振幅の計算に使用）
+        sr: サンプリング周波数
+
+    Returns:
+        声門パルス列
+    """
+    point_process = call([sound, pitch], "To PointProcess (cc)")
+    # 1行の行列に変換すると全パルス時刻を一度に取り出せる
+    times = np.asarray(call(point_process, "To Matrix").values[0], dtype=np.float64)
+    times = times[(times >= 0) & (times < len(audio) / sr)]
+    if len(times) < 2:
+        return GlottalPulses(times=times, amplitudes=np.zeros(len(times)))
+
+    # 隣接パルスとの中点で区切った範囲の最大絶対振幅を一括で計算
+    # （両端のパルスは内側の周期の半分だけ外側に広げる）
+    indices = np.round(times * sr).astype(np.int64)
+    middles = (indices[1:] + indices[:-1]) // 2
+    bounds = np.concatenate(
+        (
+            [indices[0] - (middles[0] - indices[0])],
+            middles,
+            [indices[-1] + (indices[-1] - middles[-1])],
+        )
+    )
+    bounds = np.clip(bounds, 0, len(audio))
+    magnitude = np.append(np.abs(audio), 0.0)
+    amplitudes = np.maximum.reduceat(magnitude, bounds)[:-1]
+    return GlottalPulses(times=times, amplitudes=amplitudes.astype(np.float64))
+
+
+def _valid_periods(pulses: GlottalPulses) -> Tuple[np.ndarray, np.ndarray]:
+    """周期と、隣接する2周期がともに許容範囲内かつ比が上限以内のマスク"""
+    periods = np.diff(pulses.times)
+    valid = (periods >= PERIOD_FLOOR_SEC) & (periods <= PERIOD_CEILING_SEC)
+    ratio = np.maximum(periods[1:], periods[:-1]) / np.maximum(
+        np.minimum(periods[1:], periods[:-1]), PERIOD_FLOOR_SEC
+    )
+    pairs = valid[1:] & valid[:-1] & (ratio <= MAX_PERIOD_FACTOR)
+    return periods, pairs
+
+
+def jitter_local(pulses: GlottalPulses) -> Optional[float]:
+    """局所ジッター（隣接周期の差の絶対値の平均 / 平均周期）
+
+    Args:
+        pulses: 声門パルス列
+
+    Returns:
+        局所ジッター（比率）。有効な周期の組がない場合はNone
+    """
+    periods, pairs = _valid_periods(pulses)
+    if not pairs.any():
+        return None
+    valid = np.zeros(len(periods), dtype=bool)
+    valid[1:] |= pairs
+    valid[:-1] |= pairs
+    differences = np.abs(np.diff(periods))[pairs]
+    return float(differences.mean() / periods[valid].mean())
+
+
+def shimmer_local(pulses: GlottalPulses) -> Optional[float]:
+    """局所シマー（隣接パルスのピーク振幅の差の絶対値の平均 / 平均振幅）
+
+    Args:
+        pulses: 声門パルス列
+
+    Returns:
+        局所シマー（比率）。有効なパルスの組がない場合はNone
+    """
+    periods = np.diff(pulses.times)
+    amplitudes = pulses.amplitudes
+    factor = np.maximum(amplitudes[1:], amplitudes[:-1]) / np.maximum(
+        np.minimum(amplitudes[1:], amplitudes[:-1]), np.finfo(np.float64).tiny
+    )
+    pairs = (
+        (periods >= PERIOD_FLOOR_SEC)
+        & (periods <= PERIOD_CEILING_SEC)
+        & (factor <= MAX_AMPLITUDE_FACTOR)
+    )
+    if not pairs.any():
+        return None
+    valid = np.zeros(len(amplitudes), dtype=bool)
+    valid[1:] |= pairs
+    valid[:-1] |= pairs
+    differences = np.abs(np.diff(amplitudes))[pairs]
+    return float(differences.mean() / amplitudes[valid].mean())
+
+
+def vibrato(contour: PitchContour) -> Tuple[float, float]:
+    """ピッチ輪郭の短時間スペクトルからビブラートの速さと深さを推定
+
+    ``VIBRATO_WINDOW_SEC`` の窓を ``VIBRATO_HOP_SEC`` ごとにずらし、全フレームが
+    有声の窓をまとめてセント値に変換・直線トレンド除去・FFT する。
+    変調周波数帯（``VIBRATO_RATE_RANGE_HZ``）のピークが窓内の変動の
+    ``VIBRATO_MIN_POWER_RATIO`` 以上を占める窓をビブラート区間とし、
+    その中央値を返す
+
+    Args:
+        contour: ピッチ輪郭
+
+    Returns:
+        (速さ（Hz）, 深さ（セント、平均からの片側の振れ幅）) のタプル。
+        ビブラート区間がない場合は (0.0, 0.0)
+    """
+    step = contour.time_step
+    length = int(round(VIBRATO_WINDOW_SEC / step))
+    hop = max(int(round(VIBRATO_HOP_SEC / step)), 1)
+    f0_hz = np.asarray(contour.f0_hz, dtype=np.float64)
+    if len(f0_hz) < length:
+        return 0.0, 0.0
+
+    voiced = f0_hz > 0
+    cents = 1200.0 * np.log2(np.where(voiced, f0_hz, 1.0))
+    windows = np.lib.stride_tricks.sliding_window_view(cents, length)[::hop]
+    voiced_windows = np.lib.stride_tricks.sliding_window_view(voiced, length)[::hop]
+    windows = windows[voiced_windows.all(axis=1)]
+    if not len(windows):
+        return 0.0, 0.0
+
+    # 窓ごとに直線トレンド（音高の移り変わり）を除去
+    x = np.arange(length) - (length - 1) / 2
+    slopes = windows @ x / (x @ x)
+    residual = windows - windows.mean(axis=1, keepdims=True) - slopes[:, None] * x
+
+    # ゼロ埋めで周波数分解能を補い、窓ごとのスペクトルを一括計算
+    window = np.hanning(length)
+    n_fft = 1 << int(np.ceil(np.log2(8 * length)))
+    spectrum = np.abs(np.fft.rfft(residual * window, n=n_fft, axis=1))
+    frequencies = np.fft.rfftfreq(n_fft, d=step)
+    low, high = VIBRATO_RATE_RANGE_HZ
+    band = (frequencies >= low) & (frequencies <= high)
+    peak = np.argmax(np.where(band, spectrum, -1.0), axis=1)
+    rows = np.arange(len(spectrum))
+
+    # 正弦波の振幅 = 2|X| / Σ窓、パワー比は残差の二乗和（窓掛け後）と比較
+    amplitude = 2.0 * spectrum[rows, peak] / window.sum()
+    power = np.sum((residual * window) ** 2, axis=1)
+    modulation = 0.5 * amplitude**2 * np.sum(window**2)
+    present = modulation >= VIBRATO_MIN_POWER_RATIO * np.maximum(power, 1e-12)
+    if not present.any():
+        return 0.0, 0.0
+    return (
+        float(np.median(frequencies[peak[present]])),
+        float(np.median(amplitude[present])),
+    )
+
+
+class VoiceQualityExtractor:
+    """声質特徴量抽出器（中間表現 "pulses", "contour" を使用）"""
+
+    requires: Tuple[str, ...] = ("pulses", "contour")
+
+    def extract_from(self, context: "FeatureContext") -> dict:
+        """共有コンテキストからジッター・シマー・ビブラートを抽出
+
+        Args:
+            context: 中間表現のキャッシュ
+
+        Returns:
+            jitter_local, shimmer_local, vibrato_rate_hz, vibrato_extent_cents
+            （ジッター・シマーは有効な周期が不足する場合None）
+        """
+        pulses = context.get("pulses")
+        rate, extent = vibrato(context.get("contour"))
+        return {
+            "jitter_local": jitter_local(pulses),
+            "shimmer_local": shimmer_local(pulses),
+            "vibrato_rate_hz": rate,
+            "vibrato_extent_cents": extent,
+        }
@@ -0,0 +1,249 @@
+"""
+スライディング窓の特徴量（累積和による窓ごとの統計量）
+
+一定間隔の窓（例: 3秒の窓を0.5秒ごと）で特徴量を求める場合、窓ごとに
+``AcousticFeatureExtractor.extract`` を呼ぶと重なりの分だけ計算量が増える。
+ここではトラック全体のフレーム単位の系列（F0, HNR, F1〜F3）を一度だけ計算し、
+値・二乗・有効フレーム数の累積和から窓ごとの平均・標準偏差を求める。
+各窓の計算量は窓の長さによらず一定
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from parselmouth.praat import call
+
+from .graph import FeatureContext
+from .lpc import lpc_formants
+
+# 窓ごとの統計量を累積和で計算する特徴量グループ
+WINDOWED_FEATURE_GROUPS = ("f0", "hnr", "formants")
+
+# Praat の Harmonicity で無効フレームを表す値
+HNR_UNDEFINED = -200.0
+
+
+@dataclass(frozen=True)
+class FramePrefixSums:
+    """フレーム単位の系列の累積和
+
+    数値誤差を抑えるため、値は有効フレームの平均（``offset``）を引いてから
+    累積する
+
+    Attributes:
+        times: 各フレームの中心時刻（秒）
+        offset: 系列ごとの基準値（形状 (系列数,)）
+        sums: 基準値を引いた値の累積和（形状 (フレーム数 + 1, 系列数)）
+        squares: 基準値を引いた値の二乗の累積和（同上）
+        counts: 有効フレーム数の累積和（同上）
+    """
+
+    times: np.ndarray
+    offset: np.ndarray
+    sums: np.ndarray
+    squares: np.ndarray
+    counts: np.ndarray
+
+    def window_statistics(
+        self, segments: Sequence[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """窓 [開始時刻, 終了時刻) ごとの有効フレームの平均・標準偏差・フレーム数
+
+        Args:
+            segments: 窓（開始時刻, 終了時刻）のリスト
+
+        Returns:
+            形状 (窓数, 系列数) の平均・標準偏差・有効フレーム数のタプル
+            （有効フレームがない窓の平均・標準偏差はNaN）
+        """
+        ranges = np.searchsorted(self.times, np.asarray(segments, dtype=float))
+        ranges = ranges.reshape(-1, 2)
+        start, end = ranges[:, 0], ranges[:, 1]
+        count = self.counts[end] - self.counts[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            shifted = (self.sums[end] - self.sums[start]) / count
+            square = (self.squares[end] - self.squares[start]) / count
+        std = np.sqrt(np.maximum(square - shifted**2, 0.0))
+        return shifted + self.offset, std, count
+
+
+def prefix_sums(
+    times: np.ndarray, values: np.ndarray, valid: np.ndarray
+) -> FramePrefixSums:
+    """フレーム単位の系列から累積和を作成
+
+    Args:
+        times: 各フレームの中心時刻（秒）
+        values: 形状 (フレーム数,) または (フレーム数, 系列数) の値
+        valid: ``values`` と同じ形状の有効フレームのマスク
+
+    Returns:
+        累積和
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(len(times), -1)
+    valid = np.asarray(valid, dtype=bool).reshape(values.shape)
+    n_valid = valid.sum(axis=0)
+    offset = np.where(
+        n_valid > 0,
+        np.sum(np.where(valid, values, 0.0), axis=0) / np.maximum(n_valid, 1),
+        0.0,
+    )
+    shifted = np.where(valid, values - offset, 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    return FramePrefixSums(
+        times=np.asarray(times, dtype=np.float64),
+        offset=offset,
+        sums=np.concatenate((zeros, np.cumsum(shifted, axis=0))),
+        squares=np.concatenate((zeros, np.cumsum(shifted**2, axis=0))),
+        counts=np.concatenate((zeros, np.cumsum(valid, axis=0))),
+    )
+
+
+def frame_series(
+    context: FeatureContext,
+    features: Iterable[str] = WINDOWED_FEATURE_GROUPS,
+    formant_engine: str = "burg",
+) -> Dict[str, FramePrefixSums]:
+    """トラック全体のフレーム単位の系列を計算し、グループごとの累積和にする
+
+    Args:
+        context: トラック全体の中間表現のキャッシュ
+        features: 計算する特徴量グループ（WINDOWED_FEATURE_GROUPS のうち）
+        formant_engine: フォルマント推定に使用するエンジン（"burg" または "lpc"）
+
+    Returns:
+        グループ名をキーにした累積和（フォルマントは F1〜F3 の3系列）
+    """
+    return series_from_tracks(frame_tracks(context, features, formant_engine))
+
+
+def frame_tracks(
+    context: FeatureContext,
+    features: Iterable[str] = WINDOWED_FEATURE_GROUPS,
+    formant_engine: str = "burg",
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """トラック全体のフレーム単位の系列（時刻, 値）を計算する
+
+    F0 は ``contour``、HNR は ``harmonicity``、フォルマントは ``formant``
+    （Burg）またはバッチLPCから取得する。中間表現はコンテキストで共有される
+
+    Args:
+        context: トラック全体の中間表現のキャッシュ
+        features: 計算する特徴量グループ（WINDOWED_FEATURE_GROUPS のうち）
+        formant_engine: フォルマント推定に使用するエンジン（"burg" または "lpc"）
+
+    Returns:
+        グループ名をキーにした（各フレームの中心時刻, 値）。値は無効フレームを
+        含む（F0 の無声フレームは0、HNR は HNR_UNDEFINED）。フォルマントの値は
+        形状 (フレーム数, 3) の F1〜F3
+    """
+    tracks = {}
+    if "f0" in features:
+        contour = context.get("contour")
+        tracks["f0"] = (contour.times, contour.f0_hz)
+    if "hnr" in features:
+        harmonicity = context.get("harmonicity")
+        tracks["hnr"] = (
+            np.asarray(harmonicity.xs()),
+            np.asarray(harmonicity.values[0]),
+        )
+    if "formants" in features:
+        if formant_engine == "lpc":
+            times, values = lpc_formants(context.audio, context.sr)
+        else:
+            formant = context.get("formant")
+            times = np.asarray(formant.xs())
+            values = np.column_stack(
+                [call(formant, "To Matrix", number).values[0] for number in (1, 2, 3)]
+            )
+        tracks["formants"] = (times, values)
+    return tracks
+
+
+def series_from_tracks(
+    tracks: Dict[str, Tuple[np.ndarray, np.ndarray]],
+) -> Dict[str, FramePrefixSums]:
+    """``frame_tracks`` の系列から無効フレームを除いた累積和を作成
+
+    Args:
+        tracks: グループ名をキーにした（各フレームの中心時刻, 値）
+
+    Returns:
+        グループ名をキーにした累積和
+    """
+    series = {}
+    for group, (times, values) in tracks.items():
+        if group == "hnr":
+            valid = values != HNR_UNDEFINED
+        else:
+            valid = np.isfinite(values) & (values > 0)
+        series[group] = prefix_sums(times, values, valid)
+    return series
+
+
+def window_grid(
+    duration: float, window_sec: float, hop_sec: float
+) -> List[Tuple[float, float]]:
+    """一定間隔の窓（開始時刻, 終了時刻）のリストを作成
+
+    窓は0秒から ``hop_sec`` ごとに始まり、トラック内に収まるものを返す。
+    トラックが窓より短い場合はトラック全体の1窓
+
+    Args:
+        duration: トラックの長さ（秒）
+        window_sec: 窓の長さ（秒）
+        hop_sec: 窓の間隔（秒）
+
+    Returns:
+        窓（開始時刻, 終了時刻）のリスト
+
+    Raises:
+        ValueError: 窓の長さ・間隔が正でない場合
+    """
+    if window_sec <= 0 or hop_sec <= 0:
+        raise ValueError("window_sec and hop_sec must be positive")
+    if duration <= 0:
+        return []
+    last_start = max(duration - window_sec, 0.0)
+    # 浮動小数点誤差で最後の窓が落ちないよう、わずかに余裕を持たせる
+    starts = np.arange(0.0, last_start + hop_sec * 1e-6, hop_sec)
+    return [
+        (float(start), float(min(start + window_sec, duration))) for start in starts
+    ]
+
+
+def windowed_features(
+    series: Dict[str, FramePrefixSums], segments: Sequence[Tuple[float, float]]
+) -> List[dict]:
+    """累積和から窓ごとの F0・HNR・フォルマントの統計量を計算
+
+    有効フレームがない窓は ``AcousticFeatureExtractor`` と同じデフォルト値
+    （F0 120 Hz, HNR 10 dB, F1〜F3 500/1500/2500 Hz）とする
+
+    Args:
+        series: ``frame_series`` が返すグループごとの累積和
+        segments: 窓（開始時刻, 終了時刻）のリスト
+
+    Returns:
+        窓ごとの FeatureData のフィールド（計算したグループのみ）
+    """
+    columns = {}
+    if "f0" in series:
+        mean, std, count = series["f0"].window_statistics(segments)
+        empty = count[:, 0] == 0
+        columns["f0_mean_hz"] = np.where(empty, 120.0, mean[:, 0])
+        columns["f0_std_hz"] = np.where(empty, 0.0, std[:, 0])
+    if "hnr" in series:
+        mean, _, count = series["hnr"].window_statistics(segments)
+        columns["hnr_mean_db"] = np.where(count[:, 0] == 0, 10.0, mean[:, 0])
+    if "formants" in series:
+        mean, _, count = series["formants"].window_statistics(segments)
+        defaults = np.array([500.0, 1500.0, 2500.0])
+        mean = np.where(count == 0, defaults, mean)
+        for index, key in enumerate(("f1_mean_hz", "f2_mean_hz", "f3_mean_hz")):
+            columns[key] = mean[:, index]
+    return [
+        {key: float(column[index]) for key, column in columns.items()}
+        for index in range(len(segments))
+    ]
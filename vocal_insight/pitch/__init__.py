@@ -0,0 +1,43 @@
+"""
+音程判定機能パッケージ
+
+ユーザー音声とリファレンス音声のピッチ輪郭を帯域制約DTWで整列し、
+音程精度の指標を計算する機能を提供
+"""
+
+from .alignment import Alignment, banded_dtw, estimate_offset
+from .analyzer import PitchAccuracyAnalyzer, PitchComparatorProtocol
+from .metrics import hz_to_cents
+from .notes import NoteSequence, load_notes, read_midi, read_note_list
+from .reference import PreparedContour, ReferenceContourStore, prepare_contour
+from .schemas import (
+    SCHEMA_VERSION,
+    PitchAnalysisConfig,
+    PitchAnalysisResult,
+    get_default_pitch_config,
+    validate_result,
+)
+from .transcription import NoteTable, NoteTranscriber
+
+__all__ = [
+    "PitchAccuracyAnalyzer",
+    "PitchComparatorProtocol",
+    "ReferenceContourStore",
+    "PreparedContour",
+    "prepare_contour",
+    "NoteSequence",
+    "load_notes",
+    "read_midi",
+    "read_note_list",
+    "NoteTable",
+    "NoteTranscriber",
+    "PitchAnalysisConfig",
+    "PitchAnalysisResult",
+    "SCHEMA_VERSION",
+    "get_default_pitch_config",
+    "validate_result",
+    "Alignment",
+    "banded_dtw",
+    "estimate_offset",
+    "hz_to_cents",
+]
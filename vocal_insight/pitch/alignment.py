@@ -0,0 +1,236 @@
+"""
+ピッチ輪郭の時間整列
+
+全体オフセットを相互相関で推定したうえで、その対角線を中心とする
+Sakoe-Chiba バンド内に制約した DTW でユーザーとリファレンスの
+セント系列を整列する。累積コストは2行分のみ保持し、バックポインタも
+バンド内のセルだけを int8 で保持するため、メモリ使用量はフレーム数に
+対して線形となる
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.signal import correlate
+
+# 両方有声のフレーム対のコスト上限（オクターブ誤りなどの影響を抑える）
+MAX_FRAME_COST_CENTS = 600.0
+
+# 片方のみ有声のフレーム対のコスト（セント換算）
+VOICING_MISMATCH_COST = 200.0
+
+# バックポインタの方向
+_DIAGONAL, _VERTICAL, _HORIZONTAL = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class Alignment:
+    """DTWによる整列結果
+
+    Attributes:
+        user_index: 整列経路上のユーザーフレーム番号
+        reference_index: 整列経路上のリファレンスフレーム番号
+        cost: 経路の累積コスト
+        offset_frames: 推定した全体オフセット（リファレンスの遅れ、フレーム数）
+        time_step: フレーム間隔（秒）
+    """
+
+    user_index: np.ndarray
+    reference_index: np.ndarray
+    cost: float
+    offset_frames: int
+    time_step: float
+
+    @property
+    def offset_seconds(self) -> float:
+        """全体オフセット（秒）"""
+        return self.offset_frames * self.time_step
+
+    @property
+    def normalized_cost(self) -> float:
+        """経路1ステップあたりの平均コスト"""
+        return self.cost / len(self.user_index) if len(self.user_index) else 0.0
+
+    def reference_for_user_frames(self, n_user_frames: int) -> np.ndarray:
+        """各ユーザーフレームに対応するリファレンスフレーム番号
+
+        経路上で同じユーザーフレームに複数のリファレンスフレームが対応する
+        場合は最初のものを採用する。
+
+        Args:
+            n_user_frames: ユーザーのフレーム数
+
+        Returns:
+            長さ n_user_frames のリファレンスフレーム番号の配列
+        """
+        mapping = np.empty(n_user_frames, dtype=np.int64)
+        first = np.flatnonzero(np.diff(self.user_index, prepend=-1))
+        mapping[self.user_index[first]] = self.reference_index[first]
+        return mapping
+
+
+def estimate_offset(
+    user_cents: np.ndarray, reference_cents: np.ndarray, max_lag: int
+) -> int:
+    """相互相関で全体オフセットを推定
+
+    各系列の有声フレームを平均0に正規化し（無声は0）、FFTによる
+    相互相関が最大となるラグを |lag| <= max_lag の範囲で探索する。
+
+    Args:
+        user_cents: ユーザーのセント値（無声はNaN）
+        reference_cents: リファレンスのセント値（無声はNaN）
+        max_lag: 探索するラグの最大値（フレーム数）
+
+    Returns:
+        リファレンスの遅れ（フレーム数）。reference[i + lag] ≈ user[i]
+    """
+    user = _centered(user_cents)
+    reference = _centered(reference_cents)
+    if not user.any() or not reference.any():
+        return 0
+
+    correlation = correlate(reference, user, mode="full", method="fft")
+    lags = np.arange(-(len(user) - 1), len(reference))
+    window = np.abs(lags) <= max_lag
+    return int(lags[window][np.argmax(correlation[window])])
+
+
+def _centered(cents: np.ndarray) -> np.ndarray:
+    """有声フレームを平均0に正規化し、無声フレームを0にする"""
+    voiced = np.isfinite(cents)
+    centered = np.zeros(len(cents))
+    if voiced.any():
+        centered[voiced] = cents[voiced] - np.mean(cents[voiced])
+    return centered
+
+
+def band_limits(n_user: int, n_reference: int, offset: int, radius: int) -> tuple:
+    """各ユーザーフレーム（行）に対するバンドの範囲 [lo, hi] を計算
+
+    中心線 j = i + offset の前後 radius フレームを許容し、経路が
+    (0, 0) から (n_user - 1, n_reference - 1) まで必ず連結するよう
+    先頭行・最終行を端まで広げる。
+
+    Args:
+        n_user: ユーザーのフレーム数
+        n_reference: リファレンスのフレーム数
+        offset: 全体オフセット（フレーム数）
+        radius: バンド半径（フレーム数）
+
+    Returns:
+        各行のバンド下端・上端の配列のタプル
+    """
+    center = np.arange(n_user) + offset
+    lo = np.clip(center - radius, 0, n_reference - 1)
+    hi = np.clip(center + radius, 0, n_reference - 1)
+    lo[0] = 0
+    hi[-1] = n_reference - 1
+    return np.maximum.accumulate(lo), np.maximum.accumulate(hi)
+
+
+def banded_dtw(
+    user_cents: np.ndarray,
+    reference_cents: np.ndarray,
+    radius: int,
+    offset: int = 0,
+    time_step: float = 0.01,
+) -> Alignment:
+    """Sakoe-Chiba バンドに制約したDTWでセント系列を整列
+
+    行 i のバンド内では漸化式
+    ``D[i, j] = c[i, j] + min(D[i-1, j-1], D[i-1, j], D[i, j-1])`` の
+    横方向の依存を累積和と ``np.minimum.accumulate`` で展開し、
+    1行をまとめてベクトル化して計算する。
+
+    Args:
+        user_cents: ユーザーのセント値（無声はNaN）
+        reference_cents: リファレンスのセント値（無声はNaN）
+        radius: バンド半径（フレーム数）
+        offset: バンド中心線の全体オフセット（フレーム数）
+        time_step: フレーム間隔（秒）
+
+    Returns:
+        整列結果
+
+    Raises:
+        ValueError: いずれかの系列が空の場合
+    """
+    n_user, n_reference = len(user_cents), len(reference_cents)
+    if n_user == 0 or n_reference == 0:
+        raise ValueError("cannot align an empty pitch contour")
+
+    lo, hi = band_limits(n_user, n_reference, offset, max(int(radius), 1))
+    widths = hi - lo + 1
+    row_starts = np.concatenate(([0], np.cumsum(widths)))
+    directions = np.empty(row_starts[-1], dtype=np.int8)
+
+    reference_voiced = np.isfinite(reference_cents)
+    reference_filled = np.where(reference_voiced, reference_cents, 0.0)
+    mismatch_row = np.where(reference_voiced, VOICING_MISMATCH_COST, 0.0)
+
+    previous = None
+    for i in range(n_user):
+        start, stop = lo[i], hi[i] + 1
+        if np.isfinite(user_cents[i]):
+            cost = np.where(
+                reference_voiced[start:stop],
+                np.minimum(
+                    np.abs(reference_filled[start:stop] - user_cents[i]),
+                    MAX_FRAME_COST_CENTS,
+                ),
+                VOICING_MISMATCH_COST,
+            )
+        else:
+            cost = mismatch_row[start:stop]
+
+        # 前の行からの遷移（縦・斜め）の最小値
+        if previous is None:
+            vertical = np.full(stop - start, np.inf)
+            vertical[0] = 0.0
+            diagonal = np.full(stop - start, np.inf)
+        else:
+            padded = np.concatenate(([np.inf], previous, [np.inf]))
+            columns = np.arange(start, stop) - lo[i - 1]
+            vertical = padded[np.clip(columns, -1, len(previous)) + 1]
+            diagonal = padded[np.clip(columns - 1, -1, len(previous)) + 1]
+        from_previous = np.minimum(diagonal, vertical)
+
+        # 横方向の依存を累積和で展開: D_j = C_j + min_{k<=j}(a_k - C_{k-1})
+        cumulative = np.cumsum(cost)
+        candidates = from_previous - (cumulative - cost)
+        running = np.minimum.accumulate(candidates)
+        current = cumulative + running
+
+        row = directions[row_starts[i] : row_starts[i + 1]]
+        row[:] = np.where(diagonal <= vertical, _DIAGONAL, _VERTICAL)
+        row[1:][candidates[1:] > running[:-1]] = _HORIZONTAL
+        previous = current
+
+    user_path, reference_path = _backtrack(directions, row_starts, lo, n_reference)
+    return Alignment(
+        user_index=user_path,
+        reference_index=reference_path,
+        cost=float(previous[-1]),
+        offset_frames=int(offset),
+        time_step=time_step,
+    )
+
+
+def _backtrack(
+    directions: np.ndarray, row_starts: np.ndarray, lo: np.ndarray, n_reference: int
+) -> tuple:
+    """バックポインタを終端から辿って整列経路を復元"""
+    i, j = len(lo) - 1, n_reference - 1
+    user_path, reference_path = [i], [j]
+    while i > 0 or j > 0:
+        step = directions[row_starts[i] + j - lo[i]]
+        if step == _DIAGONAL:
+            i, j = i - 1, j - 1
+        elif step == _VERTICAL:
+            i -= 1
+        else:
+            j -= 1
+        user_path.append(i)
+        reference_path.append(j)
+    return np.array(user_path[::-1]), np.array(reference_path[::-1])
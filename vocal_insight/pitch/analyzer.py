@@ -0,0 +1,355 @@
+"""
+音程判定アナライザー
+
+ユーザー音声とリファレンス音声のピッチ輪郭を整列し、音程精度の指標を
+計算するエントリーポイント
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Optional, Protocol, Sequence, Tuple, Union
+
+import librosa
+import numpy as np
+
+from ..core.config import DEFAULT_MIN_GAP_SEC, PITCH_ENGINES
+from ..features.contour import PitchContour, compute_pitch_contour
+from ..segments.phrase import PhraseBoundaryDetector
+from .alignment import Alignment, banded_dtw, estimate_offset
+from .metrics import (
+    cent_deviation,
+    hit_rate,
+    mean_cent_deviation,
+    section_metrics,
+    stability,
+)
+from .notes import NoteSequence
+from .reference import (
+    AudioInput,
+    PreparedContour,
+    ReferenceContourStore,
+    prepare_contour,
+)
+from .schemas import (
+    SCHEMA_VERSION,
+    AlignmentInfo,
+    PitchAccuracy,
+    PitchAnalysisConfig,
+    PitchAnalysisResult,
+    ReferenceAudioInfo,
+    SectionAccuracy,
+    empty_expression_comparison,
+    get_default_pitch_config,
+)
+
+logger = logging.getLogger(__name__)
+
+# 区間指定: （区間ID, 開始時刻, 終了時刻）
+Section = Tuple[str, float, float]
+
+
+class PitchComparatorProtocol(Protocol):
+    """音程判定アルゴリズムのプロトコル"""
+
+    def analyze(
+        self,
+        audio: AudioInput,
+        reference: Optional[AudioInput] = None,
+        sr: Optional[int] = None,
+        reference_sr: Optional[int] = None,
+    ) -> PitchAnalysisResult:
+        """ユーザー音声をリファレンス音声と比較して音程精度を評価
+
+        Args:
+            audio: ユーザー音声
+            reference: リファレンス音声（省略時は音程判定なし）
+            sr: ユーザー音声のサンプリング周波数（配列入力時に必須）
+            reference_sr: リファレンス音声のサンプリング周波数（配列入力時に必須）
+
+        Returns:
+            音程判定結果
+        """
+        ...
+
+
+class PitchAccuracyAnalyzer:
+    """帯域制約DTWによる音程判定アナライザー"""
+
+    def __init__(
+        self,
+        config: Optional[PitchAnalysisConfig] = None,
+        reference_store: Optional[ReferenceContourStore] = None,
+    ):
+        """
+        Args:
+            config: 音程判定の設定（省略した項目はデフォルト値）
+            reference_store: 前処理済みリファレンス輪郭のキャッシュ。
+                指定時は同じリファレンスとの2回目以降の比較で
+                リファレンスの分析を省略する
+
+        Raises:
+            ValueError: 設定値が不正な場合
+        """
+        self.config = PitchAnalysisConfig(
+            {**get_default_pitch_config(), **(config or {})}
+        )
+        if self.config["pitch_engine"] not in PITCH_ENGINES:
+            raise ValueError(f"pitch_engine must be one of {PITCH_ENGINES}")
+        for key in (
+            "hit_tolerance_cents",
+            "outlier_cents",
+            "band_radius_sec",
+            "stability_step_cents",
+        ):
+            if self.config[key] <= 0:
+                raise ValueError(f"{key} must be positive")
+        if self.config["max_offset_sec"] < 0:
+            raise ValueError("max_offset_sec must be non-negative")
+        if self.config["smoothing_frames"] < 1:
+            raise ValueError("smoothing_frames must be at least 1")
+        self.reference_store = reference_store
+
+    def analyze(
+        self,
+        audio: AudioInput,
+        reference: Optional[Union[AudioInput, NoteSequence]] = None,
+        sr: Optional[int] = None,
+        reference_sr: Optional[int] = None,
+        sections: Optional[Sequence[Section]] = None,
+        reference_id: Optional[str] = None,
+    ) -> PitchAnalysisResult:
+        """ユーザー音声をリファレンス音声と比較して音程精度を評価
+
+        ピッチ分析は各音声に対して元のサンプリング周波数のまま同じ
+        フレーム間隔で行うため、サンプリング周波数が異なる音声同士も
+        比較できる。
+
+        Args:
+            audio: ユーザー音声（ファイルパスまたは音声データ）
+            reference: リファレンス音声、またはMIDI・音符リストから読み込んだ
+                音符列（省略時は音程判定なし）。音符列の場合はリファレンス側の
+                音声処理を行わない
+            sr: ユーザー音声のサンプリング周波数（配列入力時に必須）
+            reference_sr: リファレンス音声のサンプリング周波数（配列入力時に必須）
+            sections: 区間別指標を計算する区間（ユーザー音声の時刻）。
+                省略時はユーザー音声のフレーズ境界で分割
+            reference_id: 結果に記録するリファレンスの識別子
+
+        Returns:
+            音程判定結果
+
+        Raises:
+            ValueError: サンプリング周波数の指定漏れ、またはピッチを
+                検出できない場合
+        """
+        engine = self.config["pitch_engine"]
+        user_audio, user_sr = _load_audio(audio, sr, "audio")
+        user_contour = compute_pitch_contour(user_audio, user_sr, engine=engine)
+
+        if reference is None:
+            logger.info("pitch analysis skipped: no reference audio")
+            return _result(None, None)
+
+        if isinstance(reference, NoteSequence):
+            # 音符列はユーザーと同じフレーム格子の目標F0輪郭に直接変換
+            start_time = (
+                float(user_contour.times[0]) if len(user_contour.times) else 0.0
+            )
+            reference_contour = reference.to_contour(
+                user_contour.time_step, start_time=start_time
+            )
+            source_path = reference.source_path
+        elif self.reference_store is not None:
+            # 前処理済みのリファレンス輪郭を再利用（初回のみ計算して保存）
+            reference_contour, cached = self.reference_store.get(
+                reference,
+                reference_sr,
+                pitch_engine=engine,
+                smoothing_frames=self.config["smoothing_frames"],
+            )
+            logger.info("reference contour %s", "reused" if cached else "stored")
+        else:
+            reference_audio, ref_sr = _load_audio(reference, reference_sr, "reference")
+            reference_contour = compute_pitch_contour(
+                reference_audio, ref_sr, engine=engine
+            )
+
+        if not isinstance(reference, NoteSequence):
+            source_path = None if isinstance(reference, np.ndarray) else str(reference)
+        if reference_id is None and source_path is not None:
+            reference_id = Path(source_path).stem
+        return self.compare(
+            user_contour,
+            reference_contour,
+            sections=sections,
+            reference_id=reference_id,
+            source_path=source_path,
+        )
+
+    def compare(
+        self,
+        user: PitchContour,
+        reference: Union[PitchContour, PreparedContour],
+        sections: Optional[Sequence[Section]] = None,
+        reference_id: Optional[str] = None,
+        source_path: Optional[str] = None,
+    ) -> PitchAnalysisResult:
+        """計算済みのピッチ輪郭同士を比較
+
+        Args:
+            user: ユーザーのピッチ輪郭
+            reference: リファレンスのピッチ輪郭、またはリファレンス輪郭ストア
+                などで前処理済みの輪郭
+            sections: 区間別指標を計算する区間（省略時はフレーズ境界で分割）
+            reference_id: 結果に記録するリファレンスの識別子
+            source_path: 結果に記録するリファレンスのパス
+
+        Returns:
+            音程判定結果
+
+        Raises:
+            ValueError: フレーム間隔が異なる、またはいずれかの輪郭に
+                有声フレームがない場合
+        """
+        if not np.isclose(user.time_step, reference.time_step):
+            raise ValueError(
+                f"pitch contours have different time steps "
+                f"({user.time_step} s vs {reference.time_step} s)"
+            )
+        for name, contour in (("audio", user), ("reference", reference)):
+            if not contour.voiced.any():
+                raise ValueError(
+                    f"pitch estimation failed: {name} has no voiced frames"
+                )
+
+        started = time.perf_counter()
+        config = self.config
+        step = user.time_step
+        smoothing = config["smoothing_frames"]
+        user_cents = prepare_contour(user, smoothing).cents
+        if not isinstance(reference, PreparedContour):
+            reference = prepare_contour(reference, smoothing)
+        reference_cents = reference.cents
+
+        # 全体オフセットを推定し、その周辺のバンド内でDTW整列
+        offset = estimate_offset(
+            user_cents, reference_cents, int(round(config["max_offset_sec"] / step))
+        )
+        alignment = banded_dtw(
+            user_cents,
+            reference_cents,
+            radius=int(round(config["band_radius_sec"] / step)),
+            offset=offset,
+            time_step=step,
+        )
+
+        # 各ユーザーフレームに対応するリファレンスとの偏差
+        mapping = alignment.reference_for_user_frames(len(user_cents))
+        deviation = cent_deviation(
+            user_cents, reference_cents[mapping], config["outlier_cents"]
+        )
+
+        if sections is None:
+            sections = _phrase_sections(user)
+        accuracy = self._accuracy(user.times, user_cents, deviation, sections)
+
+        logger.info(
+            "pitch analysis: engine=%s frames=%d/%d offset=%.2fs band=%.2fs "
+            "tolerance=%.0f cents elapsed=%.3fs",
+            config["pitch_engine"],
+            len(user_cents),
+            len(reference_cents),
+            alignment.offset_seconds,
+            config["band_radius_sec"],
+            config["hit_tolerance_cents"],
+            time.perf_counter() - started,
+        )
+
+        return _result(
+            ReferenceAudioInfo(
+                id=reference_id,
+                source_path=source_path,
+                alignment=_alignment_info(alignment),
+            ),
+            accuracy,
+        )
+
+    def _accuracy(
+        self,
+        times: np.ndarray,
+        user_cents: np.ndarray,
+        deviation: np.ndarray,
+        sections: Sequence[Section],
+    ) -> PitchAccuracy:
+        """整列済みの偏差から全体・区間別の指標を計算"""
+        tolerance = self.config["hit_tolerance_cents"]
+        section_deviation, section_hit_rate = section_metrics(
+            times,
+            deviation,
+            [(start, end) for _, start, end in sections],
+            tolerance,
+        )
+        per_section = [
+            SectionAccuracy(
+                section_id=section_id,
+                time_start_s=round(float(start), 3),
+                time_end_s=round(float(end), 3),
+                cent_deviation=_optional(section_deviation[index]),
+                hit_rate=_optional(section_hit_rate[index]),
+            )
+            for index, (section_id, start, end) in enumerate(sections)
+        ]
+        return PitchAccuracy(
+            mean_cent_deviation=_optional(mean_cent_deviation(deviation)),
+            hit_rate=_optional(hit_rate(deviation, tolerance)),
+            stability=_optional(
+                stability(user_cents, self.config["stability_step_cents"])
+            ),
+            per_section=per_section,
+        )
+
+
+def _load_audio(
+    audio: AudioInput, sr: Optional[int], name: str
+) -> Tuple[np.ndarray, int]:
+    """ファイルパスまたは配列から音声データを取得"""
+    if isinstance(audio, np.ndarray):
+        if sr is None:
+            raise ValueError(f"sampling rate is required when {name} is an array")
+        return audio, sr
+    return librosa.load(str(audio), sr=None)
+
+
+def _phrase_sections(contour: PitchContour) -> list:
+    """ピッチ輪郭のフレーズ境界で区間を作成"""
+    boundaries = PhraseBoundaryDetector().detect(contour, DEFAULT_MIN_GAP_SEC)
+    end = float(contour.times[-1] + contour.time_step) if len(contour.times) else 0.0
+    edges = np.concatenate(([0.0], boundaries, [end]))
+    return [
+        (f"section_{index + 1}", float(start), float(stop))
+        for index, (start, stop) in enumerate(zip(edges[:-1], edges[1:]))
+    ]
+
+
+def _alignment_info(alignment: Alignment) -> AlignmentInfo:
+    return AlignmentInfo(
+        offset_seconds=round(alignment.offset_seconds, 3),
+        DTW_cost=float(alignment.normalized_cost),
+    )
+
+
+def _optional(value: float) -> Optional[float]:
+    """NaN（計算不能）を None に変換"""
+    return None if np.isnan(value) else float(value)
+
+
+def _result(
+    reference: Optional[ReferenceAudioInfo], accuracy: Optional[PitchAccuracy]
+) -> PitchAnalysisResult:
+    return PitchAnalysisResult(
+        version=SCHEMA_VERSION,
+        reference_audio=reference,
+        pitch_accuracy=accuracy,
+        expression_comparison=empty_expression_comparison(),
+    )
@@ -0,0 +1,152 @@
+"""
+音程精度の指標計算
+
+整列済みフレームに対するセント偏差・一致率・安定度・区間別指標を
+ベクトル化して計算する。無声フレームはNaNとして扱う
+"""
+
+import warnings
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# セント換算の基準周波数（A4）
+CENTS_REFERENCE_HZ = 440.0
+
+
+def hz_to_cents(
+    f0_hz: np.ndarray, reference_hz: float = CENTS_REFERENCE_HZ
+) -> np.ndarray:
+    """周波数をセントに変換（無声フレーム＝0以下はNaN）
+
+    Args:
+        f0_hz: フレーム単位の基本周波数
+        reference_hz: 0セントに対応する周波数
+
+    Returns:
+        セント値の配列
+    """
+    f0_hz = np.asarray(f0_hz, dtype=np.float64)
+    cents = np.full(f0_hz.shape, np.nan)
+    voiced = f0_hz > 0
+    cents[voiced] = 1200.0 * np.log2(f0_hz[voiced] / reference_hz)
+    return cents
+
+
+def median_smooth(cents: np.ndarray, frames: int) -> np.ndarray:
+    """有声フレームのみを対象にメディアンフィルタで平滑化
+
+    無声フレーム（NaN）は平滑化後もNaNのまま残し、窓内の無声フレームは
+    中央値の計算から除外する。
+
+    Args:
+        cents: セント値の配列
+        frames: フィルタ長（1以下で平滑化なし）
+
+    Returns:
+        平滑化されたセント値の配列
+    """
+    if frames <= 1 or len(cents) == 0:
+        return cents
+    half = frames // 2
+    padded = np.pad(cents, (half, frames - 1 - half), constant_values=np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, frames)
+    with warnings.catch_warnings():
+        # 全て無声の窓は中心も無声のため結果はNaNで正しい
+        warnings.simplefilter("ignore", RuntimeWarning)
+        smoothed = np.nanmedian(windows, axis=1)
+    return np.where(np.isnan(cents), np.nan, smoothed)
+
+
+def cent_deviation(
+    user_cents: np.ndarray, reference_cents: np.ndarray, outlier_cents: float
+) -> np.ndarray:
+    """整列済みフレーム間のセント偏差（ユーザー − リファレンス）
+
+    Args:
+        user_cents: ユーザーのセント値
+        reference_cents: 対応するリファレンスのセント値
+        outlier_cents: これを超える偏差（オクターブ誤りなど）はNaNとして除外
+
+    Returns:
+        セント偏差の配列（いずれかが無声、または外れ値のフレームはNaN）
+    """
+    deviation = np.asarray(user_cents) - np.asarray(reference_cents)
+    with np.errstate(invalid="ignore"):
+        deviation[np.abs(deviation) > outlier_cents] = np.nan
+    return deviation
+
+
+def mean_cent_deviation(deviation: np.ndarray) -> float:
+    """平均絶対セント偏差（有効フレームがない場合はNaN）"""
+    valid = deviation[np.isfinite(deviation)]
+    return float(np.mean(np.abs(valid))) if len(valid) else float("nan")
+
+
+def hit_rate(deviation: np.ndarray, tolerance_cents: float) -> float:
+    """偏差が許容範囲内のフレームの割合（有効フレームがない場合はNaN）"""
+    valid = deviation[np.isfinite(deviation)]
+    if len(valid) == 0:
+        return float("nan")
+    return float(np.mean(np.abs(valid) <= tolerance_cents))
+
+
+def stability(cents: np.ndarray, step_cents: float) -> float:
+    """連続する有声フレーム間の変化が step_cents 以下である割合
+
+    Args:
+        cents: ユーザーのセント値
+        step_cents: 安定とみなすフレーム間変化の上限（セント）
+
+    Returns:
+        安定度（0〜1、連続する有声フレームがない場合はNaN）
+    """
+    steps = np.abs(np.diff(cents))
+    steps = steps[np.isfinite(steps)]
+    if len(steps) == 0:
+        return float("nan")
+    return float(np.mean(steps <= step_cents))
+
+
+def section_metrics(
+    times: np.ndarray,
+    deviation: np.ndarray,
+    sections: Sequence[Tuple[float, float]],
+    tolerance_cents: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """区間ごとの平均絶対セント偏差と一致率
+
+    各フレームの所属区間を二分探索で求め、区間ごとの合計を
+    ``np.bincount`` で一括集計する。
+
+    Args:
+        times: 各フレームの時刻（秒）
+        deviation: セント偏差（NaNは除外）
+        sections: （開始時刻, 終了時刻）のリスト。重複しない昇順を想定
+        tolerance_cents: 一致とみなす偏差の上限（セント）
+
+    Returns:
+        区間ごとの平均絶対セント偏差と一致率の配列のタプル
+        （有効フレームがない区間はNaN）
+    """
+    n_sections = len(sections)
+    if n_sections == 0:
+        return np.array([]), np.array([])
+
+    bounds = np.asarray(sections, dtype=np.float64)
+    index = np.searchsorted(bounds[:, 0], times, side="right") - 1
+    inside = (index >= 0) & np.isfinite(deviation)
+    inside[inside] &= times[inside] < bounds[index[inside], 1]
+
+    index = index[inside]
+    absolute = np.abs(deviation[inside])
+    counts = np.bincount(index, minlength=n_sections)
+    totals = np.bincount(index, weights=absolute, minlength=n_sections)
+    hits = np.bincount(
+        index,
+        weights=(absolute <= tolerance_cents).astype(np.float64),
+        minlength=n_sections,
+    )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals / counts, hits / counts
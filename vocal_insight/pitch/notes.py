@@ -0,0 +1,322 @@
+"""
+音符列リファレンス
+
+MIDIファイルまたは音符リスト（開始・終了時刻とMIDIノート番号）を
+読み込み、分析フレームの格子上の目標F0輪郭に変換する。リファレンス側の
+音声処理（ボーカル分離・ピッチ分析）を行わずに音程判定ができる
+"""
+
+import csv
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..features.contour import PitchContour
+
+# 音符リストとして読み込むファイルの拡張子
+MIDI_SUFFIXES = (".mid", ".midi")
+NOTE_LIST_SUFFIXES = (".csv",)
+
+# General MIDI のドラムチャンネル（0始まり）
+DRUM_CHANNEL = 9
+
+# MIDIの既定テンポ（4分音符あたりのマイクロ秒、120 BPM）
+_DEFAULT_TEMPO = 500000
+
+
+@dataclass(frozen=True)
+class NoteSequence:
+    """音符列（配列形式）
+
+    Attributes:
+        start_s: 各音符の開始時刻（秒）
+        end_s: 各音符の終了時刻（秒）
+        pitch: 各音符のMIDIノート番号（小数可、69 = A4 = 440 Hz）
+        source_path: 読み込み元のファイルパス
+    """
+
+    start_s: np.ndarray
+    end_s: np.ndarray
+    pitch: np.ndarray
+    source_path: Optional[str] = None
+
+    @classmethod
+    def from_notes(
+        cls,
+        notes: Iterable[Tuple[float, float, float]],
+        source_path: Optional[str] = None,
+    ) -> "NoteSequence":
+        """（開始時刻, 終了時刻, MIDIノート番号）の列から作成
+
+        Raises:
+            ValueError: 終了時刻が開始時刻以前の音符を含む場合
+        """
+        table = np.asarray(list(notes), dtype=np.float64).reshape(-1, 3)
+        if np.any(table[:, 1] <= table[:, 0]):
+            raise ValueError("every note must end after it starts")
+        order = np.argsort(table[:, 0], kind="stable")
+        table = table[order]
+        return cls(
+            start_s=table[:, 0],
+            end_s=table[:, 1],
+            pitch=table[:, 2],
+            source_path=source_path,
+        )
+
+    def __len__(self) -> int:
+        return len(self.pitch)
+
+    @property
+    def duration(self) -> float:
+        """最後の音符の終了時刻（秒）"""
+        return float(self.end_s.max()) if len(self) else 0.0
+
+    def to_contour(
+        self,
+        time_step: float,
+        start_time: float = 0.0,
+        n_frames: Optional[int] = None,
+    ) -> PitchContour:
+        """分析フレームの格子上の目標F0輪郭に変換
+
+        フレーム時刻 t が start <= t < end を満たす音符を発音中とみなし、
+        複数の音符が重なるフレームでは最も高い音を採用する（スカイライン）。
+
+        Args:
+            time_step: フレーム間隔（秒）
+            start_time: 先頭フレームの時刻（秒）
+            n_frames: フレーム数（省略時は最後の音符の終了まで）
+
+        Returns:
+            目標F0輪郭（休符は0）
+        """
+        if n_frames is None:
+            n_frames = max(int(np.ceil((self.duration - start_time) / time_step)), 0)
+        times = start_time + np.arange(n_frames) * time_step
+
+        # 各音符が覆うフレーム範囲 [first, last)
+        first = np.clip(np.ceil((self.start_s - start_time) / time_step), 0, n_frames)
+        last = np.clip(np.ceil((self.end_s - start_time) / time_step), 0, n_frames)
+        first, last = first.astype(np.int64), last.astype(np.int64)
+        lengths = np.maximum(last - first, 0)
+
+        # 全音符のフレーム番号を一括で展開し、フレームごとの最高音を求める
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        frames = np.repeat(first, lengths) + offsets
+        midi = np.full(n_frames, -np.inf)
+        np.maximum.at(midi, frames, np.repeat(self.pitch, lengths))
+
+        f0_hz = np.zeros(n_frames)
+        sounding = np.isfinite(midi)
+        f0_hz[sounding] = 440.0 * 2.0 ** ((midi[sounding] - 69.0) / 12.0)
+        return PitchContour(times=times, f0_hz=f0_hz, time_step=time_step)
+
+
+def load_notes(path: Union[str, Path], track: Optional[int] = None) -> NoteSequence:
+    """拡張子に応じてMIDIファイルまたは音符リストCSVを読み込む
+
+    Args:
+        path: ファイルパス（.mid/.midi または .csv）
+        track: MIDIのトラック番号（省略時は全トラック）
+
+    Returns:
+        音符列
+
+    Raises:
+        ValueError: 未対応の拡張子、または不正なファイルの場合
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in MIDI_SUFFIXES:
+        return read_midi(path, track=track)
+    if suffix in NOTE_LIST_SUFFIXES:
+        return read_note_list(path)
+    raise ValueError(
+        f"unsupported note reference '{suffix}'; "
+        f"expected one of {list(MIDI_SUFFIXES + NOTE_LIST_SUFFIXES)}"
+    )
+
+
+def read_note_list(path: Union[str, Path]) -> NoteSequence:
+    """音符リストCSV（start_s, end_s, pitch）を読み込む
+
+    1行目がヘッダー（数値でない行）の場合は読み飛ばす。pitch はMIDIノート番号。
+
+    Raises:
+        ValueError: 列数・数値が不正な場合
+    """
+    notes = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_number, row in enumerate(csv.reader(f), start=1):
+            if not row or not "".join(row).strip():
+                continue
+            try:
+                start, end, pitch = (float(value) for value in row[:3])
+            except ValueError:
+                if line_number == 1:
+                    continue
+                raise ValueError(f"{path}:{line_number}: expected start_s,end_s,pitch")
+            notes.append((start, end, pitch))
+    return NoteSequence.from_notes(notes, source_path=str(path))
+
+
+def read_midi(
+    path: Union[str, Path], track: Optional[int] = None, include_drums: bool = False
+) -> NoteSequence:
+    """Standard MIDI File（フォーマット0/1）から音符列を読み込む
+
+    テンポ変更は全トラックのテンポイベントから求めたテンポマップで
+    秒に換算する。
+
+    Args:
+        path: MIDIファイルのパス
+        track: 読み込むトラック番号（省略時は全トラック）
+        include_drums: ドラムチャンネル（10ch）の音符を含めるかどうか
+
+    Returns:
+        音符列
+
+    Raises:
+        ValueError: MIDIファイルとして解釈できない場合
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[:4] != b"MThd" or len(data) < 14:
+        raise ValueError(f"{path} is not a standard MIDI file")
+    header_length = struct.unpack(">I", data[4:8])[0]
+    _, n_tracks, division = struct.unpack(">HHH", data[8:14])
+    position = 8 + header_length
+
+    tracks: List[bytes] = []
+    while position + 8 <= len(data) and len(tracks) < n_tracks:
+        chunk_type = data[position : position + 4]
+        chunk_length = struct.unpack(">I", data[position + 4 : position + 8])[0]
+        body = data[position + 8 : position + 8 + chunk_length]
+        if chunk_type == b"MTrk":
+            tracks.append(body)
+        position += 8 + chunk_length
+
+    if track is not None and not (0 <= track < len(tracks)):
+        raise ValueError(f"track {track} not found ({len(tracks)} tracks)")
+
+    tempo_events: List[Tuple[int, int]] = []
+    notes: List[Tuple[int, int, int]] = []
+    for index, body in enumerate(tracks):
+        track_notes, track_tempos = _parse_track(body, include_drums)
+        tempo_events.extend(track_tempos)
+        if track is None or index == track:
+            notes.extend(track_notes)
+
+    if not notes:
+        return NoteSequence.from_notes([], source_path=str(path))
+
+    ticks = np.array([(start, end) for start, end, _ in notes], dtype=np.float64)
+    seconds = _ticks_to_seconds(ticks, division, tempo_events)
+    return NoteSequence.from_notes(
+        [
+            (start, end, pitch)
+            for (start, end), (_, _, pitch) in zip(seconds, notes)
+            if end > start
+        ],
+        source_path=str(path),
+    )
+
+
+def _read_varlen(body: bytes, position: int) -> Tuple[int, int]:
+    """可変長数値を読み込み、値と次の位置を返す"""
+    value = 0
+    while True:
+        byte = body[position]
+        position += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, position
+
+
+def _parse_track(
+    body: bytes, include_drums: bool
+) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]:
+    """1トラック分のイベントから音符（開始tick, 終了tick, ノート番号）とテンポを抽出"""
+    notes: List[Tuple[int, int, int]] = []
+    tempos: List[Tuple[int, int]] = []
+    open_notes: dict = {}
+    tick = 0
+    position = 0
+    running_status = 0
+    try:
+        while position < len(body):
+            delta, position = _read_varlen(body, position)
+            tick += delta
+            status = body[position]
+
+            if status == 0xFF:
+                meta_type = body[position + 1]
+                length, position = _read_varlen(body, position + 2)
+                if meta_type == 0x51 and length == 3:
+                    tempo = int.from_bytes(body[position : position + 3], "big")
+                    tempos.append((tick, tempo))
+                position += length
+                if meta_type == 0x2F:
+                    break
+                continue
+            if status in (0xF0, 0xF7):
+                length, position = _read_varlen(body, position + 1)
+                position += length
+                continue
+
+            # データバイトで始まる場合は直前のステータスを引き継ぐ（ランニングステータス）
+            if status & 0x80:
+                running_status = status
+                position += 1
+            status = running_status
+            if not status:
+                raise ValueError("MIDI data byte without a status byte")
+
+            kind, channel = status & 0xF0, status & 0x0F
+            n_data = 1 if kind in (0xC0, 0xD0) else 2
+            values = body[position : position + n_data]
+            position += n_data
+            if kind not in (0x80, 0x90) or (
+                channel == DRUM_CHANNEL and not include_drums
+            ):
+                continue
+
+            key = (channel, values[0])
+            if kind == 0x90 and values[1] > 0:
+                open_notes.setdefault(key, []).append(tick)
+            elif open_notes.get(key):
+                # 同じ音高の重複発音は先に始まったものから閉じる
+                notes.append((open_notes[key].pop(0), tick, values[0]))
+    except IndexError:
+        raise ValueError("truncated MIDI track")
+    return notes, tempos
+
+
+def _ticks_to_seconds(
+    ticks: np.ndarray, division: int, tempo_events: List[Tuple[int, int]]
+) -> np.ndarray:
+    """テンポマップに従ってtickを秒に換算"""
+    if division & 0x8000:
+        # SMPTE形式: 上位バイトは負のフレームレート、下位バイトはフレームあたりのtick
+        frames_per_second = 256 - (division >> 8)
+        return ticks / (frames_per_second * (division & 0xFF))
+
+    changes = sorted(dict(sorted(tempo_events)).items())
+    if not changes or changes[0][0] != 0:
+        changes.insert(0, (0, _DEFAULT_TEMPO))
+    change_ticks = np.array([tick for tick, _ in changes], dtype=np.float64)
+    seconds_per_tick = np.array([tempo for _, tempo in changes]) / 1e6 / division
+    change_seconds = np.concatenate(
+        ([0.0], np.cumsum(np.diff(change_ticks) * seconds_per_tick[:-1]))
+    )
+
+    segment = np.searchsorted(change_ticks, ticks, side="right") - 1
+    return (
+        change_seconds[segment]
+        + (ticks - change_ticks[segment]) * seconds_per_tick[segment]
+    )
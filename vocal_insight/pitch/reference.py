@@ -0,0 +1,194 @@
+"""
+リファレンス輪郭ストア
+
+前処理済み（セント変換・無声マスク・平滑化）のリファレンスピッチ輪郭を
+リファレンス音声のハッシュと分析設定をキーとしてディスクに保存し、
+メモリマップで読み込んで再利用する。同じリファレンスに対して多数の
+ユーザー歌唱を比較する場合、2回目以降はユーザー歌唱の分析と整列のみを行う
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import librosa
+import numpy as np
+
+from ..core.config import PITCH_ENGINES
+from ..core.storage import AudioInput, atomic_write, audio_hash, settings_digest
+from ..features.contour import PitchContour, compute_pitch_contour
+from .metrics import hz_to_cents, median_smooth
+
+# 保存形式のバージョン（前処理内容を変更した場合は更新してキャッシュを無効化）
+CONTOUR_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PreparedContour:
+    """比較用に前処理したピッチ輪郭
+
+    Attributes:
+        cents: 平滑化済みのセント値（無声フレームはNaN）
+        start_time: 先頭フレームの時刻（秒）
+        time_step: フレーム間隔（秒）
+    """
+
+    cents: np.ndarray
+    start_time: float
+    time_step: float
+
+    @property
+    def times(self) -> np.ndarray:
+        """各フレームの時刻（秒）"""
+        return self.start_time + np.arange(len(self.cents)) * self.time_step
+
+    @property
+    def voiced(self) -> np.ndarray:
+        """有声フレームのマスク"""
+        return np.isfinite(self.cents)
+
+
+def prepare_contour(contour: PitchContour, smoothing_frames: int) -> PreparedContour:
+    """ピッチ輪郭をセントに変換し、有声フレームのみを平滑化
+
+    Args:
+        contour: ピッチ輪郭
+        smoothing_frames: メディアンフィルタ長（1で平滑化なし）
+
+    Returns:
+        前処理済みの輪郭
+    """
+    start_time = float(contour.times[0]) if len(contour.times) else 0.0
+    return PreparedContour(
+        cents=median_smooth(hz_to_cents(contour.f0_hz), smoothing_frames),
+        start_time=start_time,
+        time_step=float(contour.time_step),
+    )
+
+
+class ReferenceContourStore:
+    """前処理済みリファレンス輪郭のディスクキャッシュ
+
+    ``<キー>.npy`` にセント値を、``<キー>.json`` にフレーム情報と
+    分析設定を保存する。キーは音声ハッシュ・ピッチエンジン・平滑化設定・
+    保存形式バージョンから決まるため、いずれかが変わると再計算される。
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（存在しない場合は作成）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(
+        self,
+        reference: AudioInput,
+        sr: Optional[int],
+        pitch_engine: str,
+        smoothing_frames: int,
+    ) -> str:
+        """キャッシュキーを計算
+
+        Args:
+            reference: リファレンス音声
+            sr: リファレンスのサンプリング周波数（配列入力時に必須）
+            pitch_engine: ピッチエンジン
+            smoothing_frames: メディアンフィルタ長
+
+        Returns:
+            キャッシュキー
+        """
+        digest = settings_digest(
+            pitch_engine, int(smoothing_frames), f"v{CONTOUR_FORMAT_VERSION}"
+        )
+        return f"{audio_hash(reference, sr)}-{digest}"
+
+    def get(
+        self,
+        reference: AudioInput,
+        sr: Optional[int] = None,
+        pitch_engine: str = "yin",
+        smoothing_frames: int = 5,
+    ) -> Tuple[PreparedContour, bool]:
+        """前処理済みのリファレンス輪郭を取得（未保存なら計算して保存）
+
+        Args:
+            reference: リファレンス音声（ファイルパスまたは音声データ）
+            sr: リファレンスのサンプリング周波数（配列入力時に必須）
+            pitch_engine: ピッチエンジン（"praat" または "yin"）
+            smoothing_frames: メディアンフィルタ長
+
+        Returns:
+            前処理済みの輪郭（セント値はメモリマップされた読み取り専用配列）と、
+            キャッシュから読み込んだかどうかのタプル
+
+        Raises:
+            ValueError: 未知のピッチエンジン、または配列入力で
+                サンプリング周波数が指定されていない場合
+        """
+        if pitch_engine not in PITCH_ENGINES:
+            raise ValueError(f"pitch_engine must be one of {PITCH_ENGINES}")
+
+        key = self.key(reference, sr, pitch_engine, smoothing_frames)
+        cached = self._load(key)
+        if cached is not None:
+            return cached, True
+
+        if isinstance(reference, np.ndarray):
+            audio = reference
+        else:
+            audio, sr = librosa.load(str(reference), sr=None)
+        contour = compute_pitch_contour(audio, sr, engine=pitch_engine)
+        prepared = prepare_contour(contour, smoothing_frames)
+        self._save(key, prepared, reference, pitch_engine, smoothing_frames)
+        return self._load(key), False
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.npy", self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[PreparedContour]:
+        """保存済みの輪郭をメモリマップで読み込む（未保存・破損時はNone）"""
+        array_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            cents = np.load(array_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CONTOUR_FORMAT_VERSION or len(cents) != meta.get(
+            "n_frames"
+        ):
+            return None
+        return PreparedContour(
+            cents=cents, start_time=meta["start_time"], time_step=meta["time_step"]
+        )
+
+    def _save(
+        self,
+        key: str,
+        prepared: PreparedContour,
+        reference: AudioInput,
+        pitch_engine: str,
+        smoothing_frames: int,
+    ) -> None:
+        """輪郭とメタデータを一時ファイル経由でアトミックに保存"""
+        array_path, meta_path = self._paths(key)
+        meta = {
+            "version": CONTOUR_FORMAT_VERSION,
+            "source_path": None
+            if isinstance(reference, np.ndarray)
+            else str(reference),
+            "pitch_engine": pitch_engine,
+            "smoothing_frames": int(smoothing_frames),
+            "start_time": prepared.start_time,
+            "time_step": prepared.time_step,
+            "n_frames": len(prepared.cents),
+        }
+        # 配列を先に保存し、メタデータの存在をもって保存完了とする
+        atomic_write(array_path, lambda f: np.save(f, prepared.cents))
+        atomic_write(
+            meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode("utf-8"))
+        )
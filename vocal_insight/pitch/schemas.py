@@ -0,0 +1,140 @@
+"""
+音程判定結果のスキーマ
+
+JSON入出力用の型定義とスキーマバージョン管理、結果の検証を提供
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, TypedDict
+
+# 音程判定結果JSONのスキーマバージョン
+SCHEMA_VERSION = "1.0"
+
+# 読み込み可能なスキーマバージョン（後方互換性のため過去のバージョンも列挙）
+SUPPORTED_SCHEMA_VERSIONS = ("1.0",)
+
+
+class AlignmentInfo(TypedDict):
+    """リファレンスとの時間整列情報"""
+
+    offset_seconds: float  # ユーザー音声に対するリファレンスの遅れ（秒）
+    DTW_cost: float  # 整列経路1ステップあたりの平均コスト（セント）
+
+
+class ReferenceAudioInfo(TypedDict):
+    """リファレンス音声の情報"""
+
+    id: Optional[str]
+    source_path: Optional[str]
+    alignment: Optional[AlignmentInfo]
+
+
+class SectionAccuracy(TypedDict):
+    """区間ごとの音程精度"""
+
+    section_id: str
+    time_start_s: float
+    time_end_s: float
+    cent_deviation: Optional[float]
+    hit_rate: Optional[float]
+
+
+class PitchAccuracy(TypedDict):
+    """音程精度の指標"""
+
+    mean_cent_deviation: Optional[float]
+    hit_rate: Optional[float]
+    stability: Optional[float]
+    per_section: List[SectionAccuracy]
+
+
+class ExpressionComparison(TypedDict):
+    """歌唱表現の対照分析（将来拡張用のプレースホルダ）"""
+
+    vibrato: Optional[Dict[str, Any]]
+    dynamics: Optional[Dict[str, Any]]
+    notes: List[Dict[str, Any]]
+
+
+class PitchAnalysisResult(TypedDict):
+    """音程判定結果のトップレベル構造
+
+    リファレンス音声が未指定の場合、``reference_audio`` と
+    ``pitch_accuracy`` は None（音程判定なし）となる。
+    """
+
+    version: str
+    reference_audio: Optional[ReferenceAudioInfo]
+    pitch_accuracy: Optional[PitchAccuracy]
+    expression_comparison: ExpressionComparison
+
+
+class PitchAnalysisConfig(TypedDict, total=False):
+    """音程判定の設定
+
+    省略した項目は ``get_default_pitch_config`` と同じ値として扱われる。
+    """
+
+    pitch_engine: str  # "praat" または "yin"
+    hit_tolerance_cents: float  # 一致とみなす偏差の上限（セント）
+    outlier_cents: float  # 外れ値（オクターブ誤りなど）として除外する偏差（セント）
+    smoothing_frames: int  # 偏差系列のメディアンフィルタ長（1で無効）
+    band_radius_sec: float  # DTWのSakoe-Chibaバンド半径（秒）
+    max_offset_sec: float  # 探索する全体オフセットの最大値（秒）
+    stability_step_cents: float  # 安定とみなすフレーム間変化の上限（セント）
+
+
+def get_default_pitch_config() -> PitchAnalysisConfig:
+    """音程判定のデフォルト設定を取得
+
+    Returns:
+        デフォルトの音程判定設定
+    """
+    return PitchAnalysisConfig(
+        pitch_engine="yin",
+        hit_tolerance_cents=50.0,
+        outlier_cents=600.0,
+        smoothing_frames=5,
+        band_radius_sec=2.0,
+        max_offset_sec=5.0,
+        stability_step_cents=30.0,
+    )
+
+
+def empty_expression_comparison() -> ExpressionComparison:
+    """未実装の表現比較ブロックを作成"""
+    return ExpressionComparison(vibrato=None, dynamics=None, notes=[])
+
+
+def validate_result(data: Mapping[str, Any]) -> PitchAnalysisResult:
+    """音程判定結果JSONの構造を検証
+
+    Args:
+        data: JSONから読み込んだ辞書
+
+    Returns:
+        検証済みの音程判定結果
+
+    Raises:
+        ValueError: バージョンが未対応、または必須項目が欠落している場合
+    """
+    version = data.get("version")
+    if version not in SUPPORTED_SCHEMA_VERSIONS:
+        raise ValueError(
+            f"unsupported pitch result version {version!r}; "
+            f"expected one of {list(SUPPORTED_SCHEMA_VERSIONS)}"
+        )
+
+    for key in ("reference_audio", "pitch_accuracy", "expression_comparison"):
+        if key not in data:
+            raise ValueError(f"pitch result is missing '{key}'")
+
+    accuracy = data["pitch_accuracy"]
+    if accuracy is not None:
+        for key in PitchAccuracy.__annotations__:
+            if key not in accuracy:
+                raise ValueError(f"pitch_accuracy is missing '{key}'")
+        for section in accuracy["per_section"]:
+            if "section_id" not in section:
+                raise ValueError("per_section entries require 'section_id'")
+
+    return PitchAnalysisResult(**data)
@@ -0,0 +1,200 @@
+"""
+音符イベントの採譜
+
+フレーム単位のピッチ輪郭を音符イベント（開始・終了時刻、中央値ピッチ）に
+変換する。半音格子へのヒステリシス付き量子化とランレングス処理を
+ベクトル化して行うため、フレームごとのPythonループを含まない
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..features.contour import PitchContour
+from .metrics import hz_to_cents, median_smooth
+from .notes import NoteSequence
+
+
+@dataclass(frozen=True)
+class NoteTable:
+    """音符イベントの表（配列形式）
+
+    Attributes:
+        onset_s: 各音符の開始時刻（秒）
+        offset_s: 各音符の終了時刻（秒）
+        pitch_cents: 各音符の中央値ピッチ（A4 = 440 Hz を0とするセント）
+    """
+
+    onset_s: np.ndarray
+    offset_s: np.ndarray
+    pitch_cents: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.onset_s)
+
+    @property
+    def duration_s(self) -> np.ndarray:
+        """各音符の長さ（秒）"""
+        return self.offset_s - self.onset_s
+
+    @property
+    def pitch_midi(self) -> np.ndarray:
+        """各音符のMIDIノート番号（小数）"""
+        return 69.0 + self.pitch_cents / 100.0
+
+    def to_sequence(self, source_path: Optional[str] = None) -> NoteSequence:
+        """音程判定のリファレンスとして使える音符列に変換"""
+        return NoteSequence(
+            start_s=self.onset_s,
+            end_s=self.offset_s,
+            pitch=self.pitch_midi,
+            source_path=source_path,
+        )
+
+    def to_sections(self) -> List[Tuple[str, float, float]]:
+        """音符ごとの区間指定（``PitchAccuracyAnalyzer`` の ``sections``）に変換"""
+        return [
+            (f"note_{index + 1}", float(onset), float(offset))
+            for index, (onset, offset) in enumerate(zip(self.onset_s, self.offset_s))
+        ]
+
+
+class NoteTranscriber:
+    """ピッチ輪郭から音符イベントを抽出する採譜器
+
+    1. セントに変換して有声フレームのみを平滑化し、全体のチューニングのずれ
+       （半音格子からの平均的なずれ）を推定して補正
+    2. 半音の中心から ``50 - hysteresis_cents`` 以内に入ったフレームでのみ
+       音高を確定し、境界付近のフレームは直前の確定音高を引き継ぐ
+       （ヒステリシス）。無声区間で状態をリセットする
+    3. 音高が同じ連続フレームをランレングスで音符にまとめ、短すぎる音符を除外
+    """
+
+    def __init__(
+        self,
+        min_note_sec: float = 0.06,
+        max_gap_sec: float = 0.03,
+        hysteresis_cents: float = 15.0,
+        smoothing_frames: int = 3,
+    ):
+        """
+        Args:
+            min_note_sec: 音符とみなす最短の長さ（秒）
+            max_gap_sec: 同じ音符内の途切れとして埋める無声区間の最大長（秒）
+            hysteresis_cents: 音高を切り替える際のヒステリシス幅（セント、0〜50未満）
+            smoothing_frames: セント値のメディアンフィルタ長
+
+        Raises:
+            ValueError: 設定値が範囲外の場合
+        """
+        if not 0 <= hysteresis_cents < 50:
+            raise ValueError("hysteresis_cents must be in [0, 50)")
+        if min_note_sec < 0 or max_gap_sec < 0:
+            raise ValueError("min_note_sec and max_gap_sec must be non-negative")
+        self.min_note_sec = min_note_sec
+        self.max_gap_sec = max_gap_sec
+        self.hysteresis_cents = hysteresis_cents
+        self.smoothing_frames = smoothing_frames
+
+    def transcribe(self, contour: PitchContour) -> NoteTable:
+        """ピッチ輪郭を音符イベントに変換
+
+        Args:
+            contour: ピッチ輪郭
+
+        Returns:
+            開始時刻順の音符イベント表
+        """
+        cents = median_smooth(hz_to_cents(contour.f0_hz), self.smoothing_frames)
+        voiced = np.isfinite(cents)
+        if not voiced.any():
+            return _empty_table()
+
+        # 短い途切れは音符内とみなし、音高は直前の確定値を引き継がせる
+        bridged = voiced | _short_gaps(voiced, self.max_gap_sec / contour.time_step)
+
+        tuning = _tuning_offset(cents[voiced])
+        semitones = self._quantize(cents - tuning, voiced, bridged)
+
+        # 音高・有声状態が変わる位置で区切ったランを音符候補とする
+        change = (
+            np.flatnonzero(
+                (semitones[1:] != semitones[:-1]) | (bridged[1:] != bridged[:-1])
+            )
+            + 1
+        )
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [len(cents)]))
+        min_frames = max(int(round(self.min_note_sec / contour.time_step)), 1)
+        voiced_count = np.concatenate(([0], np.cumsum(voiced)))
+        keep = (
+            bridged[starts]
+            & (ends - starts >= min_frames)
+            & (voiced_count[ends] > voiced_count[starts])
+        )
+        starts, ends = starts[keep], ends[keep]
+        if not len(starts):
+            return _empty_table()
+
+        times = contour.times
+        return NoteTable(
+            onset_s=times[starts].astype(np.float64),
+            offset_s=times[ends - 1] + contour.time_step,
+            pitch_cents=_run_medians(cents, starts, ends),
+        )
+
+    def _quantize(
+        self, cents: np.ndarray, voiced: np.ndarray, bridged: np.ndarray
+    ) -> np.ndarray:
+        """ヒステリシス付きで半音に量子化（確定フレームの値を前方に伝播）"""
+        nearest = np.round(np.nan_to_num(cents) / 100.0).astype(np.int64)
+        distance = np.abs(cents - 100.0 * nearest)
+        committed = voiced & (distance <= 50.0 - self.hysteresis_cents)
+        # 無声区間（途切れを埋めた区間を除く）も状態のリセット点とする
+        anchor = committed | ~bridged
+        index = np.maximum.accumulate(np.where(anchor, np.arange(len(cents)), -1))
+        inherited = (index >= 0) & committed[np.maximum(index, 0)]
+        return np.where(inherited, nearest[np.maximum(index, 0)], nearest)
+
+
+def _empty_table() -> NoteTable:
+    empty = np.zeros(0)
+    return NoteTable(onset_s=empty, offset_s=empty.copy(), pitch_cents=empty.copy())
+
+
+def _short_gaps(voiced: np.ndarray, max_frames: float) -> np.ndarray:
+    """有声フレームに挟まれた ``max_frames`` 以下の無声区間のマスク"""
+    padded = np.concatenate(([0], (~voiced).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[0::2], edges[1::2]
+    fill = (ends - starts <= max_frames) & (starts > 0) & (ends < len(voiced))
+    mask = np.zeros(len(voiced) + 1, dtype=np.int8)
+    np.add.at(mask, starts[fill], 1)
+    np.add.at(mask, ends[fill], -1)
+    return np.cumsum(mask[:-1]) > 0
+
+
+def _tuning_offset(cents: np.ndarray) -> float:
+    """半音格子からの全体的なずれ（セント、-50〜50）を円周平均で推定"""
+    angle = 2 * np.pi * cents / 100.0
+    return float(np.angle(np.mean(np.exp(1j * angle))) * 100.0 / (2 * np.pi))
+
+
+def _run_medians(cents: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """各ラン [start, end) の有声フレームの中央値を一括で計算"""
+    lengths = ends - starts
+    run = np.repeat(np.arange(len(starts)), lengths)
+    frames = np.repeat(starts, lengths) + (
+        np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    )
+    values = cents[frames]
+    finite = np.isfinite(values)
+    run, values = run[finite], values[finite]
+
+    # ラン番号・値の順に並べ、各ランの中央の要素を取り出す
+    order = np.lexsort((values, run))
+    values = values[order]
+    counts = np.bincount(run, minlength=len(starts))
+    first = np.cumsum(counts) - counts
+    return (values[first + (counts - 1) // 2] + values[first + counts // 2]) / 2
@@ -4,7 +4,14 @@
 音声セグメント検出と処理機能を提供
 """
 
-from .detector import SegmentBoundaryDetector
+from .detector import RmsBoundaries, SegmentBoundaryDetector, rms_boundaries
+from .phrase import PhraseBoundaryDetector
 from .processor import SegmentProcessor
 
-__all__ = ["SegmentBoundaryDetector", "SegmentProcessor"]
+__all__ = [
+    "SegmentBoundaryDetector",
+    "RmsBoundaries",
+    "rms_boundaries",
+    "PhraseBoundaryDetector",
+    "SegmentProcessor",
+]
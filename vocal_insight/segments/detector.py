@@ -4,9 +4,31 @@
 音声データからRMS変化点を検出してセグメント境界を特定
 """
 
+from dataclasses import dataclass
+from typing import Optional
+
 import librosa
 import numpy as np
 
+# RMSのフレーム設定（librosaの既定値。特徴量グラフの "rms" と同じ）
+RMS_FRAME_LENGTH = 2048
+RMS_HOP_LENGTH = 512
+
+
+@dataclass(frozen=True)
+class RmsBoundaries:
+    """RMS変化点による境界検出の結果
+
+    Attributes:
+        boundaries: 検出された境界時刻（秒）
+        rms: フレーム単位のRMS（フレーム間隔は RMS_HOP_LENGTH）
+        delta_rms: 隣接フレーム間のRMSの変化量の絶対値（長さは len(rms) - 1）
+    """
+
+    boundaries: np.ndarray
+    rms: np.ndarray
+    delta_rms: np.ndarray
+
 
 class SegmentBoundaryDetector:
     """セグメント境界検出器クラス"""
@@ -22,23 +44,64 @@ class SegmentBoundaryDetector:
         Returns:
             検出された境界時刻（秒）の配列
         """
+        return self.analyze(audio, sr, percentile).boundaries
+
+    def analyze(
+        self,
+        audio: np.ndarray,
+        sr: int,
+        percentile: int,
+        rms: Optional[np.ndarray] = None,
+    ) -> RmsBoundaries:
+        """境界を検出し、計算したRMS・変化量の配列もあわせて返す
+
+        Args:
+            audio: 音声データ
+            sr: サンプリング周波数
+            percentile: RMS変化点検出に使用するパーセンタイル
+            rms: 計算済みのフレーム単位RMS（同じフレーム設定のもの）。
+                指定時はRMSを再計算しない
+
+        Returns:
+            境界時刻・RMS・RMS変化量
+        """
         if len(audio) == 0:
-            return np.array([])
+            empty = np.array([])
+            return RmsBoundaries(boundaries=empty, rms=empty, delta_rms=empty)
 
         # RMS特徴量を計算
-        rms = librosa.feature.rms(y=audio)[0]
+        if rms is None:
+            rms = librosa.feature.rms(
+                y=audio, frame_length=RMS_FRAME_LENGTH, hop_length=RMS_HOP_LENGTH
+            )[0]
+
+        return rms_boundaries(rms, sr, percentile)
+
+
+def rms_boundaries(rms: np.ndarray, sr: int, percentile: int) -> RmsBoundaries:
+    """計算済みのフレーム単位RMSからRMS変化点の境界を検出
+
+    Args:
+        rms: フレーム単位のRMS（フレーム間隔は RMS_HOP_LENGTH）
+        sr: サンプリング周波数
+        percentile: RMS変化点検出に使用するパーセンタイル
 
-        # RMSの変化量を計算
-        delta_rms = np.abs(np.diff(rms))
+    Returns:
+        境界時刻・RMS・RMS変化量
+    """
+    # RMSの変化量を計算
+    delta_rms = np.abs(np.diff(rms))
 
-        if len(delta_rms) == 0:
-            return np.array([])
+    if len(delta_rms) == 0:
+        return RmsBoundaries(boundaries=np.array([]), rms=rms, delta_rms=delta_rms)
 
-        # 閾値以上の変化点を検出
-        threshold = np.percentile(delta_rms, percentile)
-        change_points_frames = np.where(delta_rms > threshold)[0]
+    # 閾値以上の変化点を検出
+    threshold = np.percentile(delta_rms, percentile)
+    change_points_frames = np.where(delta_rms > threshold)[0]
 
-        # フレーム番号を時間に変換
-        boundaries_sec = librosa.frames_to_time(change_points_frames + 1, sr=sr)
+    # フレーム番号を時間に変換
+    boundaries_sec = librosa.frames_to_time(
+        change_points_frames + 1, sr=sr, hop_length=RMS_HOP_LENGTH
+    )
 
-        return boundaries_sec
+    return RmsBoundaries(boundaries=boundaries_sec, rms=rms, delta_rms=delta_rms)
@@ -0,0 +1,42 @@
+"""
+フレーズ境界検出器
+
+ピッチ輪郭の無声区間（息継ぎ・休符）からフレーズ境界を特定
+"""
+
+import numpy as np
+
+from ..features.contour import PitchContour
+
+
+class PhraseBoundaryDetector:
+    """フレーズ境界検出器クラス"""
+
+    def detect(self, contour: PitchContour, min_gap_sec: float) -> np.ndarray:
+        """ピッチ輪郭の無声区間からフレーズ境界を検出
+
+        トラック先頭・末尾に接する無声区間は境界として扱わない。
+
+        Args:
+            contour: トラック全体のピッチ輪郭
+            min_gap_sec: フレーズ区切りとみなす無声区間の最小長（秒）
+
+        Returns:
+            検出された境界時刻（秒）の配列（各無声区間の中央）
+        """
+        unvoiced = ~contour.voiced
+        if len(unvoiced) == 0:
+            return np.array([])
+
+        # 無声区間の開始・終了フレームをランレングスで求める
+        padded = np.concatenate(([0], unvoiced.astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(padded))
+        starts, ends = edges[0::2], edges[1::2]
+
+        durations = (ends - starts) * contour.time_step
+        keep = (durations >= min_gap_sec) & (starts > 0) & (ends < len(unvoiced))
+
+        # 無声区間の中央を境界とする
+        gap_start_sec = contour.times[starts[keep]]
+        gap_end_sec = contour.times[ends[keep] - 1]
+        return (gap_start_sec + gap_end_sec) / 2
@@ -0,0 +1,38 @@
+"""
+リファレンスボーカル抽出パッケージ
+
+ミックス音源からリファレンスボーカルをチャンク処理で抽出し、
+音源のハッシュと設定をキーとするキャッシュで再利用する機能を提供
+"""
+
+from .extractor import (
+    SEPARATION_MODELS,
+    HpssRepetModel,
+    VocalExtractor,
+    get_default_extraction_config,
+    separate_in_chunks,
+)
+from .loader import expand_path, load_source, to_mono
+from .protocols import (
+    ExtractionMetadata,
+    SeparationModelProtocol,
+    VocalExtractionConfig,
+    VocalExtractionResult,
+    VocalExtractorProtocol,
+)
+
+__all__ = [
+    "VocalExtractor",
+    "VocalExtractorProtocol",
+    "SeparationModelProtocol",
+    "HpssRepetModel",
+    "SEPARATION_MODELS",
+    "VocalExtractionConfig",
+    "VocalExtractionResult",
+    "ExtractionMetadata",
+    "get_default_extraction_config",
+    "separate_in_chunks",
+    "load_source",
+    "expand_path",
+    "to_mono",
+]
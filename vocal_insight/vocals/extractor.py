@@ -0,0 +1,377 @@
+"""
+リファレンスボーカル抽出器
+
+学習済みモデルを使わないベースライン（HPSS + REPET-SIM + センター定位マスク）で
+ミックス音源からボーカルを抽出する。音源は重なりのあるチャンクに分けて処理し、
+メモリ使用量をチャンク長に比例する量に抑える。抽出結果は音源のハッシュと
+設定をキーとするキャッシュに保存し、同じ音源の再抽出を省略する
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from ..core.storage import AudioInput, atomic_write, audio_hash, settings_digest
+from .loader import expand_path, load_source, to_mono
+from .postprocess import separation_snr_db, trim_silence, voiced_ratio
+from .protocols import (
+    ExtractionMetadata,
+    SeparationModelProtocol,
+    VocalExtractionConfig,
+    VocalExtractionResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# 保存形式のバージョン（処理内容を変更した場合は更新してキャッシュを無効化）
+VOCAL_FORMAT_VERSION = 1
+
+
+def get_default_extraction_config() -> VocalExtractionConfig:
+    """デフォルトのボーカル抽出設定を取得"""
+    return VocalExtractionConfig(
+        model="hpss_repet",
+        sample_rate=22050,
+        chunk_sec=30.0,
+        overlap_sec=2.0,
+        trim_silence=False,
+    )
+
+
+class HpssRepetModel:
+    """HPSS・REPET-SIM・センター定位による学習不要のボーカル分離
+
+    振幅スペクトログラムに対して次のソフトマスクを掛け合わせる。
+
+    - HPSS: 時間方向のメディアンフィルタで打楽器成分を抑える
+    - センター定位（ステレオ音源）: 左右の振幅が揃った成分を残す
+    - REPET-SIM（モノラル音源）: 類似フレームの中央値を繰り返し成分（伴奏）とみなし、
+      それを上回る成分を残す
+
+    REPET-SIM は繰り返し歌われる旋律もボーカル自身の類似フレームとして
+    伴奏側に推定してしまうため、定位の手がかりがあるステレオ音源では使用しない。
+    """
+
+    name = "hpss_repet"
+
+    def __init__(
+        self,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+        kernel_size: int = 17,
+        repet_width_sec: float = 2.0,
+        repet_margin: float = 0.1,
+        center_power: float = 4.0,
+        min_freq_hz: float = 80.0,
+    ):
+        """
+        Args:
+            n_fft: FFT長
+            hop_length: フレームシフト
+            kernel_size: HPSSのメディアンフィルタ長（フレーム・ビン）
+            repet_width_sec: REPET-SIMで類似フレームから除外する近傍の幅（秒）
+            repet_margin: REPET-SIMの伴奏側マスクの余裕係数（大きいほど伴奏を強く除去）
+            center_power: センター定位マスクの指数（大きいほど左右差のある成分を
+                強く除去、0で無効）
+            min_freq_hz: これより低い周波数成分は除去
+        """
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.kernel_size = kernel_size
+        self.repet_width_sec = repet_width_sec
+        self.repet_margin = repet_margin
+        self.center_power = center_power
+        self.min_freq_hz = min_freq_hz
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {
+            "n_fft": self.n_fft,
+            "hop_length": self.hop_length,
+            "kernel_size": self.kernel_size,
+            "repet_width_sec": self.repet_width_sec,
+            "repet_margin": self.repet_margin,
+            "center_power": self.center_power,
+            "min_freq_hz": self.min_freq_hz,
+        }
+
+    def separate(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        stft = librosa.stft(audio, n_fft=self.n_fft, hop_length=self.hop_length)
+        mix = stft.mean(axis=0)
+        magnitude = np.abs(mix)
+        mask, _ = librosa.decompose.hpss(
+            magnitude, kernel_size=self.kernel_size, mask=True
+        )
+
+        if len(stft) >= 2:
+            left, right = np.abs(stft[0]), np.abs(stft[1])
+            # 左右の振幅が等しいとき1、片側のみのとき0
+            similarity = 2 * left * right / np.maximum(left**2 + right**2, 1e-12)
+            mask *= similarity**self.center_power
+        else:
+            mask *= self._repet_mask(magnitude, sr)
+
+        frequencies = librosa.fft_frequencies(sr=sr, n_fft=self.n_fft)
+        mask[frequencies < self.min_freq_hz] = 0.0
+        return librosa.istft(
+            mask * mix,
+            hop_length=self.hop_length,
+            n_fft=self.n_fft,
+            length=audio.shape[-1],
+        ).astype(np.float32)
+
+    def _repet_mask(self, magnitude: np.ndarray, sr: int) -> np.ndarray:
+        """繰り返し成分を上回るボーカル成分のソフトマスク"""
+        n_frames = magnitude.shape[1]
+        width = int(
+            librosa.time_to_frames(
+                self.repet_width_sec, sr=sr, hop_length=self.hop_length
+            )
+        )
+        # 類似フレームの探索には近傍を除いても十分なフレーム数が必要
+        width = min(width, (n_frames - 1) // 2 - 1)
+        if width < 1:
+            return np.ones_like(magnitude)
+
+        # 無音フレームでもコサイン距離が定義できるよう微小値を加える
+        background = np.minimum(
+            magnitude,
+            librosa.decompose.nn_filter(
+                magnitude + 1e-10,
+                aggregate=np.median,
+                metric="cosine",
+                width=width,
+            ),
+        )
+        return librosa.util.softmask(
+            magnitude - background, self.repet_margin * background, power=2
+        )
+
+
+# 利用可能な分離モデル
+SEPARATION_MODELS = {HpssRepetModel.name: HpssRepetModel}
+
+
+def separate_in_chunks(
+    model: SeparationModelProtocol,
+    audio: np.ndarray,
+    sr: int,
+    chunk_sec: float,
+    overlap_sec: float,
+) -> Tuple[np.ndarray, int]:
+    """重なりのあるチャンクごとに分離し、重なり部分をクロスフェードで連結
+
+    隣接チャンクの重なり区間では相補的な線形ランプ（和が1）で重み付けするため、
+    正規化用の配列を持たずに出力へ加算できる。
+
+    Args:
+        model: 分離モデル
+        audio: 音声データ（チャンネル数, サンプル数）
+        sr: サンプリング周波数
+        chunk_sec: チャンク長（秒）
+        overlap_sec: 重なり（秒）
+
+    Returns:
+        ボーカル信号とチャンク数のタプル
+    """
+    n_samples = audio.shape[-1]
+    chunk = int(round(chunk_sec * sr))
+    overlap = int(round(overlap_sec * sr))
+    if n_samples <= chunk:
+        return model.separate(audio, sr), 1
+
+    step = chunk - overlap
+    ramp = np.linspace(0.0, 1.0, overlap + 2, dtype=np.float32)[1:-1]
+    output = np.zeros(n_samples, dtype=np.float32)
+    starts = range(0, n_samples - overlap, step)
+    for start in starts:
+        stop = min(start + chunk, n_samples)
+        piece = model.separate(audio[:, start:stop], sr)
+        if overlap and start > 0:
+            piece[:overlap] *= ramp
+        if overlap and stop < n_samples:
+            piece[-overlap:] *= ramp[::-1]
+        output[start:stop] += piece
+    return output, len(starts)
+
+
+class VocalExtractor:
+    """チャンク処理とキャッシュを備えたリファレンスボーカル抽出器"""
+
+    def __init__(
+        self,
+        config: Optional[VocalExtractionConfig] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        model: Optional[SeparationModelProtocol] = None,
+    ):
+        """
+        Args:
+            config: 抽出設定（省略した項目はデフォルト値）
+            cache_dir: 抽出結果のキャッシュディレクトリ（環境変数を展開。
+                省略時はキャッシュしない）
+            model: 分離モデル（省略時は設定の ``model`` から作成）
+
+        Raises:
+            ValueError: 未知のモデル名、または不正な設定値の場合
+        """
+        self.config = VocalExtractionConfig(
+            {**get_default_extraction_config(), **(config or {})}
+        )
+        if model is None:
+            name = self.config["model"]
+            if name not in SEPARATION_MODELS:
+                raise ValueError(
+                    f"unknown separation model '{name}'; "
+                    f"available: {sorted(SEPARATION_MODELS)}"
+                )
+            model = SEPARATION_MODELS[name]()
+        if self.config["chunk_sec"] <= 0:
+            raise ValueError("chunk_sec must be positive")
+        if not 0 <= self.config["overlap_sec"] < self.config["chunk_sec"] / 2:
+            raise ValueError("overlap_sec must be in [0, chunk_sec / 2)")
+        self.model = model
+        self.cache_dir = None
+        if cache_dir is not None:
+            self.cache_dir = expand_path(cache_dir)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, source: AudioInput, sr: Optional[int] = None) -> str:
+        """音源のハッシュと抽出設定から決まるキャッシュキー"""
+        return f"{_source_hash(source, sr)}-{self._settings_digest()}"
+
+    def _settings_digest(self) -> str:
+        config = self.config
+        return settings_digest(
+            self.model.name,
+            sorted(self.model.params.items()),
+            config["sample_rate"],
+            config["chunk_sec"],
+            config["overlap_sec"],
+            config["trim_silence"],
+            f"v{VOCAL_FORMAT_VERSION}",
+        )
+
+    def extract(
+        self, source: AudioInput, sr: Optional[int] = None
+    ) -> VocalExtractionResult:
+        """リファレンス音源からボーカルを抽出（キャッシュ済みなら読み込み）
+
+        Args:
+            source: 音源（ファイルパスまたは音声データ）
+            sr: 音声データのサンプリング周波数（配列入力時に必須）
+
+        Returns:
+            抽出結果
+
+        Raises:
+            ValueError: サンプリング周波数の指定漏れ、または音声データが不正な場合
+        """
+        source_hash = _source_hash(source, sr)
+        key = None
+        if self.cache_dir is not None:
+            key = f"{source_hash}-{self._settings_digest()}"
+            cached = self._load(key)
+            if cached is not None:
+                logger.info("vocal extraction reused: %s", cached.cache_path)
+                return cached
+
+        started = time.perf_counter()
+        config = self.config
+        audio, sr = load_source(source, sr, config["sample_rate"])
+        vocal, n_chunks = separate_in_chunks(
+            self.model, audio, sr, config["chunk_sec"], config["overlap_sec"]
+        )
+        snr = separation_snr_db(to_mono(audio), vocal)
+        n_channels, n_samples = audio.shape
+        del audio
+
+        trim_start = 0.0
+        if config["trim_silence"]:
+            vocal, trim_start = trim_silence(vocal, sr)
+        quality = voiced_ratio(vocal, sr)
+
+        metadata = ExtractionMetadata(
+            version=VOCAL_FORMAT_VERSION,
+            model=self.model.name,
+            params=self.model.params,
+            source_hash=source_hash,
+            source_path=None if isinstance(source, np.ndarray) else str(source),
+            sample_rate=sr,
+            n_channels=n_channels,
+            duration_s=round(n_samples / sr, 3),
+            n_chunks=n_chunks,
+            trim_start_s=round(trim_start, 3),
+            processing_time_s=round(time.perf_counter() - started, 3),
+            snr_db=None if snr is None else round(snr, 2),
+            voiced_ratio=quality,
+        )
+        logger.info(
+            "vocal extraction: model=%s duration=%.1fs chunks=%d snr=%s elapsed=%.2fs",
+            self.model.name,
+            metadata["duration_s"],
+            n_chunks,
+            metadata["snr_db"],
+            metadata["processing_time_s"],
+        )
+
+        cache_path = None
+        if key is not None:
+            cache_path = str(self._save(key, vocal, sr, metadata))
+        return VocalExtractionResult(
+            audio=vocal, sr=sr, metadata=metadata, cache_path=cache_path
+        )
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.wav", self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[VocalExtractionResult]:
+        """保存済みの抽出結果を読み込む（未保存・破損時はNone）"""
+        audio_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+            audio, sr = sf.read(audio_path, dtype="float32")
+        except (OSError, ValueError, RuntimeError):
+            return None
+        if metadata.get("version") != VOCAL_FORMAT_VERSION or sr != metadata.get(
+            "sample_rate"
+        ):
+            return None
+        return VocalExtractionResult(
+            audio=audio,
+            sr=sr,
+            metadata=ExtractionMetadata(metadata),
+            cache_path=str(audio_path),
+            cached=True,
+        )
+
+    def _save(
+        self, key: str, vocal: np.ndarray, sr: int, metadata: ExtractionMetadata
+    ) -> Path:
+        """ボーカル（32bit float WAV）とメタデータをアトミックに保存"""
+        audio_path, meta_path = self._paths(key)
+        # 音声を先に保存し、メタデータの存在をもって保存完了とする
+        atomic_write(
+            audio_path,
+            lambda f: sf.write(f, vocal, sr, format="WAV", subtype="FLOAT"),
+        )
+        atomic_write(
+            meta_path,
+            lambda f: f.write(
+                json.dumps(metadata, indent=2, ensure_ascii=False).encode("utf-8")
+            ),
+        )
+        return audio_path
+
+
+def _source_hash(source: AudioInput, sr: Optional[int]) -> str:
+    """音源ファイルの内容、または音声データのハッシュ"""
+    if not isinstance(source, np.ndarray):
+        source = expand_path(source)
+    return audio_hash(source, sr)
@@ -0,0 +1,61 @@
+"""
+音源の読み込みと前処理
+
+リファレンス音源を（チャンネル数, サンプル数）の float32 配列として読み込み、
+サンプリング周波数を統一する。設定されたパスの環境変数展開も扱う
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import librosa
+import numpy as np
+
+from ..core.storage import AudioInput
+
+
+def expand_path(path: Union[str, Path]) -> Path:
+    """``$HOME`` などの環境変数と ``~`` を展開したパス"""
+    return Path(os.path.expandvars(os.path.expanduser(str(path))))
+
+
+def load_source(
+    source: AudioInput, sr: Optional[int] = None, target_sr: Optional[int] = None
+) -> Tuple[np.ndarray, int]:
+    """音源を読み込み、必要に応じてリサンプリング
+
+    チャンネル情報（センター定位の推定に使用）は保持する。
+
+    Args:
+        source: ファイルパス、または音声データ（サンプル数,）/（チャンネル数, サンプル数）
+        sr: 音声データのサンプリング周波数（配列入力時に必須）
+        target_sr: 出力のサンプリング周波数（Noneで元のまま）
+
+    Returns:
+        （チャンネル数, サンプル数）の音声データとサンプリング周波数のタプル
+
+    Raises:
+        ValueError: サンプリング周波数の指定漏れ、または音声データが空・不正な形状の場合
+    """
+    if isinstance(source, np.ndarray):
+        if sr is None:
+            raise ValueError("sampling rate is required when source is an array")
+        audio = np.asarray(source, dtype=np.float32)
+    else:
+        audio, sr = librosa.load(str(expand_path(source)), sr=None, mono=False)
+
+    if audio.ndim == 1:
+        audio = audio[np.newaxis, :]
+    if audio.ndim != 2 or audio.shape[-1] == 0:
+        raise ValueError(f"unsupported audio shape {audio.shape}")
+
+    if target_sr is not None and target_sr != sr:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=target_sr, axis=-1)
+        sr = target_sr
+    return np.ascontiguousarray(audio, dtype=np.float32), int(sr)
+
+
+def to_mono(audio: np.ndarray) -> np.ndarray:
+    """（チャンネル数, サンプル数）の音声をチャンネル平均でモノラル化"""
+    return audio.mean(axis=0) if audio.ndim == 2 else audio
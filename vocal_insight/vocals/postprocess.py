@@ -0,0 +1,60 @@
+"""
+抽出結果の後処理と品質評価
+
+無音区間のトリミングと、抽出品質の指標（分離SNR・有声フレーム率）を提供
+"""
+
+from typing import Optional, Tuple
+
+import librosa
+import numpy as np
+
+from ..features.contour import compute_pitch_contour
+
+# トリミングで無音とみなす最大値からの相対レベル（dB）
+TRIM_TOP_DB = 40.0
+
+
+def trim_silence(
+    audio: np.ndarray, sr: int, top_db: float = TRIM_TOP_DB
+) -> Tuple[np.ndarray, float]:
+    """先頭・末尾の無音区間を除去
+
+    Returns:
+        トリミング後の音声と、除去した先頭区間の長さ（秒）のタプル
+    """
+    trimmed, (start, _) = librosa.effects.trim(audio, top_db=top_db)
+    return trimmed, start / sr
+
+
+def separation_snr_db(mix: np.ndarray, vocal: np.ndarray) -> Optional[float]:
+    """分離SNR（抽出したボーカルと残り成分のエネルギー比, dB）
+
+    正解のボーカルがない状態での目安で、伴奏が大きく残るほど高くなる点に注意。
+
+    Args:
+        mix: モノラル化した元の音源
+        vocal: 抽出したボーカル（同じ長さ）
+
+    Returns:
+        dB値（いずれかのエネルギーが0の場合はNone）
+    """
+    vocal_energy = float(np.sum(np.square(vocal, dtype=np.float64)))
+    residual_energy = float(np.sum(np.square(mix - vocal, dtype=np.float64)))
+    if vocal_energy <= 0 or residual_energy <= 0:
+        return None
+    return 10.0 * np.log10(vocal_energy / residual_energy)
+
+
+def voiced_ratio(vocal: np.ndarray, sr: int) -> Optional[float]:
+    """ピッチを検出できたフレームの割合（ピッチトラッカビリティの目安）
+
+    音程判定と同じYINエンジンで推定する。
+
+    Returns:
+        0〜1の割合（フレームがない場合はNone）
+    """
+    contour = compute_pitch_contour(vocal, sr, engine="yin")
+    if not len(contour.f0_hz):
+        return None
+    return float(np.mean(contour.f0_hz > 0))
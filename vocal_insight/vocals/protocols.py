@@ -0,0 +1,106 @@
+"""
+ボーカル抽出のインターフェース定義
+
+抽出器・分離モデルのプロトコルと、設定・結果・メタデータの型を定義する。
+分離モデルは ``SeparationModelProtocol`` を満たせば Demucs などの
+学習済みモデルや外部APIの実装に差し替えられる
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol, TypedDict
+
+import numpy as np
+
+from ..core.storage import AudioInput
+
+
+class VocalExtractionConfig(TypedDict, total=False):
+    """ボーカル抽出の設定（省略した項目はデフォルト値）"""
+
+    model: str  # 分離モデル名
+    sample_rate: Optional[int]  # 処理・出力のサンプリング周波数（Noneで元のまま）
+    chunk_sec: float  # チャンク長（秒）
+    overlap_sec: float  # 隣接チャンクの重なり（秒）
+    trim_silence: bool  # 先頭・末尾の無音を除去するか
+
+
+class ExtractionMetadata(TypedDict):
+    """抽出結果のメタデータ（キャッシュにJSONとして保存）"""
+
+    version: int
+    model: str
+    params: Dict[str, Any]
+    source_hash: str
+    source_path: Optional[str]
+    sample_rate: int
+    n_channels: int
+    duration_s: float
+    n_chunks: int
+    trim_start_s: float
+    processing_time_s: float
+    snr_db: Optional[float]
+    voiced_ratio: Optional[float]
+
+
+@dataclass(frozen=True)
+class VocalExtractionResult:
+    """ボーカル抽出結果
+
+    Attributes:
+        audio: 抽出したボーカル（モノラル、float32）
+        sr: サンプリング周波数
+        metadata: 処理時間・品質指標などのメタデータ
+        cache_path: キャッシュに保存したボーカルのパス（キャッシュ未使用時はNone）
+        cached: キャッシュから読み込んだかどうか
+    """
+
+    audio: np.ndarray
+    sr: int
+    metadata: ExtractionMetadata
+    cache_path: Optional[str] = None
+    cached: bool = False
+
+
+class SeparationModelProtocol(Protocol):
+    """分離モデルのプロトコル
+
+    チャンク単位の音声を受け取り、同じ長さのボーカル信号を返す。
+    チャンク分割と連結は抽出器が行う。
+    """
+
+    name: str
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """キャッシュキーとメタデータに記録するパラメータ"""
+        ...
+
+    def separate(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """ボーカルを分離
+
+        Args:
+            audio: 音声データ（チャンネル数, サンプル数）
+            sr: サンプリング周波数
+
+        Returns:
+            ボーカル信号（サンプル数,）
+        """
+        ...
+
+
+class VocalExtractorProtocol(Protocol):
+    """ボーカル抽出器のプロトコル"""
+
+    def extract(
+        self, source: AudioInput, sr: Optional[int] = None
+    ) -> VocalExtractionResult:
+        """リファレンス音源からボーカルを抽出
+
+        Args:
+            source: 音源（ファイルパスまたは音声データ）
+            sr: 音声データのサンプリング周波数（配列入力時に必須）
+
+        Returns:
+            抽出結果
+        """
+        ...
@@ -1,8 +1,10 @@
-from typing import TypedDict
+from typing import Optional, TypedDict
 
 import librosa
 import numpy as np
-import parselmouth
+
+from vocal_insight.analysis.prompt import estimate_tokens, segment_table
+from vocal_insight.features.graph import FeatureContext
 
 
 # --- 型定義 ---
@@ -29,6 +31,13 @@ class AnalysisConfig(TypedDict):
 
 
 # --- 設定項目 ---
+# トークン数の上限を指定した場合の表の説明と、行を省いた場合の注記
+_COMPACT_TABLE_GUIDE = (
+    "表の各行は1セグメントです。番号が「3-5」の行は、特徴量の近い隣接セグメントを"
+    "まとめた平均値です。値のない項目は「-」です。\n"
+)
+_OMITTED_NOTE = "（全{total}行のうち{shown}行を表示。特徴量の変化が小さい行は省略）"
+
 default_analysis_config: AnalysisConfig = {
     "rms_delta_percentile": 95,  # RMSの変化点検出に使用するパーセンタイル
     "min_len_sec": 8.0,  # セグメントの最小長さ（秒）
@@ -71,18 +80,19 @@ def process_boundaries(boundaries_sec, total_duration, min_len, max_len):
 def analyze_segment_with_praat(y_segment: np.ndarray, sr: int) -> FeatureData:
     """parselmouthを使って音声セグメント（NumPy配列）を分析し、特徴量を返す"""
     try:
-        snd = parselmouth.Sound(y_segment, sr)
-        pitch = snd.to_pitch()
-        hnr = snd.to_harmonicity()
-        formant = snd.to_formant_burg()
+        # Sound・Pitch・Harmonicity・Formant は共有コンテキストで一度だけ計算
+        context = FeatureContext(y_segment, sr)
+        pitch = context.get("pitch")
+        hnr = context.get("harmonicity")
+        formant = context.get("formant")
 
-        f0_values = pitch.selected_array["frequency"]
+        f0_values = context.get("f0")
         f0_valid = f0_values[f0_values != 0]
 
         # --- HNRの計算を「有声区間」のみに限定する修正 ---
         voiced_hnr_values = []
-        for t, f0 in zip(pitch.ts(), pitch.selected_array["frequency"]):
-            if f0 > 0:  # ピッチが検出されたフレームのみ
+        for t, voiced in zip(pitch.ts(), context.get("voiced")):
+            if voiced:  # ピッチが検出されたフレームのみ
                 hnr_val = hnr.get_value(time=t)
                 if np.isfinite(hnr_val):
                     voiced_hnr_values.append(hnr_val)
@@ -117,7 +127,24 @@ def analyze_segment_with_praat(y_segment: np.ndarray, sr: int) -> FeatureData:
         raise e
 
 
-def generate_llm_prompt(analysis_data: list[SegmentAnalysis], filename: str) -> str:
+def generate_llm_prompt(
+    analysis_data: list[SegmentAnalysis],
+    filename: str,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """セグメントの音響特徴からLLMプロンプトを生成します。
+
+    Args:
+        analysis_data (list[dict]): セグメントごとの分析結果。
+        filename (str): 分析対象のファイル名。
+        max_tokens (int, optional): プロンプト全体の見積もりトークン数の上限。
+            指定した場合、分析データを1行1セグメントの表にし、上限を超える場合は
+            似た隣接セグメントをまとめ、特徴量の変化が大きいセグメントを優先して
+            残します。Defaults to None（上限なし、セグメントごとに列挙）。
+
+    Returns:
+        str: 生成されたLLMプロンプト。
+    """
     prompt = f"""
 あなたはプロのボーカルアナリストです。
 以下のデータは、楽曲「{filename}」の歌声の時系列データから、ダイナミクスの変化で分割したセグメントごとの音響特徴です。
@@ -128,6 +155,16 @@ def generate_llm_prompt(analysis_data: list[SegmentAnalysis], filename: str) ->
 ---
 ### 分析データ
 """
+    ending = "\n--- 以上です。分析レポートを作成してください。---"
+    if max_tokens is not None:
+        prompt += _COMPACT_TABLE_GUIDE
+        table = segment_table(
+            analysis_data,
+            max_tokens=max_tokens - estimate_tokens(prompt + ending),
+            omitted_note=_OMITTED_NOTE,
+        )
+        return prompt + table.text + ending
+
     for segment in analysis_data:
         seg_id = segment["segment_id"]
         start = segment["time_start_s"]
@@ -142,7 +179,7 @@ def generate_llm_prompt(analysis_data: list[SegmentAnalysis], filename: str) ->
 - フォルマント F2: {feat["f2_mean_hz"]:.1f} Hz
 - フォルマント F3: {feat["f3_mean_hz"]:.1f} Hz
 """
-    prompt += "\n--- 以上です。分析レポートを作成してください。---"
+    prompt += ending
     return prompt
 
 
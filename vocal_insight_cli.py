@@ -1,6 +1,7 @@
 import json
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 import click
 import librosa
@@ -10,19 +11,131 @@ import yaml
 from vocal_insight import (
     AnalysisConfig,
     FeatureData,
-    analyze_audio_segments,
 )
+from vocal_insight.analysis import (
+    DEFAULT_CLIPS_PER_TASK,
+    analyze_to_bundle,
+    config_grid,
+    estimate_tokens,
+    extract_clips,
+    extract_ranges,
+    format_sweep_table,
+    iter_audio_segments,
+    load_bundle,
+    read_ranges,
+    segment_table,
+    sweep_audio,
+    table_rows,
+)
+from vocal_insight.core.config import (
+    DEFAULT_FEATURE_GROUPS,
+    FEATURE_GROUPS,
+    get_default_config,
+    parse_features,
+    validate_config,
+)
+from vocal_insight.core.decode import (
+    DEFAULT_DECODE_CACHE_BYTES,
+    DecodeCache,
+    list_audio_files,
+    load_audio,
+    load_audio_range,
+)
+from vocal_insight.core.prefetch import DEFAULT_PREFETCH_DEPTH, PrefetchLoader
+from vocal_insight.features import available_extractors, get_extractor
+from vocal_insight.pitch import (
+    PitchAccuracyAnalyzer,
+    PitchAnalysisResult,
+    ReferenceContourStore,
+    load_notes,
+)
+from vocal_insight.vocals import VocalExtractor
+from vocal_insight.vocals.loader import expand_path
 
 # レガシー互換性のためのインポート
 from vocal_insight_ai import analyze_audio_segments as legacy_analyze
+from vocal_insight_ai import generate_llm_prompt as legacy_prompt
+
+# Failed clips listed individually by `extract --clips` (the rest are counted)
+MAX_REPORTED_CLIP_ERRORS = 10
+
+
+def _parse_features_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[tuple]:
+    """Validate a comma-separated --features value."""
+    if value is None:
+        return None
+    try:
+        return parse_features(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def _parse_list_option(item_type: type):
+    """Build a callback parsing a comma-separated list of values."""
+
+    def parse(
+        ctx: click.Context, param: click.Parameter, value: Optional[str]
+    ) -> Optional[list]:
+        if value is None:
+            return None
+        try:
+            return [
+                item_type(item.strip()) for item in value.split(",") if item.strip()
+            ]
+        except ValueError:
+            raise click.BadParameter(
+                f"expected comma-separated {item_type.__name__} values, got {value!r}"
+            )
+
+    return parse
+
+
+features_option = click.option(
+    "--features",
+    callback=_parse_features_option,
+    help=f"Comma-separated feature groups to compute ({', '.join(FEATURE_GROUPS)}, "
+    "or all); skipped fields are output as null "
+    f"[default: {','.join(DEFAULT_FEATURE_GROUPS)}]",
+)
+
+max_tokens_option = click.option(
+    "--max-tokens",
+    type=click.IntRange(min=1),
+    help="Fit the LLM prompt into about this many tokens (local estimate): "
+    "segments become a compact table, similar adjacent segments are merged "
+    "and the rows with the largest feature changes are kept",
+)
 
 
 @click.group()
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 @click.option("--quiet", "-q", is_flag=True, help="Suppress all output except errors")
+@click.option(
+    "--decode-cache",
+    type=click.Path(file_okay=False, path_type=Path),
+    envvar="VOCAL_INSIGHT_DECODE_CACHE",
+    help="Directory caching decoded audio so compressed inputs are decoded once "
+    "across commands ($VARS and ~ are expanded) [env: VOCAL_INSIGHT_DECODE_CACHE]",
+)
+@click.option(
+    "--decode-cache-size",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_DECODE_CACHE_BYTES / (1 << 20),
+    show_default=True,
+    help="Size limit of the decode cache in MiB; least recently used entries "
+    "are evicted beyond it",
+)
 @click.version_option(version="0.1.0", prog_name="VocalInsight AI")
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool, quiet: bool):
+def cli(
+    ctx: click.Context,
+    verbose: bool,
+    quiet: bool,
+    decode_cache: Optional[Path],
+    decode_cache_size: float,
+):
     """VocalInsight AI - Advanced vocal analysis tool with modular architecture.
 
     This tool provides comprehensive vocal analysis including segment detection,
@@ -32,6 +145,11 @@ def cli(ctx: click.Context, verbose: bool, quiet: bool):
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = verbose
     ctx.obj["quiet"] = quiet
+    ctx.obj["decode_cache"] = (
+        DecodeCache(expand_path(decode_cache), int(decode_cache_size * (1 << 20)))
+        if decode_cache is not None
+        else None
+    )
 
     if verbose and quiet:
         click.echo(
@@ -77,6 +195,82 @@ def cli(ctx: click.Context, verbose: bool, quiet: bool):
     default=95,
     help="RMS percentile for boundary detection [default: 95]",
 )
+@click.option(
+    "--segmentation",
+    type=click.Choice(["rms", "phrase", "window"], case_sensitive=False),
+    default="rms",
+    help="Segmentation method: RMS change points, unvoiced gaps between phrases, "
+    "or a regular grid of overlapping windows [default: rms]",
+)
+@click.option(
+    "--min-gap",
+    type=float,
+    default=0.3,
+    help="Minimum unvoiced gap in seconds treated as a phrase break [default: 0.3]",
+)
+@click.option(
+    "--window",
+    "window_sec",
+    type=click.FloatRange(min=0, min_open=True),
+    default=3.0,
+    help="Window length in seconds for --segmentation window [default: 3.0]",
+)
+@click.option(
+    "--window-hop",
+    "window_hop_sec",
+    type=click.FloatRange(min=0, min_open=True),
+    default=0.5,
+    help="Window spacing in seconds for --segmentation window [default: 0.5]",
+)
+@click.option(
+    "--pitch-engine",
+    type=click.Choice(["praat", "yin"], case_sensitive=False),
+    default="praat",
+    help="F0 estimator: Praat or vectorized YIN [default: praat]",
+)
+@click.option(
+    "--formant-engine",
+    type=click.Choice(["burg", "lpc"], case_sensitive=False),
+    default="burg",
+    help="Formant estimator: Praat Burg or batched LPC [default: burg]",
+)
+@features_option
+@click.option(
+    "--reference-audio",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Reference vocal to evaluate pitch accuracy against (enables pitch analysis)",
+)
+@click.option(
+    "--reference-midi",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="MIDI file or note-list CSV (start_s,end_s,pitch) to evaluate pitch "
+    "accuracy against; no reference audio is processed",
+)
+@click.option(
+    "--midi-track",
+    type=click.IntRange(min=0),
+    help="MIDI track holding the melody [default: all tracks]",
+)
+@click.option(
+    "--reference-cache",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory caching preprocessed reference contours for reuse across takes",
+)
+@click.option(
+    "--extract-vocals",
+    is_flag=True,
+    help="Isolate the vocal from --reference-audio (a full mix) before comparing",
+)
+@click.option(
+    "--vocal-cache",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory caching extracted reference vocals ($VARS and ~ are expanded)",
+)
+@click.option(
+    "--pitch-results-path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Where to save the pitch accuracy JSON [default: <output-dir>/<name>_pitch.json]",
+)
 @click.option(
     "--format",
     "output_format",
@@ -84,6 +278,27 @@ def cli(ctx: click.Context, verbose: bool, quiet: bool):
     default="txt",
     help="Output format [default: txt]",
 )
+@click.option(
+    "--bundle",
+    "bundle_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Also save an analysis bundle (RMS, contours, tracks) to this directory",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Worker processes for per-segment feature extraction [default: 1]",
+)
+@click.option(
+    "--chunk",
+    "chunk_sec",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Compute the whole-track RMS and pitch contour in overlapping chunks "
+    "of this many seconds, spread over --jobs processes",
+)
+@max_tokens_option
 @click.pass_context
 def analyze(
     ctx: click.Context,
@@ -93,7 +308,25 @@ def analyze(
     min_segment: float,
     max_segment: float,
     percentile: int,
+    segmentation: str,
+    min_gap: float,
+    window_sec: float,
+    window_hop_sec: float,
+    pitch_engine: str,
+    formant_engine: str,
+    features: Optional[tuple],
+    reference_audio: Optional[Path],
+    reference_midi: Optional[Path],
+    midi_track: Optional[int],
+    reference_cache: Optional[Path],
+    extract_vocals: bool,
+    vocal_cache: Optional[Path],
+    pitch_results_path: Optional[Path],
     output_format: str,
+    bundle_dir: Optional[Path],
+    jobs: int,
+    chunk_sec: Optional[float],
+    max_tokens: Optional[int],
 ):
     """Analyze an audio file and generate comprehensive analysis results.
 
@@ -115,6 +348,42 @@ def analyze(
 
         # Use specific processing module
         vocal-insight analyze recording.wav --module acoustic --format yaml
+
+        # Split at breaths and rests instead of RMS change points
+        vocal-insight analyze recording.wav --segmentation phrase --min-gap 0.25
+
+        # Features on a regular grid (3 s windows every 0.5 s) for alignment
+        vocal-insight analyze recording.wav --segmentation window --window 3 --window-hop 0.5
+
+        # Faster F0 estimation with the vectorized YIN engine
+        vocal-insight analyze recording.wav --pitch-engine yin
+
+        # High-throughput mode for large corpora (YIN + batched LPC formants)
+        vocal-insight analyze recording.wav --pitch-engine yin --formant-engine lpc
+
+        # Pitch only: HNR and formant analyses are never run
+        vocal-insight analyze recording.wav --features f0 --format json
+
+        # Pitch accuracy against a reference vocal (writes <name>_pitch.json)
+        vocal-insight analyze take.wav --reference-audio reference_vocal.wav
+
+        # Many takes against one reference: its contour is analyzed only once
+        vocal-insight analyze take2.wav --reference-audio ref.wav --reference-cache ./refs
+
+        # Pitch accuracy against the score melody (MIDI or note-list CSV)
+        vocal-insight analyze take.wav --reference-midi melody.mid --midi-track 1
+
+        # Reference is a full mix: isolate its vocal first (cached per source)
+        vocal-insight analyze take.wav --reference-audio song.wav --extract-vocals
+
+        # Keep the intermediates for fast segment/extract/prompt follow-ups
+        vocal-insight analyze take.wav --bundle take.bundle
+
+        # Long recordings: whole-track analysis in 60 s chunks on 4 processes
+        vocal-insight analyze concert.wav --segmentation phrase --chunk 60 --jobs 4
+
+        # Keep the LLM prompt within about 2000 tokens (compact table)
+        vocal-insight analyze concert.wav --segmentation window --max-tokens 2000
     """
     verbose = ctx.obj.get("verbose", False)
     quiet = ctx.obj.get("quiet", False)
@@ -126,12 +395,33 @@ def analyze(
     if min_segment >= max_segment:
         click.echo("Error: --min-segment must be less than --max-segment", err=True)
         ctx.exit(1)
+    if extract_vocals and reference_audio is None:
+        click.echo("Error: --extract-vocals requires --reference-audio", err=True)
+        ctx.exit(1)
+    if reference_audio is not None and reference_midi is not None:
+        click.echo(
+            "Error: --reference-audio and --reference-midi are mutually exclusive",
+            err=True,
+        )
+        ctx.exit(1)
+    if bundle_dir is not None and module == "legacy":
+        click.echo("Error: --bundle is not supported by the legacy module", err=True)
+        ctx.exit(1)
+    if chunk_sec is not None and module == "legacy":
+        click.echo("Error: --chunk is not supported by the legacy module", err=True)
+        ctx.exit(1)
 
     # Create configuration
     config = AnalysisConfig(
         rms_delta_percentile=percentile,
         min_len_sec=min_segment,
         max_len_sec=max_segment,
+        segmentation=segmentation,
+        min_gap_sec=min_gap,
+        window_sec=window_sec,
+        window_hop_sec=window_hop_sec,
+        pitch_engine=pitch_engine,
+        formant_engine=formant_engine,
     )
 
     try:
@@ -139,9 +429,13 @@ def analyze(
         if module == "legacy":
             if verbose:
                 click.echo("📦 Using legacy module (vocal_insight_ai)")
+            if features is not None and not quiet:
+                click.echo(
+                    "Warning: --features is ignored by the legacy module", err=True
+                )
 
             # Load audio file
-            y, sr = librosa.load(input_file, sr=None)
+            y, sr = load_audio(input_file, sr=None, cache=ctx.obj.get("decode_cache"))
 
             # Use legacy analysis
             analysis_results, llm_prompt = legacy_analyze(
@@ -156,10 +450,36 @@ def analyze(
                 click.echo("📦 Using new modular architecture (vocal_insight)")
 
             # Use new modular analysis
-            segments = analyze_audio_segments(str(input_file), config)
-
-            # Generate LLM prompt from segments
-            llm_prompt = _generate_llm_prompt_from_segments(segments, input_file.name)
+            if bundle_dir is not None:
+                segments = analyze_to_bundle(
+                    input_file,
+                    bundle_dir,
+                    config,
+                    features=features,
+                    decode_cache=ctx.obj.get("decode_cache"),
+                    jobs=jobs,
+                    chunk_sec=chunk_sec,
+                )
+                if not quiet:
+                    click.echo(f"✅ Analysis bundle saved to {bundle_dir}")
+            else:
+                # Segments are reported as they finish when verbose
+                segments = []
+                for result in iter_audio_segments(
+                    str(input_file),
+                    config,
+                    features=features,
+                    decode_cache=ctx.obj.get("decode_cache"),
+                    jobs=jobs,
+                    chunk_sec=chunk_sec,
+                ):
+                    segments.append(result)
+                    if verbose:
+                        click.echo(
+                            f"  segment {result['segment_id']}: "
+                            f"{result['time_start_s']:.1f}s - "
+                            f"{result['time_end_s']:.1f}s"
+                        )
 
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -167,6 +487,66 @@ def analyze(
         # Generate output filename
         base_name = input_file.stem
 
+        # Pitch accuracy against the reference vocal
+        pitch_section = ""
+        reference = reference_audio
+        if reference_midi is not None:
+            reference = load_notes(reference_midi, track=midi_track)
+        if reference is not None:
+            if verbose:
+                click.echo(
+                    f"🎯 Comparing pitch with {(reference_audio or reference_midi).name}"
+                )
+            store = (
+                ReferenceContourStore(reference_cache)
+                if reference_cache is not None
+                else None
+            )
+            pitch_analyzer = PitchAccuracyAnalyzer(
+                {"pitch_engine": pitch_engine}, reference_store=store
+            )
+            if extract_vocals:
+                extraction = VocalExtractor(cache_dir=vocal_cache).extract(
+                    reference_audio
+                )
+                if verbose:
+                    click.echo(
+                        f"🎤 Reference vocal "
+                        f"{'reused' if extraction.cached else 'extracted'} "
+                        f"(SNR {extraction.metadata['snr_db']} dB, "
+                        f"{extraction.metadata['processing_time_s']:.1f}s)"
+                    )
+                pitch_result = pitch_analyzer.analyze(
+                    input_file,
+                    extraction.audio,
+                    reference_sr=extraction.sr,
+                    reference_id=reference_audio.stem,
+                )
+            else:
+                pitch_result = pitch_analyzer.analyze(input_file, reference)
+            pitch_file = pitch_results_path or output_dir / f"{base_name}_pitch.json"
+            pitch_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(pitch_file, "w", encoding="utf-8") as f:
+                json.dump(pitch_result, f, indent=2, ensure_ascii=False)
+            pitch_section = _format_pitch_accuracy_section(pitch_result)
+            if not quiet:
+                click.echo(f"✅ Pitch accuracy saved to {pitch_file}")
+
+        # Generate LLM prompt from segments (the pitch accuracy section counts
+        # against --max-tokens)
+        budget = None
+        if max_tokens is not None:
+            budget = max_tokens - estimate_tokens(pitch_section)
+        if module != "legacy":
+            llm_prompt = _generate_llm_prompt_from_segments(
+                segments, input_file.name, max_tokens=budget
+            )
+        elif budget is not None:
+            llm_prompt = legacy_prompt(segments, input_file.name, max_tokens=budget)
+        llm_prompt += pitch_section
+        if not quiet and (verbose or max_tokens is not None):
+            _report_prompt_tokens(llm_prompt, max_tokens)
+
         # Save results based on format
         if output_format == "txt":
             output_file = output_dir / f"{base_name}_analysis.txt"
@@ -197,9 +577,7 @@ def analyze(
 
 
 @cli.command()
-@click.argument(
-    "input_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
-)
+@click.argument("input_file", type=click.Path(exists=True, path_type=Path))
 @click.option(
     "--output-dir",
     "-o",
@@ -217,9 +595,10 @@ def analyze(
 @click.option(
     "--extractor",
     default="acoustic",
-    type=click.Choice(["acoustic"], case_sensitive=False),
-    help="Feature extractor to use [default: acoustic]",
+    type=click.Choice(available_extractors(), case_sensitive=False),
+    help="Feature extractor to use (yin: YIN pitch, lpc: batched LPC formants, fast: both) [default: acoustic]",
 )
+@features_option
 @click.option(
     "--segment-start",
     type=float,
@@ -230,6 +609,44 @@ def analyze(
     type=float,
     help="End time for partial extraction (seconds)",
 )
+@click.option(
+    "--ranges",
+    "ranges_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="CSV/JSON file of (start_s, end_s) ranges; writes one combined table",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Worker processes for --ranges and --clips extraction [default: 1]",
+)
+@click.option(
+    "--bundle",
+    "bundle_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Compute features from an analysis bundle of this file (no decoding)",
+)
+@click.option(
+    "--prefetch",
+    type=click.IntRange(min=0),
+    default=DEFAULT_PREFETCH_DEPTH,
+    help="Files to decode ahead while extracting when INPUT_FILE is a directory "
+    f"(0: no prefetching) [default: {DEFAULT_PREFETCH_DEPTH}]",
+)
+@click.option(
+    "--clips",
+    is_flag=True,
+    help="Treat a directory as many short clips: batch them into worker tasks "
+    "and write one combined table",
+)
+@click.option(
+    "--clips-per-task",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CLIPS_PER_TASK,
+    help=f"Clips per worker task with --clips [default: {DEFAULT_CLIPS_PER_TASK}]",
+)
 @click.pass_context
 def extract(
     ctx: click.Context,
@@ -237,14 +654,22 @@ def extract(
     output_dir: Path,
     output_format: str,
     extractor: str,
+    features: Optional[tuple],
     segment_start: Optional[float],
     segment_end: Optional[float],
+    ranges_file: Optional[Path],
+    jobs: int,
+    bundle_dir: Optional[Path],
+    prefetch: int,
+    clips: bool,
+    clips_per_task: int,
 ):
     """Extract acoustic features from an audio file.
 
     This command performs only feature extraction without full analysis,
     useful for obtaining structured feature data or analyzing specific
-    time segments of recordings.
+    time segments of recordings. INPUT_FILE may also be a directory, in
+    which case every audio file in it is extracted.
 
     Examples:
 
@@ -256,6 +681,27 @@ def extract(
 
         # Output as CSV for data analysis
         vocal-insight extract recording.wav --format csv --output-dir ./features
+
+        # Extract every range of a labelling file into one table
+        vocal-insight extract recording.wav --ranges labels.csv --jobs 4
+
+        # Reuse the tracks saved by `analyze --bundle` (near-instant)
+        vocal-insight extract recording.wav --ranges labels.csv --bundle rec.bundle
+
+        # Extract every audio file of a directory (decoding ahead)
+        vocal-insight extract ./takes --output-dir ./features
+
+        # Many short clips into one table
+        vocal-insight extract ./clips --clips --format csv --jobs 8
+
+        # Use the vectorized YIN pitch engine
+        vocal-insight extract recording.wav --extractor yin
+
+        # High-throughput mode (YIN pitch + batched LPC formants)
+        vocal-insight extract recording.wav --extractor fast
+
+        # Compute only the F0 and HNR feature groups
+        vocal-insight extract recording.wav --features f0,hnr
     """
     verbose = ctx.obj.get("verbose", False)
     quiet = ctx.obj.get("quiet", False)
@@ -263,6 +709,66 @@ def extract(
     if not quiet:
         click.echo(f"🔍 Extracting features from {input_file.name}...")
 
+    if input_file.is_dir():
+        if (
+            segment_start is not None
+            or segment_end is not None
+            or ranges_file is not None
+            or bundle_dir is not None
+        ):
+            click.echo(
+                "Error: --segment-start/--segment-end, --ranges and --bundle "
+                "cannot be used with a directory",
+                err=True,
+            )
+            ctx.exit(1)
+        if clips:
+            _extract_clips(
+                ctx,
+                input_file,
+                output_dir,
+                output_format,
+                extractor,
+                features,
+                jobs,
+                clips_per_task,
+            )
+        else:
+            _extract_directory(
+                ctx,
+                input_file,
+                output_dir,
+                output_format,
+                extractor,
+                features,
+                prefetch,
+            )
+        return
+
+    if clips:
+        click.echo("Error: --clips requires a directory", err=True)
+        ctx.exit(1)
+
+    if ranges_file is not None:
+        if segment_start is not None or segment_end is not None:
+            click.echo(
+                "Error: --ranges cannot be combined with --segment-start/--segment-end",
+                err=True,
+            )
+            ctx.exit(1)
+        _extract_ranges_file(
+            ctx,
+            input_file,
+            ranges_file,
+            output_dir,
+            output_format,
+            extractor,
+            features,
+            jobs,
+            bundle_dir,
+        )
+        return
+
     # Validate time range
     if segment_start is not None and segment_end is not None:
         if segment_start >= segment_end:
@@ -272,51 +778,278 @@ def extract(
             ctx.exit(1)
 
     try:
-        # Load audio
-        y, sr = librosa.load(input_file, sr=None)
-
-        # Apply time range if specified
-        if segment_start is not None or segment_end is not None:
-            start_sample = int(segment_start * sr) if segment_start is not None else 0
-            end_sample = int(segment_end * sr) if segment_end is not None else len(y)
-            y = y[start_sample:end_sample]
+        if bundle_dir is not None:
+            # Summarize the bundle's frame tracks over the range
+            bundle = _load_bundle_for(input_file, bundle_dir)
+            start = segment_start or 0.0
+            end = segment_end if segment_end is not None else bundle.duration
+            features = bundle.extract([(start, end)], features)[0]
+            extractor = "bundle"
+        else:
+            # Load audio (only the requested time range is read)
+            y, sr = load_audio_range(
+                input_file,
+                segment_start,
+                segment_end,
+                cache=ctx.obj.get("decode_cache"),
+            )
 
-            if verbose:
-                duration = (end_sample - start_sample) / sr
+            if verbose and (segment_start is not None or segment_end is not None):
+                start = segment_start or 0.0
                 click.echo(
-                    f"📐 Analyzing segment: {segment_start or 0:.1f}s - {segment_end or duration:.1f}s"
+                    f"📐 Analyzing segment: {start:.1f}s - {start + len(y) / sr:.1f}s"
                 )
 
-        # Extract features using new modular system
-        from vocal_insight.features import AcousticFeatureExtractor
-
-        extractor_instance = AcousticFeatureExtractor()
-        features = extractor_instance.extract(y, sr)
+            # Extract features using new modular system
+            extractor_instance = get_extractor(extractor, features=features)
+            features = extractor_instance.extract(y, sr)
 
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
-        base_name = input_file.stem
 
         # Save features
-        if output_format == "json":
-            output_file = output_dir / f"{base_name}_features.json"
-            _save_features_json(
-                output_file, features, input_file.name, segment_start, segment_end
-            )
-        elif output_format == "csv":
-            output_file = output_dir / f"{base_name}_features.csv"
-            _save_features_csv(output_file, features)
-        elif output_format == "yaml":
-            output_file = output_dir / f"{base_name}_features.yaml"
-            _save_features_yaml(
-                output_file, features, input_file.name, segment_start, segment_end
-            )
+        output_file = _save_file_features(
+            output_dir,
+            input_file,
+            features,
+            output_format,
+            extractor,
+            segment_start,
+            segment_end,
+        )
 
         if not quiet:
             click.echo(f"✅ Features saved to {output_file}")
 
         if verbose:
-            click.echo(f"📊 Extracted {len(features)} feature values")
+            computed = sum(value is not None for value in features.values())
+            click.echo(f"📊 Extracted {computed} feature values")
+
+    except Exception as e:
+        click.echo(f"❌ Error during feature extraction: {e}", err=True)
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        ctx.exit(1)
+
+
+def _extract_directory(
+    ctx: click.Context,
+    input_dir: Path,
+    output_dir: Path,
+    output_format: str,
+    extractor: str,
+    features: Optional[tuple],
+    prefetch: int,
+):
+    """Extract features from every audio file of a directory.
+
+    Upcoming files are decoded on a background thread (``prefetch`` files
+    ahead) while the current file's features are extracted, and the timing
+    line reports how much of the decoding was hidden behind extraction.
+    A file that fails is reported and skipped; the command then exits 1.
+    """
+    verbose = ctx.obj.get("verbose", False)
+    quiet = ctx.obj.get("quiet", False)
+
+    paths = list_audio_files(input_dir)
+    if not paths:
+        click.echo(f"❌ No audio files found in {input_dir}", err=True)
+        ctx.exit(1)
+
+    extractor_instance = get_extractor(extractor, features=features)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    extract_sec = 0.0
+    started = time.perf_counter()
+    # Decode at the native rate like single-file extract
+    with PrefetchLoader(
+        paths, sr=None, cache=ctx.obj.get("decode_cache"), depth=prefetch
+    ) as loader:
+        for item in loader:
+            try:
+                if item.error is not None:
+                    raise item.error
+                start = time.perf_counter()
+                values = extractor_instance.extract(item.audio, item.sr)
+                extract_sec += time.perf_counter() - start
+                output_file = _save_file_features(
+                    output_dir, item.path, values, output_format, extractor
+                )
+            except Exception as e:
+                failed += 1
+                reason = str(e) or type(e).__name__
+                click.echo(f"❌ Error extracting {item.path.name}: {reason}", err=True)
+                continue
+            if verbose:
+                click.echo(f"✅ Features saved to {output_file}")
+    elapsed = time.perf_counter() - started
+    stats = loader.stats
+
+    if not quiet:
+        click.echo(
+            f"✅ Features for {len(paths) - failed}/{len(paths)} files "
+            f"saved to {output_dir}"
+        )
+        click.echo(
+            f"⏱️  {len(paths)} files in {elapsed:.2f}s: "
+            f"decode {stats.decode_sec:.2f}s "
+            f"({stats.overlap:.0%} overlapped with extraction), "
+            f"extraction {extract_sec:.2f}s"
+        )
+    if failed:
+        ctx.exit(1)
+
+
+def _extract_clips(
+    ctx: click.Context,
+    input_dir: Path,
+    output_dir: Path,
+    output_format: str,
+    extractor: str,
+    features: Optional[tuple],
+    jobs: int,
+    clips_per_task: int,
+):
+    """Extract features from many short clips of a directory into one table.
+
+    Clips are sent to the workers ``clips_per_task`` at a time and each worker
+    keeps one extractor for all of its clips. Results arrive in file order;
+    CSV rows are written as they arrive. A clip that fails is recorded in
+    the table's ``error`` column; the command then exits 1.
+    """
+    verbose = ctx.obj.get("verbose", False)
+    quiet = ctx.obj.get("quiet", False)
+
+    paths = list_audio_files(input_dir)
+    if not paths:
+        click.echo(f"❌ No audio files found in {input_dir}", err=True)
+        ctx.exit(1)
+
+    try:
+        if verbose:
+            click.echo(
+                f"📐 Extracting {len(paths)} clips with {jobs} job(s), "
+                f"{clips_per_task} clips per task"
+            )
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / f"{input_dir.name}_clip_features.{output_format}"
+        started = time.perf_counter()
+        results = extract_clips(
+            paths,
+            extractor,
+            features=features,
+            jobs=jobs,
+            clips_per_task=clips_per_task,
+        )
+        if output_format == "csv":
+            failed = _save_clip_features_csv(output_file, results)
+        else:
+            results = list(results)
+            failed = [result for result in results if result["error"] is not None]
+            if output_format == "json":
+                _save_clip_features_json(
+                    output_file, results, input_dir.name, extractor
+                )
+            elif output_format == "yaml":
+                _save_clip_features_yaml(
+                    output_file, results, input_dir.name, extractor
+                )
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        click.echo(f"❌ Error during feature extraction: {e}", err=True)
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        ctx.exit(1)
+
+    for result in failed[:MAX_REPORTED_CLIP_ERRORS]:
+        click.echo(
+            f"❌ Error extracting {result['filename']}: {result['error']}", err=True
+        )
+    if len(failed) > MAX_REPORTED_CLIP_ERRORS:
+        click.echo(
+            f"❌ ... and {len(failed) - MAX_REPORTED_CLIP_ERRORS} more clips "
+            "(see the error column)",
+            err=True,
+        )
+    if not quiet:
+        click.echo(
+            f"✅ Features for {len(paths) - len(failed)}/{len(paths)} clips "
+            f"saved to {output_file}"
+        )
+        click.echo(
+            f"⏱️  {len(paths)} clips in {elapsed:.2f}s "
+            f"({len(paths) / elapsed:.1f} clips/s)"
+        )
+    if failed:
+        ctx.exit(1)
+
+
+def _extract_ranges_file(
+    ctx: click.Context,
+    input_file: Path,
+    ranges_file: Path,
+    output_dir: Path,
+    output_format: str,
+    extractor: str,
+    features: Optional[tuple],
+    jobs: int,
+    bundle_dir: Optional[Path] = None,
+):
+    """Extract features for every range of a ranges file into one table.
+
+    The audio is decoded once and the ranges are spread over ``jobs`` worker
+    processes, instead of one ``extract --segment-start/--segment-end`` call
+    (and one decode) per range. With ``bundle_dir`` the features come from
+    the bundle's frame tracks and nothing is decoded.
+    """
+    verbose = ctx.obj.get("verbose", False)
+    quiet = ctx.obj.get("quiet", False)
+
+    try:
+        ranges = read_ranges(ranges_file)
+        if not ranges:
+            raise ValueError(f"no ranges in {ranges_file.name}")
+
+        if bundle_dir is not None:
+            bundle = _load_bundle_for(input_file, bundle_dir)
+            results = [
+                {
+                    "segment_id": number,
+                    "time_start_s": start,
+                    "time_end_s": min(end, bundle.duration),
+                    "features": values,
+                }
+                for number, ((start, end), values) in enumerate(
+                    zip(ranges, bundle.extract(ranges, features)), start=1
+                )
+            ]
+            extractor = "bundle"
+        else:
+            # Decode at the native rate like single-range extract
+            y, sr = load_audio(input_file, sr=None, cache=ctx.obj.get("decode_cache"))
+
+            if verbose:
+                click.echo(f"📐 Extracting {len(ranges)} ranges with {jobs} job(s)")
+
+            results = extract_ranges(
+                y, sr, ranges, extractor, features=features, jobs=jobs
+            )
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / f"{input_file.stem}_range_features.{output_format}"
+        if output_format == "json":
+            _save_range_features_json(output_file, results, input_file.name, extractor)
+        elif output_format == "csv":
+            _save_range_features_csv(output_file, results)
+        elif output_format == "yaml":
+            _save_range_features_yaml(output_file, results, input_file.name, extractor)
+
+        if not quiet:
+            click.echo(f"✅ Features for {len(results)} ranges saved to {output_file}")
 
     except Exception as e:
         click.echo(f"❌ Error during feature extraction: {e}", err=True)
@@ -363,11 +1096,29 @@ def extract(
     default=95,
     help="RMS percentile for boundary detection [default: 95]",
 )
+@click.option(
+    "--segmentation",
+    type=click.Choice(["rms", "phrase"], case_sensitive=False),
+    default="rms",
+    help="Segmentation method: RMS change points or unvoiced gaps between phrases [default: rms]",
+)
+@click.option(
+    "--min-gap",
+    type=float,
+    default=0.3,
+    help="Minimum unvoiced gap in seconds treated as a phrase break [default: 0.3]",
+)
 @click.option(
     "--plot",
     is_flag=True,
     help="Generate visualization plot of segments (requires matplotlib)",
 )
+@click.option(
+    "--bundle",
+    "bundle_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Segment from an analysis bundle of this file (no decoding)",
+)
 @click.pass_context
 def segment(
     ctx: click.Context,
@@ -377,7 +1128,10 @@ def segment(
     min_segment: float,
     max_segment: float,
     percentile: int,
+    segmentation: str,
+    min_gap: float,
     plot: bool,
+    bundle_dir: Optional[Path],
 ):
     """Detect and analyze segments in an audio file.
 
@@ -395,6 +1149,12 @@ def segment(
 
         # Custom segment parameters
         vocal-insight segment recording.wav --min-segment 5.0 --percentile 90
+
+        # Phrase-aware segmentation from the voicing contour
+        vocal-insight segment recording.wav --segmentation phrase
+
+        # Re-segment and re-plot from the intermediates saved by analyze
+        vocal-insight segment recording.wav --bundle rec.bundle --plot --percentile 90
     """
     verbose = ctx.obj.get("verbose", False)
     quiet = ctx.obj.get("quiet", False)
@@ -407,22 +1167,44 @@ def segment(
         click.echo("Error: --min-segment must be less than --max-segment", err=True)
         ctx.exit(1)
 
+    config = AnalysisConfig(
+        rms_delta_percentile=percentile,
+        min_len_sec=min_segment,
+        max_len_sec=max_segment,
+        segmentation=segmentation,
+        min_gap_sec=min_gap,
+    )
+
     try:
         # Use new modular system for segment detection
-        from vocal_insight.segments import SegmentBoundaryDetector, SegmentProcessor
+        from vocal_insight.analysis import detect_segments
 
-        # Load audio
-        y, sr = librosa.load(input_file, sr=None)
-
-        # Detect boundaries
-        detector = SegmentBoundaryDetector()
-        boundaries = detector.detect_boundaries(y, sr, percentile)
-
-        # Process segments
-        processor = SegmentProcessor()
-        segments = processor.process_boundaries(
-            boundaries, len(y), sr, min_segment, max_segment
-        )
+        if bundle_dir is not None:
+            # RMS and the pitch contour come from the bundle
+            bundle = _load_bundle_for(input_file, bundle_dir)
+            y, sr, rms = None, bundle.sr, bundle.rms
+            segment_ranges = bundle.segment(config)
+        else:
+            # Load audio
+            y, sr = load_audio(input_file, sr=None, cache=ctx.obj.get("decode_cache"))
+
+            # Frame RMS is shared by RMS boundary detection and the plot
+            rms = None
+            if plot or segmentation == "rms":
+                from vocal_insight.segments import SegmentBoundaryDetector
+
+                rms = SegmentBoundaryDetector().analyze(y, sr, percentile).rms
+
+            # Detect boundaries and apply length constraints
+            segment_ranges, _ = detect_segments(y, sr, config, rms=rms)
+        segments = [
+            {
+                "segment_id": i,
+                "time_start_s": float(start),
+                "time_end_s": float(end),
+            }
+            for i, (start, end) in enumerate(segment_ranges)
+        ]
 
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -442,7 +1224,14 @@ def segment(
         # Generate plot if requested
         if plot:
             plot_file = output_dir / f"{base_name}_segments.png"
-            _generate_segment_plot(plot_file, y, sr, segments)
+            _generate_segment_plot(
+                plot_file,
+                y,
+                sr,
+                segments,
+                rms=rms,
+                envelope=bundle.envelope if bundle_dir is not None else None,
+            )
             if not quiet:
                 click.echo(f"📊 Plot saved to {plot_file}")
 
@@ -463,6 +1252,231 @@ def segment(
         ctx.exit(1)
 
 
+@cli.command()
+@click.argument(
+    "input_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path.cwd(),
+    help="Output directory [default: current directory]",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["txt", "csv", "json"], case_sensitive=False),
+    default="txt",
+    help="Output format [default: txt]",
+)
+@click.option(
+    "--percentile",
+    "percentiles",
+    callback=_parse_list_option(int),
+    help="Comma-separated RMS percentiles to try [default: 95]",
+)
+@click.option(
+    "--min-segment",
+    "min_segments",
+    callback=_parse_list_option(float),
+    help="Comma-separated minimum segment lengths in seconds [default: 8.0]",
+)
+@click.option(
+    "--max-segment",
+    "max_segments",
+    callback=_parse_list_option(float),
+    help="Comma-separated maximum segment lengths in seconds [default: 45.0]",
+)
+@click.option(
+    "--segmentation",
+    "segmentations",
+    callback=_parse_list_option(str),
+    help="Comma-separated segmentation methods to try (rms, phrase, window) "
+    "[default: rms]",
+)
+@click.option(
+    "--min-gap",
+    "min_gaps",
+    callback=_parse_list_option(float),
+    help="Comma-separated minimum phrase gaps in seconds [default: 0.3]",
+)
+@click.option(
+    "--pitch-engine",
+    type=click.Choice(["praat", "yin"], case_sensitive=False),
+    default="praat",
+    help="F0 estimator: Praat or vectorized YIN [default: praat]",
+)
+@click.option(
+    "--formant-engine",
+    type=click.Choice(["burg", "lpc"], case_sensitive=False),
+    default="burg",
+    help="Formant estimator: Praat Burg or batched LPC [default: burg]",
+)
+@features_option
+@click.pass_context
+def sweep(
+    ctx: click.Context,
+    input_file: Path,
+    output_dir: Path,
+    output_format: str,
+    percentiles: Optional[list],
+    min_segments: Optional[list],
+    max_segments: Optional[list],
+    segmentations: Optional[list],
+    min_gaps: Optional[list],
+    pitch_engine: str,
+    formant_engine: str,
+    features: Optional[tuple],
+):
+    """Compare many segmentation settings on one file in a single pass.
+
+    Every combination of the comma-separated values is evaluated. The audio is
+    decoded once and the RMS, pitch, HNR and formant frame data are computed
+    once; each setting only re-segments and aggregates the shared frames. The
+    comparison table lists segment counts, segment length distribution and the
+    spread (standard deviation across segments) of each feature.
+
+    Examples:
+
+        # Calibrate the RMS boundary settings for a new genre
+        vocal-insight sweep song.wav --percentile 85,90,95,99 --min-segment 5,8
+
+        # RMS vs phrase segmentation, saved as CSV
+        vocal-insight sweep song.wav --segmentation rms,phrase --format csv
+    """
+    verbose = ctx.obj.get("verbose", False)
+    quiet = ctx.obj.get("quiet", False)
+
+    base = get_default_config()
+    base.update(pitch_engine=pitch_engine, formant_engine=formant_engine)
+    grid = {
+        key: values
+        for key, values in (
+            ("rms_delta_percentile", percentiles),
+            ("min_len_sec", min_segments),
+            ("max_len_sec", max_segments),
+            ("segmentation", segmentations),
+            ("min_gap_sec", min_gaps),
+        )
+        if values
+    }
+    configs = []
+    for config in config_grid(base, **grid):
+        try:
+            validate_config(config)
+        except ValueError as e:
+            if not quiet:
+                click.echo(f"Warning: skipping {dict(config)}: {e}", err=True)
+            continue
+        configs.append(config)
+    if not configs:
+        click.echo("Error: no valid setting to evaluate", err=True)
+        ctx.exit(1)
+
+    if not quiet:
+        click.echo(f"🧪 Sweeping {len(configs)} settings on {input_file.name}...")
+
+    try:
+        y, sr = load_audio(input_file, cache=ctx.obj.get("decode_cache"))
+        results = sweep_audio(y, sr, configs, features=features)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / f"{input_file.stem}_sweep.{output_format}"
+        table = format_sweep_table(results)
+        if output_format == "txt":
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(table + "\n")
+        elif output_format == "csv":
+            _save_sweep_csv(output_file, results)
+        elif output_format == "json":
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"filename": input_file.name, "results": results},
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+
+        if not quiet:
+            click.echo(table)
+            click.echo(f"✅ Sweep results saved to {output_file}")
+
+    except Exception as e:
+        click.echo(f"❌ Error during sweep: {e}", err=True)
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument(
+    "bundle_dir", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path.cwd(),
+    help="Output directory [default: current directory]",
+)
+@max_tokens_option
+@click.pass_context
+def prompt(
+    ctx: click.Context, bundle_dir: Path, output_dir: Path, max_tokens: Optional[int]
+):
+    """Regenerate the LLM prompt from an analysis bundle.
+
+    The segments and features saved by `analyze --bundle` are formatted
+    again without decoding or analyzing the audio.
+
+    Examples:
+
+        vocal-insight analyze take.wav --bundle take.bundle
+        vocal-insight prompt take.bundle --output-dir ./prompts
+        vocal-insight prompt take.bundle --max-tokens 1500
+    """
+    verbose = ctx.obj.get("verbose", False)
+    quiet = ctx.obj.get("quiet", False)
+
+    try:
+        bundle = load_bundle(bundle_dir)
+        segments = bundle.segments
+        llm_prompt = _generate_llm_prompt_from_segments(
+            segments, bundle.filename, max_tokens=max_tokens
+        )
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / f"{Path(bundle.filename).stem}_analysis.txt"
+        _save_text_format(output_file, segments, llm_prompt)
+
+        if not quiet:
+            click.echo(f"✅ Prompt saved to {output_file}")
+        if not quiet and (verbose or max_tokens is not None):
+            _report_prompt_tokens(llm_prompt, max_tokens)
+
+    except Exception as e:
+        click.echo(f"❌ Error during prompt generation: {e}", err=True)
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        ctx.exit(1)
+
+
+def _load_bundle_for(input_file: Path, bundle_dir: Path):
+    """Load an analysis bundle, checking that it was made from ``input_file``."""
+    bundle = load_bundle(bundle_dir)
+    if not bundle.matches(input_file):
+        raise ValueError(
+            f"bundle {bundle_dir} was created from {bundle.filename}, "
+            f"not {input_file.name}"
+        )
+    return bundle
+
+
 @cli.command()
 def examples():
     """Show usage examples for different commands and scenarios."""
@@ -481,12 +1495,33 @@ Structured Output:
   vocal-insight analyze recording.wav --format json --output-dir ./results
   vocal-insight analyze recording.wav --format yaml --quiet
 
+Long Recordings:
+  vocal-insight analyze concert.wav --chunk 60 --jobs 4
+  vocal-insight analyze concert.wav --segmentation phrase --chunk 60 --jobs 4
+
 Feature Extraction:
   vocal-insight extract recording.wav --format csv
   vocal-insight extract recording.wav --segment-start 10.0 --segment-end 20.0
+  vocal-insight extract recording.wav --extractor yin
+  vocal-insight extract recording.wav --extractor fast
+  vocal-insight extract recording.wav --features f0,hnr
+  vocal-insight extract recording.wav --ranges labels.csv --jobs 4
+  vocal-insight extract ./takes --format csv --output-dir ./features
+  vocal-insight extract ./clips --clips --format csv --jobs 8
+
+Analysis Bundles:
+  vocal-insight analyze recording.wav --bundle rec.bundle
+  vocal-insight segment recording.wav --bundle rec.bundle --plot --percentile 90
+  vocal-insight extract recording.wav --bundle rec.bundle --segment-start 10 --segment-end 20
+  vocal-insight prompt rec.bundle
+
+Parameter Sweep:
+  vocal-insight sweep recording.wav --percentile 90,95,99 --min-segment 5,8
+  vocal-insight sweep recording.wav --segmentation rms,phrase --format csv
 
 Segment Detection:
   vocal-insight segment recording.wav --plot
+  vocal-insight segment recording.wav --segmentation phrase --min-gap 0.25
   vocal-insight segment recording.wav --min-segment 5.0 --format yaml
 
 Module Selection:
@@ -495,6 +1530,7 @@ Module Selection:
 
 Batch Processing:
   vocal-insight --quiet analyze *.wav --format json --output-dir ./batch
+  vocal-insight --decode-cache ~/.cache/vocal-insight analyze song.mp3
 
 Get Help:
   vocal-insight --help
@@ -517,6 +1553,8 @@ acoustic:
   - F0 (fundamental frequency) analysis
   - HNR (harmonics-to-noise ratio) 
   - Formant frequency detection (F1, F2, F3)
+  - Pitch engine selectable with --pitch-engine (praat, yin)
+  - Formant engine selectable with --formant-engine (burg, lpc)
   
 core:
   Basic feature extraction with essential functionality
@@ -609,10 +1647,37 @@ Supported Audio Formats:
 
 
 # Helper functions for output formatting
+# (key, label, unit, scale): jitter/shimmer are ratios shown as percentages,
+# mean RMS is shown in thousandths of full scale
+_PROMPT_FEATURE_LINES = [
+    ("f0_mean_hz", "F0 mean", "Hz", 1.0),
+    ("f0_std_hz", "F0 std", "Hz", 1.0),
+    ("hnr_mean_db", "HNR mean", "dB", 1.0),
+    ("f1_mean_hz", "F1 mean", "Hz", 1.0),
+    ("f2_mean_hz", "F2 mean", "Hz", 1.0),
+    ("f3_mean_hz", "F3 mean", "Hz", 1.0),
+    ("rms_mean", "RMS mean", "x 1e-3", 1000.0),
+    ("dynamic_range_db", "Dynamic range", "dB", 1.0),
+    ("crest_factor_db", "Crest factor", "dB", 1.0),
+    ("loudness_slope_db_per_s", "Loudness slope", "dB/s", 1.0),
+    ("jitter_local", "Jitter (local)", "%", 100.0),
+    ("shimmer_local", "Shimmer (local)", "%", 100.0),
+    ("vibrato_rate_hz", "Vibrato rate", "Hz", 1.0),
+    ("vibrato_extent_cents", "Vibrato extent", "cents", 1.0),
+    ("spectral_centroid_hz", "Spectral centroid", "Hz", 1.0),
+    ("spectral_rolloff_hz", "Spectral rolloff", "Hz", 1.0),
+]
+
+
 def _generate_llm_prompt_from_segments(
-    segments: List[Dict[str, Any]], filename: str
+    segments: List[Dict[str, Any]], filename: str, max_tokens: Optional[int] = None
 ) -> str:
-    """Generate LLM prompt from segment analysis results."""
+    """Generate LLM prompt from segment analysis results.
+
+    With ``max_tokens`` the segments are rendered as a compact table that is
+    fitted into about that many (estimated) tokens: similar adjacent segments
+    are merged first, then the rows with the largest feature changes are kept.
+    """
     prompt_parts = [
         f"Vocal Analysis Results for {filename}",
         "=" * (len(filename) + 28),
@@ -622,6 +1687,17 @@ def _generate_llm_prompt_from_segments(
         "",
     ]
 
+    if max_tokens is not None:
+        prompt_parts.append(
+            "Segment features (one row per segment; a row like 3-5 averages "
+            "similar adjacent segments; - means not computed):"
+        )
+        header = "\n".join(prompt_parts) + "\n"
+        table = segment_table(
+            segments, max_tokens=max_tokens - estimate_tokens(header), start=0
+        )
+        return header + table.text
+
     for i, segment in enumerate(segments):
         prompt_parts.extend(
             [
@@ -633,21 +1709,60 @@ def _generate_llm_prompt_from_segments(
 
         if "features" in segment:
             features = segment["features"]
-            prompt_parts.extend(
-                [
-                    f"  F0 mean: {features.get('f0_mean_hz', 0):.1f} Hz",
-                    f"  F0 std: {features.get('f0_std_hz', 0):.1f} Hz",
-                    f"  HNR mean: {features.get('hnr_mean_db', 0):.1f} dB",
-                    f"  F1 mean: {features.get('f1_mean_hz', 0):.1f} Hz",
-                    f"  F2 mean: {features.get('f2_mean_hz', 0):.1f} Hz",
-                    f"  F3 mean: {features.get('f3_mean_hz', 0):.1f} Hz",
-                ]
-            )
+            for key, label, unit, scale in _PROMPT_FEATURE_LINES:
+                value = features.get(key)
+                # Skip fields that were not computed (feature selection)
+                if value is not None:
+                    prompt_parts.append(f"  {label}: {value * scale:.1f} {unit}")
         prompt_parts.append("")
 
     return "\n".join(prompt_parts)
 
 
+def _report_prompt_tokens(llm_prompt: str, max_tokens: Optional[int]) -> None:
+    """Echo the local token estimate of a generated prompt."""
+    tokens = estimate_tokens(llm_prompt)
+    if max_tokens is None:
+        click.echo(f"🧮 LLM prompt: ~{tokens} tokens (estimate)")
+    elif tokens <= max_tokens:
+        click.echo(f"🧮 LLM prompt: ~{tokens} tokens (estimate, budget {max_tokens})")
+    else:
+        click.echo(
+            f"⚠️  LLM prompt: ~{tokens} tokens exceeds the budget of {max_tokens} "
+            "(the fixed text alone does not fit)",
+            err=True,
+        )
+
+
+def _format_pitch_accuracy_section(result: PitchAnalysisResult) -> str:
+    """Format pitch accuracy results as a prompt section."""
+    accuracy = result["pitch_accuracy"]
+    if accuracy is None:
+        return ""
+
+    def fmt(value: Optional[float], spec: str) -> str:
+        return "n/a" if value is None else format(value, spec)
+
+    alignment = result["reference_audio"]["alignment"]
+    lines = [
+        "",
+        "Pitch accuracy against reference:",
+        f"  Reference offset: {alignment['offset_seconds']:.2f}s",
+        f"  Mean deviation: {fmt(accuracy['mean_cent_deviation'], '.1f')} cents",
+        f"  Hit rate: {fmt(accuracy['hit_rate'], '.0%')}",
+        f"  Stability: {fmt(accuracy['stability'], '.0%')}",
+    ]
+    for section in accuracy["per_section"]:
+        lines.append(
+            f"  {section['section_id']} ({section['time_start_s']:.1f}s - "
+            f"{section['time_end_s']:.1f}s): "
+            f"{fmt(section['cent_deviation'], '.1f')} cents, "
+            f"hit rate {fmt(section['hit_rate'], '.0%')}"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
 def _save_text_format(
     output_file: Path, segments: List[Dict[str, Any]], llm_prompt: str
 ):
@@ -665,11 +1780,7 @@ def _save_json_format(
     """Save analysis results in JSON format."""
     data = {
         "filename": filename,
-        "analysis_config": {
-            "rms_delta_percentile": config["rms_delta_percentile"],
-            "min_len_sec": config["min_len_sec"],
-            "max_len_sec": config["max_len_sec"],
-        },
+        "analysis_config": dict(config),
         "segments": segments,
         "metadata": {
             "total_segments": len(segments),
@@ -690,11 +1801,7 @@ def _save_yaml_format(
     """Save analysis results in YAML format."""
     data = {
         "filename": filename,
-        "analysis_config": {
-            "rms_delta_percentile": config["rms_delta_percentile"],
-            "min_len_sec": config["min_len_sec"],
-            "max_len_sec": config["max_len_sec"],
-        },
+        "analysis_config": dict(config),
         "segments": segments,
         "metadata": {
             "total_segments": len(segments),
@@ -708,12 +1815,37 @@ def _save_yaml_format(
         )
 
 
+def _save_file_features(
+    output_dir: Path,
+    input_file: Path,
+    features: FeatureData,
+    output_format: str,
+    extractor: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+) -> Path:
+    """Save one file's features as ``<stem>_features.<format>``."""
+    output_file = output_dir / f"{input_file.stem}_features.{output_format}"
+    if output_format == "json":
+        _save_features_json(
+            output_file, features, input_file.name, start_time, end_time, extractor
+        )
+    elif output_format == "csv":
+        _save_features_csv(output_file, features)
+    elif output_format == "yaml":
+        _save_features_yaml(
+            output_file, features, input_file.name, start_time, end_time, extractor
+        )
+    return output_file
+
+
 def _save_features_json(
     output_file: Path,
     features: FeatureData,
     filename: str,
     start_time: Optional[float],
     end_time: Optional[float],
+    extraction_method: str = "acoustic",
 ):
     """Save features in JSON format."""
     data = {
@@ -726,7 +1858,7 @@ def _save_features_json(
         else None,
         "features": dict(features),
         "metadata": {
-            "extraction_method": "acoustic",
+            "extraction_method": extraction_method,
             "feature_count": len(features),
         },
     }
@@ -752,6 +1884,7 @@ def _save_features_yaml(
     filename: str,
     start_time: Optional[float],
     end_time: Optional[float],
+    extraction_method: str = "acoustic",
 ):
     """Save features in YAML format."""
     data = {
@@ -764,7 +1897,7 @@ def _save_features_yaml(
         else None,
         "features": dict(features),
         "metadata": {
-            "extraction_method": "acoustic",
+            "extraction_method": extraction_method,
             "feature_count": len(features),
         },
     }
@@ -775,6 +1908,172 @@ def _save_features_yaml(
         )
 
 
+def _range_features_data(
+    results: List[Dict[str, Any]], filename: str, extraction_method: str
+) -> Dict[str, Any]:
+    """Build the combined document for multi-range extraction."""
+    return {
+        "filename": filename,
+        "ranges": [
+            dict(result, features=dict(result["features"])) for result in results
+        ],
+        "metadata": {
+            "extraction_method": extraction_method,
+            "total_ranges": len(results),
+        },
+    }
+
+
+def _save_range_features_json(
+    output_file: Path,
+    results: List[Dict[str, Any]],
+    filename: str,
+    extraction_method: str = "acoustic",
+):
+    """Save multi-range features in JSON format."""
+    data = _range_features_data(results, filename, extraction_method)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _save_range_features_csv(output_file: Path, results: List[Dict[str, Any]]):
+    """Save multi-range features in CSV format (one row per range)."""
+    import csv
+
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        if not results:
+            return
+
+        writer = csv.DictWriter(
+            f,
+            fieldnames=["segment_id", "time_start_s", "time_end_s"]
+            + list(results[0]["features"]),
+        )
+        writer.writeheader()
+        for result in results:
+            writer.writerow(
+                {
+                    "segment_id": result["segment_id"],
+                    "time_start_s": result["time_start_s"],
+                    "time_end_s": result["time_end_s"],
+                    **result["features"],
+                }
+            )
+
+
+def _save_range_features_yaml(
+    output_file: Path,
+    results: List[Dict[str, Any]],
+    filename: str,
+    extraction_method: str = "acoustic",
+):
+    """Save multi-range features in YAML format."""
+    data = _range_features_data(results, filename, extraction_method)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        yaml.dump(
+            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
+        )
+
+
+def _clip_features_data(
+    results: List[Dict[str, Any]], directory: str, extraction_method: str
+) -> Dict[str, Any]:
+    """Build the combined document for short-clip extraction."""
+    return {
+        "directory": directory,
+        "clips": [
+            dict(
+                result,
+                features=None
+                if result["features"] is None
+                else dict(result["features"]),
+            )
+            for result in results
+        ],
+        "metadata": {
+            "extraction_method": extraction_method,
+            "total_clips": len(results),
+        },
+    }
+
+
+def _save_clip_features_json(
+    output_file: Path,
+    results: List[Dict[str, Any]],
+    directory: str,
+    extraction_method: str = "acoustic",
+):
+    """Save short-clip features in JSON format."""
+    data = _clip_features_data(results, directory, extraction_method)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _save_clip_features_csv(
+    output_file: Path, results: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Save short-clip features in CSV format (one row per clip).
+
+    Rows are written as they arrive; only the clips that failed are kept
+    (and returned) so that very large runs stay within memory.
+    """
+    import csv
+
+    failed: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    writer = None
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        for result in results:
+            if result["error"] is not None:
+                failed.append(result)
+            pending.append(result)
+            if writer is None:
+                if result["features"] is None:
+                    # Feature columns come from the first clip that succeeded
+                    continue
+                writer = csv.DictWriter(
+                    f,
+                    fieldnames=["clip_id", "filename", "duration_s"]
+                    + list(result["features"])
+                    + ["error"],
+                )
+                writer.writeheader()
+            for row in pending:
+                writer.writerow(
+                    {
+                        "clip_id": row["clip_id"],
+                        "filename": row["filename"],
+                        "duration_s": row["duration_s"],
+                        **(row["features"] or {}),
+                        "error": row["error"],
+                    }
+                )
+            pending.clear()
+        if writer is None and pending:
+            writer = csv.DictWriter(f, fieldnames=list(pending[0]))
+            writer.writeheader()
+            writer.writerows(pending)
+    return failed
+
+
+def _save_clip_features_yaml(
+    output_file: Path,
+    results: List[Dict[str, Any]],
+    directory: str,
+    extraction_method: str = "acoustic",
+):
+    """Save short-clip features in YAML format."""
+    data = _clip_features_data(results, directory, extraction_method)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        yaml.dump(
+            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
+        )
+
+
 def _save_segments_json(
     output_file: Path, segments: List[Dict[str, Any]], filename: str
 ):
@@ -817,6 +2116,20 @@ def _save_segments_csv(output_file: Path, segments: List[Dict[str, Any]]):
             )
 
 
+def _save_sweep_csv(output_file: Path, results: List[Dict[str, Any]]):
+    """Save sweep comparison rows in CSV format."""
+    import csv
+
+    rows = table_rows(results)
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        if not rows:
+            return
+
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
 def _save_segments_yaml(
     output_file: Path, segments: List[Dict[str, Any]], filename: str
 ):
@@ -837,9 +2150,20 @@ def _save_segments_yaml(
 
 
 def _generate_segment_plot(
-    output_file: Path, y: Any, sr: int, segments: List[Dict[str, Any]]
+    output_file: Path,
+    y: Any,
+    sr: int,
+    segments: List[Dict[str, Any]],
+    rms: Optional[Any] = None,
+    envelope: Optional[Any] = None,
 ):
-    """Generate visualization plot of segments."""
+    """Generate visualization plot of segments.
+
+    ``rms`` is the frame RMS already computed for boundary detection; it is
+    only recomputed when not given. Without audio (``y`` is None) the
+    waveform is drawn from ``envelope``, the per-RMS-frame peak amplitude
+    saved in an analysis bundle.
+    """
     try:
         import matplotlib.pyplot as plt
         import numpy as np
@@ -847,26 +2171,40 @@ def _generate_segment_plot(
         # Create figure
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
 
-        # Time axis
-        time = np.arange(len(y)) / sr
+        from vocal_insight.segments.detector import (
+            RMS_HOP_LENGTH,
+            SegmentBoundaryDetector,
+            rms_boundaries,
+        )
+
+        # RMS and its frame-to-frame change (the detector's curves)
+        if y is None:
+            curves = rms_boundaries(rms, sr, 0)
+        else:
+            curves = SegmentBoundaryDetector().analyze(y, sr, 0, rms=rms)
+        rms_time = librosa.frames_to_time(
+            np.arange(len(curves.rms)), sr=sr, hop_length=RMS_HOP_LENGTH
+        )
 
         # Plot waveform
-        ax1.plot(time, y, alpha=0.7, color="blue")
+        if y is None:
+            ax1.fill_between(rms_time, -envelope, envelope, alpha=0.7, color="blue")
+        else:
+            ax1.plot(np.arange(len(y)) / sr, y, alpha=0.7, color="blue")
         ax1.set_ylabel("Amplitude")
         ax1.set_title("Audio Waveform with Detected Segments")
         ax1.grid(True, alpha=0.3)
 
-        # Plot RMS
-        frame_length = 2048
-        hop_length = 512
-        rms = librosa.feature.rms(
-            y=y, frame_length=frame_length, hop_length=hop_length
-        )[0]
-        rms_time = librosa.frames_to_time(
-            np.arange(len(rms)), sr=sr, hop_length=hop_length
-        )
+        # Plot RMS and its frame-to-frame change
 
-        ax2.plot(rms_time, rms, color="orange", label="RMS Energy")
+        ax2.plot(rms_time, curves.rms, color="orange", label="RMS Energy")
+        ax2.plot(
+            rms_time[1:],
+            curves.delta_rms,
+            color="green",
+            alpha=0.6,
+            label="RMS Change",
+        )
         ax2.set_xlabel("Time (seconds)")
         ax2.set_ylabel("RMS Energy")
         ax2.set_title("RMS Energy with Segment Boundaries")